@@ -3,6 +3,7 @@
 __version__ = importlib.metadata.version("autogen_core")
 
 from ._agent import Agent
+from ._agent_eviction import AgentEvictionPolicy
 from ._agent_id import AgentId
 from ._agent_instantiation import AgentInstantiationContext
 from ._agent_metadata import AgentMetadata
@@ -10,7 +11,7 @@
 from ._agent_runtime import AgentRuntime
 from ._agent_type import AgentType
 from ._base_agent import BaseAgent
-from ._cache_store import CacheStore, InMemoryStore
+from ._cache_store import CacheStats, CacheStore, InMemoryStore
 from ._cancellation_token import CancellationToken
 from ._closure_agent import ClosureAgent, ClosureContext
 from ._component_config import (
@@ -44,6 +45,7 @@
 )
 from ._message_context import MessageContext
 from ._message_handler_context import MessageHandlerContext
+from ._message_queue import MessageQueueMetrics
 from ._routed_agent import RoutedAgent, event, message_handler, rpc
 from ._serialization import (
     JSON_DATA_CONTENT_TYPE as JSON_DATA_CONTENT_TYPE_ALIAS,
@@ -87,6 +89,7 @@
     "AgentRuntime",
     "BaseAgent",
     "CacheStore",
+    "CacheStats",
     "InMemoryStore",
     "CancellationToken",
     "AgentInstantiationContext",
@@ -116,6 +119,8 @@
     "JSON_DATA_CONTENT_TYPE",
     "PROTOBUF_DATA_CONTENT_TYPE",
     "SingleThreadedAgentRuntime",
+    "AgentEvictionPolicy",
+    "MessageQueueMetrics",
     "ROOT_LOGGER_NAME",
     "EVENT_LOGGER_NAME",
     "TRACE_LOGGER_NAME",
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Mapping, Tuple
+
+from ._agent import Agent
+from ._agent_id import AgentId
+from ._cache_store import CacheStore, InMemoryStore
+
+logger = logging.getLogger("autogen_core")
+
+
+@dataclass
+class AgentEvictionPolicy:
+    """Controls when a runtime evicts instantiated agents from memory.
+
+    When an agent is evicted, the runtime saves its state with :meth:`~autogen_core.Agent.save_state`
+    into the state store and closes it. The next time the agent is needed, the runtime creates a new
+    instance with the agent's factory and restores its state with :meth:`~autogen_core.Agent.load_state`.
+
+    The runtime checks for agents to evict whenever it looks up an agent. An idle agent therefore
+    stays in memory until the runtime next looks up any agent. Agents that are handling a message
+    are never evicted.
+
+    .. note::
+
+        :meth:`~autogen_core.AgentRuntime.save_state` of the runtime only covers the agents that are in memory.
+        The state of evicted agents is in the state store.
+
+    Args:
+        max_agents (int | None, optional): The maximum number of agents kept in memory. The least recently
+            used agents are evicted beyond it. Defaults to None (no limit).
+        idle_timeout (float | None, optional): Agents that have not been used for this many seconds are
+            evicted. Defaults to None (no timeout).
+        state_store (CacheStore[Mapping[str, Any]], optional): Where the states of evicted agents are kept,
+            keyed by ``str(agent_id)``. Defaults to an :class:`~autogen_core.InMemoryStore`, which keeps the
+            states in memory. Use a persistent store, such as :class:`~autogen_ext.cache_store.redis.RedisStore`,
+            to keep the memory of the runtime bounded.
+    """
+
+    max_agents: int | None = None
+    idle_timeout: float | None = None
+    state_store: CacheStore[Mapping[str, Any]] = field(default_factory=lambda: InMemoryStore[Mapping[str, Any]]())
+
+    def __post_init__(self) -> None:
+        if self.max_agents is not None and self.max_agents <= 0:
+            raise ValueError("max_agents must be greater than 0.")
+        if self.idle_timeout is not None and self.idle_timeout <= 0:
+            raise ValueError("idle_timeout must be greater than 0.")
+
+
+class AgentInstances:
+    """The instantiated agents of a runtime, evicted according to an :class:`AgentEvictionPolicy`.
+
+    Without a policy, agents are kept forever. Runtimes mark an agent as in use with :meth:`acquire`
+    right after looking it up for a delivery, and with :meth:`release` once the agent has handled
+    the message."""
+
+    def __init__(self, policy: AgentEvictionPolicy | None = None) -> None:
+        self._policy = policy
+        # Least recently used first.
+        self._agents: OrderedDict[AgentId, Agent] = OrderedDict()
+        self._last_used: Dict[AgentId, float] = {}
+        self._in_use: Dict[AgentId, int] = {}
+        self._evictions: Dict[AgentId, asyncio.Task[None]] = {}
+        # Agents that are being created, so that concurrent lookups share one instance.
+        self._creations: Dict[AgentId, asyncio.Future[Agent]] = {}
+
+    def __contains__(self, agent_id: AgentId) -> bool:
+        return agent_id in self._agents
+
+    def __iter__(self) -> Iterator[AgentId]:
+        # A snapshot, as looking up agents reorders them.
+        return iter(list(self._agents))
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def items(self) -> List[Tuple[AgentId, Agent]]:
+        """The agents in memory, without marking them as used."""
+        return list(self._agents.items())
+
+    def get(self, agent_id: AgentId) -> Agent | None:
+        agent = self._agents.get(agent_id)
+        if self._policy is None:
+            return agent
+        if agent is not None:
+            self._touch(agent_id)
+        self._evict(keep=agent_id)
+        return agent
+
+    def add(self, agent_id: AgentId, agent: Agent) -> None:
+        self._agents[agent_id] = agent
+        if self._policy is not None:
+            self._touch(agent_id)
+            self._evict(keep=agent_id)
+
+    async def get_or_create(self, agent_id: AgentId, create: Callable[[], Awaitable[Agent]]) -> Agent:
+        """Look up an agent, or create it with ``create`` and restore its saved state.
+
+        Concurrent lookups of an agent that is being created wait for that instance
+        instead of creating another one."""
+        while True:
+            agent = self.get(agent_id)
+            if agent is not None:
+                return agent
+            creation = self._creations.get(agent_id)
+            if creation is None:
+                break
+            try:
+                return await asyncio.shield(creation)
+            except asyncio.CancelledError:
+                if not creation.cancelled():
+                    # This lookup was cancelled, not the creation.
+                    raise
+                # The lookup that was creating the agent was cancelled, so try again.
+        creation = asyncio.get_running_loop().create_future()
+        self._creations[agent_id] = creation
+        try:
+            agent = await create()
+            await self._restore(agent_id, agent)
+            self.add(agent_id, agent)
+        except asyncio.CancelledError:
+            creation.cancel()
+            raise
+        except BaseException as e:
+            creation.set_exception(e)
+            # The error is raised here, so waiting lookups are optional.
+            creation.exception()
+            raise
+        else:
+            creation.set_result(agent)
+        finally:
+            del self._creations[agent_id]
+        return agent
+
+    async def _restore(self, agent_id: AgentId, agent: Agent) -> None:
+        """Load the saved state of a previously evicted agent into its new instance."""
+        if self._policy is None:
+            return
+        # Wait until the state of an agent that is being evicted has been saved.
+        eviction = self._evictions.get(agent_id)
+        if eviction is not None:
+            await asyncio.shield(eviction)
+        state = await self._policy.state_store.aget(str(agent_id))
+        if state is not None:
+            await agent.load_state(state)
+
+    def acquire(self, agent_id: AgentId) -> None:
+        if self._policy is not None:
+            self._in_use[agent_id] = self._in_use.get(agent_id, 0) + 1
+
+    def release(self, agent_id: AgentId) -> None:
+        if self._policy is None:
+            return
+        count = self._in_use.get(agent_id, 0) - 1
+        if count > 0:
+            self._in_use[agent_id] = count
+        else:
+            self._in_use.pop(agent_id, None)
+        if agent_id in self._agents:
+            self._touch(agent_id)
+
+    async def wait_for_evictions(self) -> None:
+        """Wait until the states of the evicted agents have been saved."""
+        if self._evictions:
+            await asyncio.gather(*self._evictions.values(), return_exceptions=True)
+
+    def _touch(self, agent_id: AgentId) -> None:
+        self._agents.move_to_end(agent_id)
+        self._last_used[agent_id] = time.monotonic()
+
+    def _evict(self, keep: AgentId) -> None:
+        assert self._policy is not None
+        max_agents = self._policy.max_agents
+        idle_timeout = self._policy.idle_timeout
+        excess = len(self._agents) - max_agents if max_agents is not None else 0
+        idle_before = time.monotonic() - idle_timeout if idle_timeout is not None else None
+        evicted: List[AgentId] = []
+        for agent_id in self._agents:
+            if agent_id == keep or agent_id in self._in_use:
+                continue
+            if excess > 0:
+                excess -= 1
+            elif idle_before is None or self._last_used[agent_id] >= idle_before:
+                # Agents are ordered by last use, so the remaining ones are more recently used.
+                break
+            evicted.append(agent_id)
+        for agent_id in evicted:
+            agent = self._agents.pop(agent_id)
+            del self._last_used[agent_id]
+            self._evictions[agent_id] = asyncio.create_task(self._save_and_close(agent_id, agent))
+
+    async def _save_and_close(self, agent_id: AgentId, agent: Agent) -> None:
+        assert self._policy is not None
+        try:
+            state = await agent.save_state()
+            await self._policy.state_store.aset(str(agent_id), dict(state))
+            await agent.close()
+        except BaseException:
+            logger.error(f"Error evicting agent {agent_id}", exc_info=True)
+        finally:
+            if self._evictions.get(agent_id) is asyncio.current_task():
+                del self._evictions[agent_id]
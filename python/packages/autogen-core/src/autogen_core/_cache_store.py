@@ -1,5 +1,9 @@
+import heapq
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, Optional, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Generic, List, Literal, Mapping, Optional, Sequence, Tuple, TypeVar
 
 from pydantic import BaseModel
 from typing_extensions import Self
@@ -8,12 +12,40 @@
 
 T = TypeVar("T")
 
+EvictionPolicy = Literal["lru", "lfu"]
+
+
+@dataclass
+class CacheStats:
+    """Counters of the lookups of a :class:`~autogen_core.CacheStore`."""
+
+    hits: int = 0
+    """The number of lookups that found their key."""
+    misses: int = 0
+    """The number of lookups that did not find their key, or found it expired."""
+    evictions: int = 0
+    """The number of items removed to respect the size limit of the store.
+    Only counted by stores that evict items themselves."""
+    expirations: int = 0
+    """The number of items removed because their time to live passed.
+    Only counted by stores that expire items themselves."""
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that found their key, or 0 if there were no lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
 
 class CacheStore(ABC, Generic[T], ComponentBase[BaseModel]):
     """
     This protocol defines the basic interface for store/cache operations.
 
     Sub-classes should handle the lifecycle of underlying storage.
+
+    Only :meth:`get` and :meth:`set` must be implemented. The bulk and async methods call them by
+    default. Stores that do I/O should override the async methods, so that they do not block the
+    event loop, and the bulk methods, to do a single round trip.
     """
 
     component_type = "cache_store"
@@ -34,37 +66,239 @@ def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
         ...
 
     @abstractmethod
-    def set(self, key: str, value: T) -> None:
+    def set(self, key: str, value: T, ttl: Optional[float] = None) -> None:
         """
         Set an item in the store.
 
         Args:
             key: The key under which the item is to be stored.
             value: The value to be stored in the store.
+            ttl (optional): The number of seconds after which the item expires.
+                            Defaults to None, which uses the default of the store.
         """
         ...
 
+    def get_many(self, keys: Sequence[str]) -> Dict[str, T]:
+        """
+        Retrieve several items from the store.
+
+        Args:
+            keys: The keys identifying the items in the store.
+
+        Returns:
+            The values of the keys that were found.
+        """
+        values: Dict[str, T] = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_many(self, items: Mapping[str, T], ttl: Optional[float] = None) -> None:
+        """
+        Set several items in the store.
+
+        Args:
+            items: The values to be stored, by key.
+            ttl (optional): The number of seconds after which the items expire.
+                            Defaults to None, which uses the default of the store.
+        """
+        for key, value in items.items():
+            if ttl is None:
+                # Stores written before ttl was added do not take it.
+                self.set(key, value)
+            else:
+                self.set(key, value, ttl)
+
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        """Async version of :meth:`get`."""
+        return self.get(key, default)
+
+    async def aset(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        """Async version of :meth:`set`."""
+        self.set_many({key: value}, ttl)
+
+    async def aget_many(self, keys: Sequence[str]) -> Dict[str, T]:
+        """Async version of :meth:`get_many`."""
+        return self.get_many(keys)
+
+    async def aset_many(self, items: Mapping[str, T], ttl: Optional[float] = None) -> None:
+        """Async version of :meth:`set_many`."""
+        self.set_many(items, ttl)
+
+    @property
+    def stats(self) -> Optional[CacheStats]:
+        """The lookup statistics of the store, or None if the store does not keep them."""
+        return None
+
 
 class InMemoryStoreConfig(BaseModel):
-    pass
+    max_size: Optional[int] = None
+    eviction_policy: EvictionPolicy = "lru"
+    default_ttl: Optional[float] = None
 
 
 class InMemoryStore(CacheStore[T], Component[InMemoryStoreConfig]):
+    """A store that keeps its items in a dictionary.
+
+    By default, the store is unbounded and its items never expire. With ``max_size``, an item is
+    evicted when a new item is added to a full store: the least recently used item with the
+    ``"lru"`` policy, or the least frequently used item with the ``"lfu"`` policy. Items expire
+    after their time to live, and expired items are removed as new items are added.
+
+    Args:
+        max_size (int | None, optional): The maximum number of items. Defaults to None (no limit).
+        eviction_policy (Literal["lru", "lfu"], optional): Which item is evicted when the store is full.
+            Defaults to ``"lru"``.
+        default_ttl (float | None, optional): The number of seconds after which items expire, when
+            :meth:`set` is not given a ttl. Defaults to None (items never expire).
+    """
+
     component_provider_override = "autogen_core.InMemoryStore"
     component_config_schema = InMemoryStoreConfig
 
-    def __init__(self) -> None:
-        self.store: Dict[str, T] = {}
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        eviction_policy: EvictionPolicy = "lru",
+        default_ttl: Optional[float] = None,
+    ) -> None:
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be greater than 0.")
+        if eviction_policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+        if default_ttl is not None and default_ttl <= 0:
+            raise ValueError("default_ttl must be greater than 0.")
+        self._max_size = max_size
+        self._eviction_policy = eviction_policy
+        self._default_ttl = default_ttl
+        # Least recently used first.
+        self.store: OrderedDict[str, T] = OrderedDict()
+        self._expires_at: Dict[str, float] = {}
+        # Expiry times and keys, soonest first. Entries of keys that were removed or set again are skipped.
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # The use counts of the keys, and the keys of each use count, least recently used first.
+        self._frequencies: Dict[str, int] = {}
+        self._keys_by_frequency: Dict[int, OrderedDict[str, None]] = {}
+        # The use counts that have keys, linked in increasing order, so that the least frequently used
+        # key is found without scanning the use counts.
+        self._min_frequency: Optional[int] = None
+        self._previous_frequency: Dict[int, Optional[int]] = {}
+        self._next_frequency: Dict[int, Optional[int]] = {}
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
 
     def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
-        return self.store.get(key, default)
+        if key not in self.store:
+            self._stats.misses += 1
+            return default
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return default
+        self._stats.hits += 1
+        self._touch(key)
+        return self.store[key]
+
+    def set(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        self._remove_expired()
+        if key in self.store:
+            self.store[key] = value
+            self._touch(key)
+        else:
+            if self._max_size is not None and len(self.store) >= self._max_size:
+                self._evict()
+            self.store[key] = value
+            if self._eviction_policy == "lfu":
+                self._frequencies[key] = 1
+                self._add_frequency(key, 1, None)
+        ttl = ttl if ttl is not None else self._default_ttl
+        if ttl is None:
+            self._expires_at.pop(key, None)
+        else:
+            expires_at = time.monotonic() + ttl
+            self._expires_at[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            # Rebuild the heap when most of its entries are stale, so that setting the same keys
+            # again and again does not grow it without bound.
+            if len(self._expiry_heap) - len(self._expires_at) > 2 * len(self._expires_at):
+                self._expiry_heap = [(expires_at, key) for key, expires_at in self._expires_at.items()]
+                heapq.heapify(self._expiry_heap)
+
+    def _touch(self, key: str) -> None:
+        if self._eviction_policy == "lru":
+            self.store.move_to_end(key)
+            return
+        frequency = self._frequencies[key]
+        self._frequencies[key] = frequency + 1
+        self._add_frequency(key, frequency + 1, frequency)
+        self._discard_frequency(key, frequency)
+
+    def _add_frequency(self, key: str, frequency: int, previous: Optional[int]) -> None:
+        """Add a key to the keys of a use count, which follows the use count ``previous`` if it has no keys yet."""
+        keys = self._keys_by_frequency.get(frequency)
+        if keys is None:
+            keys = self._keys_by_frequency[frequency] = OrderedDict()
+            following = self._min_frequency if previous is None else self._next_frequency[previous]
+            self._previous_frequency[frequency] = previous
+            self._next_frequency[frequency] = following
+            if previous is None:
+                self._min_frequency = frequency
+            else:
+                self._next_frequency[previous] = frequency
+            if following is not None:
+                self._previous_frequency[following] = frequency
+        keys[key] = None
+
+    def _discard_frequency(self, key: str, frequency: int) -> None:
+        keys = self._keys_by_frequency[frequency]
+        del keys[key]
+        if not keys:
+            del self._keys_by_frequency[frequency]
+            previous = self._previous_frequency.pop(frequency)
+            following = self._next_frequency.pop(frequency)
+            if previous is None:
+                self._min_frequency = following
+            else:
+                self._next_frequency[previous] = following
+            if following is not None:
+                self._previous_frequency[following] = previous
+
+    def _remove(self, key: str) -> None:
+        del self.store[key]
+        self._expires_at.pop(key, None)
+        frequency = self._frequencies.pop(key, None)
+        if frequency is not None:
+            self._discard_frequency(key, frequency)
+
+    def _evict(self) -> None:
+        if self._eviction_policy == "lru":
+            key = next(iter(self.store))
+        else:
+            assert self._min_frequency is not None
+            key = next(iter(self._keys_by_frequency[self._min_frequency]))
+        self._remove(key)
+        self._stats.evictions += 1
 
-    def set(self, key: str, value: T) -> None:
-        self.store[key] = value
+    def _remove_expired(self) -> None:
+        now = time.monotonic()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            if self._expires_at.get(key) == expires_at:
+                self._remove(key)
+                self._stats.expirations += 1
 
     def _to_config(self) -> InMemoryStoreConfig:
-        return InMemoryStoreConfig()
+        return InMemoryStoreConfig(
+            max_size=self._max_size, eviction_policy=self._eviction_policy, default_ttl=self._default_ttl
+        )
 
     @classmethod
     def _from_config(cls, config: InMemoryStoreConfig) -> Self:
-        return cls()
+        return cls(max_size=config.max_size, eviction_policy=config.eviction_policy, default_ttl=config.default_ttl)
@@ -4,17 +4,25 @@
 import re
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, cast
+from typing import Any, Dict, Tuple, cast
 
 from PIL import Image as PILImage
 from pydantic import GetCoreSchemaHandler, ValidationInfo
 from pydantic_core import core_schema
 from typing_extensions import Literal
 
+# The encodings that model APIs accept, which are kept as they are.
+_MIME_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "GIF": "image/gif", "WEBP": "image/webp"}
+# The prefix of the data URIs of these encodings.
+_DATA_URI_PREFIX = re.compile(r"data:(?:%s);base64," % "|".join(re.escape(t) for t in _MIME_TYPES.values()))
+
 
 class Image:
     """Represents an image.
 
+    An image created from encoded data, such as with :meth:`from_base64` or :meth:`from_file`,
+    keeps the encoded bytes and is only decoded when :attr:`image` is accessed. The base64 and
+    data URI forms are computed once and cached, so images must not be modified in place.
 
     Example:
 
@@ -40,7 +48,69 @@ async def from_url(url: str) -> Image:
     """
 
     def __init__(self, image: PILImage.Image):
-        self.image: PILImage.Image = image.convert("RGB")
+        self._image: PILImage.Image | None = image.convert("RGB")
+        # An image opened from encoded bytes, which is only decoded when the pixels are needed.
+        self._lazy_image: PILImage.Image | None = None
+        self._encoded: bytes | None = None
+        self._mime_type: str | None = None
+        self._base64: str | None = None
+        self._data_uri: str | None = None
+
+    @classmethod
+    def _from_encoded(cls, data: bytes, base64_str: str | None = None) -> Image:
+        """Create an image that keeps the encoded bytes, if models accept their format.
+
+        Opening the image only reads its header, the pixels are decoded on first use."""
+        lazy_image = PILImage.open(BytesIO(data))
+        mime_type = _MIME_TYPES.get(lazy_image.format or "")
+        if mime_type is None or getattr(lazy_image, "is_animated", False):
+            # Models do not accept this format, or animated images, so the image (or its first frame)
+            # is converted to PNG like images from PIL.
+            return cls(lazy_image)
+        image = cls.__new__(cls)
+        image._image = None
+        image._lazy_image = lazy_image
+        image._encoded = data
+        image._mime_type = mime_type
+        image._base64 = base64_str
+        image._data_uri = None
+        return image
+
+    @property
+    def image(self) -> PILImage.Image:
+        """The image as an RGB PIL image.
+
+        The image must not be modified in place, as its encoded forms are cached.
+        Assign a new image instead."""
+        if self._image is None:
+            assert self._lazy_image is not None
+            self._image = self._lazy_image.convert("RGB")
+            self._lazy_image = None
+        return self._image
+
+    @image.setter
+    def image(self, image: PILImage.Image) -> None:
+        self._image = image
+        self._lazy_image = None
+        self._encoded = None
+        self._mime_type = None
+        self._base64 = None
+        self._data_uri = None
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """The width and height of the image in pixels, read without decoding the image."""
+        if self._image is not None:
+            return self._image.size
+        assert self._lazy_image is not None
+        return self._lazy_image.size
+
+    @property
+    def mime_type(self) -> str:
+        """The MIME type of the encoded image returned by :meth:`to_base64`."""
+        self._encode()
+        assert self._mime_type is not None
+        return self._mime_type
 
     @classmethod
     def from_pil(cls, pil_image: PILImage.Image) -> Image:
@@ -48,29 +118,40 @@ def from_pil(cls, pil_image: PILImage.Image) -> Image:
 
     @classmethod
     def from_uri(cls, uri: str) -> Image:
-        if not re.match(r"data:image/(?:png|jpeg);base64,", uri):
+        if not _DATA_URI_PREFIX.match(uri):
             raise ValueError("Invalid URI format. It should be a base64 encoded image URI.")
 
         # A URI. Remove the prefix and decode the base64 string.
-        base64_data = re.sub(r"data:image/(?:png|jpeg);base64,", "", uri)
+        base64_data = _DATA_URI_PREFIX.sub("", uri)
         return cls.from_base64(base64_data)
 
     @classmethod
     def from_base64(cls, base64_str: str) -> Image:
-        return cls(PILImage.open(BytesIO(base64.b64decode(base64_str))))
+        return cls._from_encoded(base64.b64decode(base64_str), base64_str)
 
     def to_file(self, file_path: Path) -> None:
         self.image.save(file_path)
 
     def to_base64(self) -> str:
-        buffered = BytesIO()
-        self.image.save(buffered, format="PNG")
-        content = buffered.getvalue()
-        return base64.b64encode(content).decode("utf-8")
+        """The encoded image as a base64 string.
+
+        Images created from encoded data keep their encoding if models accept it, other images
+        are encoded as PNG. The result is cached."""
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self._encode()).decode("utf-8")
+        return self._base64
+
+    def _encode(self) -> bytes:
+        if self._encoded is None:
+            buffered = BytesIO()
+            self.image.save(buffered, format="PNG")
+            self._encoded = buffered.getvalue()
+            self._mime_type = "image/png"
+        return self._encoded
 
     @classmethod
     def from_file(cls, file_path: Path) -> Image:
-        return cls(PILImage.open(file_path))
+        return cls._from_encoded(Path(file_path).read_bytes())
 
     def _repr_html_(self) -> str:
         # Show the image in Jupyter notebook
@@ -78,7 +159,9 @@ def _repr_html_(self) -> str:
 
     @property
     def data_uri(self) -> str:
-        return _convert_base64_to_data_uri(self.to_base64())
+        if self._data_uri is None:
+            self._data_uri = f"data:{self.mime_type};base64,{self.to_base64()}"
+        return self._data_uri
 
     # Returns openai.types.chat.ChatCompletionContentPartImageParam, which is a TypedDict
     # We don't use the explicit type annotation so that we can avoid a dependency on the OpenAI Python SDK in this package.
@@ -108,23 +191,3 @@ def serialize(value: Image) -> dict[str, Any]:
             core_schema.any_schema(),  # Accept any type; adjust if needed
             serialization=core_schema.plain_serializer_function_ser_schema(serialize),
         )
-
-
-def _convert_base64_to_data_uri(base64_image: str) -> str:
-    def _get_mime_type_from_data_uri(base64_image: str) -> str:
-        # Decode the base64 string
-        image_data = base64.b64decode(base64_image)
-        # Check the first few bytes for known signatures
-        if image_data.startswith(b"\xff\xd8\xff"):
-            return "image/jpeg"
-        elif image_data.startswith(b"\x89PNG\r\n\x1a\n"):
-            return "image/png"
-        elif image_data.startswith(b"GIF87a") or image_data.startswith(b"GIF89a"):
-            return "image/gif"
-        elif image_data.startswith(b"RIFF") and image_data[8:12] == b"WEBP":
-            return "image/webp"
-        return "image/jpeg"  # use jpeg for unknown formats, best guess.
-
-    mime_type = _get_mime_type_from_data_uri(base64_image)
-    data_uri = f"data:{mime_type};base64,{base64_image}"
-    return data_uri
@@ -5,7 +5,7 @@
 from ._topic import TopicId
 
 
-@dataclass
+@dataclass(frozen=True)
 class MessageContext:
     sender: AgentId | None
     topic_id: TopicId | None
@@ -0,0 +1,212 @@
+import asyncio
+import sys
+from collections import deque
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
+from typing import Callable, Deque, Dict, Generic, List, Literal, TypeVar
+
+from ._agent_id import AgentId
+
+if sys.version_info >= (3, 13):
+    from asyncio import Queue
+else:
+    from ._queue import Queue  # type: ignore
+
+T = TypeVar("T")
+
+QueueFullPolicy = Literal["wait", "drop_oldest", "reject"]
+
+
+@dataclass
+class MessageQueueMetrics:
+    """Counters for the message queue of :class:`~autogen_core.SingleThreadedAgentRuntime`.
+
+    The counters cover sent and published messages. Responses to RPC calls are never
+    bounded or dropped, so they are not counted."""
+
+    depth: int = 0
+    """The number of messages waiting in the queue."""
+    max_depth: int = 0
+    """The largest number of messages that were waiting in the queue at once."""
+    enqueued: int = 0
+    """The number of messages put into the queue."""
+    enqueue_waits: int = 0
+    """The number of messages whose sender had to wait for the queue to have room."""
+    enqueue_wait_time: float = 0.0
+    """The total time in seconds that senders waited for the queue to have room."""
+    max_enqueue_wait_time: float = 0.0
+    """The longest time in seconds that a sender waited for the queue to have room."""
+    dropped: int = 0
+    """The number of queued messages that were dropped to make room for newer messages."""
+    rejected: int = 0
+    """The number of messages that were rejected because the queue was full."""
+
+
+class _PriorityBuckets(Generic[T]):
+    """One FIFO bucket per priority. Items are taken from the highest priority bucket first,
+    and in arrival order within a bucket.
+
+    Only a few distinct priorities are expected, so the buckets are kept in a heap of their
+    priorities. With a single priority this is a plain deque."""
+
+    def __init__(self, priority_of: Callable[[T], float]) -> None:
+        self._priority_of = priority_of
+        self._buckets: Dict[float, Deque[T]] = {}
+        # Negated priorities of the non-empty buckets.
+        self._order: List[float] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, item: T) -> None:
+        priority = self._priority_of(item)
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = deque()
+            self._buckets[priority] = bucket
+            heappush(self._order, -priority)
+        bucket.append(item)
+        self._size += 1
+
+    def popleft(self) -> T:
+        priority = -self._order[0]
+        bucket = self._buckets[priority]
+        item = bucket.popleft()
+        if not bucket:
+            del self._buckets[priority]
+            heappop(self._order)
+        self._size -= 1
+        return item
+
+    def pop_lowest(self, predicate: Callable[[T], bool]) -> T | None:
+        """Remove and return the oldest item that matches the predicate, from the lowest
+        priority bucket that has one."""
+        for priority in sorted(self._buckets):
+            bucket = self._buckets[priority]
+            for index, item in enumerate(bucket):
+                if predicate(item):
+                    del bucket[index]
+                    if not bucket:
+                        del self._buckets[priority]
+                        self._order.remove(-priority)
+                        heapify(self._order)
+                    self._size -= 1
+                    return item
+        return None
+
+
+class MessageQueue(Queue[T], Generic[T]):
+    """A :class:`asyncio.Queue` that returns items with a higher priority first.
+
+    Items with the same priority are returned in the order they were put.
+
+    Args:
+        priority_of (Callable[[T], float]): Returns the priority of an item.
+        maxsize (int, optional): The maximum number of items in the queue. Defaults to 0 (unbounded).
+    """
+
+    def __init__(self, priority_of: Callable[[T], float], maxsize: int = 0) -> None:
+        super().__init__(maxsize)
+        self._items = _PriorityBuckets(priority_of)
+
+    def _put(self, item: T) -> None:
+        self._items.append(item)
+
+    def _get(self) -> T:
+        return self._items.popleft()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def put_unbounded(self, item: T) -> None:
+        """Put an item into the queue without blocking, even if the queue is full."""
+        maxsize = self._maxsize
+        self._maxsize = 0
+        try:
+            self.put_nowait(item)
+        finally:
+            self._maxsize = maxsize
+
+    def evict(self, evictable: Callable[[T], bool]) -> T | None:
+        """Remove and return the oldest evictable item with the lowest priority, or None if no
+        item is evictable. The removed item is marked as done."""
+        item = self._items.pop_lowest(evictable)
+        if item is not None:
+            self.task_done()
+        return item
+
+
+class Mailboxes:
+    """Bounded mailboxes, one per agent.
+
+    A slot in an agent's mailbox is taken when a message for the agent is queued, and freed
+    when the runtime dispatches the message. Taking a slot in a full mailbox waits until a
+    slot is freed, which applies backpressure to the sender.
+
+    Args:
+        size (int): The number of messages that can be queued for one agent.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._queued: Dict[AgentId, int] = {}
+        self._waiters: Dict[AgentId, Deque[asyncio.Future[None]]] = {}
+
+    def queued(self, agent_id: AgentId) -> int:
+        """The number of messages queued for the agent."""
+        return self._queued.get(agent_id, 0)
+
+    async def acquire(self, agent_id: AgentId) -> None:
+        """Take a slot in the agent's mailbox, waiting for one to be freed if it is full."""
+        while self._queued.get(agent_id, 0) >= self._size:
+            waiter = asyncio.get_running_loop().create_future()
+            waiters = self._waiters.setdefault(agent_id, deque())
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                woken = waiter.done() and not waiter.cancelled()
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                if not waiters:
+                    self._waiters.pop(agent_id, None)
+                if woken:
+                    # Hand the freed slot to the next waiter.
+                    self._wake_next(agent_id)
+                raise
+        self._queued[agent_id] = self._queued.get(agent_id, 0) + 1
+
+    def release(self, agent_id: AgentId) -> None:
+        """Free a slot in the agent's mailbox."""
+        queued = self._queued.get(agent_id, 0) - 1
+        if queued > 0:
+            self._queued[agent_id] = queued
+        else:
+            self._queued.pop(agent_id, None)
+        self._wake_next(agent_id)
+
+    def _wake_next(self, agent_id: AgentId) -> None:
+        waiters = self._waiters.get(agent_id)
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+        if waiters is not None and not waiters:
+            del self._waiters[agent_id]
+
+    def reset(self) -> None:
+        """Free every slot, for example when the queued messages are discarded."""
+        self._queued.clear()
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+        self._waiters.clear()
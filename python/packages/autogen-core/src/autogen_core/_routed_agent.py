@@ -4,7 +4,7 @@
     Any,
     Callable,
     Coroutine,
-    DefaultDict,
+    Dict,
     List,
     Literal,
     Protocol,
@@ -17,6 +17,7 @@
     overload,
     runtime_checkable,
 )
+from weakref import WeakKeyDictionary
 
 from ._base_agent import BaseAgent
 from ._message_context import MessageContext
@@ -48,7 +49,13 @@ class MessageHandler(Protocol[AgentT, ReceivesT, ProducesT]):  # type: ignore
     async def __call__(agent_instance: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT: ...
 
 
-# NOTE: this works on concrete types and not inheritance
+def _is_target_type(message_type: Type[Any], target_types: Sequence[Type[Any]]) -> bool:
+    """Whether the message type or one of its base classes is a target type."""
+    if message_type in target_types:
+        return True
+    return any(base in target_types for base in message_type.__mro__)
+
+
 # TODO: Use a protocol for the outer function to check checked arg names
 
 
@@ -140,7 +147,7 @@ def decorator(
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT:
-            if type(message) not in target_types:
+            if not _is_target_type(type(message), target_types):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
@@ -259,7 +266,7 @@ def decorator(
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> None:
-            if type(message) not in target_types:
+            if not _is_target_type(type(message), target_types):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
@@ -380,7 +387,7 @@ def decorator(
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT:
-            if type(message) not in target_types:
+            if not _is_target_type(type(message), target_types):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
@@ -412,6 +419,33 @@ async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> Prod
         raise ValueError("Invalid arguments")
 
 
+class _HandlerTable:
+    """The message handlers of a :class:`RoutedAgent` subclass, by the message types they handle."""
+
+    def __init__(self, handlers: Sequence[MessageHandler[Any, Any, Any]]) -> None:
+        self.handlers = handlers
+        self.by_type: Dict[Type[Any], List[MessageHandler[Any, Any, Any]]] = {}
+        for handler in handlers:
+            for target_type in handler.target_types:
+                self.by_type.setdefault(target_type, []).append(handler)
+        self._resolved: Dict[Type[Any], Tuple[MessageHandler[Any, Any, Any], ...]] = {}
+
+    def resolve(self, message_type: Type[Any]) -> Tuple[MessageHandler[Any, Any, Any], ...]:
+        """Return the handlers for a message type, including the handlers of its base classes.
+
+        Handlers of the message type come first, followed by those of its base classes in
+        method resolution order."""
+        handlers = self._resolved.get(message_type)
+        if handlers is None:
+            handlers = tuple(handler for base in message_type.__mro__ for handler in self.by_type.get(base, ()))
+            self._resolved[message_type] = handlers
+        return handlers
+
+
+# Handler tables are computed once per class, not once per agent instance.
+_handler_tables: "WeakKeyDictionary[type, _HandlerTable]" = WeakKeyDictionary()
+
+
 class RoutedAgent(BaseAgent):
     """A base class for agents that route messages to handlers based on the type of the message
     and optional matching functions.
@@ -419,6 +453,9 @@ class RoutedAgent(BaseAgent):
     To create a routed agent, subclass this class and add message handlers as methods decorated with
     either :func:`event` or :func:`rpc` decorator.
 
+    A message is routed to the handlers of its type, and then to the handlers of its base classes
+    in method resolution order. The first handler whose ``match`` function returns True handles it.
+
     Example:
 
     .. code-block:: python
@@ -458,16 +495,9 @@ async def handle_special_rpc_message(self, message: MessageWithContent, ctx: Mes
     """
 
     def __init__(self, description: str) -> None:
-        # Self is already bound to the handlers
-        self._handlers: DefaultDict[
-            Type[Any],
-            List[MessageHandler[RoutedAgent, Any, Any]],
-        ] = DefaultDict(list)
-
-        handlers = self._discover_handlers()
-        for message_handler in handlers:
-            for target_type in message_handler.target_types:
-                self._handlers[target_type].append(message_handler)
+        self._handler_table = self._get_handler_table()
+        # The handlers by the exact message type they handle. Shared by all instances of the class.
+        self._handlers: Dict[Type[Any], List[MessageHandler[RoutedAgent, Any, Any]]] = self._handler_table.by_type
 
         super().__init__(description)
 
@@ -475,14 +505,11 @@ async def on_message_impl(self, message: Any, ctx: MessageContext) -> Any | None
         """Handle a message by routing it to the appropriate message handler.
         Do not override this method in subclasses. Instead, add message handlers as methods decorated with
         either the :func:`event` or :func:`rpc` decorator."""
-        key_type: Type[Any] = type(message)  # type: ignore
-        handlers = self._handlers.get(key_type)  # type: ignore
-        if handlers is not None:
-            # Iterate over all handlers for this matching message type.
-            # Call the first handler whose router returns True and then return the result.
-            for h in handlers:
-                if h.router(message, ctx):
-                    return await h(self, message, ctx)
+        # Iterate over all handlers for this message type and its base classes.
+        # Call the first handler whose router returns True and then return the result.
+        for h in self._handler_table.resolve(type(message)):
+            if h.router(message, ctx):
+                return await h(self, message, ctx)
         return await self.on_unhandled_message(message, ctx)  # type: ignore
 
     async def on_unhandled_message(self, message: Any, ctx: MessageContext) -> None:
@@ -501,10 +528,18 @@ def _discover_handlers(cls) -> Sequence[MessageHandler[Any, Any, Any]]:
                     handlers.append(cast(MessageHandler[Any, Any, Any], handler))
         return handlers
 
+    @classmethod
+    def _get_handler_table(cls) -> _HandlerTable:
+        table = _handler_tables.get(cls)
+        if table is None:
+            table = _HandlerTable(cls._discover_handlers())
+            _handler_tables[cls] = table
+        return table
+
     @classmethod
     def _handles_types(cls) -> List[Tuple[Type[Any], List[MessageSerializer[Any]]]]:
         # TODO handle deduplication
-        handlers = cls._discover_handlers()
+        handlers = cls._get_handler_table().handlers
         types: List[Tuple[Type[Any], List[MessageSerializer[Any]]]] = []
         types.extend(cls.internal_extra_handles_types)
         for handler in handlers:
@@ -1,11 +1,13 @@
-from collections import defaultdict
-from typing import Awaitable, Callable, DefaultDict, List, Sequence, Set
+from collections import OrderedDict, defaultdict
+from typing import Awaitable, Callable, DefaultDict, Dict, List, Sequence, Set
 
 from ._agent import Agent
 from ._agent_id import AgentId
 from ._agent_type import AgentType
 from ._subscription import Subscription
 from ._topic import TopicId
+from ._type_prefix_subscription import TypePrefixSubscription
+from ._type_subscription import TypeSubscription
 
 
 async def get_impl(
@@ -29,11 +31,107 @@ async def get_impl(
     return id
 
 
-class SubscriptionManager:
+class _PrefixTrieNode:
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _PrefixTrieNode] = {}
+        self.subscriptions: List[Subscription] = []
+
+
+class _PrefixTrie:
+    """A character trie of :class:`TypePrefixSubscription` keyed by topic type prefix."""
+
     def __init__(self) -> None:
+        self._root = _PrefixTrieNode()
+
+    def node(self, prefix: str) -> _PrefixTrieNode:
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                child = _PrefixTrieNode()
+                node.children[char] = child
+            node = child
+        return node
+
+    def find(self, prefix: str) -> _PrefixTrieNode | None:
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def remove(self, prefix: str, subscription_id: str) -> None:
+        path = [self._root]
+        for char in prefix:
+            child = path[-1].children.get(char)
+            if child is None:
+                return
+            path.append(child)
+        path[-1].subscriptions = [sub for sub in path[-1].subscriptions if sub.id != subscription_id]
+        # Prune nodes that no longer hold subscriptions or children.
+        for depth in range(len(prefix), 0, -1):
+            node = path[depth]
+            if node.subscriptions or node.children:
+                break
+            del path[depth - 1].children[prefix[depth - 1]]
+
+    def match(self, topic_type: str) -> List[Subscription]:
+        node = self._root
+        matches = list(node.subscriptions)
+        for char in topic_type:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+            matches.extend(node.subscriptions)
+        return matches
+
+
+def _is_exact_type_subscription(subscription: Subscription) -> bool:
+    return isinstance(subscription, TypeSubscription) and type(subscription).is_match is TypeSubscription.is_match
+
+
+def _is_prefix_type_subscription(subscription: Subscription) -> bool:
+    return (
+        isinstance(subscription, TypePrefixSubscription)
+        and type(subscription).is_match is TypePrefixSubscription.is_match
+    )
+
+
+class SubscriptionManager:
+    """Tracks subscriptions and resolves the recipients of a topic.
+
+    :class:`TypeSubscription` objects are indexed by topic type and
+    :class:`TypePrefixSubscription` objects by a prefix trie, so resolving a topic
+    does not scan every subscription. Any other subscription is checked linearly.
+    Resolved recipients are cached per topic in an LRU cache of at most
+    ``max_seen_topics`` entries, and adding or removing a subscription only
+    invalidates the cached topics it can match.
+
+    Args:
+        max_seen_topics (int | None): The maximum number of topics whose recipients are cached.
+            If None, the cache is unbounded.
+    """
+
+    def __init__(self, *, max_seen_topics: int | None = 10000) -> None:
+        if max_seen_topics is not None and max_seen_topics <= 0:
+            raise ValueError("max_seen_topics must be greater than 0.")
+        self._max_seen_topics = max_seen_topics
         self._subscriptions: List[Subscription] = []
-        self._seen_topics: Set[TopicId] = set()
-        self._subscribed_recipients: DefaultDict[TopicId, List[AgentId]] = defaultdict(list)
+        # Insertion sequence of each subscription, used to keep recipients in subscription order.
+        self._subscription_order: Dict[str, int] = {}
+        self._next_order = 0
+        self._subscriptions_by_id: DefaultDict[str, List[Subscription]] = defaultdict(list)
+        self._exact_subscriptions: DefaultDict[str, List[Subscription]] = defaultdict(list)
+        self._prefix_subscriptions = _PrefixTrie()
+        self._other_subscriptions: List[Subscription] = []
+        # LRU cache of resolved recipients, plus an index of cached topics by topic type.
+        self._subscribed_recipients: OrderedDict[TopicId, List[AgentId]] = OrderedDict()
+        self._seen_topics: DefaultDict[str, Set[TopicId]] = defaultdict(set)
 
     @property
     def subscriptions(self) -> Sequence[Subscription]:
@@ -41,38 +139,111 @@ def subscriptions(self) -> Sequence[Subscription]:
 
     async def add_subscription(self, subscription: Subscription) -> None:
         # Check if the subscription already exists
-        if any(sub == subscription for sub in self._subscriptions):
+        if any(sub == subscription for sub in self._duplicate_candidates(subscription)):
             raise ValueError("Subscription already exists")
 
         self._subscriptions.append(subscription)
-        self._rebuild_subscriptions(self._seen_topics)
+        self._subscription_order[subscription.id] = self._next_order
+        self._next_order += 1
+        self._subscriptions_by_id[subscription.id].append(subscription)
+        if _is_exact_type_subscription(subscription):
+            assert isinstance(subscription, TypeSubscription)
+            self._exact_subscriptions[subscription.topic_type].append(subscription)
+        elif _is_prefix_type_subscription(subscription):
+            assert isinstance(subscription, TypePrefixSubscription)
+            self._prefix_subscriptions.node(subscription.topic_type_prefix).subscriptions.append(subscription)
+        else:
+            self._other_subscriptions.append(subscription)
+        self._invalidate([subscription])
 
     async def remove_subscription(self, id: str) -> None:
         # Check if the subscription exists
-        if not any(sub.id == id for sub in self._subscriptions):
+        removed = self._subscriptions_by_id.pop(id, None)
+        if not removed:
             raise ValueError("Subscription does not exist")
 
         def is_not_sub(x: Subscription) -> bool:
             return x.id != id
 
         self._subscriptions = list(filter(is_not_sub, self._subscriptions))
-
-        # Rebuild the subscriptions
-        self._rebuild_subscriptions(self._seen_topics)
+        del self._subscription_order[id]
+        for subscription in removed:
+            if _is_exact_type_subscription(subscription):
+                assert isinstance(subscription, TypeSubscription)
+                remaining = [sub for sub in self._exact_subscriptions[subscription.topic_type] if sub.id != id]
+                if remaining:
+                    self._exact_subscriptions[subscription.topic_type] = remaining
+                else:
+                    del self._exact_subscriptions[subscription.topic_type]
+            elif _is_prefix_type_subscription(subscription):
+                assert isinstance(subscription, TypePrefixSubscription)
+                self._prefix_subscriptions.remove(subscription.topic_type_prefix, id)
+            else:
+                self._other_subscriptions = list(filter(is_not_sub, self._other_subscriptions))
+        self._invalidate(removed)
 
     async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
-        if topic not in self._seen_topics:
-            self._build_for_new_topic(topic)
-        return self._subscribed_recipients[topic]
-
-    # TODO: optimize this...
-    def _rebuild_subscriptions(self, topics: Set[TopicId]) -> None:
-        self._subscribed_recipients.clear()
-        for topic in topics:
-            self._build_for_new_topic(topic)
-
-    def _build_for_new_topic(self, topic: TopicId) -> None:
-        self._seen_topics.add(topic)
-        for subscription in self._subscriptions:
-            if subscription.is_match(topic):
-                self._subscribed_recipients[topic].append(subscription.map_to_agent(topic))
+        recipients = self._subscribed_recipients.get(topic)
+        if recipients is None:
+            recipients = self._build_for_new_topic(topic)
+        else:
+            self._subscribed_recipients.move_to_end(topic)
+        return recipients
+
+    def _duplicate_candidates(self, subscription: Subscription) -> List[Subscription]:
+        """Existing subscriptions that could compare equal to the given subscription."""
+        if _is_exact_type_subscription(subscription):
+            assert isinstance(subscription, TypeSubscription)
+            same_key = self._exact_subscriptions.get(subscription.topic_type, [])
+        elif _is_prefix_type_subscription(subscription):
+            assert isinstance(subscription, TypePrefixSubscription)
+            node = self._prefix_subscriptions.find(subscription.topic_type_prefix)
+            same_key = node.subscriptions if node is not None else []
+        else:
+            return self._subscriptions
+        return [*self._subscriptions_by_id.get(subscription.id, []), *same_key, *self._other_subscriptions]
+
+    def _matching_subscriptions(self, topic: TopicId) -> List[Subscription]:
+        matches = [
+            *self._exact_subscriptions.get(topic.type, []),
+            *self._prefix_subscriptions.match(topic.type),
+            *(sub for sub in self._other_subscriptions if sub.is_match(topic)),
+        ]
+        matches.sort(key=lambda sub: self._subscription_order[sub.id])
+        return matches
+
+    def _build_for_new_topic(self, topic: TopicId) -> List[AgentId]:
+        recipients = [subscription.map_to_agent(topic) for subscription in self._matching_subscriptions(topic)]
+        self._subscribed_recipients[topic] = recipients
+        self._seen_topics[topic.type].add(topic)
+        if self._max_seen_topics is not None and len(self._subscribed_recipients) > self._max_seen_topics:
+            evicted, _ = self._subscribed_recipients.popitem(last=False)
+            self._forget_topic(evicted)
+        return recipients
+
+    def _forget_topic(self, topic: TopicId) -> None:
+        topics = self._seen_topics.get(topic.type)
+        if topics is not None:
+            topics.discard(topic)
+            if not topics:
+                del self._seen_topics[topic.type]
+
+    def _invalidate(self, subscriptions: Sequence[Subscription]) -> None:
+        """Drop the cached recipients of every seen topic the given subscriptions can match."""
+        affected: List[TopicId] = []
+        for subscription in subscriptions:
+            if _is_exact_type_subscription(subscription):
+                assert isinstance(subscription, TypeSubscription)
+                affected.extend(self._seen_topics.get(subscription.topic_type, ()))
+            elif _is_prefix_type_subscription(subscription):
+                assert isinstance(subscription, TypePrefixSubscription)
+                prefix = subscription.topic_type_prefix
+                for topic_type, topics in self._seen_topics.items():
+                    if topic_type.startswith(prefix):
+                        affected.extend(topics)
+            else:
+                affected.extend(self._subscribed_recipients.keys())
+                break
+        for topic in affected:
+            if self._subscribed_recipients.pop(topic, None) is not None:
+                self._forget_topic(topic)
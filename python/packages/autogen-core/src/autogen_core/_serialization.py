@@ -170,7 +170,10 @@ def deserialize(self, payload: bytes) -> ProtobufT:
         # Parse payload into a proto any
         any_proto = any_pb2.Any()
         any_proto.ParseFromString(payload)
+        return self.unpack(any_proto)
 
+    def unpack(self, any_proto: any_pb2.Any) -> ProtobufT:
+        """Unpack a message from an ``Any`` that is already parsed, such as a field of another message."""
         destination_message = self.cls()
 
         if not any_proto.Unpack(destination_message):  # type: ignore
@@ -244,6 +247,18 @@ def deserialize(self, payload: bytes, *, type_name: str, data_content_type: str)
 
         return serializer.deserialize(payload)
 
+    def deserialize_any(self, any_proto: any_pb2.Any, *, type_name: str) -> Any:
+        """Deserialize a protobuf payload that is already parsed into an ``Any``.
+
+        Protobuf messages are unpacked directly, without serializing the ``Any`` to bytes and parsing it again.
+        """
+        serializer = self._serializers.get((type_name, PROTOBUF_DATA_CONTENT_TYPE))
+        if isinstance(serializer, ProtobufMessageSerializer):
+            return serializer.unpack(any_proto)
+        return self.deserialize(
+            any_proto.SerializeToString(), type_name=type_name, data_content_type=PROTOBUF_DATA_CONTENT_TYPE
+        )
+
     def serialize(self, message: Any, *, type_name: str, data_content_type: str) -> bytes:
         serializer = self._serializers.get((type_name, data_content_type))
         if serializer is None:
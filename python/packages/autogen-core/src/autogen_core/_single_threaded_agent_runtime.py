@@ -3,12 +3,15 @@
 import asyncio
 import inspect
 import logging
+import math
 import sys
+import time
 import uuid
 import warnings
-from asyncio import CancelledError, Future, Queue, Task
+from asyncio import CancelledError, Future, Task
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import partial
 from typing import Any, Awaitable, Callable, Dict, List, Mapping, ParamSpec, Set, Type, TypeVar, cast
 
 from opentelemetry.trace import TracerProvider
@@ -23,12 +26,13 @@
 )
 
 if sys.version_info >= (3, 13):
-    from asyncio import Queue, QueueShutDown
+    from asyncio import QueueShutDown
 else:
-    from ._queue import Queue, QueueShutDown  # type: ignore
+    from ._queue import QueueShutDown  # type: ignore
 
 
 from ._agent import Agent
+from ._agent_eviction import AgentEvictionPolicy, AgentInstances
 from ._agent_id import AgentId
 from ._agent_instantiation import AgentInstantiationContext
 from ._agent_metadata import AgentMetadata
@@ -38,6 +42,7 @@
 from ._intervention import DropMessage, InterventionHandler
 from ._message_context import MessageContext
 from ._message_handler_context import MessageHandlerContext
+from ._message_queue import Mailboxes, MessageQueue, MessageQueueMetrics, QueueFullPolicy
 from ._runtime_impl_helpers import SubscriptionManager, get_impl
 from ._serialization import JSON_DATA_CONTENT_TYPE, MessageSerializer, SerializationRegistry
 from ._subscription import Subscription
@@ -64,6 +69,8 @@ class PublishMessageEnvelope:
     topic_id: TopicId
     metadata: EnvelopeMetadata | None = None
     message_id: str
+    priority: int = 0
+    mailbox_recipients: Sequence[AgentId] = ()
 
 
 @dataclass(kw_only=True)
@@ -78,6 +85,7 @@ class SendMessageEnvelope:
     cancellation_token: CancellationToken
     metadata: EnvelopeMetadata | None = None
     message_id: str
+    priority: int = 0
 
 
 @dataclass(kw_only=True)
@@ -89,6 +97,7 @@ class ResponseMessageEnvelope:
     sender: AgentId
     recipient: AgentId | None
     metadata: EnvelopeMetadata | None = None
+    priority: int = 0
 
 
 P = ParamSpec("P")
@@ -148,7 +157,8 @@ def _warn_if_none(value: Any, handler_name: str) -> None:
 class SingleThreadedAgentRuntime(AgentRuntime):
     """A single-threaded agent runtime that processes all messages using a single asyncio queue.
     Messages are delivered in the order they are received, and the runtime processes
-    each message in a separate asyncio task concurrently.
+    each message in a separate asyncio task concurrently. Messages sent or published with
+    a higher ``priority`` are delivered before queued messages with a lower priority.
 
     .. note::
 
@@ -160,6 +170,12 @@ class SingleThreadedAgentRuntime(AgentRuntime):
             handlers that can intercept messages before they are sent or published. Defaults to None.
         tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
         ignore_unhandled_exceptions (bool, optional): Whether to ignore unhandled exceptions in that occur in agent event handlers. Any background exceptions will be raised on the next call to `process_next` or from an awaited `stop`, `stop_when_idle` or `stop_when`. Note, this does not apply to RPC handlers. Defaults to True.
+        max_publish_concurrency (int | None, optional): The maximum number of subscribers that handle a single published message concurrently. If None, all subscribers handle the message concurrently. Defaults to None.
+        prioritize_responses (bool, optional): Whether responses to RPC calls are delivered ahead of all other queued messages. Otherwise a response has the priority of the request it answers. Defaults to False.
+        mailbox_size (int | None, optional): The maximum number of queued messages for a single agent. Sending or publishing a message waits while the mailbox of a recipient is full. A slot is freed when the runtime dispatches the message to the agent, so messages that are queued before the runtime is started wait until it is. If None, mailboxes are unbounded. Defaults to None.
+        max_queue_size (int | None, optional): The maximum number of sent and published messages waiting in the queue. Responses to RPC calls are not bounded. If None, the queue is unbounded. Defaults to None.
+        queue_full_policy (Literal["wait", "drop_oldest", "reject"], optional): What to do when a message is sent or published while the queue is full. "wait" waits until the queue has room. "drop_oldest" drops the oldest queued message with the lowest priority, and an RPC call that is dropped raises :class:`~autogen_core.exceptions.MessageDroppedException`. "reject" raises :class:`~autogen_core.exceptions.MessageDroppedException` to the caller. Defaults to "wait".
+        agent_eviction_policy (AgentEvictionPolicy | None, optional): When to evict instantiated agents from memory. Evicted agents are saved to the policy's state store and restored on their next message. If None, agents are kept in memory. Defaults to None.
 
     Examples:
 
@@ -250,14 +266,33 @@ def __init__(
         intervention_handlers: List[InterventionHandler] | None = None,
         tracer_provider: TracerProvider | None = None,
         ignore_unhandled_exceptions: bool = True,
+        max_publish_concurrency: int | None = None,
+        prioritize_responses: bool = False,
+        mailbox_size: int | None = None,
+        max_queue_size: int | None = None,
+        queue_full_policy: QueueFullPolicy = "wait",
+        agent_eviction_policy: AgentEvictionPolicy | None = None,
     ) -> None:
+        if max_publish_concurrency is not None and max_publish_concurrency <= 0:
+            raise ValueError("max_publish_concurrency must be greater than 0.")
+        if mailbox_size is not None and mailbox_size <= 0:
+            raise ValueError("mailbox_size must be greater than 0.")
+        if max_queue_size is not None and max_queue_size <= 0:
+            raise ValueError("max_queue_size must be greater than 0.")
+        if queue_full_policy not in ("wait", "drop_oldest", "reject"):
+            raise ValueError(f"Unknown queue_full_policy: {queue_full_policy}")
         self._tracer_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("SingleThreadedAgentRuntime"))
-        self._message_queue: Queue[PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope] = Queue()
+        self._prioritize_responses = prioritize_responses
+        self._max_queue_size = max_queue_size
+        self._queue_full_policy = queue_full_policy
+        self._queue_metrics = MessageQueueMetrics()
+        self._message_queue = self._new_message_queue()
+        self._mailboxes = Mailboxes(mailbox_size) if mailbox_size is not None else None
         # (namespace, type) -> List[AgentId]
         self._agent_factories: Dict[
             str, Callable[[], Agent | Awaitable[Agent]] | Callable[[AgentRuntime, AgentId], Agent | Awaitable[Agent]]
         ] = {}
-        self._instantiated_agents: Dict[AgentId, Agent] = {}
+        self._instantiated_agents = AgentInstances(agent_eviction_policy)
         self._intervention_handlers = intervention_handlers
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
@@ -265,6 +300,7 @@ def __init__(
         self._serialization_registry = SerializationRegistry()
         self._ignore_unhandled_handler_exceptions = ignore_unhandled_exceptions
         self._background_exception: BaseException | None = None
+        self._max_publish_concurrency = max_publish_concurrency
 
     @property
     def unprocessed_messages_count(
@@ -272,10 +308,99 @@ def unprocessed_messages_count(
     ) -> int:
         return self._message_queue.qsize()
 
+    def queue_metrics(self) -> MessageQueueMetrics:
+        """Return the counters of the message queue.
+
+        The counters accumulate over the lifetime of the runtime, while
+        :attr:`~autogen_core.MessageQueueMetrics.depth` is the current number of queued messages."""
+        metrics = replace(self._queue_metrics)
+        metrics.depth = self._message_queue.qsize()
+        return metrics
+
     @property
     def _known_agent_names(self) -> Set[str]:
         return set(self._agent_factories.keys())
 
+    def _new_message_queue(
+        self,
+    ) -> MessageQueue[PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope]:
+        return MessageQueue(self._envelope_priority, maxsize=self._max_queue_size or 0)
+
+    def _envelope_priority(
+        self, message_envelope: PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+    ) -> float:
+        if self._prioritize_responses and isinstance(message_envelope, ResponseMessageEnvelope):
+            return math.inf
+        return message_envelope.priority
+
+    def _reset_message_queue(self) -> None:
+        self._message_queue = self._new_message_queue()
+        # The queued messages are discarded, so their mailbox slots are freed.
+        if self._mailboxes is not None:
+            self._mailboxes.reset()
+
+    async def _enqueue(self, message_envelope: PublishMessageEnvelope | SendMessageEnvelope) -> None:
+        queue = self._message_queue
+        metrics = self._queue_metrics
+        if queue.full():
+            if self._queue_full_policy == "reject":
+                metrics.rejected += 1
+                self._release_mailboxes(message_envelope)
+                raise MessageDroppedException("The message queue is full.")
+            if self._queue_full_policy == "drop_oldest":
+                dropped = queue.evict(lambda envelope: not isinstance(envelope, ResponseMessageEnvelope))
+                if dropped is not None:
+                    self._drop_queued(dropped)
+                queue.put_unbounded(message_envelope)
+            else:
+                start = time.perf_counter()
+                try:
+                    await queue.put(message_envelope)
+                except BaseException:
+                    self._release_mailboxes(message_envelope)
+                    raise
+                waited = time.perf_counter() - start
+                metrics.enqueue_waits += 1
+                metrics.enqueue_wait_time += waited
+                metrics.max_enqueue_wait_time = max(metrics.max_enqueue_wait_time, waited)
+        else:
+            await queue.put(message_envelope)
+        metrics.enqueued += 1
+        metrics.max_depth = max(metrics.max_depth, queue.qsize())
+
+    def _drop_queued(
+        self, message_envelope: PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+    ) -> None:
+        self._queue_metrics.dropped += 1
+        self._release_mailboxes(message_envelope)
+        if isinstance(message_envelope, SendMessageEnvelope) and not message_envelope.future.done():
+            message_envelope.future.set_exception(MessageDroppedException("The message queue is full."))
+        if event_logger.isEnabledFor(logging.INFO):
+            receiver: AgentId | TopicId | None
+            if isinstance(message_envelope, PublishMessageEnvelope):
+                receiver, kind = message_envelope.topic_id, MessageKind.PUBLISH
+            else:
+                receiver, kind = message_envelope.recipient, MessageKind.DIRECT
+            event_logger.info(
+                MessageDroppedEvent(
+                    payload=partial(self._try_serialize, message_envelope.message),
+                    sender=message_envelope.sender,
+                    receiver=receiver,
+                    kind=kind,
+                )
+            )
+
+    def _release_mailboxes(
+        self, message_envelope: PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+    ) -> None:
+        if self._mailboxes is None:
+            return
+        if isinstance(message_envelope, SendMessageEnvelope):
+            self._mailboxes.release(message_envelope.recipient)
+        elif isinstance(message_envelope, PublishMessageEnvelope):
+            for recipient in message_envelope.mailbox_recipients:
+                self._mailboxes.release(recipient)
+
     # Returns the response of the message
     async def send_message(
         self,
@@ -285,6 +410,7 @@ async def send_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: int = 0,
     ) -> Any:
         if cancellation_token is None:
             cancellation_token = CancellationToken()
@@ -292,15 +418,16 @@ async def send_message(
         if message_id is None:
             message_id = str(uuid.uuid4())
 
-        event_logger.info(
-            MessageEvent(
-                payload=self._try_serialize(message),
-                sender=sender,
-                receiver=recipient,
-                kind=MessageKind.DIRECT,
-                delivery_stage=DeliveryStage.SEND,
+        if event_logger.isEnabledFor(logging.INFO):
+            event_logger.info(
+                MessageEvent(
+                    payload=partial(self._try_serialize, message),
+                    sender=sender,
+                    receiver=recipient,
+                    kind=MessageKind.DIRECT,
+                    delivery_stage=DeliveryStage.SEND,
+                )
             )
-        )
 
         with self._tracer_helper.trace_block(
             "create",
@@ -312,10 +439,13 @@ async def send_message(
             if recipient.type not in self._known_agent_names:
                 future.set_exception(Exception("Recipient not found"))
 
-            content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(f"Sending message of type {type(message).__name__} to {recipient.type}: {content}")
+            if logger.isEnabledFor(logging.INFO):
+                content = message.__dict__ if hasattr(message, "__dict__") else message
+                logger.info(f"Sending message of type {type(message).__name__} to {recipient.type}: {content}")
 
-            await self._message_queue.put(
+            if self._mailboxes is not None:
+                await self._mailboxes.acquire(recipient)
+            await self._enqueue(
                 SendMessageEnvelope(
                     message=message,
                     recipient=recipient,
@@ -324,6 +454,7 @@ async def send_message(
                     sender=sender,
                     metadata=get_telemetry_envelope_metadata(),
                     message_id=message_id,
+                    priority=priority,
                 )
             )
 
@@ -339,6 +470,7 @@ async def publish_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: int = 0,
     ) -> None:
         with self._tracer_helper.trace_block(
             "create",
@@ -348,23 +480,37 @@ async def publish_message(
         ):
             if cancellation_token is None:
                 cancellation_token = CancellationToken()
-            content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(f"Publishing message of type {type(message).__name__} to all subscribers: {content}")
+            if logger.isEnabledFor(logging.INFO):
+                content = message.__dict__ if hasattr(message, "__dict__") else message
+                logger.info(f"Publishing message of type {type(message).__name__} to all subscribers: {content}")
 
             if message_id is None:
                 message_id = str(uuid.uuid4())
 
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(message),
-                    sender=sender,
-                    receiver=topic_id,
-                    kind=MessageKind.PUBLISH,
-                    delivery_stage=DeliveryStage.SEND,
+            if event_logger.isEnabledFor(logging.INFO):
+                event_logger.info(
+                    MessageEvent(
+                        payload=partial(self._try_serialize, message),
+                        sender=sender,
+                        receiver=topic_id,
+                        kind=MessageKind.PUBLISH,
+                        delivery_stage=DeliveryStage.SEND,
+                    )
                 )
-            )
 
-            await self._message_queue.put(
+            mailbox_recipients: List[AgentId] = []
+            if self._mailboxes is not None:
+                try:
+                    for recipient in await self._subscription_manager.get_subscribed_recipients(topic_id):
+                        if recipient != sender:
+                            await self._mailboxes.acquire(recipient)
+                            mailbox_recipients.append(recipient)
+                except BaseException:
+                    for recipient in mailbox_recipients:
+                        self._mailboxes.release(recipient)
+                    raise
+
+            await self._enqueue(
                 PublishMessageEnvelope(
                     message=message,
                     cancellation_token=cancellation_token,
@@ -372,6 +518,8 @@ async def publish_message(
                     topic_id=topic_id,
                     metadata=get_telemetry_envelope_metadata(),
                     message_id=message_id,
+                    priority=priority,
+                    mailbox_recipients=mailbox_recipients,
                 )
             )
 
@@ -389,8 +537,8 @@ async def save_state(self) -> Mapping[str, Any]:
 
         """
         state: Dict[str, Dict[str, Any]] = {}
-        for agent_id in self._instantiated_agents:
-            state[str(agent_id)] = dict(await (await self._get_agent(agent_id)).save_state())
+        for agent_id, agent in self._instantiated_agents.items():
+            state[str(agent_id)] = dict(await agent.save_state())
         return state
 
     async def load_state(self, state: Mapping[str, Any]) -> None:
@@ -417,21 +565,27 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
             if recipient.type not in self._known_agent_names:
                 raise LookupError(f"Agent type '{recipient.type}' does not exist.")
 
+            # Check the log levels once per message; payloads are only serialized when an event is consumed.
+            log_enabled = logger.isEnabledFor(logging.INFO)
+            event_log_enabled = event_logger.isEnabledFor(logging.INFO)
             try:
-                sender_id = str(message_envelope.sender) if message_envelope.sender is not None else "Unknown"
-                logger.info(
-                    f"Calling message handler for {recipient} with message type {type(message_envelope.message).__name__} sent by {sender_id}"
-                )
-                event_logger.info(
-                    MessageEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        sender=message_envelope.sender,
-                        receiver=recipient,
-                        kind=MessageKind.DIRECT,
-                        delivery_stage=DeliveryStage.DELIVER,
+                if log_enabled:
+                    sender_id = str(message_envelope.sender) if message_envelope.sender is not None else "Unknown"
+                    logger.info(
+                        f"Calling message handler for {recipient} with message type {type(message_envelope.message).__name__} sent by {sender_id}"
+                    )
+                if event_log_enabled:
+                    event_logger.info(
+                        MessageEvent(
+                            payload=partial(self._try_serialize, message_envelope.message),
+                            sender=message_envelope.sender,
+                            receiver=recipient,
+                            kind=MessageKind.DIRECT,
+                            delivery_stage=DeliveryStage.DELIVER,
+                        )
                     )
-                )
                 recipient_agent = await self._get_agent(recipient)
+                self._instantiated_agents.acquire(recipient)
 
                 message_context = MessageContext(
                     sender=message_envelope.sender,
@@ -440,141 +594,187 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
                     cancellation_token=message_envelope.cancellation_token,
                     message_id=message_envelope.message_id,
                 )
-                with self._tracer_helper.trace_block("process", recipient_agent.id, parent=message_envelope.metadata):
-                    with MessageHandlerContext.populate_context(recipient_agent.id):
-                        response = await recipient_agent.on_message(
-                            message_envelope.message,
-                            ctx=message_context,
-                        )
+                try:
+                    with self._tracer_helper.trace_block(
+                        "process", recipient_agent.id, parent=message_envelope.metadata
+                    ):
+                        with MessageHandlerContext.populate_context(recipient_agent.id):
+                            response = await recipient_agent.on_message(
+                                message_envelope.message,
+                                ctx=message_context,
+                            )
+                finally:
+                    self._instantiated_agents.release(recipient)
             except CancelledError as e:
                 if not message_envelope.future.cancelled():
                     message_envelope.future.set_exception(e)
                 self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                if event_log_enabled:
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=partial(self._try_serialize, message_envelope.message),
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
             except BaseException as e:
                 message_envelope.future.set_exception(e)
                 self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                if event_log_enabled:
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=partial(self._try_serialize, message_envelope.message),
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
 
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(response),
-                    sender=message_envelope.recipient,
-                    receiver=message_envelope.sender,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.SEND,
+            if event_log_enabled:
+                event_logger.info(
+                    MessageEvent(
+                        payload=partial(self._try_serialize, response),
+                        sender=message_envelope.recipient,
+                        receiver=message_envelope.sender,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.SEND,
+                    )
                 )
-            )
 
-            await self._message_queue.put(
+            # Responses are not bounded, so a full queue does not hold up the caller.
+            self._message_queue.put_unbounded(
                 ResponseMessageEnvelope(
                     message=response,
                     future=message_envelope.future,
                     sender=message_envelope.recipient,
                     recipient=message_envelope.sender,
                     metadata=get_telemetry_envelope_metadata(),
+                    priority=message_envelope.priority,
                 )
             )
             self._message_queue.task_done()
 
     async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> None:
         with self._tracer_helper.trace_block("publish", message_envelope.topic_id, parent=message_envelope.metadata):
+            # Check the log levels once per message; payloads are only serialized when an event is consumed.
+            log_enabled = logger.isEnabledFor(logging.INFO)
+            event_log_enabled = event_logger.isEnabledFor(logging.INFO)
+            # The recipients are marked as in use, so they are not evicted before handling the message.
+            acquired: List[AgentId] = []
             try:
-                responses: List[Awaitable[Any]] = []
+                sender = message_envelope.sender
+                sender_name = str(sender) if sender is not None else "Unknown"
+                message_type_name = type(message_envelope.message).__name__
+                # All recipients share one context, which is immutable.
+                message_context = MessageContext(
+                    sender=sender,
+                    topic_id=message_envelope.topic_id,
+                    is_rpc=False,
+                    cancellation_token=message_envelope.cancellation_token,
+                    message_id=message_envelope.message_id,
+                )
+                agents: List[Agent] = []
                 recipients = await self._subscription_manager.get_subscribed_recipients(message_envelope.topic_id)
                 for agent_id in recipients:
                     # Avoid sending the message back to the sender
-                    if message_envelope.sender is not None and agent_id == message_envelope.sender:
+                    if sender is not None and agent_id == sender:
                         continue
 
-                    sender_agent = (
-                        await self._get_agent(message_envelope.sender) if message_envelope.sender is not None else None
-                    )
-                    sender_name = str(sender_agent.id) if sender_agent is not None else "Unknown"
-                    logger.info(
-                        f"Calling message handler for {agent_id.type} with message type {type(message_envelope.message).__name__} published by {sender_name}"
-                    )
-                    event_logger.info(
-                        MessageEvent(
-                            payload=self._try_serialize(message_envelope.message),
-                            sender=message_envelope.sender,
-                            receiver=None,
-                            kind=MessageKind.PUBLISH,
-                            delivery_stage=DeliveryStage.DELIVER,
+                    if log_enabled:
+                        logger.info(
+                            f"Calling message handler for {agent_id.type} with message type {message_type_name} published by {sender_name}"
                         )
-                    )
-                    message_context = MessageContext(
-                        sender=message_envelope.sender,
-                        topic_id=message_envelope.topic_id,
-                        is_rpc=False,
-                        cancellation_token=message_envelope.cancellation_token,
-                        message_id=message_envelope.message_id,
-                    )
-                    agent = await self._get_agent(agent_id)
-
-                    async def _on_message(agent: Agent, message_context: MessageContext) -> Any:
-                        with self._tracer_helper.trace_block("process", agent.id, parent=message_envelope.metadata):
-                            with MessageHandlerContext.populate_context(agent.id):
-                                try:
-                                    return await agent.on_message(
-                                        message_envelope.message,
-                                        ctx=message_context,
-                                    )
-                                except BaseException as e:
-                                    logger.error(f"Error processing publish message for {agent.id}", exc_info=True)
+                    if event_log_enabled:
+                        event_logger.info(
+                            MessageEvent(
+                                payload=partial(self._try_serialize, message_envelope.message),
+                                sender=sender,
+                                receiver=None,
+                                kind=MessageKind.PUBLISH,
+                                delivery_stage=DeliveryStage.DELIVER,
+                            )
+                        )
+                    agents.append(await self._get_agent(agent_id))
+                    self._instantiated_agents.acquire(agent_id)
+                    acquired.append(agent_id)
+
+                async def _on_message(agent: Agent) -> Any:
+                    with self._tracer_helper.trace_block("process", agent.id, parent=message_envelope.metadata):
+                        with MessageHandlerContext.populate_context(agent.id):
+                            try:
+                                return await agent.on_message(
+                                    message_envelope.message,
+                                    ctx=message_context,
+                                )
+                            except BaseException as e:
+                                logger.error(f"Error processing publish message for {agent.id}", exc_info=True)
+                                if event_log_enabled:
                                     event_logger.info(
                                         MessageHandlerExceptionEvent(
-                                            payload=self._try_serialize(message_envelope.message),
+                                            payload=partial(self._try_serialize, message_envelope.message),
                                             handling_agent=agent.id,
                                             exception=e,
                                         )
                                     )
-                                    raise e
+                                raise e
 
-                    future = _on_message(agent, message_context)
-                    responses.append(future)
-
-                await asyncio.gather(*responses)
+                if self._max_publish_concurrency is None or len(agents) <= self._max_publish_concurrency:
+                    await asyncio.gather(*[_on_message(agent) for agent in agents])
+                else:
+                    await self._gather_bounded(_on_message, agents, self._max_publish_concurrency)
             except BaseException as e:
                 if not self._ignore_unhandled_handler_exceptions:
                     self._background_exception = e
             finally:
+                for agent_id in acquired:
+                    self._instantiated_agents.release(agent_id)
                 self._message_queue.task_done()
             # TODO if responses are given for a publish
 
+    @staticmethod
+    async def _gather_bounded(
+        deliver: Callable[[Agent], Awaitable[Any]], agents: Sequence[Agent], max_concurrency: int
+    ) -> None:
+        """Deliver to every agent with at most ``max_concurrency`` handlers running at once.
+
+        Like :func:`asyncio.gather`, every agent is delivered to even if a handler raises,
+        and the first exception is raised once all deliveries have finished."""
+        pending = iter(agents)
+        exceptions: List[BaseException] = []
+
+        async def _worker() -> None:
+            for agent in pending:
+                try:
+                    await deliver(agent)
+                except BaseException as e:
+                    exceptions.append(e)
+
+        await asyncio.gather(*[_worker() for _ in range(max_concurrency)])
+        if exceptions:
+            raise exceptions[0]
+
     async def _process_response(self, message_envelope: ResponseMessageEnvelope) -> None:
         with self._tracer_helper.trace_block("ack", message_envelope.recipient, parent=message_envelope.metadata):
-            content = (
-                message_envelope.message.__dict__
-                if hasattr(message_envelope.message, "__dict__")
-                else message_envelope.message
-            )
-            logger.info(
-                f"Resolving response with message type {type(message_envelope.message).__name__} for recipient {message_envelope.recipient} from {message_envelope.sender.type}: {content}"
-            )
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(message_envelope.message),
-                    sender=message_envelope.sender,
-                    receiver=message_envelope.recipient,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.DELIVER,
+            if logger.isEnabledFor(logging.INFO):
+                content = (
+                    message_envelope.message.__dict__
+                    if hasattr(message_envelope.message, "__dict__")
+                    else message_envelope.message
+                )
+                logger.info(
+                    f"Resolving response with message type {type(message_envelope.message).__name__} for recipient {message_envelope.recipient} from {message_envelope.sender.type}: {content}"
+                )
+            if event_logger.isEnabledFor(logging.INFO):
+                event_logger.info(
+                    MessageEvent(
+                        payload=partial(self._try_serialize, message_envelope.message),
+                        sender=message_envelope.sender,
+                        receiver=message_envelope.recipient,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.DELIVER,
+                    )
                 )
-            )
             if not message_envelope.future.cancelled():
                 message_envelope.future.set_result(message_envelope.message)
             self._message_queue.task_done()
@@ -604,6 +804,8 @@ async def _process_next(self) -> None:
                 raise e from None
             return
 
+        self._release_mailboxes(message_envelope)
+
         match message_envelope:
             case SendMessageEnvelope(message=message, sender=sender, recipient=recipient, future=future):
                 if self._intervention_handlers is not None:
@@ -629,7 +831,7 @@ async def _process_next(self) -> None:
                             if temp_message is DropMessage or isinstance(temp_message, DropMessage):
                                 event_logger.info(
                                     MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
+                                        payload=partial(self._try_serialize, message),
                                         sender=sender,
                                         receiver=recipient,
                                         kind=MessageKind.DIRECT,
@@ -669,7 +871,7 @@ async def _process_next(self) -> None:
                             if temp_message is DropMessage or isinstance(temp_message, DropMessage):
                                 event_logger.info(
                                     MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
+                                        payload=partial(self._try_serialize, message),
                                         sender=sender,
                                         receiver=topic_id,
                                         kind=MessageKind.PUBLISH,
@@ -695,7 +897,7 @@ async def _process_next(self) -> None:
                         if temp_message is DropMessage or isinstance(temp_message, DropMessage):
                             event_logger.info(
                                 MessageDroppedEvent(
-                                    payload=self._try_serialize(message),
+                                    payload=partial(self._try_serialize, message),
                                     sender=sender,
                                     receiver=recipient,
                                     kind=MessageKind.RESPOND,
@@ -744,8 +946,8 @@ async def close(self) -> None:
         if self._run_context is not None:
             await self.stop()
         # close all the agents that have been instantiated
-        for agent_id in self._instantiated_agents:
-            agent = await self._get_agent(agent_id)
+        await self._instantiated_agents.wait_for_evictions()
+        for _, agent in self._instantiated_agents.items():
             await agent.close()
 
     async def stop(self) -> None:
@@ -757,7 +959,7 @@ async def stop(self) -> None:
             await self._run_context.stop()
         finally:
             self._run_context = None
-            self._message_queue = Queue()
+            self._reset_message_queue()
 
     async def stop_when_idle(self) -> None:
         """Stop the runtime message processing loop when there is
@@ -769,7 +971,7 @@ async def stop_when_idle(self) -> None:
             await self._run_context.stop_when_idle()
         finally:
             self._run_context = None
-            self._message_queue = Queue()
+            self._reset_message_queue()
 
     async def stop_when(self, condition: Callable[[], bool]) -> None:
         """Stop the runtime message processing loop when the condition is met.
@@ -790,7 +992,7 @@ async def stop_when(self, condition: Callable[[], bool]) -> None:
         await self._run_context.stop_when(condition)
 
         self._run_context = None
-        self._message_queue = Queue()
+        self._reset_message_queue()
 
     async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
         return (await self._get_agent(agent)).metadata
@@ -866,16 +1068,18 @@ async def _invoke_agent_factory(
                 raise
 
     async def _get_agent(self, agent_id: AgentId) -> Agent:
-        if agent_id in self._instantiated_agents:
-            return self._instantiated_agents[agent_id]
+        agent = self._instantiated_agents.get(agent_id)
+        if agent is not None:
+            return agent
 
         if agent_id.type not in self._agent_factories:
             raise LookupError(f"Agent with name {agent_id.type} not found.")
 
         agent_factory = self._agent_factories[agent_id.type]
-        agent = await self._invoke_agent_factory(agent_factory, agent_id)
-        self._instantiated_agents[agent_id] = agent
-        return agent
+        # Restores the state of an agent that was evicted.
+        return await self._instantiated_agents.get_or_create(
+            agent_id, lambda: self._invoke_agent_factory(agent_factory, agent_id)
+        )
 
     # TODO: uncomment out the following type ignore when this is fixed in mypy: https://github.com/python/mypy/issues/3737
     async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
@@ -1,6 +1,6 @@
 import json
 from enum import Enum
-from typing import Any, Dict, List, cast
+from typing import Any, Callable, Dict, List, cast
 
 from ._agent_id import AgentId
 from ._message_handler_context import MessageHandlerContext
@@ -210,70 +210,79 @@ class DeliveryStage(Enum):
     DELIVER = 2
 
 
-class MessageEvent:
+class _PayloadEvent:
+    """Base of the events of a message, whose payload can be given as a function that serializes the message.
+
+    The function is only called when the event is formatted or its ``kwargs`` are read, so the message is not
+    serialized for events that no handler consumes."""
+
+    def __init__(self, payload: str | Callable[[], str], kwargs: Dict[str, Any]) -> None:
+        self._payload = payload
+        self._kwargs = kwargs
+        # Keeps the payload first in the formatted event.
+        self._kwargs["payload"] = None if callable(payload) else payload
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        if callable(self._payload):
+            self._payload = self._payload()
+            self._kwargs["payload"] = self._payload
+        return self._kwargs
+
+    # This must output the event in a json serializable format
+    def __str__(self) -> str:
+        return json.dumps(self.kwargs)
+
+
+class MessageEvent(_PayloadEvent):
     def __init__(
         self,
         *,
-        payload: str,
+        payload: str | Callable[[], str],
         sender: AgentId | None,
         receiver: AgentId | TopicId | None,
         kind: MessageKind,
         delivery_stage: DeliveryStage,
         **kwargs: Any,
     ) -> None:
-        self.kwargs = kwargs
-        self.kwargs["payload"] = payload
-        self.kwargs["sender"] = None if sender is None else str(sender)
-        self.kwargs["receiver"] = None if receiver is None else str(receiver)
-        self.kwargs["kind"] = str(kind)
-        self.kwargs["delivery_stage"] = str(delivery_stage)
-        self.kwargs["type"] = "Message"
-
-    # This must output the event in a json serializable format
-    def __str__(self) -> str:
-        return json.dumps(self.kwargs)
+        super().__init__(payload, kwargs)
+        self._kwargs["sender"] = None if sender is None else str(sender)
+        self._kwargs["receiver"] = None if receiver is None else str(receiver)
+        self._kwargs["kind"] = str(kind)
+        self._kwargs["delivery_stage"] = str(delivery_stage)
+        self._kwargs["type"] = "Message"
 
 
-class MessageDroppedEvent:
+class MessageDroppedEvent(_PayloadEvent):
     def __init__(
         self,
         *,
-        payload: str,
+        payload: str | Callable[[], str],
         sender: AgentId | None,
         receiver: AgentId | TopicId | None,
         kind: MessageKind,
         **kwargs: Any,
     ) -> None:
-        self.kwargs = kwargs
-        self.kwargs["payload"] = payload
-        self.kwargs["sender"] = None if sender is None else str(sender)
-        self.kwargs["receiver"] = None if receiver is None else str(receiver)
-        self.kwargs["kind"] = str(kind)
-        self.kwargs["type"] = "MessageDropped"
-
-    # This must output the event in a json serializable format
-    def __str__(self) -> str:
-        return json.dumps(self.kwargs)
+        super().__init__(payload, kwargs)
+        self._kwargs["sender"] = None if sender is None else str(sender)
+        self._kwargs["receiver"] = None if receiver is None else str(receiver)
+        self._kwargs["kind"] = str(kind)
+        self._kwargs["type"] = "MessageDropped"
 
 
-class MessageHandlerExceptionEvent:
+class MessageHandlerExceptionEvent(_PayloadEvent):
     def __init__(
         self,
         *,
-        payload: str,
+        payload: str | Callable[[], str],
         handling_agent: AgentId,
         exception: BaseException,
         **kwargs: Any,
     ) -> None:
-        self.kwargs = kwargs
-        self.kwargs["payload"] = payload
-        self.kwargs["handling_agent"] = str(handling_agent)
-        self.kwargs["exception"] = str(exception)
-        self.kwargs["type"] = "MessageHandlerException"
-
-    # This must output the event in a json serializable format
-    def __str__(self) -> str:
-        return json.dumps(self.kwargs)
+        super().__init__(payload, kwargs)
+        self._kwargs["handling_agent"] = str(handling_agent)
+        self._kwargs["exception"] = str(exception)
+        self._kwargs["type"] = "MessageHandlerException"
 
 
 class AgentConstructionExceptionEvent:
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, List, Mapping
 
 from pydantic import BaseModel
 from typing_extensions import Self
@@ -53,29 +53,92 @@ def __init__(
         self._token_limit = token_limit
         self._model_client = model_client
         self._tool_schema = tool_schema or []
+        # Per-message token counts, aligned with ``self._messages``. Each entry
+        # excludes the fixed per-request overhead counted by ``_empty_tokens``.
+        self._message_tokens: List[int] = []
+        self._empty_tokens: int | None = None
+        self._tool_tokens: int | None = None
+
+    async def add_message(self, message: LLMMessage) -> None:
+        """Add a message to the context and cache its token count."""
+        await super().add_message(message)
+        if len(self._message_tokens) == len(self._messages) - 1:
+            self._message_tokens.append(self._count_message_tokens(message))
 
     async def get_messages(self) -> List[LLMMessage]:
         """Get at most `token_limit` tokens in recent messages. If the token limit is not
-        provided, then return as many messages as the remaining token allowed by the model client."""
+        provided, then return as many messages as the remaining token allowed by the model client.
+
+        Messages are removed from the middle of the context until the remaining
+        messages fit. Token counts are cached per message when they are added, so
+        trimming only sums cached counts and does not re-tokenize the history."""
         messages = list(self._messages)
+        message_tokens = self._get_message_tokens()
         if self._token_limit is None:
-            remaining_tokens = self._model_client.remaining_tokens(messages, tools=self._tool_schema)
-            while remaining_tokens < 0 and len(messages) > 0:
-                middle_index = len(messages) // 2
-                messages.pop(middle_index)
-                remaining_tokens = self._model_client.remaining_tokens(messages, tools=self._tool_schema)
+            budget = self._model_client.remaining_tokens([]) - self._get_tool_tokens()
         else:
-            token_count = self._model_client.count_tokens(messages, tools=self._tool_schema)
-            while token_count > self._token_limit and len(messages) > 0:
-                middle_index = len(messages) // 2
-                messages.pop(middle_index)
-                token_count = self._model_client.count_tokens(messages, tools=self._tool_schema)
+            budget = self._token_limit - self._get_empty_tokens() - self._get_tool_tokens()
+
+        # Removing the middle message repeatedly always leaves the first
+        # ceil(n / 2) and the last floor(n / 2) of n kept messages, so the token
+        # count for every candidate length can be read from prefix sums.
+        prefix_sums = [0]
+        for count in message_tokens:
+            prefix_sums.append(prefix_sums[-1] + count)
+        total = prefix_sums[-1]
+        num_kept = len(messages)
+        while num_kept > 0:
+            head = (num_kept + 1) // 2
+            tail = num_kept // 2
+            token_count = prefix_sums[head] + total - prefix_sums[len(messages) - tail]
+            if token_count <= budget:
+                break
+            num_kept -= 1
+        if num_kept < len(messages):
+            head = (num_kept + 1) // 2
+            tail = num_kept // 2
+            messages = messages[:head] + messages[len(messages) - tail :]
+
         if messages and isinstance(messages[0], FunctionExecutionResultMessage):
             # Handle the first message is a function call result message.
             # Remove the first message from the list.
             messages = messages[1:]
         return messages
 
+    async def clear(self) -> None:
+        """Clear the context."""
+        await super().clear()
+        self._message_tokens = []
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await super().load_state(state)
+        self._message_tokens = []
+
+    def _get_empty_tokens(self) -> int:
+        """Tokens counted by the model client for a request without messages or tools."""
+        if self._empty_tokens is None:
+            self._empty_tokens = self._model_client.count_tokens([])
+        return self._empty_tokens
+
+    def _get_tool_tokens(self) -> int:
+        """Tokens used by the tool schema, computed once."""
+        if self._tool_tokens is None:
+            if self._tool_schema:
+                tokens_with_tools = self._model_client.count_tokens([], tools=self._tool_schema)
+                self._tool_tokens = tokens_with_tools - self._get_empty_tokens()
+            else:
+                self._tool_tokens = 0
+        return self._tool_tokens
+
+    def _count_message_tokens(self, message: LLMMessage) -> int:
+        return self._model_client.count_tokens([message]) - self._get_empty_tokens()
+
+    def _get_message_tokens(self) -> List[int]:
+        """Return the cached token counts, recounting if the messages were modified directly."""
+        if len(self._message_tokens) != len(self._messages):
+            self._message_tokens = [self._count_message_tokens(message) for message in self._messages]
+        return self._message_tokens
+
     def _to_config(self) -> TokenLimitedChatCompletionContextConfig:
         return TokenLimitedChatCompletionContextConfig(
             model_client=self._model_client.dump_component(),
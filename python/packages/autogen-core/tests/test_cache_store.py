@@ -1,6 +1,8 @@
+import time
 from unittest.mock import Mock
 
-from autogen_core import CacheStore, InMemoryStore
+import pytest
+from autogen_core import CacheStats, CacheStore, InMemoryStore
 
 
 def test_set_and_get_object_key_value() -> None:
@@ -46,3 +48,97 @@ def test_inmemory_store() -> None:
     key = "non_existent_key"
     default_value = 99
     assert store.get(key, default_value) == default_value
+
+
+def test_inmemory_store_lru() -> None:
+    store = InMemoryStore[int](max_size=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    assert store.get("a") == 1
+    store.set("c", 3)
+    # "b" is the least recently used.
+    assert store.get("b") is None
+    assert store.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert store.stats == CacheStats(hits=3, misses=2, evictions=1)
+
+
+def test_inmemory_store_lfu() -> None:
+    store = InMemoryStore[int](max_size=2, eviction_policy="lfu")
+    store.set_many({"a": 1, "b": 2})
+    assert store.get("a") == 1
+    assert store.get("a") == 1
+    assert store.get("b") == 2
+    store.set("c", 3)
+    # "b" is used less than "a".
+    assert store.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    store.set("d", 4)
+    # "c" is used as often as "d", but less recently.
+    assert store.get_many(["a", "c", "d"]) == {"a": 1, "d": 4}
+    assert store.stats.evictions == 2
+
+
+def test_inmemory_store_lfu_expired(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    store = InMemoryStore[int](max_size=3, eviction_policy="lfu")
+    store.set("a", 1, ttl=5)
+    store.set_many({"b": 2, "c": 3})
+    assert store.get_many(["b", "b", "c"]) == {"b": 2, "c": 3}
+    now += 10
+    # "a", the only key used once, expires when "d" is added.
+    store.set("d", 4)
+    assert set(store.store) == {"b", "c", "d"}
+    store.set("e", 5)
+    # "d" is the least frequently used.
+    assert set(store.store) == {"b", "c", "e"}
+    assert store.get("e") == 5
+    store.set("f", 6)
+    # "c" is used as often as "e", but less recently.
+    assert set(store.store) == {"b", "e", "f"}
+    assert store.stats.evictions == 2
+
+
+def test_inmemory_store_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    store = InMemoryStore[int](default_ttl=10)
+    store.set("a", 1)
+    store.set("b", 2, ttl=30)
+    now += 20
+    assert store.get("a") is None
+    assert store.get("b") == 2
+
+    # Expired items are removed when items are added, even if they are never looked up.
+    store.set("c", 3, ttl=5)
+    now += 20
+    store.set("d", 4)
+    assert set(store.store) == {"d"}
+    assert store.stats.expirations == 3
+
+    config = store.dump_component()
+    loaded = InMemoryStore[int].load_component(config)
+    assert loaded.dump_component() == config
+
+    with pytest.raises(ValueError):
+        InMemoryStore[int](max_size=0)
+
+
+def test_inmemory_store_ttl_set_again() -> None:
+    store = InMemoryStore[int](default_ttl=10)
+    for i in range(100):
+        store.set("a", i)
+        store.set("b", i, ttl=20)
+    # The entries of the earlier expiry times are dropped from the heap.
+    assert len(store._expiry_heap) <= 6  # type: ignore
+    assert store.get("a") == 99
+
+
+@pytest.mark.asyncio
+async def test_inmemory_store_async() -> None:
+    store = InMemoryStore[int]()
+    await store.aset("a", 1)
+    await store.aset_many({"b": 2, "c": 3})
+    assert await store.aget("a") == 1
+    assert await store.aget("d", 4) == 4
+    assert await store.aget_many(["b", "c", "d"]) == {"b": 2, "c": 3}
+    assert store.stats.hit_rate == 0.6
@@ -0,0 +1,82 @@
+import base64
+from io import BytesIO
+from pathlib import Path
+
+from autogen_core import Image
+from PIL import Image as PILImage
+
+
+def _encode(pil_image: PILImage.Image, format: str) -> bytes:
+    buffered = BytesIO()
+    pil_image.save(buffered, format=format)
+    return buffered.getvalue()
+
+
+def test_image_keeps_encoded_bytes() -> None:
+    data = _encode(PILImage.new("RGB", (120, 80), color="red"), "JPEG")
+    base64_str = base64.b64encode(data).decode("utf-8")
+
+    image = Image.from_base64(base64_str)
+    assert image.size == (120, 80)
+    assert image.mime_type == "image/jpeg"
+    assert image.to_base64() == base64_str
+    assert image.data_uri == f"data:image/jpeg;base64,{base64_str}"
+    # Nothing above needed the pixels.
+    assert image._image is None  # type: ignore[reportPrivateUsage]
+
+    assert image.image.mode == "RGB"
+    assert image.image.size == (120, 80)
+    assert image.to_base64() == base64_str
+
+
+def test_image_from_file(tmp_path: Path) -> None:
+    file_path = tmp_path / "image.png"
+    PILImage.new("RGBA", (10, 20)).save(file_path)
+
+    image = Image.from_file(file_path)
+    assert image.size == (10, 20)
+    assert image.to_base64() == base64.b64encode(file_path.read_bytes()).decode("utf-8")
+    assert image.image.mode == "RGB"
+
+
+def test_image_unsupported_format_is_converted_to_png() -> None:
+    data = _encode(PILImage.new("RGB", (4, 4)), "BMP")
+
+    image = Image.from_base64(base64.b64encode(data).decode("utf-8"))
+    assert image.mime_type == "image/png"
+    assert base64.b64decode(image.to_base64()).startswith(b"\x89PNG\r\n\x1a\n")
+
+
+def test_image_encoding_is_cached() -> None:
+    image = Image.from_pil(PILImage.new("RGB", (8, 8)))
+    assert image.size == (8, 8)
+    assert image.mime_type == "image/png"
+    assert image.to_base64() is image.to_base64()
+    assert image.data_uri is image.data_uri
+
+    image.image = PILImage.new("RGB", (16, 16))
+    assert image.size == (16, 16)
+    assert Image.from_base64(image.to_base64()).size == (16, 16)
+
+
+def test_image_data_uri_round_trip() -> None:
+    for format, mime_type in [
+        ("PNG", "image/png"),
+        ("JPEG", "image/jpeg"),
+        ("GIF", "image/gif"),
+        ("WEBP", "image/webp"),
+    ]:
+        data = _encode(PILImage.new("RGB", (6, 6), color="blue"), format)
+        image = Image.from_base64(base64.b64encode(data).decode("utf-8"))
+        assert image.mime_type == mime_type
+        assert Image.from_uri(image.data_uri).to_base64() == image.to_base64()
+
+
+def test_image_animated_gif_is_converted_to_png() -> None:
+    frames = [PILImage.new("RGB", (4, 4), color=color) for color in ["red", "green"]]
+    buffered = BytesIO()
+    frames[0].save(buffered, format="GIF", save_all=True, append_images=frames[1:])
+
+    image = Image.from_base64(base64.b64encode(buffered.getvalue()).decode("utf-8"))
+    assert image.mime_type == "image/png"
+    assert image.size == (4, 4)
@@ -1,4 +1,5 @@
 from typing import List
+from unittest.mock import patch
 
 import pytest
 from autogen_core.model_context import (
@@ -16,6 +17,7 @@
 )
 from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
 
 
 @pytest.mark.asyncio
@@ -205,3 +207,26 @@ async def test_token_limited_model_context_openai_with_function_result(
     assert type(retrieved[0]) == UserMessage  # Function result should be removed
     assert type(retrieved[1]) == AssistantMessage
     assert type(retrieved[2]) == UserMessage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token_limit", [1, 5, 12, 20, 40, 1000])
+async def test_token_limited_model_context_caches_message_tokens(token_limit: int) -> None:
+    model_client = ReplayChatCompletionClient(["Hello"])
+    model_context = TokenLimitedChatCompletionContext(model_client=model_client, token_limit=token_limit)
+    messages: List[LLMMessage] = [
+        UserMessage(content=" ".join(["word"] * (i % 4 + 1)), source="user") for i in range(9)
+    ]
+    for msg in messages:
+        await model_context.add_message(msg)
+
+    # Reference implementation: drop the middle message until the rest fit.
+    expected = list(messages)
+    while model_client.count_tokens(expected) > token_limit and len(expected) > 0:
+        expected.pop(len(expected) // 2)
+
+    with patch.object(model_client, "count_tokens", wraps=model_client.count_tokens) as count_tokens:
+        retrieved = await model_context.get_messages()
+        # Token counts are cached when messages are added.
+        assert count_tokens.call_count == 0
+    assert retrieved == expected
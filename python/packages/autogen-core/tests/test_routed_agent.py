@@ -13,6 +13,7 @@
     event,
     message_handler,
     rpc,
+    try_get_known_serializers_for_type,
 )
 from autogen_test_utils import LoopbackAgent
 
@@ -219,3 +220,49 @@ async def test_rpc() -> None:
     agent = await runtime.try_get_underlying_agent_instance(agent_id, type=RPCAgent)
     assert agent.num_calls[0] == 1
     assert agent.num_calls[1] == 1
+
+
+@dataclass
+class BaseMessage:
+    content: str
+
+
+@dataclass
+class DerivedMessage(BaseMessage): ...
+
+
+@dataclass
+class SpecialMessage(DerivedMessage): ...
+
+
+class InheritanceAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that handles message subclasses.")
+
+    @rpc
+    async def on_base(self, message: BaseMessage, ctx: MessageContext) -> str:
+        return "base"
+
+    @rpc
+    async def on_special(self, message: SpecialMessage, ctx: MessageContext) -> str:
+        return "special"
+
+
+@pytest.mark.asyncio
+async def test_message_subclass_dispatch() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await InheritanceAgent.register(runtime, "inheritance", InheritanceAgent, skip_class_subscriptions=True)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(DerivedMessage))
+    runtime.start()
+    agent_id = AgentId("inheritance", "default")
+    assert await runtime.send_message(BaseMessage("a"), recipient=agent_id) == "base"
+    # A subclass without its own handler goes to the handler of its base class.
+    assert await runtime.send_message(DerivedMessage("b"), recipient=agent_id) == "base"
+    # The handler of the most derived class wins.
+    assert await runtime.send_message(SpecialMessage("c"), recipient=agent_id) == "special"
+
+    # The handler table is computed once per class.
+    other = await runtime.try_get_underlying_agent_instance(AgentId("inheritance", "other"), type=InheritanceAgent)
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=InheritanceAgent)
+    assert agent._handlers is other._handlers  # type: ignore[reportPrivateUsage]
+    await runtime.stop()
@@ -1,11 +1,18 @@
+import asyncio
+import json
 import logging
+from typing import Any, List, Mapping
+from unittest.mock import patch
 
 import pytest
 from autogen_core import (
+    EVENT_LOGGER_NAME,
+    AgentEvictionPolicy,
     AgentId,
     AgentInstantiationContext,
     AgentType,
     DefaultTopicId,
+    InMemoryStore,
     MessageContext,
     RoutedAgent,
     SingleThreadedAgentRuntime,
@@ -16,9 +23,12 @@
     type_subscription,
 )
 from autogen_core._default_subscription import default_subscription
+from autogen_core.exceptions import MessageDroppedException
+from autogen_core.logging import MessageEvent
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
+    ContentMessage,
     LoopbackAgent,
     LoopbackAgentWithDefaultSubscription,
     MessageType,
@@ -310,3 +320,330 @@ async def test_event_handler_exception_multi_message() -> None:
         await runtime.stop_when_idle()
 
     await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_message_events_only_when_logging_enabled() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    agent_id = AgentId("name", key="default")
+
+    events: List[Any] = []
+
+    class _EventHandler(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            events.append(record.msg)
+
+    event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+    handler = _EventHandler()
+    level, propagate = event_logger.level, event_logger.propagate
+    # Keep pytest's log capture from formatting the events.
+    event_logger.propagate = False
+    event_logger.addHandler(handler)
+    try:
+        with patch.object(runtime, "_try_serialize", wraps=runtime._try_serialize) as try_serialize:  # type: ignore[reportPrivateUsage]
+            # No events are created when the event logger is disabled.
+            event_logger.setLevel(logging.WARNING)
+            runtime.start()
+            await runtime.send_message(MessageType(), recipient=agent_id)
+            await runtime.stop_when_idle()
+            assert events == []
+            assert try_serialize.call_count == 0
+
+            # The events are created when the event logger is enabled, but the messages are only
+            # serialized when a handler reads the events.
+            event_logger.setLevel(logging.INFO)
+            runtime.start()
+            await runtime.send_message(MessageType(), recipient=agent_id)
+            await runtime.stop_when_idle()
+            message_events = [event for event in events if isinstance(event, MessageEvent)]
+            assert len(message_events) == 4
+            assert try_serialize.call_count == 0
+            for event in message_events:
+                assert isinstance(event.kwargs["payload"], str)
+                assert json.loads(str(event))["payload"] == event.kwargs["payload"]
+            assert try_serialize.call_count == 4
+    finally:
+        event_logger.removeHandler(handler)
+        event_logger.setLevel(level)
+        event_logger.propagate = propagate
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_publish_concurrency", [None, 3])
+async def test_publish_fan_out(max_publish_concurrency: int | None) -> None:
+    runtime = SingleThreadedAgentRuntime(max_publish_concurrency=max_publish_concurrency)
+    contexts: List[MessageContext] = []
+    running = 0
+    max_running = 0
+
+    class SlowAgent(RoutedAgent):
+        def __init__(self) -> None:
+            super().__init__("A slow agent.")
+
+        @event
+        async def on_new_message(self, message: MessageType, ctx: MessageContext) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            contexts.append(ctx)
+
+    num_subscribers = 10
+    for i in range(num_subscribers):
+        await SlowAgent.register(runtime, f"slow{i}", SlowAgent, skip_class_subscriptions=True)
+        await runtime.add_subscription(TypeSubscription("default", f"slow{i}"))
+
+    runtime.start()
+    await runtime.publish_message(MessageType(), topic_id=TopicId("default", "default"))
+    await runtime.stop_when_idle()
+
+    assert len(contexts) == num_subscribers
+    # Every recipient gets the same context object.
+    assert all(ctx is contexts[0] for ctx in contexts)
+    assert max_running == (num_subscribers if max_publish_concurrency is None else max_publish_concurrency)
+
+
+@pytest.mark.asyncio
+async def test_message_priority() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "loopback", LoopbackAgentWithDefaultSubscription)
+
+    # Queue the messages before starting so they are dispatched by priority.
+    await runtime.publish_message(ContentMessage("low 1"), topic_id=DefaultTopicId())
+    await runtime.publish_message(ContentMessage("high"), topic_id=DefaultTopicId(), priority=1)
+    await runtime.publish_message(ContentMessage("low 2"), topic_id=DefaultTopicId())
+    await runtime.publish_message(ContentMessage("urgent"), topic_id=DefaultTopicId(), priority=2)
+    runtime.start()
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("loopback", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert [message.content for message in agent.received_messages] == ["urgent", "high", "low 1", "low 2"]
+
+
+@pytest.mark.asyncio
+async def test_prioritize_responses() -> None:
+    runtime = SingleThreadedAgentRuntime(prioritize_responses=True)
+    await LoopbackAgent.register(runtime, "rpc", LoopbackAgent)
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "subscriber", LoopbackAgentWithDefaultSubscription)
+
+    async def send() -> int:
+        await runtime.send_message(MessageType(), recipient=AgentId("rpc", "default"))
+        return runtime.unprocessed_messages_count
+
+    send_task = asyncio.create_task(send())
+    await asyncio.sleep(0)
+    num_published = 10
+    for _ in range(num_published):
+        await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    runtime.start()
+
+    # The response overtakes the published messages that were queued before it.
+    assert await send_task > 0
+    await runtime.stop_when_idle()
+    subscriber = await runtime.try_get_underlying_agent_instance(AgentId("subscriber", "default"), type=LoopbackAgent)
+    assert subscriber.num_calls == num_published
+
+
+@pytest.mark.asyncio
+async def test_mailbox_backpressure() -> None:
+    with pytest.raises(ValueError):
+        SingleThreadedAgentRuntime(mailbox_size=0)
+
+    runtime = SingleThreadedAgentRuntime(mailbox_size=2)
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "loopback", LoopbackAgentWithDefaultSubscription)
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    # A message to a topic without subscribers does not take a slot.
+    await runtime.publish_message(MessageType(), topic_id=TopicId("other", "default"))
+
+    # The mailbox is full, so the third publish waits until the runtime dispatches a message.
+    publish_task = asyncio.create_task(runtime.publish_message(MessageType(), topic_id=DefaultTopicId()))
+    await asyncio.sleep(0.01)
+    assert not publish_task.done()
+    assert runtime.unprocessed_messages_count == 3
+
+    runtime.start()
+    await publish_task
+    await runtime.stop_when_idle()
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("loopback", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert agent.num_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_waits_when_full() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=2)
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "loopback", LoopbackAgentWithDefaultSubscription)
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+
+    publish_task = asyncio.create_task(runtime.publish_message(MessageType(), topic_id=DefaultTopicId()))
+    await asyncio.sleep(0.01)
+    assert not publish_task.done()
+    assert runtime.unprocessed_messages_count == 2
+
+    runtime.start()
+    await publish_task
+    await runtime.stop_when_idle()
+
+    metrics = runtime.queue_metrics()
+    assert metrics.depth == 0
+    assert metrics.max_depth == 2
+    assert metrics.enqueued == 3
+    assert metrics.enqueue_waits == 1
+    assert metrics.enqueue_wait_time > 0
+    assert metrics.dropped == metrics.rejected == 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_drops_oldest() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=2, queue_full_policy="drop_oldest")
+    await LoopbackAgent.register(runtime, "rpc", LoopbackAgent)
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "loopback", LoopbackAgentWithDefaultSubscription)
+
+    send_task = asyncio.create_task(runtime.send_message(MessageType(), recipient=AgentId("rpc", "default")))
+    await asyncio.sleep(0)
+    await runtime.publish_message(ContentMessage("first"), topic_id=DefaultTopicId(), priority=1)
+    # The queue is full, so the send, which is the oldest message with the lowest priority, is dropped.
+    await runtime.publish_message(ContentMessage("second"), topic_id=DefaultTopicId())
+    with pytest.raises(MessageDroppedException):
+        await send_task
+
+    runtime.start()
+    await runtime.stop_when_idle()
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("loopback", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert [message.content for message in agent.received_messages] == ["first", "second"]
+    metrics = runtime.queue_metrics()
+    assert metrics.enqueued == 3
+    assert metrics.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_rejects_when_full() -> None:
+    with pytest.raises(ValueError):
+        SingleThreadedAgentRuntime(max_queue_size=0)
+
+    runtime = SingleThreadedAgentRuntime(max_queue_size=1, queue_full_policy="reject")
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    with pytest.raises(MessageDroppedException):
+        await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+
+    metrics = runtime.queue_metrics()
+    assert metrics.depth == 1
+    assert metrics.enqueued == 1
+    assert metrics.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_agent_eviction_max_agents() -> None:
+    store = InMemoryStore[Mapping[str, Any]]()
+    runtime = SingleThreadedAgentRuntime(agent_eviction_policy=AgentEvictionPolicy(max_agents=2, state_store=store))
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+    for key in ["a", "b", "c"]:
+        await runtime.send_message(MessageType(), recipient=AgentId("loopback", key))
+    await runtime.stop_when_idle()
+
+    # The least recently used agent was evicted and its state saved.
+    assert set(await runtime.save_state()) == {"loopback/b", "loopback/c"}
+    assert store.get("loopback/a") == {"num_calls": 1}
+
+    # The next message restores the evicted agent from its saved state.
+    runtime.start()
+    await runtime.send_message(MessageType(), recipient=AgentId("loopback", "a"))
+    await runtime.stop_when_idle()
+    assert await runtime.agent_save_state(AgentId("loopback", "a")) == {"num_calls": 2}
+    assert store.get("loopback/b") == {"num_calls": 1}
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_agent_eviction_idle_timeout() -> None:
+    with pytest.raises(ValueError):
+        AgentEvictionPolicy(idle_timeout=0)
+
+    policy = AgentEvictionPolicy(idle_timeout=0.05)
+    runtime = SingleThreadedAgentRuntime(agent_eviction_policy=policy)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+    await runtime.send_message(MessageType(), recipient=AgentId("loopback", "a"))
+    await asyncio.sleep(0.1)
+    # Looking up another agent evicts the idle one.
+    await runtime.send_message(MessageType(), recipient=AgentId("loopback", "b"))
+    await runtime.stop_when_idle()
+    assert set(await runtime.save_state()) == {"loopback/b"}
+    assert policy.state_store.get("loopback/a") == {"num_calls": 1}
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_agent_eviction_skips_agents_in_use() -> None:
+    runtime = SingleThreadedAgentRuntime(agent_eviction_policy=AgentEvictionPolicy(max_agents=1))
+
+    class SlowAgent(RoutedAgent):
+        def __init__(self) -> None:
+            super().__init__("A slow agent.")
+            self.num_calls = 0
+
+        @event
+        async def on_new_message(self, message: MessageType, ctx: MessageContext) -> None:
+            await asyncio.sleep(0.01)
+            self.num_calls += 1
+
+        async def save_state(self) -> Mapping[str, Any]:
+            return {"num_calls": self.num_calls}
+
+        async def load_state(self, state: Mapping[str, Any]) -> None:
+            self.num_calls = state["num_calls"]
+
+    num_agents = 3
+    for i in range(num_agents):
+        await SlowAgent.register(runtime, f"slow{i}", SlowAgent, skip_class_subscriptions=True)
+        await runtime.add_subscription(TypeSubscription("default", f"slow{i}"))
+    runtime.start()
+    await runtime.publish_message(MessageType(), topic_id=TopicId("default", "default"))
+    await runtime.stop_when_idle()
+
+    # No agent was evicted while handling the message, so no update was lost.
+    for i in range(num_agents):
+        assert await runtime.agent_save_state(AgentId(f"slow{i}", "default")) == {"num_calls": 1}
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_agent_eviction_concurrent_restore() -> None:
+    runtime = SingleThreadedAgentRuntime(agent_eviction_policy=AgentEvictionPolicy(max_agents=1))
+    num_instances = 0
+
+    class SlowSavingAgent(LoopbackAgent):
+        def __init__(self) -> None:
+            nonlocal num_instances
+            super().__init__()
+            num_instances += 1
+
+        async def save_state(self) -> Mapping[str, Any]:
+            await asyncio.sleep(0.05)
+            return await super().save_state()
+
+    await SlowSavingAgent.register(runtime, "loopback", SlowSavingAgent)
+    runtime.start()
+    await runtime.send_message(MessageType(), recipient=AgentId("loopback", "a"))
+    # Evicts agent "a", whose state takes a while to save.
+    await runtime.send_message(MessageType(), recipient=AgentId("loopback", "b"))
+    # Both messages wait for the eviction, then share one new instance.
+    await asyncio.gather(
+        runtime.send_message(MessageType(), recipient=AgentId("loopback", "a")),
+        runtime.send_message(MessageType(), recipient=AgentId("loopback", "a")),
+    )
+    await runtime.stop_when_idle()
+
+    assert num_instances == 3
+    assert await runtime.agent_save_state(AgentId("loopback", "a")) == {"num_calls": 3}
+    await runtime.close()
@@ -10,8 +10,10 @@
     MessageSerializer,
     PydanticJsonMessageSerializer,
     SerializationRegistry,
+    UnknownPayload,
     try_get_known_serializers_for_type,
 )
+from google.protobuf import any_pb2
 from PIL import Image as PILImage
 from protos.serialization_test_pb2 import NestingProtoMessage, ProtoMessage
 from pydantic import BaseModel
@@ -97,6 +99,14 @@ def test_proto() -> None:
     deserialized = serde.deserialize(data, type_name=name, data_content_type=PROTOBUF_DATA_CONTENT_TYPE)
     assert deserialized.message == message.message
 
+    any_proto = any_pb2.Any()
+    any_proto.Pack(message)
+    assert serde.deserialize_any(any_proto, type_name=name) == message
+    # Unknown types are returned as their serialized payload.
+    unknown = SerializationRegistry().deserialize_any(any_proto, type_name=name)
+    assert isinstance(unknown, UnknownPayload)
+    assert unknown.payload == data
+
 
 def test_nested_proto() -> None:
     serde = SerializationRegistry()
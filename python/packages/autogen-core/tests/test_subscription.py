@@ -1,12 +1,17 @@
+from typing import List
+
 import pytest
 from autogen_core import (
     AgentId,
     DefaultSubscription,
     DefaultTopicId,
     SingleThreadedAgentRuntime,
+    Subscription,
     TopicId,
+    TypePrefixSubscription,
     TypeSubscription,
 )
+from autogen_core._runtime_impl_helpers import SubscriptionManager
 from autogen_core.exceptions import CantHandleException
 from autogen_test_utils import LoopbackAgent, MessageType
 
@@ -120,3 +125,53 @@ async def test_subscription_deduplication() -> None:
     default_subscription = DefaultSubscription(agent_type=agent_type)
     with pytest.raises(ValueError, match="Subscription already exists"):
         await runtime.add_subscription(default_subscription)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_matches_linear_scan() -> None:
+    manager = SubscriptionManager()
+    subscriptions: List[Subscription] = [
+        TypeSubscription(topic_type="t1", agent_type="a1"),
+        TypePrefixSubscription(topic_type_prefix="t", agent_type="a2"),
+        TypeSubscription(topic_type="t12", agent_type="a3"),
+        TypePrefixSubscription(topic_type_prefix="t1", agent_type="a4"),
+        TypePrefixSubscription(topic_type_prefix="", agent_type="a5"),
+        DefaultSubscription(agent_type="a6"),
+    ]
+    topics = [TopicId(type=t, source="s1") for t in ["t1", "t12", "t2", "x", "default"]]
+
+    async def check() -> None:
+        for topic in topics:
+            expected = [sub.map_to_agent(topic) for sub in manager.subscriptions if sub.is_match(topic)]
+            assert await manager.get_subscribed_recipients(topic) == expected
+
+    for subscription in subscriptions:
+        await manager.add_subscription(subscription)
+        await check()
+
+    with pytest.raises(ValueError):
+        await manager.add_subscription(TypePrefixSubscription(topic_type_prefix="t1", agent_type="a4"))
+    with pytest.raises(ValueError):
+        await manager.add_subscription(TypeSubscription(topic_type="t2", agent_type="a1", id=subscriptions[0].id))
+
+    for subscription in subscriptions[::2]:
+        await manager.remove_subscription(subscription.id)
+        await check()
+
+    with pytest.raises(ValueError):
+        await manager.remove_subscription(subscriptions[0].id)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_seen_topics_bounded() -> None:
+    manager = SubscriptionManager(max_seen_topics=2)
+    await manager.add_subscription(TypeSubscription(topic_type="t1", agent_type="a1"))
+    for i in range(5):
+        recipients = await manager.get_subscribed_recipients(TopicId(type="t1", source=f"s{i}"))
+        assert recipients == [AgentId(type="a1", key=f"s{i}")]
+    assert len(manager._subscribed_recipients) == 2  # type: ignore[reportPrivateUsage]
+
+    # Evicted topics are resolved again with the current subscriptions.
+    await manager.add_subscription(TypeSubscription(topic_type="t1", agent_type="a2"))
+    recipients = await manager.get_subscribed_recipients(TopicId(type="t1", source="s0"))
+    assert recipients == [AgentId(type="a1", key="s0"), AgentId(type="a2", key="s0")]
@@ -1,7 +1,8 @@
-from typing import Any, Optional, TypeVar, cast
+import asyncio
+from typing import Any, Dict, Mapping, Optional, Sequence, TypeVar, cast
 
 import diskcache
-from autogen_core import CacheStore, Component
+from autogen_core import CacheStats, CacheStore, Component
 from pydantic import BaseModel
 from typing_extensions import Self
 
@@ -12,7 +13,11 @@ class DiskCacheStoreConfig(BaseModel):
     """Configuration for DiskCacheStore"""
 
     directory: str  # Path where cache is stored
-    # Could add other diskcache.Cache parameters like size_limit, etc.
+    # Settings of a new diskcache.Cache. The settings of an existing cache are kept in its directory.
+    size_limit: Optional[int] = None
+    eviction_policy: Optional[str] = None
+    namespace: Optional[str] = None
+    default_ttl: Optional[float] = None
 
 
 class DiskCacheStore(CacheStore[T], Component[DiskCacheStoreConfig]):
@@ -20,27 +25,89 @@ class DiskCacheStore(CacheStore[T], Component[DiskCacheStoreConfig]):
     A typed CacheStore implementation that uses diskcache as the underlying storage.
     See :class:`~autogen_ext.models.cache.ChatCompletionCache` for an example of usage.
 
+    The size of the cache is bounded by the ``size_limit`` of the diskcache.Cache, which evicts
+    items according to its ``eviction_policy``. The async methods run in a worker thread, so that
+    disk I/O does not block the event loop.
+
     Args:
         cache_instance: An instance of diskcache.Cache.
                         The user is responsible for managing the DiskCache instance's lifetime.
+        namespace (str, optional): A prefix of the keys of the store, so that several stores can share
+            a cache without their keys colliding. Defaults to None (no prefix).
+        default_ttl (float, optional): The number of seconds after which items expire, when
+            :meth:`set` is not given a ttl. Defaults to None (items never expire).
     """
 
     component_config_schema = DiskCacheStoreConfig
     component_provider_override = "autogen_ext.cache_store.diskcache.DiskCacheStore"
 
-    def __init__(self, cache_instance: diskcache.Cache):  # type: ignore[no-any-unimported]
+    def __init__(  # type: ignore[no-any-unimported]
+        self,
+        cache_instance: diskcache.Cache,
+        namespace: Optional[str] = None,
+        default_ttl: Optional[float] = None,
+    ):
         self.cache = cache_instance
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """The lookups of this store. Evictions and expirations are done by diskcache and not counted."""
+        return self._stats
+
+    def _key(self, key: str) -> str:
+        return key if self.namespace is None else f"{self.namespace}:{key}"
 
     def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
-        return cast(Optional[T], self.cache.get(key, default))  # type: ignore[reportUnknownMemberType]
+        value = cast(Optional[T], self.cache.get(self._key(key)))  # type: ignore[reportUnknownMemberType]
+        if value is None:
+            self._stats.misses += 1
+            return default
+        self._stats.hits += 1
+        return value
+
+    def set(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        expire = ttl if ttl is not None else self.default_ttl
+        self.cache.set(self._key(key), cast(Any, value), expire=expire)  # type: ignore[reportUnknownMemberType]
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, T]:
+        # One transaction, rather than one per key.
+        with self.cache.transact():  # type: ignore[reportUnknownMemberType]
+            return super().get_many(keys)
+
+    def set_many(self, items: Mapping[str, T], ttl: Optional[float] = None) -> None:
+        with self.cache.transact():  # type: ignore[reportUnknownMemberType]
+            super().set_many(items, ttl)
+
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aset(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def aget_many(self, keys: Sequence[str]) -> Dict[str, T]:
+        return await asyncio.to_thread(self.get_many, keys)
 
-    def set(self, key: str, value: T) -> None:
-        self.cache.set(key, cast(Any, value))  # type: ignore[reportUnknownMemberType]
+    async def aset_many(self, items: Mapping[str, T], ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set_many, items, ttl)
 
     def _to_config(self) -> DiskCacheStoreConfig:
         # Get directory from cache instance
-        return DiskCacheStoreConfig(directory=self.cache.directory)
+        return DiskCacheStoreConfig(
+            directory=self.cache.directory, namespace=self.namespace, default_ttl=self.default_ttl
+        )
 
     @classmethod
     def _from_config(cls, config: DiskCacheStoreConfig) -> Self:
-        return cls(cache_instance=diskcache.Cache(config.directory))  # type: ignore[no-any-return]
+        settings: Dict[str, Any] = {}
+        if config.size_limit is not None:
+            settings["size_limit"] = config.size_limit
+        if config.eviction_policy is not None:
+            settings["eviction_policy"] = config.eviction_policy
+        return cls(  # type: ignore[no-any-return]
+            cache_instance=diskcache.Cache(config.directory, **settings),
+            namespace=config.namespace,
+            default_ttl=config.default_ttl,
+        )
@@ -1,7 +1,8 @@
-from typing import Any, Dict, Optional, TypeVar, cast
+import asyncio
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TypeVar, cast
 
 import redis
-from autogen_core import CacheStore, Component
+from autogen_core import CacheStats, CacheStore, Component
 from pydantic import BaseModel
 from typing_extensions import Self
 
@@ -19,6 +20,8 @@ class RedisStoreConfig(BaseModel):
     password: Optional[str] = None
     ssl: bool = False
     socket_timeout: Optional[float] = None
+    namespace: Optional[str] = None
+    default_ttl: Optional[float] = None
 
 
 class RedisStore(CacheStore[T], Component[RedisStoreConfig]):
@@ -26,25 +29,90 @@ class RedisStore(CacheStore[T], Component[RedisStoreConfig]):
     A typed CacheStore implementation that uses redis as the underlying storage.
     See :class:`~autogen_ext.models.cache.ChatCompletionCache` for an example of usage.
 
+    The size of the cache is bounded by the ``maxmemory`` setting of the Redis server, which evicts
+    keys according to its ``maxmemory-policy``. The async methods run in a worker thread, so that
+    network I/O does not block the event loop.
+
     Args:
         cache_instance: An instance of `redis.Redis`.
                         The user is responsible for managing the Redis instance's lifetime.
+        namespace (str, optional): A prefix of the keys of the store, so that several stores can share
+            a Redis database without their keys colliding. Defaults to None (no prefix).
+        default_ttl (float, optional): The number of seconds after which items expire, when
+            :meth:`set` is not given a ttl. Defaults to None (items never expire).
     """
 
     component_config_schema = RedisStoreConfig
     component_provider_override = "autogen_ext.cache_store.redis.RedisStore"
 
-    def __init__(self, redis_instance: redis.Redis):
+    def __init__(
+        self, redis_instance: redis.Redis, namespace: Optional[str] = None, default_ttl: Optional[float] = None
+    ):
         self.cache = redis_instance
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """The lookups of this store. Evictions and expirations are done by Redis and not counted."""
+        return self._stats
+
+    def _key(self, key: str) -> str:
+        return key if self.namespace is None else f"{self.namespace}:{key}"
+
+    def _count(self, value: Optional[T]) -> Optional[T]:
+        if value is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return value
 
     def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
-        value = cast(Optional[T], self.cache.get(key))
+        value = self._count(cast(Optional[T], self.cache.get(self._key(key))))
         if value is None:
             return default
         return value
 
-    def set(self, key: str, value: T) -> None:
-        self.cache.set(key, cast(Any, value))
+    def set(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        self._set(self.cache, key, value, ttl)
+
+    def _set(self, client: "redis.Redis | redis.client.Pipeline", key: str, value: T, ttl: Optional[float]) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        if ttl is None:
+            client.set(self._key(key), cast(Any, value))
+        else:
+            client.set(self._key(key), cast(Any, value), px=max(1, round(ttl * 1000)))
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, T]:
+        if not keys:
+            return {}
+        found: Dict[str, T] = {}
+        values = cast(List[Optional[T]], self.cache.mget([self._key(key) for key in keys]))
+        for key, value in zip(keys, values, strict=True):
+            value = self._count(value)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items: Mapping[str, T], ttl: Optional[float] = None) -> None:
+        # One round trip, rather than one per key.
+        pipeline = self.cache.pipeline(transaction=False)
+        for key, value in items.items():
+            self._set(pipeline, key, value, ttl)
+        pipeline.execute()
+
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aset(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def aget_many(self, keys: Sequence[str]) -> Dict[str, T]:
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aset_many(self, items: Mapping[str, T], ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set_many, items, ttl)
 
     def _to_config(self) -> RedisStoreConfig:
         # Extract connection info from redis instance
@@ -63,6 +131,8 @@ def _to_config(self) -> RedisStoreConfig:
             password=str(password) if password is not None else None,
             ssl=bool(connection_kwargs.get("ssl", False)),
             socket_timeout=float(socket_timeout) if socket_timeout is not None else None,
+            namespace=self.namespace,
+            default_ttl=self.default_ttl,
         )
 
     @classmethod
@@ -77,4 +147,4 @@ def _from_config(cls, config: RedisStoreConfig) -> Self:
             ssl=config.ssl,
             socket_timeout=config.socket_timeout,
         )
-        return cls(redis_instance=redis_instance)
+        return cls(redis_instance=redis_instance, namespace=config.namespace, default_ttl=config.default_ttl)
@@ -1,6 +1,9 @@
+import asyncio
 import logging
 import uuid
-from typing import Any, Dict, List, Literal
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Literal, Sequence, Tuple, TypeVar
 
 from autogen_core import CancellationToken, Component, Image
 from autogen_core.memory import Memory, MemoryContent, MemoryMimeType, MemoryQueryResult, UpdateContextResult
@@ -8,12 +11,14 @@
 from autogen_core.models import SystemMessage
 from chromadb import HttpClient, PersistentClient
 from chromadb.api.models.Collection import Collection
-from chromadb.api.types import Document, Metadata
+from chromadb.api.types import Document, Metadata, QueryResult
 from pydantic import BaseModel, Field
 from typing_extensions import Self
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 try:
     from chromadb.api import ClientAPI
@@ -34,6 +39,21 @@ class ChromaDBVectorMemoryConfig(BaseModel):
     allow_reset: bool = Field(default=False, description="Whether to allow resetting the ChromaDB client")
     tenant: str = Field(default="default_tenant", description="Tenant to use")
     database: str = Field(default="default_database", description="Database to use")
+    max_workers: int = Field(
+        default=4, gt=0, description="Maximum number of threads that run ChromaDB calls off the event loop"
+    )
+    write_buffer_size: int = Field(
+        default=0,
+        ge=0,
+        description="Number of added documents to buffer before writing them to ChromaDB in one batch. "
+        "0 writes every add immediately",
+    )
+    write_buffer_flush_interval: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of seconds added documents stay in the write buffer. "
+        "None flushes only when the buffer is full or before a query",
+    )
 
 
 class PersistentChromaDBVectorMemoryConfig(ChromaDBVectorMemoryConfig):
@@ -71,6 +91,15 @@ class ChromaDBVectorMemory(Memory, Component[ChromaDBVectorMemoryConfig]):
         This implementation requires the ChromaDB extra to be installed. Install with:
         `pip install autogen-ext[chromadb]`
 
+    ChromaDB calls, which embed the documents and search the collection, run in a thread pool
+    of at most ``max_workers`` threads so they do not block the event loop. Use :meth:`add_many`
+    and :meth:`query_many` to embed and search many documents in one call.
+
+    With ``write_buffer_size`` set, added documents are buffered and written to ChromaDB in batches
+    when the buffer is full, when ``write_buffer_flush_interval`` seconds have passed, or when
+    :meth:`flush` is called. Queries flush the buffer first, so they always see the added documents.
+    Close the memory to write the remaining buffered documents.
+
     Args:
         config (ChromaDBVectorMemoryConfig | None): Configuration for the ChromaDB memory.
             If None, defaults to a PersistentChromaDBVectorMemoryConfig with default values.
@@ -132,6 +161,13 @@ def __init__(self, config: ChromaDBVectorMemoryConfig | None = None) -> None:
         self._config = config or PersistentChromaDBVectorMemoryConfig()
         self._client: ClientAPI | None = None
         self._collection: Collection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        # Documents, metadatas and ids waiting to be written.
+        self._write_buffer: List[Tuple[str, Metadata, str]] = []
+        # Incremented when the buffer is discarded, so that a failed flush does not bring back its documents.
+        self._write_buffer_generation = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: asyncio.Task[None] | None = None
 
     @property
     def collection_name(self) -> str:
@@ -178,6 +214,32 @@ def _ensure_initialized(self) -> None:
                 logger.error(f"Failed to get/create collection: {e}")
                 raise
 
+    async def _run(
+        self, func: Callable[..., T], *args: Any, cancellation_token: CancellationToken | None = None, **kwargs: Any
+    ) -> T:
+        """Run a blocking ChromaDB call in the thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._config.max_workers, thread_name_prefix="chromadb")
+        future = asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        return await future
+
+    async def _get_collection(self) -> Collection:
+        if self._collection is None:
+            await self._run(self._ensure_initialized)
+        if self._collection is None:
+            raise RuntimeError("Failed to initialize ChromaDB")
+        return self._collection
+
+    def _write(self, documents: List[str], metadatas: List[Metadata], ids: List[str]) -> None:
+        """Add documents to the collection, in batches no larger than the client allows."""
+        assert self._client is not None and self._collection is not None
+        batch_size = self._client.get_max_batch_size()
+        for start in range(0, len(documents), batch_size):
+            end = start + batch_size
+            self._collection.add(documents=documents[start:end], metadatas=metadatas[start:end], ids=ids[start:end])
+
     def _extract_text(self, content_item: str | MemoryContent) -> str:
         """Extract searchable text from content."""
         if isinstance(content_item, str):
@@ -292,25 +354,91 @@ async def update_context(
 
     async def add(self, content: MemoryContent, cancellation_token: CancellationToken | None = None) -> None:
         """Add a memory content to ChromaDB."""
-        self._ensure_initialized()
-        if self._collection is None:
-            raise RuntimeError("Failed to initialize ChromaDB")
+        await self.add_many([content], cancellation_token)
 
-        try:
-            # Extract text from content
-            text = self._extract_text(content)
+    async def add_many(
+        self, contents: Sequence[MemoryContent], cancellation_token: CancellationToken | None = None
+    ) -> None:
+        """Add many memory contents to ChromaDB, embedding them in as few calls as possible.
 
-            # Use metadata directly from content
-            metadata_dict = content.metadata or {}
-            metadata_dict["mime_type"] = str(content.mime_type)
+        With a write buffer, the contents are buffered and only written when the buffer is full.
 
-            # Add to ChromaDB
-            self._collection.add(documents=[text], metadatas=[metadata_dict], ids=[str(uuid.uuid4())])
+        Args:
+            contents (Sequence[MemoryContent]): The contents to add.
+            cancellation_token (CancellationToken | None): Token for cancelling the write.
+        """
+        try:
+            entries: List[Tuple[str, Metadata, str]] = []
+            for content in contents:
+                # Extract text from content
+                text = self._extract_text(content)
+
+                # Use metadata directly from content
+                metadata_dict = content.metadata or {}
+                metadata_dict["mime_type"] = str(content.mime_type)
+                entries.append((text, metadata_dict, str(uuid.uuid4())))
+
+            if self._config.write_buffer_size > 0:
+                self._write_buffer.extend(entries)
+                if len(self._write_buffer) >= self._config.write_buffer_size:
+                    await self.flush(cancellation_token)
+                else:
+                    self._start_flush_timer()
+                return
+
+            if not entries:
+                return
+            await self._get_collection()
+            documents, metadatas, ids = map(list, zip(*entries, strict=True))
+            await self._run(self._write, documents, metadatas, ids, cancellation_token=cancellation_token)
 
         except Exception as e:
             logger.error(f"Failed to add content to ChromaDB: {e}")
             raise
 
+    async def flush(self, cancellation_token: CancellationToken | None = None) -> None:
+        """Write the buffered documents to ChromaDB.
+
+        If the write fails, the documents stay in the buffer and are written by the next flush.
+        If it is cancelled, the documents may still be written, so they are not kept.
+
+        Args:
+            cancellation_token (CancellationToken | None): Token for cancelling the write.
+        """
+        async with self._flush_lock:
+            if self._flush_timer is not None and self._flush_timer is not asyncio.current_task():
+                self._flush_timer.cancel()
+            self._flush_timer = None
+            if not self._write_buffer:
+                return
+            entries = self._write_buffer
+            generation = self._write_buffer_generation
+            self._write_buffer = []
+            try:
+                await self._get_collection()
+                documents, metadatas, ids = map(list, zip(*entries, strict=True))
+                await self._run(self._write, documents, metadatas, ids, cancellation_token=cancellation_token)
+            except Exception:
+                # Keep the documents, ahead of any added while writing, unless the buffer was discarded meanwhile.
+                # A cancelled write goes on in its thread, so its documents are not kept.
+                if generation == self._write_buffer_generation:
+                    self._write_buffer[:0] = entries
+                raise
+
+    def _start_flush_timer(self) -> None:
+        interval = self._config.write_buffer_flush_interval
+        if interval is not None and self._flush_timer is None:
+            self._flush_timer = asyncio.create_task(self._flush_after(interval))
+
+    async def _flush_after(self, interval: float) -> None:
+        await asyncio.sleep(interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush the ChromaDB write buffer: {e}")
+            # Try again after another interval.
+            self._start_flush_timer()
+
     async def query(
         self,
         query: str | MemoryContent,
@@ -318,96 +446,132 @@ async def query(
         **kwargs: Any,
     ) -> MemoryQueryResult:
         """Query memory content based on vector similarity."""
-        self._ensure_initialized()
-        if self._collection is None:
-            raise RuntimeError("Failed to initialize ChromaDB")
+        results = await self.query_many([query], cancellation_token, **kwargs)
+        return results[0]
+
+    async def query_many(
+        self,
+        queries: Sequence[str | MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        **kwargs: Any,
+    ) -> List[MemoryQueryResult]:
+        """Query memory content for many queries in one ChromaDB call.
+
+        Args:
+            queries (Sequence[str | MemoryContent]): The queries.
+            cancellation_token (CancellationToken | None): Token for cancelling the query.
+            **kwargs: Additional arguments passed to :meth:`chromadb.Collection.query`.
+
+        Returns:
+            List[MemoryQueryResult]: The results of each query, in the order of the queries.
+        """
+        if not queries:
+            return []
+        await self.flush(cancellation_token)
+        collection = await self._get_collection()
 
         try:
             # Extract text for query
-            query_text = self._extract_text(query)
+            query_texts = [self._extract_text(query) for query in queries]
 
             # Query ChromaDB
-            results = self._collection.query(
-                query_texts=[query_text],
+            results = await self._run(
+                collection.query,
+                query_texts=query_texts,
                 n_results=self._config.k,
                 include=["documents", "metadatas", "distances"],
+                cancellation_token=cancellation_token,
                 **kwargs,
             )
 
-            # Convert results to MemoryContent list
-            memory_results: List[MemoryContent] = []
-
-            if (
-                not results
-                or not results.get("documents")
-                or not results.get("metadatas")
-                or not results.get("distances")
-            ):
-                return MemoryQueryResult(results=memory_results)
-
-            documents: List[Document] = results["documents"][0] if results["documents"] else []
-            metadatas: List[Metadata] = results["metadatas"][0] if results["metadatas"] else []
-            distances: List[float] = results["distances"][0] if results["distances"] else []
-            ids: List[str] = results["ids"][0] if results["ids"] else []
-
-            for doc, metadata_dict, distance, doc_id in zip(documents, metadatas, distances, ids, strict=False):
-                # Calculate score
-                score = self._calculate_score(distance)
-                metadata = dict(metadata_dict)
-                metadata["score"] = score
-                metadata["id"] = doc_id
-                if self._config.score_threshold is not None and score < self._config.score_threshold:
-                    continue
-
-                # Extract mime_type from metadata
-                mime_type = str(metadata_dict.get("mime_type", MemoryMimeType.TEXT.value))
-
-                # Create MemoryContent
-                content = MemoryContent(
-                    content=doc,
-                    mime_type=mime_type,
-                    metadata=metadata,
-                )
-                memory_results.append(content)
-
-            return MemoryQueryResult(results=memory_results)
+            return [self._to_query_result(results, i) for i in range(len(query_texts))]
 
         except Exception as e:
             logger.error(f"Failed to query ChromaDB: {e}")
             raise
 
+    def _to_query_result(self, results: QueryResult, index: int) -> MemoryQueryResult:
+        """Convert the ChromaDB results of one query to a MemoryQueryResult."""
+        memory_results: List[MemoryContent] = []
+
+        if not results or not results.get("documents") or not results.get("metadatas") or not results.get("distances"):
+            return MemoryQueryResult(results=memory_results)
+
+        documents: List[Document] = results["documents"][index] if results["documents"] else []
+        metadatas: List[Metadata] = results["metadatas"][index] if results["metadatas"] else []
+        distances: List[float] = results["distances"][index] if results["distances"] else []
+        ids: List[str] = results["ids"][index] if results["ids"] else []
+
+        for doc, metadata_dict, distance, doc_id in zip(documents, metadatas, distances, ids, strict=False):
+            # Calculate score
+            score = self._calculate_score(distance)
+            metadata = dict(metadata_dict)
+            metadata["score"] = score
+            metadata["id"] = doc_id
+            if self._config.score_threshold is not None and score < self._config.score_threshold:
+                continue
+
+            # Extract mime_type from metadata
+            mime_type = str(metadata_dict.get("mime_type", MemoryMimeType.TEXT.value))
+
+            # Create MemoryContent
+            content = MemoryContent(
+                content=doc,
+                mime_type=mime_type,
+                metadata=metadata,
+            )
+            memory_results.append(content)
+
+        return MemoryQueryResult(results=memory_results)
+
     async def clear(self) -> None:
-        """Clear all entries from memory."""
-        self._ensure_initialized()
-        if self._collection is None:
-            raise RuntimeError("Failed to initialize ChromaDB")
+        """Clear all entries from memory, including buffered ones."""
+        self._discard_write_buffer()
+        collection = await self._get_collection()
 
-        try:
-            results = self._collection.get()
-            if results and results["ids"]:
-                self._collection.delete(ids=results["ids"])
-        except Exception as e:
-            logger.error(f"Failed to clear ChromaDB collection: {e}")
-            raise
+        # Wait for a flush in progress, so that its documents are cleared too.
+        async with self._flush_lock:
+            try:
+                results = await self._run(collection.get)
+                if results and results["ids"]:
+                    await self._run(collection.delete, ids=results["ids"])
+            except Exception as e:
+                logger.error(f"Failed to clear ChromaDB collection: {e}")
+                raise
 
     async def close(self) -> None:
-        """Clean up ChromaDB client and resources."""
-        self._collection = None
-        self._client = None
+        """Write the buffered documents, then clean up ChromaDB client and resources."""
+        try:
+            await self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self._collection = None
+            self._client = None
 
     async def reset(self) -> None:
         """Reset the memory by deleting all data."""
-        self._ensure_initialized()
+        self._discard_write_buffer()
+        await self._get_collection()
         if not self._config.allow_reset:
             raise RuntimeError("Reset not allowed. Set allow_reset=True in config to enable.")
 
         if self._client is not None:
-            try:
-                self._client.reset()
-            except Exception as e:
-                logger.error(f"Error during ChromaDB reset: {e}")
-            finally:
-                self._collection = None
+            # Wait for a flush in progress, so that its documents are deleted too.
+            async with self._flush_lock:
+                try:
+                    await self._run(self._client.reset)
+                except Exception as e:
+                    logger.error(f"Error during ChromaDB reset: {e}")
+                finally:
+                    self._collection = None
+
+    def _discard_write_buffer(self) -> None:
+        # The flush timer is left running: cancelling it could interrupt a flush in progress,
+        # and it does nothing once the buffer is empty.
+        self._write_buffer.clear()
+        self._write_buffer_generation += 1
 
     def _to_config(self) -> ChromaDBVectorMemoryConfig:
         """Serialize the memory configuration."""
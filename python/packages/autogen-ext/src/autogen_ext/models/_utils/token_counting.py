@@ -0,0 +1,81 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import tiktoken
+from autogen_core import TRACE_LOGGER_NAME
+from autogen_core.models import LLMMessage
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+
+@lru_cache(maxsize=128)
+def get_encoding_for_model(model: str) -> tiktoken.Encoding:
+    """Get the tiktoken encoding of a model, or cl100k_base if the model is not known to tiktoken.
+
+    The encodings are cached, as looking them up is slow compared to encoding a short message."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        trace_logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+class TokenCountCache:
+    """A bounded cache of the token counts of messages.
+
+    Messages are keyed by a hash of their serialized content, so a count is reused for an
+    identical message, even if it is another object, and never for a message that was changed.
+    Counting the tokens of the same conversation again only counts its new messages.
+    The least recently used counts are dropped when the cache is full.
+
+    Args:
+        max_entries (int, optional): The maximum number of cached counts. Defaults to 4096.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._max_entries = max_entries
+        # Least recently used first.
+        self._counts: OrderedDict[Tuple[Hashable, bytes], int] = OrderedDict()
+        # Token counting may be called from several threads.
+        self._lock = threading.Lock()
+
+    def get_or_count(self, message: LLMMessage, scope: Hashable, count: Callable[[LLMMessage], int]) -> int:
+        """Get the token count of the message, counting it with ``count`` if it is not cached.
+
+        Args:
+            message (LLMMessage): The message.
+            scope (Hashable): Everything other than the message that the count depends on,
+                such as the model and the counting options.
+            count (Callable[[LLMMessage], int]): Counts the tokens of the message.
+        """
+        digest = hashlib.blake2b(message.model_dump_json().encode(), digest_size=16).digest()
+        key = (scope, digest)
+        with self._lock:
+            num_tokens = self._counts.get(key)
+            if num_tokens is not None:
+                self._counts.move_to_end(key)
+                return num_tokens
+        num_tokens = count(message)
+        with self._lock:
+            self._counts[key] = num_tokens
+            self._counts.move_to_end(key)
+            while len(self._counts) > self._max_entries:
+                self._counts.popitem(last=False)
+        return num_tokens
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
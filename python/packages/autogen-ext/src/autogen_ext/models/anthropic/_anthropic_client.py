@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import inspect
 import json
 import logging
@@ -66,6 +65,7 @@
 from pydantic import BaseModel, SecretStr
 from typing_extensions import Self, Unpack
 
+from .._utils.token_counting import TokenCountCache
 from . import _model_info
 from .config import AnthropicClientConfiguration, AnthropicClientConfigurationConfigModel
 
@@ -124,24 +124,11 @@ def type_to_role(message: LLMMessage) -> str:
 
 def get_mime_type_from_image(image: Image) -> Literal["image/jpeg", "image/png", "image/gif", "image/webp"]:
     """Get a valid Anthropic media type from an Image object."""
-    # Get base64 data first
-    base64_data = image.to_base64()
-
-    # Decode the base64 string
-    image_data = base64.b64decode(base64_data)
-
-    # Check the first few bytes for known signatures
-    if image_data.startswith(b"\xff\xd8\xff"):
-        return "image/jpeg"
-    elif image_data.startswith(b"\x89PNG\r\n\x1a\n"):
-        return "image/png"
-    elif image_data.startswith(b"GIF87a") or image_data.startswith(b"GIF89a"):
-        return "image/gif"
-    elif image_data.startswith(b"RIFF") and image_data[8:12] == b"WEBP":
-        return "image/webp"
-    else:
-        # Default to JPEG as a fallback
-        return "image/jpeg"
+    mime_type = image.mime_type
+    if mime_type in ("image/jpeg", "image/png", "image/gif", "image/webp"):
+        return cast(Literal["image/jpeg", "image/png", "image/gif", "image/webp"], mime_type)
+    # Default to JPEG as a fallback
+    return "image/jpeg"
 
 
 @overload
@@ -431,6 +418,7 @@ def __init__(
         self._create_args = create_args
         self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
         self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._token_count_cache = TokenCountCache()
 
     def _serialize_message(self, message: MessageParam) -> Dict[str, Any]:
         """Convert an Anthropic MessageParam to a JSON-serializable format."""
@@ -914,13 +902,9 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
         if system_content:
             num_tokens += len(encoding.encode(system_content)) + 15  # Approximate system message overhead
 
-        # Message tokens
-        for message in messages:
-            if isinstance(message, SystemMessage):
-                continue  # Already counted
-
+        def count_message_tokens(message: LLMMessage) -> int:
             # Base token cost per message
-            num_tokens += 10  # Approximate message role & formatting overhead
+            num_tokens = 10  # Approximate message role & formatting overhead
 
             # Content tokens
             if isinstance(message, UserMessage) or isinstance(message, AssistantMessage):
@@ -942,6 +926,13 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
                 for result in message.content:
                     num_tokens += len(encoding.encode(result.content))
                     num_tokens += 10  # Function result overhead
+            return num_tokens
+
+        # Message tokens
+        for message in messages:
+            if isinstance(message, SystemMessage):
+                continue  # Already counted
+            num_tokens += self._token_count_cache.get_or_count(message, "anthropic", count_message_tokens)
 
         # Tool tokens
         for tool in tools:
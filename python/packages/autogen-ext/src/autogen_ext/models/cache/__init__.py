@@ -1,6 +1,9 @@
 from ._chat_completion_cache import CHAT_CACHE_VALUE_TYPE, ChatCompletionCache
+from ._vector_index import CacheStoreVectorIndex, VectorIndex
 
 __all__ = [
     "CHAT_CACHE_VALUE_TYPE",
+    "CacheStoreVectorIndex",
     "ChatCompletionCache",
+    "VectorIndex",
 ]
@@ -1,12 +1,15 @@
+import asyncio
 import hashlib
+import inspect
 import json
 import warnings
-from typing import Any, AsyncGenerator, List, Mapping, Optional, Sequence, Union, cast
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union, cast
 
-from autogen_core import CacheStore, CancellationToken, Component, ComponentModel, InMemoryStore
+from autogen_core import CacheStore, CancellationToken, Component, ComponentModel, FunctionCall, Image, InMemoryStore
 from autogen_core.models import (
     ChatCompletionClient,
     CreateResult,
+    FunctionExecutionResult,
     LLMMessage,
     ModelCapabilities,  # type: ignore
     ModelInfo,
@@ -16,14 +19,143 @@
 from pydantic import BaseModel
 from typing_extensions import Self
 
+from ._vector_index import CacheStoreVectorIndex, VectorIndex
+
 CHAT_CACHE_VALUE_TYPE = Union[CreateResult, List[Union[str, CreateResult]]]
 
+EmbeddingFunction = Callable[[str], Union[Sequence[float], Awaitable[Sequence[float]]]]
+
+# Fields of messages that do not change the response of a model, or that differ between runs.
+_VOLATILE_FIELDS = frozenset(["source", "id", "call_id"])
+
 
 class ChatCompletionCacheConfig(BaseModel):
     """ """
 
     client: ComponentModel
     store: Optional[ComponentModel] = None
+    normalize_messages: bool = False
+    stream_replay_delay: float = 0.0
+    cache_cancelled_streams: bool = False
+
+
+def _drop_volatile_fields(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _drop_volatile_fields(item)
+            for key, item in cast(Dict[str, Any], value).items()
+            if key not in _VOLATILE_FIELDS
+        }
+    if isinstance(value, list):
+        return [_drop_volatile_fields(item) for item in value]
+    return value
+
+
+def _normalize(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove the volatile fields of a dumped message and collapse the whitespace in its text.
+
+    Only the text content of the message is changed. Function calls and their results are kept
+    as they are, since whitespace in their arguments and outputs can be meaningful."""
+    message = _drop_volatile_fields(message)
+    content = message.get("content")
+    if isinstance(content, str):
+        message["content"] = " ".join(content.split())
+    elif isinstance(content, list) and message.get("type") == "UserMessage":
+        message["content"] = [" ".join(part.split()) if isinstance(part, str) else part for part in content]
+    return message
+
+
+def _message_text(message: LLMMessage) -> str:
+    """The text of a message, as it is embedded for near-duplicate lookups."""
+    parts: List[str] = []
+    for part in message.content if isinstance(message.content, list) else [message.content]:
+        if isinstance(part, str):
+            parts.append(part)
+        elif isinstance(part, FunctionCall):
+            parts.append(f"{part.name}({part.arguments})")
+        elif isinstance(part, FunctionExecutionResult):
+            parts.append(part.content)
+        elif isinstance(part, Image):
+            parts.append("[image]")
+    return f"{message.type}: " + "\n".join(parts)
+
+
+def _as_cached(chunk: Union[str, CreateResult]) -> Union[str, CreateResult]:
+    # A copy, so that the result returned to the caller that made the request is not changed.
+    return chunk.model_copy(update={"cached": True}) if isinstance(chunk, CreateResult) else chunk
+
+
+async def _wait(awaitable: Awaitable[Any], cancellation_token: Optional[CancellationToken]) -> None:
+    future = asyncio.ensure_future(awaitable)
+    if cancellation_token is not None:
+        cancellation_token.link_future(future)
+    await future
+
+
+class _PendingCreate:
+    """A request of the underlying client, awaited by all concurrent identical requests."""
+
+    def __init__(self) -> None:
+        self.task: Optional[asyncio.Task[CreateResult]] = None
+        self.waiters = 0
+        # Passed to the underlying client, and cancelled when nobody waits for the result anymore.
+        self.cancellation_token = CancellationToken()
+
+    def cancel(self) -> None:
+        self.cancellation_token.cancel()
+        if self.task is not None:
+            self.task.cancel()
+
+
+class _StreamRecording:
+    """The chunks of a stream of the underlying client, recorded as they arrive.
+
+    Concurrent identical requests read the same recording, so the stream is only requested once."""
+
+    def __init__(self) -> None:
+        self.chunks: List[Union[str, CreateResult]] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.readers = 0
+        self.task: Optional[asyncio.Task[None]] = None
+        # Passed to the underlying client, and cancelled when nobody reads the stream anymore.
+        self.cancellation_token = CancellationToken()
+        self._updated = asyncio.Event()
+
+    def cancel(self) -> None:
+        self.cancellation_token.cancel()
+        if self.task is not None:
+            self.task.cancel()
+
+    def append(self, chunk: Union[str, CreateResult]) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._notify()
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def read(
+        self, cached: bool, cancellation_token: Optional[CancellationToken]
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        """Yield the recorded chunks, and then the new chunks as they arrive."""
+        index = 0
+        while True:
+            if index < len(self.chunks):
+                chunk = self.chunks[index]
+                index += 1
+                yield _as_cached(chunk) if cached else chunk
+            elif self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            else:
+                await _wait(self._updated.wait(), cancellation_token)
 
 
 class ChatCompletionCache(ChatCompletionClient, Component[ChatCompletionCacheConfig]):
@@ -79,11 +211,89 @@ async def main():
 
     You can now use the `cached_client` as you would the original client, but with caching enabled.
 
+    By default, a request only hits the cache if its messages and arguments are exactly the same
+    as those of a cached request. With ``normalize_messages``, the ``source`` of messages and the
+    ids of function calls are ignored, and runs of whitespace in the text are treated as a
+    single space.
+
+    With an ``embedding_function``, a request that misses the cache can also hit the cached
+    response of a similar request. The messages of the request are embedded, and the cached
+    request with the most similar messages is used if their cosine similarity is at least
+    ``similarity_threshold``. The tools and other arguments of the requests must still be the
+    same. The embeddings are kept in a :class:`~autogen_ext.models.cache.VectorIndex`.
+
+    .. code-block:: python
+
+        import asyncio
+        import tempfile
+
+        from autogen_core.models import UserMessage
+        from autogen_ext.cache_store.diskcache import DiskCacheStore
+        from autogen_ext.models.cache import CHAT_CACHE_VALUE_TYPE, CacheStoreVectorIndex, ChatCompletionCache
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+        from diskcache import Cache
+        from sentence_transformers import SentenceTransformer
+
+
+        async def main():
+            embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+            with tempfile.TemporaryDirectory() as tmpdirname:
+                cache_client = ChatCompletionCache(
+                    OpenAIChatCompletionClient(model="gpt-4o"),
+                    DiskCacheStore[CHAT_CACHE_VALUE_TYPE](Cache(f"{tmpdirname}/results")),
+                    normalize_messages=True,
+                    embedding_function=lambda text: embedding_model.encode(text).tolist(),
+                    similarity_threshold=0.97,
+                    vector_index=CacheStoreVectorIndex(DiskCacheStore(Cache(f"{tmpdirname}/vectors"))),
+                )
+
+                response = await cache_client.create(
+                    [UserMessage(content="What is the capital of France?", source="user")]
+                )
+                print(response)  # Should print response from OpenAI
+                response = await cache_client.create(
+                    [UserMessage(content="what is the capital of France ?", source="a")]
+                )
+                print(response)  # Should print cached response
+
+
+        asyncio.run(main())
+
+    .. note::
+
+        A near-duplicate hit returns the response to another request. Use a threshold that is
+        high enough for your embedding model, so that requests that need a different response
+        do not hit each other's responses.
+
+    A cached stream replays the chunks of the original stream, instantly or with
+    ``stream_replay_delay`` seconds between chunks, so that a cache hit can be displayed like a
+    stream. Only complete streams are cached. When all the callers of a stream stop reading it or
+    are cancelled, the request to the original client is cancelled, unless ``cache_cancelled_streams``
+    is True: the stream then keeps being read from the original client, so that it is cached all the same.
+
+    Concurrent identical requests share one request to the original client: the requests that
+    arrive while the first one is running receive its result, or read its stream, as a cache hit.
+    The results of :meth:`create` and of :meth:`create_stream` are cached under the same key, so a
+    request also hits the cached result of the other method.
+
     Args:
         client (ChatCompletionClient): The original ChatCompletionClient to wrap.
         store (CacheStore): A store object that implements get and set methods.
             The user is responsible for managing the store's lifecycle & clearing it (if needed).
             Defaults to using in-memory cache.
+        normalize_messages (bool, optional): Whether to ignore the volatile fields of messages and
+            whitespace changes when looking up requests. Defaults to False.
+        embedding_function (Callable[[str], Sequence[float] | Awaitable[Sequence[float]]], optional):
+            Embeds the text of the messages of a request, to look up similar cached requests.
+            Defaults to None, which only looks up identical requests.
+        similarity_threshold (float, optional): The minimum cosine similarity of a similar request.
+            Defaults to 0.95.
+        vector_index (VectorIndex, optional): The index of the embeddings of cached requests.
+            Defaults to a :class:`~autogen_ext.models.cache.CacheStoreVectorIndex` in memory.
+        stream_replay_delay (float, optional): Seconds to wait between the chunks of a cached stream
+            when it is replayed. Defaults to 0, which replays cached streams instantly.
+        cache_cancelled_streams (bool, optional): Whether to keep reading a stream of the original
+            client when all its callers stopped reading it, to cache it. Defaults to False.
     """
 
     component_type = "chat_completion_cache"
@@ -94,20 +304,42 @@ def __init__(
         self,
         client: ChatCompletionClient,
         store: Optional[CacheStore[CHAT_CACHE_VALUE_TYPE]] = None,
+        *,
+        normalize_messages: bool = False,
+        embedding_function: Optional[EmbeddingFunction] = None,
+        similarity_threshold: float = 0.95,
+        vector_index: Optional[VectorIndex] = None,
+        stream_replay_delay: float = 0.0,
+        cache_cancelled_streams: bool = False,
     ):
+        if not -1 <= similarity_threshold <= 1:
+            raise ValueError("similarity_threshold must be between -1 and 1.")
+        if stream_replay_delay < 0:
+            raise ValueError("stream_replay_delay must be greater than or equal to 0.")
         self.client = client
         self.store = store or InMemoryStore[CHAT_CACHE_VALUE_TYPE]()
-
-    def _check_cache(
+        self.normalize_messages = normalize_messages
+        self.embedding_function = embedding_function
+        self.similarity_threshold = similarity_threshold
+        self.vector_index = vector_index or CacheStoreVectorIndex()
+        self.stream_replay_delay = stream_replay_delay
+        self.cache_cancelled_streams = cache_cancelled_streams
+        # The requests to the underlying client that are running, by cache key.
+        self._pending_creates: Dict[str, _PendingCreate] = {}
+        self._recordings: Dict[str, _StreamRecording] = {}
+
+    async def _check_cache(
         self,
         messages: Sequence[LLMMessage],
         tools: Sequence[Tool | ToolSchema],
         json_output: Optional[bool | type[BaseModel]],
         extra_create_args: Mapping[str, Any],
-    ) -> tuple[Optional[Union[CreateResult, List[Union[str, CreateResult]]]], str]:
+        stream: bool,
+    ) -> tuple[Optional[CHAT_CACHE_VALUE_TYPE], str, Optional[Tuple[str, Sequence[float]]]]:
         """
         Helper function to check the cache for a result.
-        Returns a tuple of (cached_result, cache_key).
+        Returns a tuple of (cached_result, cache_key, embedding). The embedding is the partition and
+        vector to add to the vector index for the cache key once the result is cached, if any.
         """
 
         json_output_data: str | bool | None = None
@@ -117,20 +349,43 @@ def _check_cache(
         elif isinstance(json_output, bool):
             json_output_data = json_output
 
-        data = {
-            "messages": [message.model_dump() for message in messages],
+        messages_data = [message.model_dump() for message in messages]
+        if self.normalize_messages:
+            messages_data = [_normalize(message) for message in messages_data]
+        args_data = {
             "tools": [(tool.schema if isinstance(tool, Tool) else tool) for tool in tools],
             "json_output": json_output_data,
             "extra_create_args": extra_create_args,
         }
-        serialized_data = json.dumps(data, sort_keys=True)
+        serialized_data = json.dumps({"messages": messages_data, **args_data}, sort_keys=True)
         cache_key = hashlib.sha256(serialized_data.encode()).hexdigest()
 
-        cached_result = cast(Optional[CreateResult], self.store.get(cache_key))
+        cached_result = await self.store.aget(cache_key)
         if cached_result is not None:
-            return cached_result, cache_key
-
-        return None, cache_key
+            return cached_result, cache_key, None
+        if self.embedding_function is None:
+            return None, cache_key, None
+
+        # Only requests with the same arguments, and results of the same kind, are compared.
+        serialized_args = json.dumps({**args_data, "stream": stream}, sort_keys=True)
+        partition = hashlib.sha256(serialized_args.encode()).hexdigest()
+        vector = self.embedding_function("\n".join(_message_text(message) for message in messages))
+        if inspect.isawaitable(vector):
+            vector = await vector
+        while True:
+            match = await self.vector_index.search(partition, vector, self.similarity_threshold)
+            if match is None:
+                return None, cache_key, (partition, vector)
+            cached_result = await self.store.aget(match[0])
+            if cached_result is not None:
+                return cached_result, cache_key, None
+            # The result of the match expired, so it will never match again.
+            await self.vector_index.remove(partition, match[0])
+
+    async def _add_to_index(self, cache_key: str, embedding: Optional[Tuple[str, Sequence[float]]]) -> None:
+        if embedding is not None:
+            partition, vector = embedding
+            await self.vector_index.add(partition, cache_key, vector)
 
     async def create(
         self,
@@ -148,12 +403,55 @@ async def create(
 
         NOTE: cancellation_token is ignored for cached results.
         """
-        cached_result, cache_key = self._check_cache(messages, tools, json_output, extra_create_args)
-        if cached_result:
-            assert isinstance(cached_result, CreateResult)
-            cached_result.cached = True
-            return cached_result
-
+        cached_result, cache_key, embedding = await self._check_cache(
+            messages, tools, json_output, extra_create_args, stream=False
+        )
+        if cached_result is not None:
+            # A cached stream ends with its result.
+            result = cached_result[-1] if isinstance(cached_result, list) else cached_result
+            assert isinstance(result, CreateResult)
+            return result.model_copy(update={"cached": True})
+
+        pending = self._pending_creates.get(cache_key)
+        is_first = pending is None
+        if pending is None:
+            pending = _PendingCreate()
+            pending.task = asyncio.create_task(
+                self._create_and_cache(
+                    cache_key, embedding, messages, tools, json_output, extra_create_args, pending.cancellation_token
+                )
+            )
+            self._pending_creates[cache_key] = pending
+            pending.task.add_done_callback(lambda _: self._end_create(cache_key, pending))
+        assert pending.task is not None
+        pending.waiters += 1
+        try:
+            waiter = asyncio.shield(pending.task)
+            if cancellation_token is not None:
+                cancellation_token.link_future(waiter)
+            result = await waiter
+        finally:
+            pending.waiters -= 1
+            if pending.waiters == 0 and not pending.task.done():
+                # Nobody waits for the result anymore.
+                pending.cancel()
+                self._end_create(cache_key, pending)
+        return result if is_first else result.model_copy(update={"cached": True})
+
+    def _end_create(self, cache_key: str, pending: _PendingCreate) -> None:
+        if self._pending_creates.get(cache_key) is pending:
+            del self._pending_creates[cache_key]
+
+    async def _create_and_cache(
+        self,
+        cache_key: str,
+        embedding: Optional[Tuple[str, Sequence[float]]],
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool | type[BaseModel]],
+        extra_create_args: Mapping[str, Any],
+        cancellation_token: CancellationToken,
+    ) -> CreateResult:
         result = await self.client.create(
             messages,
             tools=tools,
@@ -161,7 +459,8 @@ async def create(
             extra_create_args=extra_create_args,
             cancellation_token=cancellation_token,
         )
-        self.store.set(cache_key, result)
+        await self.store.aset(cache_key, result)
+        await self._add_to_index(cache_key, embedding)
         return result
 
     def create_stream(
@@ -175,45 +474,96 @@ def create_stream(
     ) -> AsyncGenerator[Union[str, CreateResult], None]:
         """
         Cached version of ChatCompletionClient.create_stream.
-        If the result of a call to create_stream has been cached, it will be returned
+        If the result of a call to create_stream has been cached, its chunks will be replayed
         without streaming from the underlying client.
 
-        NOTE: cancellation_token is ignored for cached results.
+        NOTE: cancellation_token stops reading the stream. The request to the underlying client is
+        only cancelled when all the callers reading its stream stopped, unless cache_cancelled_streams is True.
         """
 
         async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
-            cached_result, cache_key = self._check_cache(
+            cached_result, cache_key, embedding = await self._check_cache(
                 messages,
                 tools,
                 json_output,
                 extra_create_args,
+                stream=True,
             )
-            if cached_result:
-                assert isinstance(cached_result, list)
-                for result in cached_result:
-                    if isinstance(result, CreateResult):
-                        result.cached = True
-                    yield result
+            if cached_result is not None:
+                async for chunk in self._replay(cached_result, cancellation_token):
+                    yield chunk
                 return
 
-            result_stream = self.client.create_stream(
-                messages,
-                tools=tools,
-                json_output=json_output,
-                extra_create_args=extra_create_args,
-                cancellation_token=cancellation_token,
-            )
-
-            output_results: List[Union[str, CreateResult]] = []
-            self.store.set(cache_key, output_results)
-
-            async for result in result_stream:
-                output_results.append(result)
-                yield result
+            recording = self._recordings.get(cache_key)
+            is_first = recording is None
+            if recording is None:
+                recording = _StreamRecording()
+                result_stream = self.client.create_stream(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=recording.cancellation_token,
+                )
+                recording.task = asyncio.create_task(self._record(cache_key, embedding, recording, result_stream))
+                self._recordings[cache_key] = recording
+                recording.task.add_done_callback(lambda _: self._end_recording(cache_key, recording))
+            recording.readers += 1
+            try:
+                async for chunk in recording.read(not is_first, cancellation_token):
+                    yield chunk
+            finally:
+                recording.readers -= 1
+                if recording.readers == 0 and not self.cache_cancelled_streams:
+                    recording.cancel()
+                    self._end_recording(cache_key, recording)
 
         return _generator()
 
+    async def _record(
+        self,
+        cache_key: str,
+        embedding: Optional[Tuple[str, Sequence[float]]],
+        recording: _StreamRecording,
+        result_stream: AsyncGenerator[Union[str, CreateResult], None],
+    ) -> None:
+        try:
+            async for chunk in result_stream:
+                recording.append(chunk)
+            # An incomplete stream is not cached.
+            if recording.chunks and isinstance(recording.chunks[-1], CreateResult):
+                await self.store.aset(cache_key, recording.chunks)
+                await self._add_to_index(cache_key, embedding)
+        except BaseException as e:
+            recording.finish(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        else:
+            recording.finish()
+
+    def _end_recording(self, cache_key: str, recording: _StreamRecording) -> None:
+        if self._recordings.get(cache_key) is recording:
+            del self._recordings[cache_key]
+        if recording.task is not None and recording.task.done() and not recording.done:
+            # The recording was cancelled before it started.
+            recording.finish(asyncio.CancelledError())
+
+    async def _replay(
+        self, cached_result: CHAT_CACHE_VALUE_TYPE, cancellation_token: Optional[CancellationToken]
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        # The result of a call to create is replayed as a stream without chunks.
+        chunks = cached_result if isinstance(cached_result, list) else [cached_result]
+        for index, chunk in enumerate(chunks):
+            if index > 0 and isinstance(chunk, str) and self.stream_replay_delay > 0:
+                await _wait(asyncio.sleep(self.stream_replay_delay), cancellation_token)
+            yield _as_cached(chunk)
+
     async def close(self) -> None:
+        tasks: List[asyncio.Task[Any]] = [pending.task for pending in self._pending_creates.values()]
+        tasks.extend(recording.task for recording in self._recordings.values() if recording.task is not None)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         await self.client.close()
 
     def actual_usage(self) -> RequestUsage:
@@ -238,9 +588,14 @@ def total_usage(self) -> RequestUsage:
         return self.client.total_usage()
 
     def _to_config(self) -> ChatCompletionCacheConfig:
+        if self.embedding_function is not None:
+            raise ValueError("ChatCompletionCache with an embedding_function cannot be component serialized")
         return ChatCompletionCacheConfig(
             client=self.client.dump_component(),
             store=self.store.dump_component() if not isinstance(self.store, InMemoryStore) else None,
+            normalize_messages=self.normalize_messages,
+            stream_replay_delay=self.stream_replay_delay,
+            cache_cancelled_streams=self.cache_cancelled_streams,
         )
 
     @classmethod
@@ -249,4 +604,10 @@ def _from_config(cls, config: ChatCompletionCacheConfig) -> Self:
         store: Optional[CacheStore[CHAT_CACHE_VALUE_TYPE]] = (
             CacheStore.load_component(config.store) if config.store else InMemoryStore()
         )
-        return cls(client=client, store=store)
+        return cls(
+            client=client,
+            store=store,
+            normalize_messages=config.normalize_messages,
+            stream_replay_delay=config.stream_replay_delay,
+            cache_cancelled_streams=config.cache_cancelled_streams,
+        )
@@ -0,0 +1,147 @@
+import asyncio
+import math
+import operator
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from autogen_core import CacheStore, InMemoryStore
+
+VECTOR_INDEX_VALUE_TYPE = List[Tuple[str, List[float]]]
+
+# The number of slots of a partition loaded from the store in one call.
+_LOAD_BATCH_SIZE = 256
+
+
+class VectorIndex(ABC):
+    """An index of embedding vectors, used by :class:`~autogen_ext.models.cache.ChatCompletionCache`
+    to find cached requests that are similar to a new request.
+
+    Vectors are added to a partition, and only vectors of the same partition are compared.
+    The cache puts requests in the same partition when they only differ by their messages."""
+
+    @abstractmethod
+    async def add(self, partition: str, key: str, vector: Sequence[float]) -> None:
+        """Add a vector to the index.
+
+        Args:
+            partition (str): The partition of the vector.
+            key (str): The key that :meth:`search` returns for the vector.
+            vector (Sequence[float]): The embedding vector.
+        """
+        ...
+
+    @abstractmethod
+    async def search(self, partition: str, vector: Sequence[float], threshold: float) -> Optional[Tuple[str, float]]:
+        """Find the most similar vector in a partition.
+
+        Args:
+            partition (str): The partition to search.
+            vector (Sequence[float]): The embedding vector to compare to.
+            threshold (float): The minimum cosine similarity of a match.
+
+        Returns:
+            The key and the cosine similarity of the most similar vector, or None if no vector
+            in the partition is at least as similar as the threshold.
+        """
+        ...
+
+    @abstractmethod
+    async def remove(self, partition: str, key: str) -> None:
+        """Remove a vector from the index, for example because the cached result of its key expired.
+
+        Args:
+            partition (str): The partition of the vector.
+            key (str): The key of the vector.
+        """
+        ...
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(math.fsum(x * x for x in vector))
+    if norm == 0:
+        return [0.0] * len(vector)
+    return [x / norm for x in vector]
+
+
+class CacheStoreVectorIndex(VectorIndex):
+    """A :class:`VectorIndex` that keeps the vectors of each partition in a :class:`~autogen_core.CacheStore`.
+
+    Each vector is kept in its own slot of the store, so adding a vector writes only that vector.
+    The vectors of a partition are loaded from the store when the partition is first used,
+    and searched exhaustively. This is fast enough for thousands of cached requests per partition.
+    Use a dedicated vector database behind a custom :class:`VectorIndex` beyond that.
+
+    Args:
+        store (CacheStore, optional): The store for the vectors. Defaults to an in-memory store.
+            Use a persistent store, such as :class:`~autogen_ext.cache_store.diskcache.DiskCacheStore`,
+            together with a persistent store for the cached results. The store should not expire
+            its entries; vectors whose cached results expired are removed when they are found.
+    """
+
+    def __init__(self, store: Optional[CacheStore[VECTOR_INDEX_VALUE_TYPE]] = None) -> None:
+        self.store = store or InMemoryStore[VECTOR_INDEX_VALUE_TYPE]()
+        # The slot and the vector of each key, by partition.
+        self._partitions: Dict[str, Dict[str, Tuple[int, List[float]]]] = {}
+        # The next free slot of each partition.
+        self._next_slots: Dict[str, int] = {}
+        self._load_lock = asyncio.Lock()
+
+    @staticmethod
+    def _slot_key(partition: str, slot: int) -> str:
+        return f"vector_index:{partition}:{slot}"
+
+    async def _load(self, partition: str) -> Dict[str, Tuple[int, List[float]]]:
+        entries = self._partitions.get(partition)
+        if entries is not None:
+            return entries
+        async with self._load_lock:
+            entries = self._partitions.get(partition)
+            if entries is not None:
+                return entries
+            entries = {}
+            # The slots are filled in order, so the first missing slot is the next free one.
+            slot = 0
+            while True:
+                slot_keys = [self._slot_key(partition, slot + i) for i in range(_LOAD_BATCH_SIZE)]
+                values = await self.store.aget_many(slot_keys)
+                for slot_key in slot_keys:
+                    value = values.get(slot_key)
+                    if value is None:
+                        break
+                    # Removed vectors leave an empty slot.
+                    for key, vector in value:
+                        entries[key] = (slot, vector)
+                    slot += 1
+                else:
+                    continue
+                break
+            self._partitions[partition] = entries
+            self._next_slots[partition] = slot
+            return entries
+
+    async def add(self, partition: str, key: str, vector: Sequence[float]) -> None:
+        entries = await self._load(partition)
+        existing = entries.get(key)
+        if existing is not None:
+            slot = existing[0]
+        else:
+            slot = self._next_slots[partition]
+            self._next_slots[partition] = slot + 1
+        normalized = _normalize(vector)
+        entries[key] = (slot, normalized)
+        await self.store.aset(self._slot_key(partition, slot), [(key, normalized)])
+
+    async def search(self, partition: str, vector: Sequence[float], threshold: float) -> Optional[Tuple[str, float]]:
+        query = _normalize(vector)
+        best: Optional[Tuple[str, float]] = None
+        for key, (_, entry_vector) in (await self._load(partition)).items():
+            # The vectors are normalized, so their dot product is their cosine similarity.
+            similarity = sum(map(operator.mul, query, entry_vector))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    async def remove(self, partition: str, key: str) -> None:
+        entry = (await self._load(partition)).pop(key, None)
+        if entry is not None:
+            await self.store.aset(self._slot_key(partition, entry[0]), [])
@@ -1,10 +1,26 @@
 import asyncio
 import logging  # added import
 import re
-from typing import Any, AsyncGenerator, Dict, List, Literal, Mapping, Optional, Sequence, TypedDict, Union, cast
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from autogen_core import EVENT_LOGGER_NAME, CancellationToken, FunctionCall, MessageHandlerContext
-from autogen_core.logging import LLMCallEvent
+from autogen_core.logging import LLMCallEvent, LLMStreamEndEvent, LLMStreamStartEvent
 from autogen_core.models import (
     AssistantMessage,
     ChatCompletionClient,
@@ -22,16 +38,13 @@
 from autogen_core.tools import Tool, ToolSchema
 from llama_cpp import (
     ChatCompletionFunctionParameters,
-    ChatCompletionRequestAssistantMessage,
-    ChatCompletionRequestFunctionMessage,
-    ChatCompletionRequestSystemMessage,
-    ChatCompletionRequestToolMessage,
-    ChatCompletionRequestUserMessage,
+    ChatCompletionRequestMessage,
     ChatCompletionTool,
     ChatCompletionToolFunction,
     Llama,
     llama_chat_format,
 )
+from llama_cpp.llama_cache import BaseLlamaCache, LlamaRAMCache
 from pydantic import BaseModel
 from typing_extensions import Unpack
 
@@ -183,8 +196,20 @@ class LlamaCppChatCompletionClient(ChatCompletionClient):
         n_ctx (optional, int): The context size.
         n_batch (optional, int): The batch size.
         verbose (optional, bool): Whether to print verbose output.
+        prompt_cache (optional, bool | BaseLlamaCache): Whether to keep the model states of past
+            requests in a cache, or the cache to keep them in. ``True`` creates a
+            :class:`~llama_cpp.LlamaRAMCache` with the default capacity of 2 GiB. Defaults to ``False``.
         **kwargs: Additional parameters to pass to the Llama class.
 
+    The model evaluates one request at a time. Concurrent requests, for example from agents
+    sharing the client, are queued and run in the order they were made.
+
+    Evaluating the prompt is often the slowest part of a request on a CPU. The model keeps the
+    evaluated tokens of the last request, and only evaluates the part of the next prompt that
+    does not start with them. Following turns of a conversation therefore only evaluate the new
+    messages. When requests of several conversations are interleaved, enable ``prompt_cache`` so
+    the model can restore the state of a conversation instead of evaluating its whole history.
+
     Examples:
 
         The following code snippet shows how to use the client with a local model file:
@@ -233,6 +258,7 @@ async def main():
     def __init__(
         self,
         model_info: Optional[ModelInfo] = None,
+        prompt_cache: Union[bool, BaseLlamaCache] = False,
         **kwargs: Unpack[LlamaCppParams],
     ) -> None:
         """
@@ -257,30 +283,25 @@ def __init__(
             self.llm = Llama(**kwargs)  # pyright: ignore[reportUnknownMemberType]
         else:
             raise ValueError("Please provide model_path if ... or provide repo_id and filename if ....")
+        if prompt_cache is True:
+            self.llm.set_cache(LlamaRAMCache())
+        elif isinstance(prompt_cache, BaseLlamaCache):
+            self.llm.set_cache(prompt_cache)
+        # The model is not thread-safe, so requests run one at a time on a single thread.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llama_cpp")
         self._total_usage = {"prompt_tokens": 0, "completion_tokens": 0}
 
-    async def create(
+    def _prepare_create_args(
         self,
         messages: Sequence[LLMMessage],
-        *,
-        tools: Sequence[Tool | ToolSchema] = [],
-        # None means do not override the default
-        # A value means to override the client default - often specified in the constructor
-        json_output: Optional[bool | type[BaseModel]] = None,
-        extra_create_args: Mapping[str, Any] = {},
-        cancellation_token: Optional[CancellationToken] = None,
-    ) -> CreateResult:
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool | type[BaseModel]],
+        extra_create_args: Mapping[str, Any],
+    ) -> Tuple[List[ChatCompletionRequestMessage], Dict[str, Any]]:
         create_args = dict(extra_create_args)
         # Convert LLMMessage objects to dictionaries with 'role' and 'content'
         # converted_messages: List[Dict[str, str | Image | list[str | Image] | list[FunctionCall]]] = []
-        converted_messages: list[
-            ChatCompletionRequestSystemMessage
-            | ChatCompletionRequestUserMessage
-            | ChatCompletionRequestAssistantMessage
-            | ChatCompletionRequestUserMessage
-            | ChatCompletionRequestToolMessage
-            | ChatCompletionRequestFunctionMessage
-        ] = []
+        converted_messages: List[ChatCompletionRequestMessage] = []
         for msg in messages:
             if isinstance(msg, SystemMessage):
                 converted_messages.append({"role": "system", "content": msg.content})
@@ -303,17 +324,27 @@ async def create(
             raise ValueError("json_output must be a boolean, a BaseModel subclass or None.")
 
         if self.model_info["function_calling"]:
-            # Run this in on the event loop to avoid blocking.
-            response_future = asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.llm.create_chat_completion(
-                    messages=converted_messages, tools=convert_tools(tools), stream=False, **create_args
-                ),
-            )
-        else:
-            response_future = asyncio.get_event_loop().run_in_executor(
-                None, lambda: self.llm.create_chat_completion(messages=converted_messages, stream=False, **create_args)
-            )
+            create_args["tools"] = convert_tools(tools)
+        return converted_messages, create_args
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        # None means do not override the default
+        # A value means to override the client default - often specified in the constructor
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        converted_messages, create_args = self._prepare_create_args(messages, tools, json_output, extra_create_args)
+
+        # Run the generation on the thread of the model, after the requests queued before it.
+        response_future = asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            lambda: self.llm.create_chat_completion(messages=converted_messages, stream=False, **create_args),
+        )
         if cancellation_token:
             cancellation_token.link_future(response_future)
         response = await response_future
@@ -403,8 +434,106 @@ async def create_stream(
         extra_create_args: Mapping[str, Any] = {},
         cancellation_token: Optional[CancellationToken] = None,
     ) -> AsyncGenerator[Union[str, CreateResult], None]:
-        raise NotImplementedError("Stream not yet implemented for LlamaCppChatCompletionClient")
-        yield ""
+        converted_messages, create_args = self._prepare_create_args(messages, tools, json_output, extra_create_args)
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue[Optional[Dict[str, Any]]] = asyncio.Queue()
+        stop = threading.Event()
+
+        def generate() -> int:
+            """Pass the chunks of the generation to the event loop as they are generated.
+            Returns the number of tokens in the context of the model at the end of the generation."""
+            stream = self.llm.create_chat_completion(messages=converted_messages, stream=True, **create_args)
+            try:
+                for chunk in cast(Iterator[Dict[str, Any]], stream):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            finally:
+                # Closing the generator stops the generation.
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+            return self.llm.n_tokens
+
+        def on_generation_done(future: asyncio.Future[int]) -> None:
+            if future.cancelled():
+                stop.set()
+            # Scheduled after the chunks that the generation passed to the event loop.
+            chunks.put_nowait(None)
+
+        logger.info(LLMStreamStartEvent(messages=cast(List[Dict[str, Any]], converted_messages)))
+
+        # Run the generation on the thread of the model, after the requests queued before it.
+        generation = loop.run_in_executor(self._executor, generate)
+        generation.add_done_callback(on_generation_done)
+        if cancellation_token:
+            cancellation_token.link_future(generation)
+
+        content_chunks: List[str] = []
+        full_tool_calls: Dict[int, FunctionCall] = {}
+        finish_reason: Optional[str] = None
+        try:
+            while (chunk := await chunks.get()) is not None:
+                if not chunk.get("choices"):
+                    continue
+                choice = chunk["choices"][0]
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    content_chunks.append(delta["content"])
+                    yield delta["content"]
+                for tool_call_chunk in delta.get("tool_calls") or []:
+                    index = tool_call_chunk.get("index", 0)
+                    if index not in full_tool_calls:
+                        full_tool_calls[index] = FunctionCall(id="", arguments="", name="")
+                    # The id and name are repeated in every chunk of a tool call, the arguments are not.
+                    if tool_call_chunk.get("id"):
+                        full_tool_calls[index].id = tool_call_chunk["id"]
+                    function = tool_call_chunk.get("function") or {}
+                    if function.get("name"):
+                        full_tool_calls[index].name = normalize_name(function["name"])
+                    if function.get("arguments"):
+                        full_tool_calls[index].arguments += function["arguments"]
+                if choice.get("finish_reason"):
+                    finish_reason = choice["finish_reason"]
+            n_tokens = await generation
+        finally:
+            # Stop the generation if the stream is not consumed to the end.
+            stop.set()
+            generation.cancel()
+
+        text = "".join(content_chunks)
+        content: Union[str, List[FunctionCall]] = text
+        thought: Optional[str] = None
+        if full_tool_calls:
+            content = [full_tool_calls[index] for index in sorted(full_tool_calls)]
+            if text:
+                thought = text
+            finish_reason = "function_calls"
+
+        # llama.cpp does not report the usage of a streamed generation. The context of the model
+        # holds the prompt followed by the completion, so the usage is estimated from it.
+        completion_tokens = len(self.llm.tokenize(text.encode("utf-8"), add_bos=False)) if text else 0
+        usage = RequestUsage(prompt_tokens=max(n_tokens - completion_tokens, 0), completion_tokens=completion_tokens)
+        self._total_usage["prompt_tokens"] += usage.prompt_tokens
+        self._total_usage["completion_tokens"] += usage.completion_tokens
+
+        result = CreateResult(
+            content=content,
+            thought=thought,
+            usage=usage,
+            finish_reason=normalize_stop_reason(finish_reason),
+            cached=False,
+        )
+
+        logger.info(
+            LLMStreamEndEvent(
+                response=result.model_dump(),
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+            )
+        )
+        yield result
 
     # Implement abstract methods
     def actual_usage(self) -> RequestUsage:
@@ -451,4 +580,6 @@ async def close(self) -> None:
         """
         Close the LlamaCpp client.
         """
-        self.llm.close()
+        # Close the model after the queued requests.
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.llm.close)
+        self._executor.shutdown(wait=False)
@@ -19,7 +19,6 @@
     cast,
 )
 
-import tiktoken
 from autogen_core import (
     EVENT_LOGGER_NAME,
     TRACE_LOGGER_NAME,
@@ -52,6 +51,7 @@
 from pydantic.json_schema import JsonSchemaValue
 from typing_extensions import Self, Unpack
 
+from .._utils.token_counting import TokenCountCache, get_encoding_for_model
 from . import _model_info
 from .config import BaseOllamaClientConfiguration, BaseOllamaClientConfigurationConfigModel
 
@@ -253,7 +253,7 @@ def calculate_vision_tokens(image: Image, detail: str = "auto") -> int:
     if detail == "low":
         return BASE_TOKEN_COUNT
 
-    width, height = image.image.size
+    width, height = image.size
 
     # Scale down to fit within a MAX_LONG_EDGE x MAX_LONG_EDGE square if necessary
 
@@ -379,24 +379,34 @@ def normalize_stop_reason(stop_reason: str | None) -> FinishReasons:
 
 
 # TODO: probably needs work
-def count_tokens_ollama(messages: Sequence[LLMMessage], model: str, *, tools: Sequence[Tool | ToolSchema] = []) -> int:
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        trace_logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+def count_tokens_ollama(
+    messages: Sequence[LLMMessage],
+    model: str,
+    *,
+    tools: Sequence[Tool | ToolSchema] = [],
+    token_count_cache: TokenCountCache | None = None,
+) -> int:
+    encoding = get_encoding_for_model(model)
     tokens_per_message = 3
     num_tokens = 0
 
-    # Message tokens.
-    for message in messages:
-        num_tokens += tokens_per_message
+    def count_message_tokens(message: LLMMessage) -> int:
+        num_tokens = tokens_per_message
         ollama_message = to_ollama_type(message)
         for ollama_message_part in ollama_message:
             if isinstance(message.content, Image):
                 num_tokens += calculate_vision_tokens(message.content)
             elif ollama_message_part.content is not None:
                 num_tokens += len(encoding.encode(ollama_message_part.content))
+        return num_tokens
+
+    # Message tokens.
+    scope = ("ollama", model)
+    for message in messages:
+        if token_count_cache is not None:
+            num_tokens += token_count_cache.get_or_count(message, scope, count_message_tokens)
+        else:
+            num_tokens += count_message_tokens(message)
     # TODO: every model family has its own message sequence.
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
 
@@ -491,6 +501,7 @@ def __init__(
         self._create_args = create_args
         self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
         self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._token_count_cache = TokenCountCache()
         # Ollama doesn't have IDs for tools, so we just increment a counter
         self._tool_id = 0
 
@@ -845,7 +856,9 @@ def total_usage(self) -> RequestUsage:
         return self._total_usage
 
     def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
-        return count_tokens_ollama(messages, self._create_args["model"], tools=tools)
+        return count_tokens_ollama(
+            messages, self._create_args["model"], tools=tools, token_count_cache=self._token_count_cache
+        )
 
     def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
         token_limit = _model_info.get_token_limit(self._create_args["model"])
@@ -24,7 +24,6 @@
     cast,
 )
 
-import tiktoken
 from autogen_core import (
     EVENT_LOGGER_NAME,
     TRACE_LOGGER_NAME,
@@ -74,6 +73,7 @@
 
 from .._utils.normalize_stop_reason import normalize_stop_reason
 from .._utils.parse_r1_content import parse_r1_content
+from .._utils.token_counting import TokenCountCache, get_encoding_for_model
 from . import _model_info
 from ._transformation import (
     get_transformer,
@@ -189,7 +189,7 @@ def calculate_vision_tokens(image: Image, detail: str = "auto") -> int:
     if detail == "low":
         return BASE_TOKEN_COUNT
 
-    width, height = image.image.size
+    width, height = image.size
 
     # Scale down to fit within a MAX_LONG_EDGE x MAX_LONG_EDGE square if necessary
 
@@ -281,19 +281,15 @@ def count_tokens_openai(
     add_name_prefixes: bool = False,
     tools: Sequence[Tool | ToolSchema] = [],
     model_family: str = ModelFamily.UNKNOWN,
+    token_count_cache: TokenCountCache | None = None,
 ) -> int:
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        trace_logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+    encoding = get_encoding_for_model(model)
     tokens_per_message = 3
     tokens_per_name = 1
     num_tokens = 0
 
-    # Message tokens.
-    for message in messages:
-        num_tokens += tokens_per_message
+    def count_message_tokens(message: LLMMessage) -> int:
+        num_tokens = tokens_per_message
         oai_message = to_oai_type(message, prepend_name=add_name_prefixes, model=model, model_family=model_family)
         for oai_message_part in oai_message:
             for key, value in oai_message_part.items():
@@ -330,6 +326,15 @@ def count_tokens_openai(
                     num_tokens += len(encoding.encode(value))
                     if key == "name":
                         num_tokens += tokens_per_name
+        return num_tokens
+
+    # Message tokens.
+    scope = ("openai", model, add_name_prefixes, model_family)
+    for message in messages:
+        if token_count_cache is not None:
+            num_tokens += token_count_cache.get_or_count(message, scope, count_message_tokens)
+        else:
+            num_tokens += count_message_tokens(message)
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
 
     # Tool tokens.
@@ -429,6 +434,7 @@ def __init__(
         self._create_args = create_args
         self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
         self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._token_count_cache = TokenCountCache()
 
     @classmethod
     def create_from_config(cls, config: Dict[str, Any]) -> ChatCompletionClient:
@@ -1056,6 +1062,7 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
             add_name_prefixes=self._add_name_prefixes,
             tools=tools,
             model_family=self._model_info["family"],
+            token_count_cache=self._token_count_cache,
         )
 
     def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
@@ -1,3 +1,5 @@
+from ._batching import MessageBatching
+from ._rpc_deadlines import RpcMetrics
 from ._worker_runtime import GrpcWorkerAgentRuntime
 from ._worker_runtime_host import GrpcWorkerAgentRuntimeHost
 from ._worker_runtime_host_servicer import GrpcWorkerAgentRuntimeHostServicer
@@ -13,4 +15,6 @@
     "GrpcWorkerAgentRuntime",
     "GrpcWorkerAgentRuntimeHost",
     "GrpcWorkerAgentRuntimeHostServicer",
+    "MessageBatching",
+    "RpcMetrics",
 ]
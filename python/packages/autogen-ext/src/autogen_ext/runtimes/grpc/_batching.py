@@ -0,0 +1,104 @@
+import asyncio
+from dataclasses import dataclass
+from typing import List
+
+from .protos import agent_worker_pb2
+
+# The metadata a worker sends when it opens its channel, to tell the host it accepts batched messages.
+ACCEPT_BATCH_METADATA_KEY = "accept-message-batch"
+
+
+@dataclass(frozen=True)
+class MessageBatching:
+    """When to send the messages of a channel together in one frame.
+
+    The messages that are waiting to be sent are sent in one batch, once ``max_messages`` of them or
+    ``max_bytes`` of serialized messages are collected, or ``max_delay`` seconds after the first one.
+    A message larger than ``max_bytes`` is sent alone. Keep ``max_bytes`` below the maximum message
+    size of the gRPC channel.
+
+    Args:
+        max_messages (int, optional): The maximum number of messages in a batch. Defaults to 100.
+        max_bytes (int, optional): The maximum serialized size of the messages of a batch. Defaults to 1 MiB.
+        max_delay (float, optional): The maximum number of seconds a message waits for more messages.
+            Defaults to 0.001.
+    """
+
+    max_messages: int = 100
+    max_bytes: int = 1024 * 1024
+    max_delay: float = 0.001
+
+    def __post_init__(self) -> None:
+        if self.max_messages <= 0:
+            raise ValueError("max_messages must be greater than 0.")
+        if self.max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than 0.")
+        if self.max_delay < 0:
+            raise ValueError("max_delay must not be negative.")
+
+
+class MessageBatcher:
+    """Takes the messages to send from a queue, in batches when batching is enabled."""
+
+    def __init__(self, queue: asyncio.Queue[agent_worker_pb2.Message], batching: MessageBatching | None) -> None:
+        self._queue = queue
+        self._batching = batching
+        # A message that did not fit in the previous batch.
+        self._carry: agent_worker_pb2.Message | None = None
+        # A get from the queue that outlived the delay of the previous batch. It is kept, so that its
+        # message is not lost.
+        self._getter: asyncio.Future[agent_worker_pb2.Message] | None = None
+
+    async def _next(self, timeout: float | None) -> agent_worker_pb2.Message | None:
+        if self._carry is not None:
+            message, self._carry = self._carry, None
+            return message
+        if self._getter is None:
+            if not self._queue.empty():
+                return self._queue.get_nowait()
+            if timeout is not None and timeout <= 0:
+                return None
+            self._getter = asyncio.ensure_future(self._queue.get())
+        done, _ = await asyncio.wait({self._getter}, timeout=timeout)
+        if not done:
+            return None
+        message = self._getter.result()
+        self._getter = None
+        return message
+
+    async def get(self) -> agent_worker_pb2.Message:
+        if self._batching is None:
+            return await self._queue.get()
+        message = await self._next(None)
+        assert message is not None
+
+        messages: List[agent_worker_pb2.Message] = [message]
+        size = message.ByteSize()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._batching.max_delay
+        while len(messages) < self._batching.max_messages and size < self._batching.max_bytes:
+            next_message = await self._next(deadline - loop.time())
+            if next_message is None:
+                break
+            next_size = next_message.ByteSize()
+            if size + next_size > self._batching.max_bytes:
+                self._carry = next_message
+                break
+            messages.append(next_message)
+            size += next_size
+
+        if len(messages) == 1:
+            return message
+        return agent_worker_pb2.Message(batch=agent_worker_pb2.MessageBatch(messages=messages))
+
+    def close(self) -> None:
+        if self._getter is not None:
+            self._getter.cancel()
+            self._getter = None
+
+
+def unbatch(message: agent_worker_pb2.Message) -> List[agent_worker_pb2.Message]:
+    """The messages of a batch, or the message itself if it is not a batch."""
+    if message.WhichOneof("message") == "batch":
+        return list(message.batch.messages)
+    return [message]
@@ -6,8 +6,15 @@
 DATA_SCHEMA_ATTR = "dataschema"
 AGENT_SENDER_TYPE_ATTR = "agagentsendertype"
 AGENT_SENDER_KEY_ATTR = "agagentsenderkey"
+AGENT_RECIPIENTS_ATTR = "agagentrecipients"
+AGENT_DELIVERED_RECIPIENTS_ATTR = "agagentdelivered"
 MESSAGE_KIND_ATTR = "agmsgkind"
+# The metadata of the channel of a worker that delivers messages to its own agents in-process.
+LOCAL_DELIVERY_METADATA_KEY = "local-delivery"
 MESSAGE_KIND_VALUE_PUBLISH = "publish"
 MESSAGE_KIND_VALUE_RPC_REQUEST = "rpc_request"
 MESSAGE_KIND_VALUE_RPC_RESPONSE = "rpc_response"
 MESSAGE_KIND_VALUE_RPC_ERROR = "error"
+
+# The error of the response to an RPC request whose deadline passed.
+RPC_DEADLINE_EXCEEDED_ERROR = "RPC deadline exceeded."
@@ -0,0 +1,61 @@
+import bisect
+import hashlib
+from typing import List, Optional, Set, Tuple
+
+
+class HashRing:
+    """A consistent hash ring that maps keys to nodes.
+
+    Each node is placed at ``replicas`` points of the ring, and a key maps to the node of the
+    first point at or after the hash of the key. When a node is added, it only takes over the keys
+    that map to its points, and when a node is removed, only its keys move to the other nodes.
+    The many points per node spread the keys evenly over the nodes.
+
+    Args:
+        replicas (int, optional): The number of points of each node. Defaults to 100.
+    """
+
+    def __init__(self, replicas: int = 100) -> None:
+        if replicas <= 0:
+            raise ValueError("replicas must be greater than 0.")
+        self._replicas = replicas
+        self._nodes: Set[str] = set()
+        # The points of the nodes, sorted by hash.
+        self._points: List[Tuple[int, str]] = []
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        # The built-in hash is salted per process, so keys would move when the host restarts.
+        return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+    @property
+    def nodes(self) -> Set[str]:
+        return set(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._nodes
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self._replicas):
+            bisect.insort(self._points, (self._hash(f"{node}#{replica}"), node))
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        self._points = [point for point in self._points if point[1] != node]
+
+    def get(self, key: str) -> Optional[str]:
+        """The node of a key, or None if the ring has no nodes."""
+        if not self._points:
+            return None
+        index = bisect.bisect_left(self._points, (self._hash(key), ""))
+        if index == len(self._points):
+            index = 0
+        return self._points[index][1]
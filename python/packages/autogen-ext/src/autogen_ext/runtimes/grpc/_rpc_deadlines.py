@@ -0,0 +1,127 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Hashable, List, TypeVar
+
+from google.protobuf import timestamp_pb2
+
+K = TypeVar("K", bound=Hashable)
+
+
+@dataclass
+class RpcMetrics:
+    """Counters for the RPC requests of a gRPC worker runtime or host."""
+
+    in_flight: int = 0
+    """The number of requests waiting for their response."""
+    max_in_flight: int = 0
+    """The largest number of requests that were waiting for their response at once."""
+    timed_out: int = 0
+    """The number of requests whose deadline passed before their response arrived."""
+    late_responses: int = 0
+    """The number of responses that arrived after their request timed out, and were dropped."""
+
+
+def set_deadline(deadline: timestamp_pb2.Timestamp, timeout: float) -> None:
+    """Set a deadline ``timeout`` seconds from now."""
+    deadline.FromNanoseconds(time.time_ns() + int(timeout * 1e9))
+
+
+def deadline_to_loop_time(deadline: timestamp_pb2.Timestamp) -> float:
+    """The time of the running event loop at a deadline. The clocks of the hosts are assumed to be in sync."""
+    remaining = (deadline.ToNanoseconds() - time.time_ns()) / 1e9
+    return asyncio.get_running_loop().time() + remaining
+
+
+class TimerWheel(Generic[K]):
+    """Calls a callback with each key whose deadline passed, using one timer for all keys.
+
+    The keys are hashed into ``slots`` buckets by the tick of ``tick`` seconds their deadline falls in.
+    While keys are scheduled, the wheel wakes up once per tick and only looks at the buckets of the ticks
+    that passed, so scheduling and cancelling a key take constant time however many keys are scheduled.
+    A key expires at most one tick after its deadline.
+
+    Args:
+        on_expire (Callable[[K], None]): Called with each key whose deadline passed.
+        tick (float, optional): The resolution of the wheel in seconds. Defaults to 0.05.
+        slots (int, optional): The number of buckets. Deadlines more than ``tick * slots`` seconds away
+            share a bucket with nearer ones, and stay in it until their tick comes. Defaults to 512.
+    """
+
+    def __init__(self, on_expire: Callable[[K], None], tick: float = 0.05, slots: int = 512) -> None:
+        if tick <= 0:
+            raise ValueError("tick must be greater than 0.")
+        if slots <= 0:
+            raise ValueError("slots must be greater than 0.")
+        self._on_expire = on_expire
+        self._tick = tick
+        self._slots: List[Dict[K, float]] = [{} for _ in range(slots)]
+        # The tick of the bucket of each key.
+        self._key_ticks: Dict[K, int] = {}
+        # The last tick whose bucket was looked at, while keys are scheduled.
+        self._last_tick: int | None = None
+        self._handle: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        return len(self._key_ticks)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_ticks
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """Expire a key at a deadline in the time of the running event loop. A scheduled key is rescheduled."""
+        self.cancel(key)
+        loop = asyncio.get_running_loop()
+        if self._last_tick is None:
+            self._last_tick = math.floor(loop.time() / self._tick)
+        # A deadline that already passed expires on the next tick.
+        tick = max(math.ceil(deadline / self._tick), self._last_tick + 1)
+        self._slots[tick % len(self._slots)][key] = deadline
+        self._key_ticks[key] = tick
+        if self._handle is None:
+            self._handle = loop.call_at((self._last_tick + 1) * self._tick, self._advance)
+
+    def cancel(self, key: K) -> None:
+        """Stop a key from expiring. Does nothing if the key is not scheduled."""
+        tick = self._key_ticks.pop(key, None)
+        if tick is None:
+            return
+        del self._slots[tick % len(self._slots)][key]
+        if not self._key_ticks:
+            self.close()
+
+    def close(self) -> None:
+        """Cancel all keys."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for bucket in self._slots:
+            bucket.clear()
+        self._key_ticks.clear()
+        self._last_tick = None
+
+    def _advance(self) -> None:
+        assert self._last_tick is not None
+        self._handle = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        now_tick = math.floor(now / self._tick)
+        if now_tick - self._last_tick >= len(self._slots):
+            buckets = self._slots
+        else:
+            buckets = [self._slots[tick % len(self._slots)] for tick in range(self._last_tick + 1, now_tick + 1)]
+        expired: List[K] = []
+        for bucket in buckets:
+            for key, deadline in list(bucket.items()):
+                if deadline <= now:
+                    del bucket[key]
+                    del self._key_ticks[key]
+                    expired.append(key)
+        self._last_tick = now_tick
+        if self._key_ticks:
+            self._handle = loop.call_at((now_tick + 1) * self._tick, self._advance)
+        else:
+            self._last_tick = None
+        for key in expired:
+            self._on_expire(key)
@@ -9,6 +9,7 @@
 import warnings
 from asyncio import Future, Task
 from collections import defaultdict
+from dataclasses import replace
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -35,6 +36,7 @@
     JSON_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     Agent,
+    AgentEvictionPolicy,
     AgentId,
     AgentInstantiationContext,
     AgentMetadata,
@@ -47,6 +49,7 @@
     Subscription,
     TopicId,
 )
+from autogen_core._agent_eviction import AgentInstances
 from autogen_core._runtime_impl_helpers import SubscriptionManager, get_impl
 from autogen_core._serialization import (
     SerializationRegistry,
@@ -59,7 +62,10 @@
 from autogen_ext.runtimes.grpc._utils import subscription_to_proto
 
 from . import _constants
+from ._batching import ACCEPT_BATCH_METADATA_KEY, MessageBatcher, MessageBatching, unbatch
 from ._constants import GRPC_IMPORT_ERROR_STR
+from ._hash_ring import HashRing
+from ._rpc_deadlines import RpcMetrics, TimerWheel, deadline_to_loop_time, set_deadline
 from ._type_helpers import ChannelArgumentType
 from .protos import agent_worker_pb2, agent_worker_pb2_grpc, cloudevent_pb2
 
@@ -82,11 +88,15 @@
 
 
 class QueueAsyncIterable(AsyncIterator[Any], AsyncIterable[Any]):
-    def __init__(self, queue: asyncio.Queue[Any]) -> None:
+    def __init__(self, queue: asyncio.Queue[Any], batching: MessageBatching | None = None) -> None:
         self._queue = queue
+        self._batcher = MessageBatcher(queue, batching)
 
     async def __anext__(self) -> Any:
-        return await self._queue.get()
+        return await self._batcher.get()
+
+    def close(self) -> None:
+        self._batcher.close()
 
     def __aiter__(self) -> AsyncIterator[Any]:
         return self
@@ -118,6 +128,7 @@ class HostConnection:
     def __init__(self, channel: grpc.aio.Channel, stub: Any) -> None:  # type: ignore
         self._channel = channel
         self._send_queue = asyncio.Queue[agent_worker_pb2.Message]()
+        self._send_messages: QueueAsyncIterable | None = None
         self._recv_queue = asyncio.Queue[agent_worker_pb2.Message]()
         self._connection_task: Task[None] | None = None
         self._stub: AgentRpcAsyncStub = stub
@@ -127,13 +138,22 @@ def __init__(self, channel: grpc.aio.Channel, stub: Any) -> None:  # type: ignor
     def stub(self) -> Any:
         return self._stub
 
+    @property
+    def client_id(self) -> str:
+        return self._client_id
+
     @property
     def metadata(self) -> Sequence[Tuple[str, str]]:
         return [("client-id", self._client_id)]
 
     @classmethod
     async def from_host_address(
-        cls, host_address: str, extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG
+        cls,
+        host_address: str,
+        extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG,
+        message_batching: MessageBatching | None = None,
+        compression: grpc.Compression | None = None,
+        local_delivery: bool = False,
     ) -> Self:
         logger.info("Connecting to %s", host_address)
         #  Always use DEFAULT_GRPC_CONFIG and override it with provided grpc_config
@@ -144,12 +164,14 @@ async def from_host_address(
         channel = grpc.aio.insecure_channel(
             host_address,
             options=merged_options,
+            compression=compression,
         )
         stub: AgentRpcAsyncStub = agent_worker_pb2_grpc.AgentRpcStub(channel)  # type: ignore
         instance = cls(channel, stub)
+        instance._send_messages = QueueAsyncIterable(instance._send_queue, message_batching)
 
         instance._connection_task = await instance._connect(
-            stub, instance._send_queue, instance._recv_queue, instance._client_id
+            stub, instance._send_messages, instance._recv_queue, instance._client_id, local_delivery
         )
 
         return instance
@@ -158,20 +180,28 @@ async def close(self) -> None:
         if self._connection_task is None:
             raise RuntimeError("Connection is not open.")
         await self._channel.close()
+        if self._send_messages is not None:
+            self._send_messages.close()
         await self._connection_task
 
     @staticmethod
     async def _connect(
         stub: Any,  # AgentRpcAsyncStub
-        send_queue: asyncio.Queue[agent_worker_pb2.Message],
+        send_messages: QueueAsyncIterable,
         receive_queue: asyncio.Queue[agent_worker_pb2.Message],
         client_id: str,
+        local_delivery: bool = False,
     ) -> Task[None]:
         from grpc.aio import StreamStreamCall
 
         # TODO: where do exceptions from reading the iterable go? How do we recover from those?
         stream: StreamStreamCall[agent_worker_pb2.Message, agent_worker_pb2.Message] = stub.OpenChannel(  # type: ignore
-            QueueAsyncIterable(send_queue), metadata=[("client-id", client_id)]
+            send_messages,
+            metadata=[
+                ("client-id", client_id),
+                (ACCEPT_BATCH_METADATA_KEY, "true"),
+                (_constants.LOCAL_DELIVERY_METADATA_KEY, "true" if local_delivery else "false"),
+            ],
         )
 
         await stream.wait_for_connection()
@@ -184,7 +214,8 @@ async def read_loop() -> None:
                     logger.info("EOF")
                     break
                 logger.info(f"Received a message from host: {message}")
-                await receive_queue.put(message)
+                for item in unbatch(message):
+                    await receive_queue.put(item)
                 logger.info("Put message in receive queue")
 
         return asyncio.create_task(read_loop())
@@ -212,6 +243,34 @@ async def recv(self) -> agent_worker_pb2.Message:
 #       - CommandLineCodeResult
 
 
+def _stringify_attributes(
+    attributes: Mapping[str, cloudevent_pb2.CloudEvent.CloudEventAttributeValue],
+) -> Mapping[str, str]:
+    result: Dict[str, str] = {}
+    for key, value in attributes.items():
+        item = None
+        match value.WhichOneof("attr"):
+            case "ce_boolean":
+                item = str(value.ce_boolean)
+            case "ce_integer":
+                item = str(value.ce_integer)
+            case "ce_string":
+                item = value.ce_string
+            case "ce_bytes":
+                item = str(value.ce_bytes)
+            case "ce_uri":
+                item = value.ce_uri
+            case "ce_uri_ref":
+                item = value.ce_uri_ref
+            case "ce_timestamp":
+                item = str(value.ce_timestamp)
+            case _:
+                raise ValueError("Unknown attribute kind")
+        result[key] = item
+
+    return result
+
+
 class GrpcWorkerAgentRuntime(AgentRuntime):
     """An agent runtime for running remote or cross-language agents.
 
@@ -223,6 +282,30 @@ class GrpcWorkerAgentRuntime(AgentRuntime):
 
     .. _cloudevent.proto: https://github.com/microsoft/autogen/blob/main/protos/cloudevent.proto
 
+    Args:
+        host_address (str): The address of the host runtime.
+        tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
+        extra_grpc_config (ChannelArgumentType, optional): Extra gRPC channel options. Defaults to None.
+        payload_serialization_format (str, optional): The data content type used to serialize payloads. Defaults to JSON.
+        agent_eviction_policy (AgentEvictionPolicy | None, optional): When to evict instantiated agents from memory.
+            Evicted agents are saved to the policy's state store and restored on their next message.
+            If None, agents are kept in memory. Defaults to None.
+        local_delivery (bool, optional): Deliver messages to the agents of this worker in-process, when the host
+            routes them to this worker, instead of through the host. Messages delivered in-process are not
+            serialized, so the sender and the recipient share the same message object, and errors raised by the
+            recipient of a sent message are raised with their own type. Published messages are still sent to the
+            host, for the agents of other workers. While the host changes the workers of an agent type, the
+            messages to its agents go through the host. Defaults to False.
+        message_batching (MessageBatching | None, optional): When to send the messages to the host together in one
+            frame. The host must support batches. If None, messages are sent one by one. Defaults to None.
+        compression (grpc.Compression | None, optional): The compression of the messages sent to the host.
+            Defaults to None (no compression).
+        rpc_timeout (float | None, optional): The number of seconds to wait for the response to a sent message.
+            The deadline is sent along with the message, so that the host and the worker of the recipient stop
+            waiting for the response too, and the cancellation token of the recipient's handler is cancelled.
+            :meth:`send_message` raises :class:`TimeoutError` when the deadline passes. If None, sent messages
+            wait until their response arrives. Defaults to None.
+
     """
 
     # TODO: Needs to handle agent close() call
@@ -232,25 +315,43 @@ def __init__(
         tracer_provider: TracerProvider | None = None,
         extra_grpc_config: ChannelArgumentType | None = None,
         payload_serialization_format: str = JSON_DATA_CONTENT_TYPE,
+        agent_eviction_policy: AgentEvictionPolicy | None = None,
+        local_delivery: bool = False,
+        message_batching: MessageBatching | None = None,
+        compression: grpc.Compression | None = None,
+        rpc_timeout: float | None = None,
     ) -> None:
+        if rpc_timeout is not None and rpc_timeout <= 0:
+            raise ValueError("rpc_timeout must be greater than 0.")
         self._host_address = host_address
         self._trace_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("Worker Runtime"))
         self._per_type_subscribers: DefaultDict[tuple[str, str], Set[AgentId]] = defaultdict(set)
         self._agent_factories: Dict[
             str, Callable[[], Agent | Awaitable[Agent]] | Callable[[AgentRuntime, AgentId], Agent | Awaitable[Agent]]
         ] = {}
-        self._instantiated_agents: Dict[AgentId, Agent] = {}
+        self._instantiated_agents = AgentInstances(agent_eviction_policy)
         self._known_namespaces: set[str] = set()
         self._read_task: None | Task[None] = None
         self._running = False
         self._pending_requests: Dict[str, Future[Any]] = {}
         self._pending_requests_lock = asyncio.Lock()
         self._next_request_id = 0
+        self._rpc_timeout = rpc_timeout
+        # The deadlines of the requests sent by this worker, and of the requests its agents handle.
+        self._request_deadlines = TimerWheel[str](self._expire_request)
+        self._handler_deadlines = TimerWheel[CancellationToken](CancellationToken.cancel)
+        self._rpc_metrics = RpcMetrics()
         self._host_connection: HostConnection | None = None
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
         self._serialization_registry = SerializationRegistry()
         self._extra_grpc_config = extra_grpc_config or []
+        self._local_delivery = local_delivery
+        self._message_batching = message_batching
+        self._compression = compression
+        # The clients of the agent types of this worker, as routed by the host. An agent type is missing
+        # while a change of its clients is not active yet.
+        self._agent_type_clients: Dict[str, HashRing] = {}
 
         if payload_serialization_format not in {JSON_DATA_CONTENT_TYPE, PROTOBUF_DATA_CONTENT_TYPE}:
             raise ValueError(f"Unsupported payload serialization format: {payload_serialization_format}")
@@ -263,7 +364,11 @@ async def start(self) -> None:
             raise ValueError("Runtime is already running.")
         logger.info(f"Connecting to host: {self._host_address}")
         self._host_connection = await HostConnection.from_host_address(
-            self._host_address, extra_grpc_config=self._extra_grpc_config
+            self._host_address,
+            extra_grpc_config=self._extra_grpc_config,
+            message_batching=self._message_batching,
+            compression=self._compression,
+            local_delivery=self._local_delivery,
         )
         logger.info("Connection established")
         if self._read_task is None:
@@ -299,6 +404,8 @@ async def _run_read_loop(self) -> None:
                         self._background_tasks.add(task)
                         task.add_done_callback(self._raise_on_exception)
                         task.add_done_callback(self._background_tasks.discard)
+                    case "agentTypeClients":
+                        await self._process_agent_type_clients(message.agentTypeClients)
                     case None:
                         logger.warning("No message")
             except Exception as e:
@@ -314,6 +421,8 @@ async def stop(self) -> None:
         for task_result in final_tasks_results:
             if isinstance(task_result, Exception):
                 logger.error("Error in background task", exc_info=task_result)
+        self._request_deadlines.close()
+        self._handler_deadlines.close()
         # Close the host connection.
         if self._host_connection is not None:
             try:
@@ -350,6 +459,31 @@ def signal_handler() -> None:
     def _known_agent_names(self) -> Set[str]:
         return set(self._agent_factories.keys())
 
+    async def _process_agent_type_clients(self, agent_type_clients: agent_worker_pb2.AgentTypeClients) -> None:
+        assert self._host_connection is not None
+        if agent_type_clients.active:
+            ring = HashRing()
+            for client_id in agent_type_clients.client_ids:
+                ring.add(client_id)
+            self._agent_type_clients[agent_type_clients.type] = ring
+            return
+        # Messages go through the host until it routes with the new clients.
+        self._agent_type_clients.pop(agent_type_clients.type, None)
+        await self._host_connection.send(
+            agent_worker_pb2.Message(
+                agentTypeClients=agent_worker_pb2.AgentTypeClients(
+                    type=agent_type_clients.type, epoch=agent_type_clients.epoch
+                )
+            )
+        )
+
+    def _is_local(self, agent_id: AgentId) -> bool:
+        """Whether the host routes messages to the agent to this worker."""
+        if not self._local_delivery or self._host_connection is None or agent_id.type not in self._agent_factories:
+            return False
+        ring = self._agent_type_clients.get(agent_id.type)
+        return ring is not None and ring.get(agent_id.key) == self._host_connection.client_id
+
     async def _send_message(
         self,
         runtime_message: agent_worker_pb2.Message,
@@ -380,10 +514,30 @@ async def send_message(
         with self._trace_helper.trace_block(
             "create", recipient, parent=None, extraAttributes={"message_type": data_type}
         ):
+            if self._is_local(recipient):
+                message_context = MessageContext(
+                    sender=sender,
+                    topic_id=None,
+                    is_rpc=True,
+                    cancellation_token=cancellation_token or CancellationToken(),
+                    message_id=message_id or str(uuid.uuid4()),
+                )
+                call = self._call_agent(message, data_type, recipient, message_context, get_telemetry_grpc_metadata())
+                if self._rpc_timeout is None:
+                    return await call
+                try:
+                    return await asyncio.wait_for(call, self._rpc_timeout)
+                except asyncio.TimeoutError as e:
+                    # Before Python 3.11 this is not the built-in TimeoutError raised for remote recipients.
+                    raise TimeoutError(f"No response from {recipient} before the deadline.") from e
+
             # create a new future for the result
             future = asyncio.get_event_loop().create_future()
+            if cancellation_token is not None:
+                cancellation_token.link_future(future)
             request_id = await self._get_new_request_id()
             self._pending_requests[request_id] = future
+            self._rpc_metrics.max_in_flight = max(self._rpc_metrics.max_in_flight, len(self._pending_requests))
             serialized_message = self._serialization_registry.serialize(
                 message, type_name=data_type, data_content_type=JSON_DATA_CONTENT_TYPE
             )
@@ -401,13 +555,20 @@ async def send_message(
                     ),
                 )
             )
+            if self._rpc_timeout is not None:
+                set_deadline(runtime_message.request.deadline, self._rpc_timeout)
+                self._request_deadlines.schedule(request_id, asyncio.get_running_loop().time() + self._rpc_timeout)
 
-            # TODO: Find a way to handle timeouts/errors
             task = asyncio.create_task(self._send_message(runtime_message, "send", recipient, telemetry_metadata))
             self._background_tasks.add(task)
             task.add_done_callback(self._raise_on_exception)
             task.add_done_callback(self._background_tasks.discard)
-            return await future
+            try:
+                return await future
+            finally:
+                # The request is done, timed out, or cancelled by the caller.
+                self._pending_requests.pop(request_id, None)
+                self._request_deadlines.cancel(request_id)
 
     async def publish_message(
         self,
@@ -483,11 +644,82 @@ async def publish_message(
                 )
 
             telemetry_metadata = get_telemetry_grpc_metadata()
+
+            # Deliver the message to the agents of this worker, and let the host deliver it to the others.
+            recipients = await self._subscription_manager.get_subscribed_recipients(topic_id)
+            local_recipients = [agent_id for agent_id in recipients if agent_id != sender and self._is_local(agent_id)]
+            if local_recipients:
+                runtime_message.cloudEvent.attributes[
+                    _constants.AGENT_DELIVERED_RECIPIENTS_ATTR
+                ].ce_string = json.dumps([str(agent_id) for agent_id in local_recipients])
+                local_task = asyncio.create_task(
+                    self._deliver_event(
+                        message,
+                        message_type,
+                        local_recipients,
+                        topic_id,
+                        sender,
+                        False,
+                        message_id,
+                        cancellation_token or CancellationToken(),
+                        telemetry_metadata,
+                    )
+                )
+                self._background_tasks.add(local_task)
+                local_task.add_done_callback(self._raise_on_exception)
+                local_task.add_done_callback(self._background_tasks.discard)
+
             task = asyncio.create_task(self._send_message(runtime_message, "publish", topic_id, telemetry_metadata))
             self._background_tasks.add(task)
             task.add_done_callback(self._raise_on_exception)
             task.add_done_callback(self._background_tasks.discard)
 
+    async def _call_agent(
+        self,
+        message: Any,
+        message_type: str,
+        recipient: AgentId,
+        message_context: MessageContext,
+        telemetry_metadata: Mapping[str, str],
+    ) -> Any:
+        agent = await self._get_agent(recipient)
+        self._instantiated_agents.acquire(recipient)
+        try:
+            with MessageHandlerContext.populate_context(agent.id):
+                with self._trace_helper.trace_block(
+                    "process", agent.id, parent=telemetry_metadata, extraAttributes={"message_type": message_type}
+                ):
+                    return await agent.on_message(message, ctx=message_context)
+        finally:
+            self._instantiated_agents.release(recipient)
+
+    async def _deliver_event(
+        self,
+        message: Any,
+        message_type: str,
+        recipients: Sequence[AgentId],
+        topic_id: TopicId,
+        sender: AgentId | None,
+        is_rpc: bool,
+        message_id: str,
+        cancellation_token: CancellationToken,
+        telemetry_metadata: Mapping[str, str],
+    ) -> None:
+        responses: List[Awaitable[Any]] = []
+        for agent_id in recipients:
+            message_context = MessageContext(
+                sender=sender,
+                topic_id=topic_id,
+                is_rpc=is_rpc,
+                cancellation_token=cancellation_token,
+                message_id=message_id,
+            )
+            responses.append(self._call_agent(message, message_type, agent_id, message_context, telemetry_metadata))
+        try:
+            await asyncio.gather(*responses)
+        except BaseException as e:
+            logger.error("Error handling event", exc_info=e)
+
     async def save_state(self) -> Mapping[str, Any]:
         raise NotImplementedError("Saving state is not yet implemented.")
 
@@ -503,6 +735,23 @@ async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
     async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
         raise NotImplementedError("Agent load_state is not yet implemented.")
 
+    def rpc_metrics(self) -> RpcMetrics:
+        """Return the RPC counters of the runtime.
+
+        The counters accumulate over the lifetime of the runtime, while
+        :attr:`~autogen_ext.runtimes.grpc.RpcMetrics.in_flight` is the current number of sent messages
+        waiting for their response. Messages delivered in-process are not counted."""
+        metrics = replace(self._rpc_metrics)
+        metrics.in_flight = len(self._pending_requests)
+        return metrics
+
+    def _expire_request(self, request_id: str) -> None:
+        future = self._pending_requests.pop(request_id, None)
+        if future is None or future.done():
+            return
+        self._rpc_metrics.timed_out += 1
+        future.set_exception(TimeoutError(f"No response to request {request_id} before its deadline."))
+
     async def _get_new_request_id(self) -> str:
         async with self._pending_requests_lock:
             self._next_request_id += 1
@@ -518,6 +767,14 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
         else:
             logging.info(f"Processing request from unknown source to {recipient}")
 
+        deadline: float | None = None
+        if request.HasField("deadline"):
+            deadline = deadline_to_loop_time(request.deadline)
+            if deadline <= asyncio.get_running_loop().time():
+                # The sender has stopped waiting for the response.
+                logger.info(f"Dropping request {request.request_id}, its deadline passed.")
+                return
+
         # Deserialize the message.
         message = self._serialization_registry.deserialize(
             request.payload.data,
@@ -527,11 +784,16 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
 
         # Get the receiving agent and prepare the message context.
         rec_agent = await self._get_agent(recipient)
+        self._instantiated_agents.acquire(recipient)
+        cancellation_token = CancellationToken()
+        if deadline is not None:
+            # Tell the handler when the sender stops waiting.
+            self._handler_deadlines.schedule(cancellation_token, deadline)
         message_context = MessageContext(
             sender=sender,
             topic_id=None,
             is_rpc=True,
-            cancellation_token=CancellationToken(),
+            cancellation_token=cancellation_token,
             message_id=request.request_id,
         )
 
@@ -557,6 +819,9 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
             # Send the error response.
             await self._host_connection.send(response_message)
             return
+        finally:
+            self._handler_deadlines.cancel(cancellation_token)
+            self._instantiated_agents.release(recipient)
 
         # Serialize the result.
         result_type = self._serialization_registry.type_name(result)
@@ -581,6 +846,12 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
         await self._host_connection.send(response_message)
 
     async def _process_response(self, response: agent_worker_pb2.RpcResponse) -> None:
+        future = self._pending_requests.pop(response.request_id, None)
+        if future is None or future.done():
+            # The request timed out or was cancelled.
+            self._rpc_metrics.late_responses += 1
+            logger.warning(f"Dropped the response to request {response.request_id}.")
+            return
         with self._trace_helper.trace_block(
             "ack",
             None,
@@ -594,9 +865,11 @@ async def _process_response(self, response: agent_worker_pb2.RpcResponse) -> Non
                 type_name=response.payload.data_type,
                 data_content_type=response.payload.data_content_type,
             )
-            # Get the future and set the result.
-            future = self._pending_requests.pop(response.request_id)
-            if len(response.error) > 0:
+            # Set the result of the future.
+            if response.error == _constants.RPC_DEADLINE_EXCEEDED_ERROR:
+                self._rpc_metrics.timed_out += 1
+                future.set_exception(TimeoutError(f"No response to request {response.request_id} before its deadline."))
+            elif len(response.error) > 0:
                 future.set_exception(Exception(response.error))
             else:
                 future.set_result(result)
@@ -615,6 +888,14 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         topic_id = TopicId(event.type, event.source)
         # Get the recipients for the topic.
         recipients = await self._subscription_manager.get_subscribed_recipients(topic_id)
+        if _constants.AGENT_RECIPIENTS_ATTR in event_attributes:
+            # The agent types are shared with other workers, and the host lists the agents of this worker.
+            routed_recipients = set(json.loads(event_attributes[_constants.AGENT_RECIPIENTS_ATTR].ce_string))
+            recipients = [agent_id for agent_id in recipients if str(agent_id) in routed_recipients]
+        recipients = [agent_id for agent_id in recipients if agent_id != sender]
+        # Only decode the payload when there is an agent to deliver it to.
+        if not recipients:
+            return
 
         message_content_type = event_attributes[_constants.DATA_CONTENT_TYPE_ATTR].ce_string
         message_type = event_attributes[_constants.DATA_SCHEMA_ATTR].ce_string
@@ -624,11 +905,7 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
                 event.binary_data, type_name=message_type, data_content_type=message_content_type
             )
         elif message_content_type == PROTOBUF_DATA_CONTENT_TYPE:
-            # TODO: find a way to prevent the roundtrip serialization
-            proto_binary_data = event.proto_data.SerializeToString()
-            message = self._serialization_registry.deserialize(
-                proto_binary_data, type_name=message_type, data_content_type=message_content_type
-            )
+            message = self._serialization_registry.deserialize_any(event.proto_data, type_name=message_type)
         else:
             raise ValueError(f"Unsupported message content type: {message_content_type}")
 
@@ -642,64 +919,18 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         if is_rpc and not is_marked_rpc_type:
             warnings.warn("Received RPC request with topic type suffix but not marked as RPC request.", stacklevel=2)
 
-        # Send the message to each recipient.
-        responses: List[Awaitable[Any]] = []
-        for agent_id in recipients:
-            if agent_id == sender:
-                continue
-            message_context = MessageContext(
-                sender=sender,
-                topic_id=topic_id,
-                is_rpc=is_rpc,
-                cancellation_token=CancellationToken(),
-                message_id=event.id,
-            )
-            agent = await self._get_agent(agent_id)
-            with MessageHandlerContext.populate_context(agent.id):
-
-                def stringify_attributes(
-                    attributes: Mapping[str, cloudevent_pb2.CloudEvent.CloudEventAttributeValue],
-                ) -> Mapping[str, str]:
-                    result: Dict[str, str] = {}
-                    for key, value in attributes.items():
-                        item = None
-                        match value.WhichOneof("attr"):
-                            case "ce_boolean":
-                                item = str(value.ce_boolean)
-                            case "ce_integer":
-                                item = str(value.ce_integer)
-                            case "ce_string":
-                                item = value.ce_string
-                            case "ce_bytes":
-                                item = str(value.ce_bytes)
-                            case "ce_uri":
-                                item = value.ce_uri
-                            case "ce_uri_ref":
-                                item = value.ce_uri_ref
-                            case "ce_timestamp":
-                                item = str(value.ce_timestamp)
-                            case _:
-                                raise ValueError("Unknown attribute kind")
-                        result[key] = item
-
-                    return result
-
-                async def send_message(agent: Agent, message_context: MessageContext) -> Any:
-                    with self._trace_helper.trace_block(
-                        "process",
-                        agent.id,
-                        parent=stringify_attributes(event.attributes),
-                        extraAttributes={"message_type": message_type},
-                    ):
-                        await agent.on_message(message, ctx=message_context)
-
-                future = send_message(agent, message_context)
-            responses.append(future)
-        # Wait for all responses.
-        try:
-            await asyncio.gather(*responses)
-        except BaseException as e:
-            logger.error("Error handling event", exc_info=e)
+        # Send the message to each recipient, with the same trace parent and cancellation token.
+        await self._deliver_event(
+            message,
+            message_type,
+            recipients,
+            topic_id,
+            sender,
+            is_rpc,
+            event.id,
+            CancellationToken(),
+            _stringify_attributes(event_attributes),
+        )
 
     async def register_factory(
         self,
@@ -762,16 +993,18 @@ async def _invoke_agent_factory(
         return agent
 
     async def _get_agent(self, agent_id: AgentId) -> Agent:
-        if agent_id in self._instantiated_agents:
-            return self._instantiated_agents[agent_id]
+        agent = self._instantiated_agents.get(agent_id)
+        if agent is not None:
+            return agent
 
         if agent_id.type not in self._agent_factories:
             raise ValueError(f"Agent with name {agent_id.type} not found.")
 
         agent_factory = self._agent_factories[agent_id.type]
-        agent = await self._invoke_agent_factory(agent_factory, agent_id)
-        self._instantiated_agents[agent_id] = agent
-        return agent
+        # Restores the state of an agent that was evicted.
+        return await self._instantiated_agents.get_or_create(
+            agent_id, lambda: self._invoke_agent_factory(agent_factory, agent_id)
+        )
 
     # TODO: uncomment out the following type ignore when this is fixed in mypy: https://github.com/python/mypy/issues/3737
     async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
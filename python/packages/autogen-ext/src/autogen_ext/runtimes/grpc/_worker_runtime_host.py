@@ -3,7 +3,9 @@
 import signal
 from typing import Optional, Sequence
 
+from ._batching import MessageBatching
 from ._constants import GRPC_IMPORT_ERROR_STR
+from ._rpc_deadlines import RpcMetrics
 from ._type_helpers import ChannelArgumentType
 from ._worker_runtime_host_servicer import GrpcWorkerAgentRuntimeHostServicer
 
@@ -17,9 +19,29 @@
 
 
 class GrpcWorkerAgentRuntimeHost:
-    def __init__(self, address: str, extra_grpc_config: Optional[ChannelArgumentType] = None) -> None:
-        self._server = grpc.aio.server(options=extra_grpc_config)
-        self._servicer = GrpcWorkerAgentRuntimeHostServicer()
+    """The host of the agents of :class:`~autogen_ext.runtimes.grpc.GrpcWorkerAgentRuntime` workers.
+
+    Args:
+        address (str): The address to serve on.
+        extra_grpc_config (ChannelArgumentType, optional): Extra gRPC server options. Defaults to None.
+        message_batching (MessageBatching, optional): When to send the messages to a worker together in one frame,
+            for the workers that accept batches. If None, messages are sent one by one. Defaults to None.
+        compression (grpc.Compression, optional): The compression of the messages sent to workers. Defaults to None
+            (no compression).
+        rpc_timeout (float, optional): The number of seconds to wait for the response to an RPC request that has
+            no deadline. If None, such requests wait until their response arrives. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        extra_grpc_config: Optional[ChannelArgumentType] = None,
+        message_batching: Optional[MessageBatching] = None,
+        compression: Optional[grpc.Compression] = None,
+        rpc_timeout: Optional[float] = None,
+    ) -> None:
+        self._server = grpc.aio.server(options=extra_grpc_config, compression=compression)
+        self._servicer = GrpcWorkerAgentRuntimeHostServicer(message_batching=message_batching, rpc_timeout=rpc_timeout)
         agent_worker_pb2_grpc.add_AgentRpcServicer_to_server(self._servicer, self._server)
         self._server.add_insecure_port(address)
         self._address = address
@@ -49,6 +71,13 @@ async def stop(self, grace: int = 5) -> None:
         logger.info("Server stopped.")
         self._serve_task = None
 
+    def rpc_metrics(self) -> RpcMetrics:
+        """Return the RPC counters of the host.
+
+        :attr:`~autogen_ext.runtimes.grpc.RpcMetrics.in_flight` is the current number of requests sent to a
+        worker and waiting for its response."""
+        return self._servicer.rpc_metrics()
+
     async def stop_when_signal(
         self, grace: int = 5, signals: Sequence[signal.Signals] = (signal.SIGTERM, signal.SIGINT)
     ) -> None:
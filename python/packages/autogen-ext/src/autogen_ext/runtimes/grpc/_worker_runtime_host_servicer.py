@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from abc import ABC, abstractmethod
-from asyncio import Future, Task
-from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Sequence, Set, Tuple, TypeVar
+from asyncio import Task
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, List, Sequence, Set, Tuple, TypeVar
 
-from autogen_core import TopicId
+from autogen_core import Subscription, TopicId
 from autogen_core._agent_id import AgentId
 from autogen_core._runtime_impl_helpers import SubscriptionManager
 
+from . import _constants
+from ._batching import ACCEPT_BATCH_METADATA_KEY, MessageBatcher, MessageBatching, unbatch
 from ._constants import GRPC_IMPORT_ERROR_STR
+from ._hash_ring import HashRing
+from ._rpc_deadlines import RpcMetrics, TimerWheel, deadline_to_loop_time
 from ._utils import subscription_from_proto, subscription_to_proto
 
 try:
@@ -61,9 +67,12 @@ async def _receive_messages(self, client_id: ClientConnectionId, request_iterato
     def __aiter__(self) -> AsyncIterator[SendT]:
         return self
 
+    async def _next_message(self) -> SendT:
+        return await self._send_queue.get()
+
     async def __anext__(self) -> SendT:
         try:
-            return await self._send_queue.get()
+            return await self._next_message()
         except StopAsyncIteration:
             await self._receiving_task
             raise
@@ -94,22 +103,92 @@ async def _handle_message(self, message: ReceiveT) -> None:
         await self._handle_callback(message)
 
 
-class GrpcWorkerAgentRuntimeHostServicer(agent_worker_pb2_grpc.AgentRpcServicer):
-    """A gRPC servicer that hosts message delivery service for agents."""
+class BatchingChannelConnection(CallbackChannelConnection[agent_worker_pb2.Message, agent_worker_pb2.Message]):
+    """A channel connection that sends the queued messages in batches, when batching is enabled."""
+
+    def __init__(
+        self,
+        request_iterator: AsyncIterator[agent_worker_pb2.Message],
+        client_id: str,
+        handle_callback: Callable[[agent_worker_pb2.Message], Awaitable[None]],
+        batching: MessageBatching | None,
+    ) -> None:
+        super().__init__(request_iterator, client_id, handle_callback=handle_callback)
+        self._batcher = MessageBatcher(self._send_queue, batching)
+
+    async def _next_message(self) -> agent_worker_pb2.Message:
+        return await self._batcher.get()
+
+    def close(self) -> None:
+        self._batcher.close()
+
 
-    def __init__(self) -> None:
+@dataclass
+class _AgentTypeClients:
+    """The clients of an agent type.
+
+    Messages are routed with ``routing``, while changes are made to ``latest``. The clients that deliver
+    messages locally may still route with ``routing``, so ``latest`` only replaces it once they have all
+    acknowledged its ``epoch``."""
+
+    routing: HashRing = field(default_factory=HashRing)
+    latest: HashRing = field(default_factory=HashRing)
+    epoch: int = 0
+    active_epoch: int = 0
+    # The clients that have yet to acknowledge the latest epoch.
+    pending_acks: Set[ClientConnectionId] = field(default_factory=set)
+
+
+class GrpcWorkerAgentRuntimeHostServicer(agent_worker_pb2_grpc.AgentRpcServicer):
+    """A gRPC servicer that hosts message delivery service for agents.
+
+    Several workers can register the same agent type. The agents of the type are then spread over
+    the workers by consistent hashing of their keys, so that all messages to an agent go to the same
+    worker, and only a share of the agents move to another worker when a worker joins or leaves.
+    The events sent to such workers list the agents each worker should deliver them to.
+
+    The workers of an agent type are sent the list of these workers whenever it changes, so that
+    they can deliver messages to their own agents without a round trip through the host. The host
+    keeps routing with the previous list until the workers that deliver messages locally acknowledge
+    the new one, so that a worker never delivers a message locally that the host routes elsewhere.
+
+    An RPC request that is not answered by its deadline is answered with an error, and its response is
+    dropped if it arrives later. The requests to a worker that disconnects are answered with an error.
+
+    Args:
+        message_batching (MessageBatching | None, optional): When to send the messages to a worker together
+            in one frame, for the workers that accept batches. If None, messages are sent one by one.
+            Defaults to None.
+        rpc_timeout (float | None, optional): The number of seconds to wait for the response to an RPC
+            request that has no deadline. If None, such requests wait until their response arrives.
+            Defaults to None.
+    """
+
+    def __init__(self, message_batching: MessageBatching | None = None, rpc_timeout: float | None = None) -> None:
+        if rpc_timeout is not None and rpc_timeout <= 0:
+            raise ValueError("rpc_timeout must be greater than 0.")
+        self._message_batching = message_batching
+        self._rpc_timeout = rpc_timeout
         self._data_connections: Dict[
             ClientConnectionId, ChannelConnection[agent_worker_pb2.Message, agent_worker_pb2.Message]
         ] = {}
         self._control_connections: Dict[
             ClientConnectionId, ChannelConnection[agent_worker_pb2.ControlMessage, agent_worker_pb2.ControlMessage]
         ] = {}
-        self._agent_type_to_client_id_lock = asyncio.Lock()
-        self._agent_type_to_client_id: Dict[str, ClientConnectionId] = {}
-        self._pending_responses: Dict[ClientConnectionId, Dict[str, Future[Any]]] = {}
+        self._agent_type_clients_lock = asyncio.Lock()
+        self._agent_type_clients: Dict[str, _AgentTypeClients] = {}
+        # The clients that deliver messages to their own agents.
+        self._local_delivery_clients: Set[ClientConnectionId] = set()
+        # The client waiting for the response to each request, by the client the request was sent to.
+        self._pending_responses: Dict[ClientConnectionId, Dict[str, ClientConnectionId]] = {}
+        self._response_deadlines = TimerWheel[Tuple[ClientConnectionId, str]](self._expire_request)
+        self._rpc_metrics = RpcMetrics()
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
         self._client_id_to_subscription_id_mapping: Dict[ClientConnectionId, set[str]] = {}
+        # Subscriptions that are equal to a subscription of another client, because the clients share an
+        # agent type. They are added when the subscription of the other client is removed.
+        self._standby_subscriptions: Dict[ClientConnectionId, Dict[str, Subscription]] = {}
 
     async def OpenChannel(  # type: ignore
         self,
@@ -117,12 +196,21 @@ async def OpenChannel(  # type: ignore
         context: grpc.aio.ServicerContext[agent_worker_pb2.Message, agent_worker_pb2.Message],
     ) -> AsyncIterator[agent_worker_pb2.Message]:
         client_id = await get_client_id_or_abort(context)
+        # The type hint on context.invocation_metadata() is incorrect.
+        metadata = metadata_to_dict(context.invocation_metadata())  # type: ignore
+        accepts_batches = metadata.get(ACCEPT_BATCH_METADATA_KEY) == "true"
+        if metadata.get(_constants.LOCAL_DELIVERY_METADATA_KEY) == "true":
+            self._local_delivery_clients.add(client_id)
 
         async def handle_callback(message: agent_worker_pb2.Message) -> None:
-            await self._receive_message(client_id, message)
-
-        connection = CallbackChannelConnection[agent_worker_pb2.Message, agent_worker_pb2.Message](
-            request_iterator, client_id, handle_callback=handle_callback
+            for item in unbatch(message):
+                await self._receive_message(client_id, item)
+
+        connection = BatchingChannelConnection(
+            request_iterator,
+            client_id,
+            handle_callback=handle_callback,
+            batching=self._message_batching if accepts_batches else None,
         )
         self._data_connections[client_id] = connection
         logger.info(f"Client {client_id} connected.")
@@ -132,10 +220,15 @@ async def handle_callback(message: agent_worker_pb2.Message) -> None:
                 yield message
         finally:
             # Clean up the client connection.
+            connection.close()
             del self._data_connections[client_id]
-            # Cancel pending requests sent to this client.
-            for future in self._pending_responses.pop(client_id, {}).values():
-                future.cancel()
+            # Fail the pending requests sent to this client.
+            for request_id, caller_client_id in self._pending_responses.pop(client_id, {}).items():
+                self._response_deadlines.cancel((client_id, request_id))
+                error = f"Client {client_id} disconnected before responding."
+                await self._send_response(
+                    caller_client_id, agent_worker_pb2.RpcResponse(request_id=request_id, error=error)
+                )
             # Remove the client id from the agent type to client id mapping.
             await self._on_client_disconnect(client_id)
 
@@ -163,20 +256,96 @@ async def handle_callback(message: agent_worker_pb2.ControlMessage) -> None:
             del self._control_connections[client_id]
 
     async def _on_client_disconnect(self, client_id: ClientConnectionId) -> None:
-        async with self._agent_type_to_client_id_lock:
-            agent_types = [agent_type for agent_type, id_ in self._agent_type_to_client_id.items() if id_ == client_id]
+        async with self._agent_type_clients_lock:
+            self._local_delivery_clients.discard(client_id)
+            agent_types = [
+                agent_type for agent_type, clients in self._agent_type_clients.items() if client_id in clients.latest
+            ]
             for agent_type in agent_types:
-                logger.info(f"Removing agent type {agent_type} from agent type to client id mapping")
-                del self._agent_type_to_client_id[agent_type]
-            for sub_id in self._client_id_to_subscription_id_mapping.get(client_id, set()):
-                logger.info(f"Client id {client_id} disconnected. Removing corresponding subscription with id {id}")
+                logger.info(f"Removing client {client_id} from the clients of agent type {agent_type}")
+                clients = self._agent_type_clients[agent_type]
+                # Messages can no longer be routed to the client. The other clients keep their agents, so
+                # they can still route with the previous clients until they acknowledge the change.
+                clients.routing.remove(client_id)
+                clients.latest.remove(client_id)
+                if len(clients.latest) == 0:
+                    del self._agent_type_clients[agent_type]
+                else:
+                    await self._change_agent_type_clients(agent_type)
+            self._standby_subscriptions.pop(client_id, None)
+            for sub_id in self._client_id_to_subscription_id_mapping.pop(client_id, set()):
+                logger.info(f"Client id {client_id} disconnected. Removing corresponding subscription with id {sub_id}")
                 try:
                     await self._subscription_manager.remove_subscription(sub_id)
                 # Catch and ignore if the subscription does not exist.
                 except ValueError:
                     continue
+            await self._add_standby_subscriptions()
         logger.info(f"Client {client_id} disconnected successfully")
 
+    async def _change_agent_type_clients(self, agent_type: str) -> None:
+        # The clients that deliver messages locally stop doing so for the agent type until the change
+        # is active, and the host routes with the previous clients until they acknowledge it.
+        clients = self._agent_type_clients[agent_type]
+        clients.epoch += 1
+        clients.pending_acks = clients.routing.nodes & clients.latest.nodes & self._local_delivery_clients
+        if clients.pending_acks:
+            await self._send_agent_type_clients(agent_type, active=False)
+        await self._maybe_activate_agent_type_clients(agent_type)
+
+    async def _acknowledge_agent_type_clients(
+        self, client_id: ClientConnectionId, message: agent_worker_pb2.AgentTypeClients
+    ) -> None:
+        async with self._agent_type_clients_lock:
+            clients = self._agent_type_clients.get(message.type)
+            if clients is None or message.epoch != clients.epoch:
+                # The acknowledged change was superseded.
+                return
+            clients.pending_acks.discard(client_id)
+            await self._maybe_activate_agent_type_clients(message.type)
+
+    async def _maybe_activate_agent_type_clients(self, agent_type: str) -> None:
+        clients = self._agent_type_clients[agent_type]
+        if clients.pending_acks or clients.active_epoch == clients.epoch:
+            return
+        clients.routing = HashRing()
+        for client_id in clients.latest.nodes:
+            clients.routing.add(client_id)
+        clients.active_epoch = clients.epoch
+        await self._send_agent_type_clients(agent_type, active=True)
+
+    async def _send_agent_type_clients(self, agent_type: str, active: bool) -> None:
+        # Tell the clients of an agent type which clients host it, so that they can route messages
+        # to their own agents locally like the host does.
+        clients = self._agent_type_clients[agent_type]
+        client_ids = clients.latest.nodes
+        message = agent_worker_pb2.Message(
+            agentTypeClients=agent_worker_pb2.AgentTypeClients(
+                type=agent_type, client_ids=sorted(client_ids), epoch=clients.epoch, active=active
+            )
+        )
+        for client_id in client_ids:
+            connection = self._data_connections.get(client_id)
+            if connection is not None:
+                await connection.send(message)
+
+    def _get_client_id(self, agent_type: str, agent_key: str) -> ClientConnectionId | None:
+        clients = self._agent_type_clients.get(agent_type)
+        if clients is None:
+            return None
+        return clients.routing.get(agent_key)
+
+    async def _add_standby_subscriptions(self) -> None:
+        # Add the standby subscriptions that no longer have an equal subscription.
+        for client_id, standby_subscriptions in self._standby_subscriptions.items():
+            for sub_id, subscription in list(standby_subscriptions.items()):
+                try:
+                    await self._subscription_manager.add_subscription(subscription)
+                except ValueError:
+                    continue
+                del standby_subscriptions[sub_id]
+                self._client_id_to_subscription_id_mapping.setdefault(client_id, set()).add(sub_id)
+
     def _raise_on_exception(self, task: Task[Any]) -> None:
         exception = task.exception()
         if exception is not None:
@@ -203,6 +372,8 @@ async def _receive_message(self, client_id: ClientConnectionId, message: agent_w
                 self._background_tasks.add(task)
                 task.add_done_callback(self._raise_on_exception)
                 task.add_done_callback(self._background_tasks.discard)
+            case "agentTypeClients":
+                await self._acknowledge_agent_type_clients(client_id, message.agentTypeClients)
             case None:
                 logger.warning("Received empty message")
 
@@ -213,7 +384,7 @@ async def _receive_control_message(
         destination = message.destination
         if destination.startswith("agentid="):
             agent_id = AgentId.from_str(destination[len("agentid=") :])
-            target_client_id = self._agent_type_to_client_id.get(agent_id.type)
+            target_client_id = self._get_client_id(agent_id.type, agent_id.key)
             if target_client_id is None:
                 logger.error(f"Agent client id not found for agent type {agent_id.type}.")
                 return
@@ -230,9 +401,25 @@ async def _receive_control_message(
         await target_send_queue.send(message)
 
     async def _process_request(self, request: agent_worker_pb2.RpcRequest, client_id: ClientConnectionId) -> None:
-        # Deliver the message to a client given the target agent type.
-        async with self._agent_type_to_client_id_lock:
-            target_client_id = self._agent_type_to_client_id.get(request.target.type)
+        deadline: float | None = None
+        if request.HasField("deadline"):
+            deadline = deadline_to_loop_time(request.deadline)
+        elif self._rpc_timeout is not None:
+            deadline = asyncio.get_running_loop().time() + self._rpc_timeout
+        if deadline is not None and deadline <= asyncio.get_running_loop().time():
+            # The caller has stopped waiting for the response.
+            self._rpc_metrics.timed_out += 1
+            await self._send_response(
+                client_id,
+                agent_worker_pb2.RpcResponse(
+                    request_id=request.request_id, error=_constants.RPC_DEADLINE_EXCEEDED_ERROR
+                ),
+            )
+            return
+
+        # Deliver the message to the client of the target agent.
+        async with self._agent_type_clients_lock:
+            target_client_id = self._get_client_id(request.target.type, request.target.key)
         if target_client_id is None:
             logger.error(f"Agent {request.target.type} not found, failed to deliver message.")
             return
@@ -240,49 +427,104 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest, client_id
         if target_send_queue is None:
             logger.error(f"Client {target_client_id} not found, failed to deliver message.")
             return
+
+        # Remember where to send the response back to, before the target can respond.
+        pending_responses = self._pending_responses.setdefault(target_client_id, {})
+        pending_responses[request.request_id] = client_id
+        self._rpc_metrics.max_in_flight = max(self._rpc_metrics.max_in_flight, self._num_pending_responses())
+        if deadline is not None:
+            self._response_deadlines.schedule((target_client_id, request.request_id), deadline)
         await target_send_queue.send(agent_worker_pb2.Message(request=request))
 
-        # Create a future to wait for the response from the target.
-        future = asyncio.get_event_loop().create_future()
-        self._pending_responses.setdefault(target_client_id, {})[request.request_id] = future
+    def _num_pending_responses(self) -> int:
+        return sum(len(pending_responses) for pending_responses in self._pending_responses.values())
 
-        # Create a task to wait for the response and send it back to the client.
-        send_response_task = asyncio.create_task(self._wait_and_send_response(future, client_id))
-        self._background_tasks.add(send_response_task)
-        send_response_task.add_done_callback(self._raise_on_exception)
-        send_response_task.add_done_callback(self._background_tasks.discard)
+    def rpc_metrics(self) -> RpcMetrics:
+        """Return the RPC counters of the host.
 
-    async def _wait_and_send_response(
-        self, future: Future[agent_worker_pb2.RpcResponse], client_id: ClientConnectionId
-    ) -> None:
-        response = await future
-        message = agent_worker_pb2.Message(response=response)
+        The counters accumulate over the lifetime of the host, while
+        :attr:`~autogen_ext.runtimes.grpc.RpcMetrics.in_flight` is the current number of requests sent to a
+        worker and waiting for its response."""
+        metrics = replace(self._rpc_metrics)
+        metrics.in_flight = self._num_pending_responses()
+        return metrics
+
+    def _expire_request(self, key: Tuple[ClientConnectionId, str]) -> None:
+        target_client_id, request_id = key
+        caller_client_id = self._pending_responses.get(target_client_id, {}).pop(request_id, None)
+        if caller_client_id is None:
+            return
+        self._rpc_metrics.timed_out += 1
+        response = agent_worker_pb2.RpcResponse(request_id=request_id, error=_constants.RPC_DEADLINE_EXCEEDED_ERROR)
+        task = asyncio.create_task(self._send_response(caller_client_id, response))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._raise_on_exception)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _send_response(self, client_id: ClientConnectionId, response: agent_worker_pb2.RpcResponse) -> None:
         send_queue = self._data_connections.get(client_id)
         if send_queue is None:
             logger.error(f"Client {client_id} not found, failed to send response message.")
             return
-        await send_queue.send(message)
+        await send_queue.send(agent_worker_pb2.Message(response=response))
 
     async def _process_response(self, response: agent_worker_pb2.RpcResponse, client_id: ClientConnectionId) -> None:
-        # Setting the result of the future will send the response back to the original sender.
-        future = self._pending_responses[client_id].pop(response.request_id)
-        future.set_result(response)
+        caller_client_id = self._pending_responses.get(client_id, {}).pop(response.request_id, None)
+        if caller_client_id is None:
+            # The request timed out, and the caller was already answered.
+            self._rpc_metrics.late_responses += 1
+            logger.warning(f"Dropped the response to request {response.request_id} from client {client_id}.")
+            return
+        self._response_deadlines.cancel((client_id, response.request_id))
+        await self._send_response(caller_client_id, response)
 
     async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         topic_id = TopicId(type=event.type, source=event.source)
         recipients = await self._subscription_manager.get_subscribed_recipients(topic_id)
-        # Get the client ids of the recipients.
-        async with self._agent_type_to_client_id_lock:
-            client_ids: Set[ClientConnectionId] = set()
+        # Whether the clients must be told which of their agents to deliver the event to.
+        list_recipients = False
+        if _constants.AGENT_DELIVERED_RECIPIENTS_ATTR in event.attributes:
+            # The publishing client delivered the event to its own agents. It skips the sender, so the
+            # sender is not a recipient either.
+            delivered = set(json.loads(event.attributes[_constants.AGENT_DELIVERED_RECIPIENTS_ATTR].ce_string))
+            sender = AgentId(
+                event.attributes[_constants.AGENT_SENDER_TYPE_ATTR].ce_string,
+                event.attributes[_constants.AGENT_SENDER_KEY_ATTR].ce_string,
+            )
+            recipients = [
+                recipient for recipient in recipients if str(recipient) not in delivered and recipient != sender
+            ]
+            list_recipients = True
+            forwarded_event = cloudevent_pb2.CloudEvent()
+            forwarded_event.CopyFrom(event)
+            del forwarded_event.attributes[_constants.AGENT_DELIVERED_RECIPIENTS_ATTR]
+            event = forwarded_event
+        # Get the client ids of the recipients, and the recipients of each client.
+        async with self._agent_type_clients_lock:
+            client_recipients: Dict[ClientConnectionId, List[AgentId]] = {}
+            # The clients that share the agent type of one of their recipients with other clients, or that
+            # get an event which was already delivered to some of its recipients.
+            listed_client_ids: Set[ClientConnectionId] = set()
             for recipient in recipients:
-                client_id = self._agent_type_to_client_id.get(recipient.type)
+                client_id = self._get_client_id(recipient.type, recipient.key)
                 if client_id is not None:
-                    client_ids.add(client_id)
+                    if recipient not in client_recipients.setdefault(client_id, []):
+                        client_recipients[client_id].append(recipient)
+                    if list_recipients or len(self._agent_type_clients[recipient.type].routing) > 1:
+                        listed_client_ids.add(client_id)
                 else:
                     logger.error(f"Agent {recipient.type} and its client not found for topic {topic_id}.")
         # Deliver the event to clients.
-        for client_id in client_ids:
-            await self._data_connections[client_id].send(agent_worker_pb2.Message(cloudEvent=event))
+        for client_id, agent_ids in client_recipients.items():
+            client_event = event
+            if client_id in listed_client_ids:
+                # The other clients of the agent types deliver the event to the other agents.
+                client_event = cloudevent_pb2.CloudEvent()
+                client_event.CopyFrom(event)
+                client_event.attributes[_constants.AGENT_RECIPIENTS_ATTR].ce_string = json.dumps(
+                    [str(agent_id) for agent_id in agent_ids]
+                )
+            await self._data_connections[client_id].send(agent_worker_pb2.Message(cloudEvent=client_event))
 
     async def RegisterAgent(  # type: ignore
         self,
@@ -293,15 +535,16 @@ async def RegisterAgent(  # type: ignore
     ) -> agent_worker_pb2.RegisterAgentTypeResponse:
         client_id = await get_client_id_or_abort(context)
 
-        async with self._agent_type_to_client_id_lock:
-            if request.type in self._agent_type_to_client_id:
-                existing_client_id = self._agent_type_to_client_id[request.type]
+        async with self._agent_type_clients_lock:
+            clients = self._agent_type_clients.setdefault(request.type, _AgentTypeClients())
+            if client_id in clients.latest:
                 await context.abort(
                     grpc.StatusCode.INVALID_ARGUMENT,
-                    f"Agent type {request.type} already registered with client {existing_client_id}.",
+                    f"Agent type {request.type} already registered with client {client_id}.",
                 )
             else:
-                self._agent_type_to_client_id[request.type] = client_id
+                clients.latest.add(client_id)
+                await self._change_agent_type_clients(request.type)
 
         return agent_worker_pb2.RegisterAgentTypeResponse()
 
@@ -320,9 +563,22 @@ async def AddSubscription(  # type: ignore
             subscription_ids = self._client_id_to_subscription_id_mapping.setdefault(client_id, set())
             subscription_ids.add(subscription.id)
         except ValueError as e:
-            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            if not self._is_subscribed_by_other_client(client_id, subscription):
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            # Workers that share an agent type add the same subscriptions. Keep this one until the
+            # equal subscription of the other client is removed.
+            self._standby_subscriptions.setdefault(client_id, {})[subscription.id] = subscription
         return agent_worker_pb2.AddSubscriptionResponse()
 
+    def _is_subscribed_by_other_client(self, client_id: ClientConnectionId, subscription: Subscription) -> bool:
+        equal_ids = {sub.id for sub in self._subscription_manager.subscriptions if sub == subscription}
+        if equal_ids & self._client_id_to_subscription_id_mapping.get(client_id, set()):
+            return False
+        standby_subscriptions = self._standby_subscriptions.get(client_id, {}).values()
+        if any(sub == subscription for sub in standby_subscriptions):
+            return False
+        return len(equal_ids) > 0
+
     async def RemoveSubscription(  # type: ignore
         self,
         request: agent_worker_pb2.RemoveSubscriptionRequest,
@@ -330,8 +586,12 @@ async def RemoveSubscription(  # type: ignore
             agent_worker_pb2.RemoveSubscriptionRequest, agent_worker_pb2.RemoveSubscriptionResponse
         ],
     ) -> agent_worker_pb2.RemoveSubscriptionResponse:
-        _client_id = await get_client_id_or_abort(context)
+        client_id = await get_client_id_or_abort(context)
+        if self._standby_subscriptions.get(client_id, {}).pop(request.id, None) is not None:
+            return agent_worker_pb2.RemoveSubscriptionResponse()
         await self._subscription_manager.remove_subscription(request.id)
+        self._client_id_to_subscription_id_mapping.get(client_id, set()).discard(request.id)
+        await self._add_standby_subscriptions()
         return agent_worker_pb2.RemoveSubscriptionResponse()
 
     async def GetSubscriptions(  # type: ignore
@@ -10,6 +10,7 @@ import google.protobuf.any_pb2
 import google.protobuf.descriptor
 import google.protobuf.internal.containers
 import google.protobuf.message
+import google.protobuf.timestamp_pb2
 import typing
 
 DESCRIPTOR: google.protobuf.descriptor.FileDescriptor
@@ -79,6 +80,7 @@ class RpcRequest(google.protobuf.message.Message):
     METHOD_FIELD_NUMBER: builtins.int
     PAYLOAD_FIELD_NUMBER: builtins.int
     METADATA_FIELD_NUMBER: builtins.int
+    DEADLINE_FIELD_NUMBER: builtins.int
     request_id: builtins.str
     method: builtins.str
     @property
@@ -89,6 +91,10 @@ class RpcRequest(google.protobuf.message.Message):
     def payload(self) -> global___Payload: ...
     @property
     def metadata(self) -> google.protobuf.internal.containers.ScalarMap[builtins.str, builtins.str]: ...
+    @property
+    def deadline(self) -> google.protobuf.timestamp_pb2.Timestamp:
+        """When the caller stops waiting for the response. Unset if the caller waits until the response arrives."""
+
     def __init__(
         self,
         *,
@@ -98,9 +104,10 @@ class RpcRequest(google.protobuf.message.Message):
         method: builtins.str = ...,
         payload: global___Payload | None = ...,
         metadata: collections.abc.Mapping[builtins.str, builtins.str] | None = ...,
+        deadline: google.protobuf.timestamp_pb2.Timestamp | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing.Literal["_source", b"_source", "payload", b"payload", "source", b"source", "target", b"target"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing.Literal["_source", b"_source", "metadata", b"metadata", "method", b"method", "payload", b"payload", "request_id", b"request_id", "source", b"source", "target", b"target"]) -> None: ...
+    def HasField(self, field_name: typing.Literal["_source", b"_source", "deadline", b"deadline", "payload", b"payload", "source", b"source", "target", b"target"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["_source", b"_source", "deadline", b"deadline", "metadata", b"metadata", "method", b"method", "payload", b"payload", "request_id", b"request_id", "source", b"source", "target", b"target"]) -> None: ...
     def WhichOneof(self, oneof_group: typing.Literal["_source", b"_source"]) -> typing.Literal["source"] | None: ...
 
 global___RpcRequest = RpcRequest
@@ -312,6 +319,57 @@ class GetSubscriptionsResponse(google.protobuf.message.Message):
 
 global___GetSubscriptionsResponse = GetSubscriptionsResponse
 
+@typing.final
+class AgentTypeClients(google.protobuf.message.Message):
+    """The clients that host an agent type. The host sends it to these clients when they change,
+    so that they can deliver messages between their own agents without a round trip through the host.
+    A change is first sent inactive: the clients stop delivering messages of the agent type locally,
+    and acknowledge it by sending back its type and epoch. Once acknowledged, the host routes messages
+    with the new clients and sends them again, active, so that the clients resume local delivery.
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    TYPE_FIELD_NUMBER: builtins.int
+    CLIENT_IDS_FIELD_NUMBER: builtins.int
+    EPOCH_FIELD_NUMBER: builtins.int
+    ACTIVE_FIELD_NUMBER: builtins.int
+    type: builtins.str
+    epoch: builtins.int
+    """Increases with every change of the clients of the agent type."""
+    active: builtins.bool
+    @property
+    def client_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    def __init__(
+        self,
+        *,
+        type: builtins.str = ...,
+        client_ids: collections.abc.Iterable[builtins.str] | None = ...,
+        epoch: builtins.int = ...,
+        active: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["active", b"active", "client_ids", b"client_ids", "epoch", b"epoch", "type", b"type"]) -> None: ...
+
+global___AgentTypeClients = AgentTypeClients
+
+@typing.final
+class MessageBatch(google.protobuf.message.Message):
+    """Several messages sent in one frame of the channel, when message batching is enabled."""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGES_FIELD_NUMBER: builtins.int
+    @property
+    def messages(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Message]: ...
+    def __init__(
+        self,
+        *,
+        messages: collections.abc.Iterable[global___Message] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["messages", b"messages"]) -> None: ...
+
+global___MessageBatch = MessageBatch
+
 @typing.final
 class Message(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
@@ -319,22 +377,30 @@ class Message(google.protobuf.message.Message):
     REQUEST_FIELD_NUMBER: builtins.int
     RESPONSE_FIELD_NUMBER: builtins.int
     CLOUDEVENT_FIELD_NUMBER: builtins.int
+    AGENTTYPECLIENTS_FIELD_NUMBER: builtins.int
+    BATCH_FIELD_NUMBER: builtins.int
     @property
     def request(self) -> global___RpcRequest: ...
     @property
     def response(self) -> global___RpcResponse: ...
     @property
     def cloudEvent(self) -> cloudevent_pb2.CloudEvent: ...
+    @property
+    def agentTypeClients(self) -> global___AgentTypeClients: ...
+    @property
+    def batch(self) -> global___MessageBatch: ...
     def __init__(
         self,
         *,
         request: global___RpcRequest | None = ...,
         response: global___RpcResponse | None = ...,
         cloudEvent: cloudevent_pb2.CloudEvent | None = ...,
+        agentTypeClients: global___AgentTypeClients | None = ...,
+        batch: global___MessageBatch | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing.Literal["cloudEvent", b"cloudEvent", "message", b"message", "request", b"request", "response", b"response"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing.Literal["cloudEvent", b"cloudEvent", "message", b"message", "request", b"request", "response", b"response"]) -> None: ...
-    def WhichOneof(self, oneof_group: typing.Literal["message", b"message"]) -> typing.Literal["request", "response", "cloudEvent"] | None: ...
+    def HasField(self, field_name: typing.Literal["agentTypeClients", b"agentTypeClients", "batch", b"batch", "cloudEvent", b"cloudEvent", "message", b"message", "request", b"request", "response", b"response"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["agentTypeClients", b"agentTypeClients", "batch", b"batch", "cloudEvent", b"cloudEvent", "message", b"message", "request", b"request", "response", b"response"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing.Literal["message", b"message"]) -> typing.Literal["request", "response", "cloudEvent", "agentTypeClients", "batch"] | None: ...
 
 global___Message = Message
 
@@ -0,0 +1,5 @@
+from ._process_pool_runtime import ProcessPoolAgentRuntime
+
+__all__ = [
+    "ProcessPoolAgentRuntime",
+]
@@ -0,0 +1,653 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import pickle
+import threading
+import uuid
+from asyncio import Future, Task
+from collections import defaultdict
+from functools import partial
+from multiprocessing.connection import wait
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    Mapping,
+    Sequence,
+    Set,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from autogen_core import (
+    Agent,
+    AgentId,
+    AgentMetadata,
+    AgentRuntime,
+    AgentType,
+    CancellationToken,
+    MessageSerializer,
+    Subscription,
+    TopicId,
+)
+from autogen_core._runtime_impl_helpers import SubscriptionManager
+from autogen_core._serialization import SerializationRegistry
+from autogen_core._telemetry import (
+    EnvelopeMetadata,
+    MessageRuntimeTracingConfig,
+    TraceHelper,
+    get_telemetry_envelope_metadata,
+)
+from opentelemetry.trace import TracerProvider
+
+from ._protocol import (
+    AddSerializers,
+    AgentCall,
+    Deliver,
+    PublishRequest,
+    RegisterFactory,
+    Result,
+    RuntimeCall,
+    SendRequest,
+    SerializedPayload,
+    Shutdown,
+    WorkerExited,
+    error_result,
+    result_error,
+    shard_for,
+)
+from ._worker import deserialize_payload, run_worker, serialize_payload
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+logger = logging.getLogger("autogen_core")
+
+T = TypeVar("T", bound=Agent)
+
+# Runtime methods that agents in a worker process can call on this runtime.
+_RUNTIME_CALLS = {
+    "save_state",
+    "load_state",
+    "agent_metadata",
+    "agent_save_state",
+    "agent_load_state",
+    "add_subscription",
+    "remove_subscription",
+    "register_factory",
+}
+
+
+class ProcessPoolAgentRuntime(AgentRuntime):
+    """An agent runtime that shards agent instances across a pool of worker processes.
+
+    Each agent is hosted by the worker selected by a stable hash of its :class:`~autogen_core.AgentId`,
+    so CPU-heavy handlers in one worker do not block agents hosted by the others. Subscriptions
+    are managed centrally by this runtime, which routes every sent and published message to the
+    worker hosting the recipient. Messages cross process boundaries in their serialized form,
+    so every message type must have a serializer registered with :meth:`add_message_serializer`
+    (agents registered with :meth:`~autogen_core.BaseAgent.register` add their handled types automatically).
+
+    Agent factories, expected classes and message types are pickled and sent to the worker
+    processes, so they must be importable module-level objects, for example an agent class
+    or a :func:`functools.partial` of one. Lambdas and local functions are not supported.
+
+    If a worker process exits unexpectedly, for example because a handler crashed the interpreter,
+    the requests it was handling fail with a :class:`RuntimeError`, and so do later messages to the
+    agents it hosted, until the runtime is restarted. The state of those agents is lost.
+
+    Exceptions raised by handlers in the worker processes are sent to the caller as their message
+    and type name, because they may not be picklable. Built-in exceptions, such as :class:`ValueError`
+    or :class:`LookupError`, and those of :mod:`autogen_core.exceptions`, such as
+    :class:`~autogen_core.exceptions.CantHandleException`, are raised again with the same type. Other
+    exceptions are raised as :class:`Exception` with the original message, unlike in
+    :class:`~autogen_core.SingleThreadedAgentRuntime`, which raises the original exception.
+
+    .. note::
+
+        Intervention handlers are not supported, and the main process cannot access agent instances with
+        :meth:`try_get_underlying_agent_instance` because agents do not live in it. Agents can access the
+        other agents of their worker process through the runtime of the worker. Cancellation tokens are not
+        propagated to the worker processes.
+
+    Args:
+        num_workers (int | None, optional): The number of worker processes. Defaults to the number of CPUs.
+        mp_context (BaseContext | None, optional): The multiprocessing context used to start the workers.
+            Defaults to the ``"spawn"`` context.
+        shutdown_timeout (float, optional): The number of seconds :meth:`stop` waits for each worker process
+            to finish its messages before terminating it. Defaults to 10.
+        tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
+
+    Example:
+
+        .. code-block:: python
+
+            import asyncio
+            from dataclasses import dataclass
+
+            from autogen_core import AgentId, MessageContext, RoutedAgent, message_handler
+            from autogen_ext.runtimes.process_pool import ProcessPoolAgentRuntime
+
+
+            @dataclass
+            class MyMessage:
+                content: str
+
+
+            class MyAgent(RoutedAgent):
+                def __init__(self) -> None:
+                    super().__init__("My agent")
+
+                @message_handler
+                async def handle_my_message(self, message: MyMessage, ctx: MessageContext) -> MyMessage:
+                    return MyMessage(content=message.content.upper())
+
+
+            async def main() -> None:
+                runtime = ProcessPoolAgentRuntime(num_workers=4)
+                await MyAgent.register(runtime, "my_agent", MyAgent)
+                runtime.start()
+                response = await runtime.send_message(MyMessage("hello"), AgentId("my_agent", "default"))
+                print(response)
+                await runtime.stop()
+
+
+            if __name__ == "__main__":
+                asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        *,
+        num_workers: int | None = None,
+        mp_context: BaseContext | None = None,
+        shutdown_timeout: float = 10.0,
+        tracer_provider: TracerProvider | None = None,
+    ) -> None:
+        if num_workers is None:
+            num_workers = multiprocessing.cpu_count()
+        if num_workers <= 0:
+            raise ValueError("num_workers must be greater than 0.")
+        self._num_workers = num_workers
+        self._shutdown_timeout = shutdown_timeout
+        self._mp_context = mp_context or multiprocessing.get_context("spawn")
+        self._trace_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("ProcessPoolAgentRuntime"))
+        self._agent_factories: Dict[str, RegisterFactory] = {}
+        self._subscription_manager = SubscriptionManager()
+        self._serialization_registry = SerializationRegistry()
+        self._serializers: List[MessageSerializer[Any]] = []
+        self._processes: List[BaseProcess] = []
+        self._inbound_queues: List["Queue[Any]"] = []
+        self._outbound_queue: "Queue[Any] | None" = None
+        self._reader: threading.Thread | None = None
+        self._monitor: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending_requests: Dict[str, Future[Any]] = {}
+        # The worker handling each pending request.
+        self._request_workers: Dict[str, int] = {}
+        # The exit codes of the workers that exited while the runtime was running.
+        self._exited_workers: Dict[int, int | None] = {}
+        self._stopping = False
+        self._background_tasks: Set[Task[Any]] = set()
+        # Number of deliveries and worker requests that have not finished yet.
+        self._outstanding = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def num_workers(self) -> int:
+        """The number of worker processes."""
+        return self._num_workers
+
+    @property
+    def _running(self) -> bool:
+        return self._outbound_queue is not None
+
+    def start(self) -> None:
+        """Start the worker processes. Must be called from within a running event loop."""
+        if self._running:
+            raise RuntimeError("Runtime is already started")
+        self._loop = asyncio.get_running_loop()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._outbound_queue = self._mp_context.Queue()
+        for index in range(self._num_workers):
+            inbound: "Queue[Any]" = self._mp_context.Queue()
+            process = self._mp_context.Process(  # type: ignore[attr-defined]
+                target=run_worker,
+                args=(
+                    index,
+                    self._num_workers,
+                    inbound,
+                    self._outbound_queue,
+                    list(self._agent_factories.values()),
+                    self._serializers,
+                ),
+                name=f"autogen-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._inbound_queues.append(inbound)
+            self._processes.append(process)
+
+        outbound = self._outbound_queue
+        loop = self._loop
+
+        def read_loop() -> None:
+            while True:
+                item = outbound.get()
+                if isinstance(item, Shutdown):
+                    return
+                loop.call_soon_threadsafe(self._handle_worker_message, item)
+
+        self._reader = threading.Thread(target=read_loop, name="autogen-process-pool-reader", daemon=True)
+        self._reader.start()
+
+        processes = list(self._processes)
+
+        def monitor_loop() -> None:
+            # Report exits through the outbound queue, after the results the workers put on it.
+            remaining = {process.sentinel: index for index, process in enumerate(processes)}
+            while remaining:
+                for sentinel in wait(list(remaining)):
+                    index = remaining.pop(cast(int, sentinel))
+                    # The sentinel is ready as the process ends, possibly before its exit code is.
+                    processes[index].join()
+                    outbound.put(WorkerExited(worker_index=index, exitcode=processes[index].exitcode))
+
+        self._monitor = threading.Thread(target=monitor_loop, name="autogen-process-pool-monitor", daemon=True)
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        """Immediately stop the worker processes. Messages being handled by the workers are completed,
+        but messages that have not been delivered yet are discarded. Workers that do not stop within
+        the shutdown timeout are terminated.
+
+        The agents hosted by the workers are closed and discarded with their processes.
+        Use :meth:`save_state` before stopping to keep their state."""
+        if not self._running:
+            raise RuntimeError("Runtime is not started")
+        assert self._outbound_queue is not None
+        self._stopping = True
+        for inbound in self._inbound_queues:
+            inbound.put(Shutdown())
+        for process in self._processes:
+            await asyncio.to_thread(process.join, self._shutdown_timeout)
+            if process.is_alive():
+                logger.warning(
+                    f"Worker process {process.name} did not stop within {self._shutdown_timeout} seconds, terminating it."
+                )
+                process.terminate()
+                await asyncio.to_thread(process.join)
+        if self._monitor is not None:
+            await asyncio.to_thread(self._monitor.join)
+        self._outbound_queue.put(Shutdown())
+        if self._reader is not None:
+            await asyncio.to_thread(self._reader.join)
+        for future in self._pending_requests.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Runtime stopped before the request completed."))
+        self._pending_requests.clear()
+        self._request_workers.clear()
+        self._exited_workers.clear()
+        self._processes = []
+        self._inbound_queues = []
+        self._outbound_queue = None
+        self._reader = None
+        self._monitor = None
+        self._outstanding = 0
+        self._stopping = False
+
+    async def wait_until_idle(self) -> None:
+        """Wait until no messages are being processed or waiting to be delivered."""
+        await self._idle.wait()
+
+    async def stop_when_idle(self) -> None:
+        """Stop the runtime once no messages are being processed or waiting to be delivered."""
+        await self.wait_until_idle()
+        await self.stop()
+
+    async def close(self) -> None:
+        """Calls :meth:`stop` if the runtime is running. Agents are closed by their worker processes."""
+        if self._running:
+            await self.stop()
+
+    def _track_start(self) -> None:
+        self._outstanding += 1
+        self._idle.clear()
+
+    def _track_done(self) -> None:
+        self._outstanding -= 1
+        if self._outstanding == 0:
+            self._idle.set()
+
+    def _create_task(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _request(self, worker_index: int, make_request: Callable[[str], Any]) -> Future[Any]:
+        """Put a request on a worker's queue and return a future for its result."""
+        assert self._loop is not None
+        request_id = str(uuid.uuid4())
+        future: Future[Any] = self._loop.create_future()
+        if worker_index in self._exited_workers:
+            future.set_exception(
+                RuntimeError(
+                    f"Worker process {worker_index} exited with code {self._exited_workers[worker_index]}, "
+                    "so the agents it hosted are no longer available."
+                )
+            )
+            return future
+        self._pending_requests[request_id] = future
+        self._request_workers[request_id] = worker_index
+        self._track_start()
+        self._inbound_queues[worker_index].put(make_request(request_id))
+        return future
+
+    def _handle_worker_message(self, item: Any) -> None:
+        match item:
+            case Result(request_id=request_id, value=value, error=error):
+                future = self._pending_requests.pop(request_id, None)
+                if future is None:
+                    return
+                self._request_workers.pop(request_id, None)
+                self._track_done()
+                if future.done():
+                    return
+                if error is not None:
+                    future.set_exception(result_error(item))
+                else:
+                    future.set_result(value)
+            case SendRequest():
+                # Track the request right away so the runtime is not considered idle
+                # between the handler that sent it finishing and the send being routed.
+                self._track_start()
+                self._create_task(self._process_worker_send(item))
+            case PublishRequest():
+                self._track_start()
+                self._create_task(self._process_worker_publish(item))
+            case RuntimeCall():
+                self._create_task(self._process_runtime_call(item))
+            case WorkerExited(worker_index=worker_index, exitcode=exitcode):
+                if not self._stopping:
+                    self._handle_worker_exit(worker_index, exitcode)
+            case _:
+                logger.warning(f"Received an unknown message from a worker: {item}")
+
+    def _handle_worker_exit(self, worker_index: int, exitcode: int | None) -> None:
+        """Fail the pending requests of a worker process that exited unexpectedly."""
+        logger.error(f"Worker process {worker_index} exited unexpectedly with code {exitcode}.")
+        self._exited_workers[worker_index] = exitcode
+        for request_id, owner in list(self._request_workers.items()):
+            if owner != worker_index:
+                continue
+            del self._request_workers[request_id]
+            future = self._pending_requests.pop(request_id)
+            self._track_done()
+            if not future.done():
+                future.set_exception(
+                    RuntimeError(
+                        f"Worker process {worker_index} exited with code {exitcode} before the request completed."
+                    )
+                )
+
+    async def _process_worker_send(self, request: SendRequest) -> None:
+        try:
+            value = await self._route_send(
+                request.payload, request.recipient, request.sender, request.message_id, request.metadata
+            )
+            result = Result(request_id=request.request_id, value=value)
+        except BaseException as e:
+            result = error_result(request.request_id, e)
+        finally:
+            self._track_done()
+        if self._running:
+            self._inbound_queues[request.worker_index].put(result)
+
+    async def _process_worker_publish(self, request: PublishRequest) -> None:
+        try:
+            await self._route_publish(
+                request.payload, request.topic_id, request.sender, request.message_id, request.metadata
+            )
+        except BaseException:
+            logger.error("Error routing published message", exc_info=True)
+        finally:
+            self._track_done()
+
+    async def _process_runtime_call(self, call: RuntimeCall) -> None:
+        try:
+            if call.method not in _RUNTIME_CALLS:
+                raise ValueError(f"Unknown runtime call: {call.method}")
+            value = await getattr(self, call.method)(*call.args, **call.kwargs)
+            result = Result(request_id=call.request_id, value=value)
+        except BaseException as e:
+            result = error_result(call.request_id, e)
+        if self._running:
+            self._inbound_queues[call.worker_index].put(result)
+
+    async def _route_send(
+        self,
+        payload: SerializedPayload,
+        recipient: AgentId,
+        sender: AgentId | None,
+        message_id: str,
+        metadata: EnvelopeMetadata | None,
+    ) -> SerializedPayload | None:
+        if recipient.type not in self._agent_factories:
+            raise LookupError(f"Agent type '{recipient.type}' does not exist.")
+        future = self._request(
+            shard_for(recipient, self._num_workers),
+            partial(
+                Deliver,
+                recipients=[recipient],
+                sender=sender,
+                topic_id=None,
+                is_rpc=True,
+                message_id=message_id,
+                payload=payload,
+                metadata=metadata,
+            ),
+        )
+        value: SerializedPayload | None = await future
+        return value
+
+    async def _route_publish(
+        self,
+        payload: SerializedPayload,
+        topic_id: TopicId,
+        sender: AgentId | None,
+        message_id: str,
+        metadata: EnvelopeMetadata | None,
+    ) -> None:
+        recipients_by_worker: DefaultDict[int, List[AgentId]] = defaultdict(list)
+        for agent_id in await self._subscription_manager.get_subscribed_recipients(topic_id):
+            # Avoid sending the message back to the sender
+            if sender is not None and agent_id == sender:
+                continue
+            recipients_by_worker[shard_for(agent_id, self._num_workers)].append(agent_id)
+        # One delivery per worker; the worker fans out to its local recipients.
+        for worker_index, recipients in recipients_by_worker.items():
+            future = self._request(
+                worker_index,
+                partial(
+                    Deliver,
+                    recipients=recipients,
+                    sender=sender,
+                    topic_id=topic_id,
+                    is_rpc=False,
+                    message_id=message_id,
+                    payload=payload,
+                    metadata=metadata,
+                ),
+            )
+            # Publishing does not wait for the deliveries, so report their errors here.
+            future.add_done_callback(partial(self._log_delivery_error, worker_index))
+
+    @staticmethod
+    def _log_delivery_error(worker_index: int, future: Future[Any]) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(
+                f"Error delivering published message in worker process {worker_index}", exc_info=future.exception()
+            )
+
+    async def send_message(
+        self,
+        message: Any,
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> Any:
+        if not self._running:
+            raise RuntimeError("Runtime must be running when sending message.")
+        if message_id is None:
+            message_id = str(uuid.uuid4())
+        with self._trace_helper.trace_block(
+            "create", recipient, parent=None, extraAttributes={"message_type": type(message).__name__}
+        ):
+            payload = serialize_payload(self._serialization_registry, message)
+            assert payload is not None
+            future = asyncio.ensure_future(
+                self._route_send(payload, recipient, sender, message_id, get_telemetry_envelope_metadata())
+            )
+            if cancellation_token is not None:
+                cancellation_token.link_future(future)
+            return deserialize_payload(self._serialization_registry, await future)
+
+    async def publish_message(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> None:
+        if not self._running:
+            raise RuntimeError("Runtime must be running when publishing message.")
+        if message_id is None:
+            message_id = str(uuid.uuid4())
+        with self._trace_helper.trace_block(
+            "create", topic_id, parent=None, extraAttributes={"message_type": type(message).__name__}
+        ):
+            payload = serialize_payload(self._serialization_registry, message)
+            assert payload is not None
+            await self._route_publish(payload, topic_id, sender, message_id, get_telemetry_envelope_metadata())
+
+    async def _call_agent(self, agent: AgentId, method: str, *args: Any) -> Any:
+        if not self._running:
+            raise RuntimeError("Runtime must be running to access agents.")
+        if agent.type not in self._agent_factories:
+            raise LookupError(f"Agent with name {agent.type} not found.")
+        return await self._request(
+            shard_for(agent, self._num_workers),
+            partial(AgentCall, method=method, args=(agent, *args)),
+        )
+
+    async def save_state(self) -> Mapping[str, Any]:
+        """Save the state of all instantiated agents in every worker process.
+
+        Returns:
+            A dictionary mapping agent IDs to their state.
+        """
+        if not self._running:
+            raise RuntimeError("Runtime must be running to save state.")
+        futures = [
+            self._request(index, partial(AgentCall, method="save_state", args=())) for index in range(self._num_workers)
+        ]
+        state: Dict[str, Any] = {}
+        for worker_state in await asyncio.gather(*futures):
+            state.update(worker_state)
+        return state
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        """Load the state of agents, instantiating them in the worker processes that host them."""
+        for agent_id_str in state:
+            agent_id = AgentId.from_str(agent_id_str)
+            if agent_id.type in self._agent_factories:
+                await self.agent_load_state(agent_id, state[agent_id_str])
+
+    async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
+        metadata: AgentMetadata = await self._call_agent(agent, "agent_metadata")
+        return metadata
+
+    async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
+        state: Mapping[str, Any] = await self._call_agent(agent, "agent_save_state")
+        return state
+
+    async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
+        await self._call_agent(agent, "agent_load_state", dict(state))
+
+    async def register_factory(
+        self,
+        type: str | AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        *,
+        expected_class: type[T] | None = None,
+    ) -> AgentType:
+        if isinstance(type, str):
+            type = AgentType(type)
+
+        if type.type in self._agent_factories:
+            raise ValueError(f"Agent with type {type} already exists.")
+
+        registration = RegisterFactory(type=type.type, factory=agent_factory, expected_class=expected_class)
+        try:
+            pickle.dumps(registration)
+        except Exception as e:
+            raise ValueError(
+                f"The factory for agent type {type.type} must be picklable to be sent to the worker processes."
+            ) from e
+
+        self._agent_factories[type.type] = registration
+        for inbound in self._inbound_queues:
+            inbound.put(registration)
+        return type
+
+    # TODO: uncomment out the following type ignore when this is fixed in mypy: https://github.com/python/mypy/issues/3737
+    async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
+        if id.type not in self._agent_factories:
+            raise LookupError(f"Agent with name {id.type} not found.")
+        raise LookupError(
+            f"Agent {id} is hosted by worker process {shard_for(id, self._num_workers)} and cannot be accessed "
+            "from the main process."
+        )
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        await self._subscription_manager.add_subscription(subscription)
+
+    async def remove_subscription(self, id: str) -> None:
+        await self._subscription_manager.remove_subscription(id)
+
+    async def get(
+        self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
+    ) -> AgentId:
+        if isinstance(id_or_type, AgentId):
+            agent_id = id_or_type
+        else:
+            type_str = id_or_type if isinstance(id_or_type, str) else id_or_type.type
+            agent_id = AgentId(type_str, key)
+        if agent_id.type not in self._agent_factories:
+            raise LookupError(f"Agent with name {agent_id.type} not found.")
+        if not lazy:
+            # Instantiate the agent in the worker process that hosts it.
+            await self.agent_metadata(agent_id)
+        return agent_id
+
+    def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
+        serializers = list(serializer) if isinstance(serializer, Sequence) else [serializer]
+        self._serialization_registry.add_serializer(serializers)
+        self._serializers.extend(serializers)
+        for inbound in self._inbound_queues:
+            inbound.put(AddSerializers(serializers=serializers))
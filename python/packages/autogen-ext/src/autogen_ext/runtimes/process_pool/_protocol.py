@@ -0,0 +1,153 @@
+"""Messages exchanged between the :class:`ProcessPoolAgentRuntime` and its worker processes.
+
+All messages are pickled by :mod:`multiprocessing` queues. Agent messages are carried as
+:class:`SerializedPayload`, produced by the runtime's serialization registry, so only
+registered message types cross process boundaries.
+"""
+
+from __future__ import annotations
+
+import builtins
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Type
+
+from autogen_core import AgentId, MessageSerializer, TopicId, exceptions
+from autogen_core._telemetry import EnvelopeMetadata
+
+
+@dataclass(frozen=True)
+class SerializedPayload:
+    type_name: str
+    data_content_type: str
+    data: bytes
+
+
+def shard_for(agent_id: AgentId, num_workers: int) -> int:
+    """Return the index of the worker that hosts the agent.
+
+    Uses a stable hash so the mapping does not depend on ``PYTHONHASHSEED``."""
+    return zlib.crc32(f"{agent_id.type}/{agent_id.key}".encode("utf-8")) % num_workers
+
+
+# Runtime -> worker
+
+
+@dataclass(frozen=True)
+class RegisterFactory:
+    type: str
+    factory: Callable[..., Any]
+    expected_class: Type[Any] | None
+
+
+@dataclass(frozen=True)
+class AddSerializers:
+    serializers: Sequence[MessageSerializer[Any]]
+
+
+@dataclass(frozen=True)
+class Deliver:
+    """Deliver a message to one or more agents hosted by the worker.
+
+    For an RPC, ``recipients`` has exactly one entry and the worker answers with the
+    serialized response. For a publish, the worker answers once every recipient has
+    handled the message."""
+
+    request_id: str
+    recipients: List[AgentId]
+    sender: AgentId | None
+    topic_id: TopicId | None
+    is_rpc: bool
+    message_id: str
+    payload: SerializedPayload
+    metadata: EnvelopeMetadata | None
+
+
+@dataclass(frozen=True)
+class AgentCall:
+    """Call a runtime method, such as ``agent_save_state``, on the worker."""
+
+    request_id: str
+    method: str
+    args: Sequence[Any]
+
+
+@dataclass(frozen=True)
+class Shutdown:
+    pass
+
+
+# Worker -> runtime
+
+
+@dataclass(frozen=True)
+class SendRequest:
+    worker_index: int
+    request_id: str
+    recipient: AgentId
+    sender: AgentId | None
+    message_id: str
+    payload: SerializedPayload
+    metadata: EnvelopeMetadata | None
+
+
+@dataclass(frozen=True)
+class PublishRequest:
+    topic_id: TopicId
+    sender: AgentId | None
+    message_id: str
+    payload: SerializedPayload
+    metadata: EnvelopeMetadata | None
+
+
+@dataclass(frozen=True)
+class RuntimeCall:
+    """Call a runtime method, such as ``add_subscription``, on the main process."""
+
+    worker_index: int
+    request_id: str
+    method: str
+    args: Sequence[Any]
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class WorkerExited:
+    """Put on the outbound queue by the runtime itself when a worker process exits, after
+    everything the worker put on the queue, so that its last results are handled first."""
+
+    worker_index: int
+    exitcode: int | None
+
+
+# Both directions
+
+
+@dataclass(frozen=True)
+class Result:
+    request_id: str
+    value: Any = None
+    error: str | None = None
+    error_type: str | None = None
+
+
+# Exceptions are sent as their message and type name, because they may not be picklable.
+# These types are raised again as themselves, others as Exception.
+_ERROR_TYPES: Dict[str, Type[Exception]] = {
+    name: value for name, value in vars(builtins).items() if isinstance(value, type) and issubclass(value, Exception)
+}
+_ERROR_TYPES.update({name: getattr(exceptions, name) for name in exceptions.__all__})
+
+
+def error_result(request_id: str, error: BaseException) -> Result:
+    return Result(request_id=request_id, error=str(error), error_type=type(error).__name__)
+
+
+def result_error(result: Result) -> Exception:
+    """Return the exception to raise for a result with an error."""
+    error_type = _ERROR_TYPES.get(result.error_type or "", Exception)
+    try:
+        return error_type(result.error)
+    except TypeError:
+        # For example UnicodeDecodeError, which needs more arguments.
+        return Exception(result.error)
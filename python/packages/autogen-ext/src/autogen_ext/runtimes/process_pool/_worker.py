@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import pickle
+import threading
+import uuid
+import warnings
+from asyncio import Future, Task
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Mapping, Sequence, Set, Type, TypeVar, cast
+
+from autogen_core import (
+    Agent,
+    AgentId,
+    AgentInstantiationContext,
+    AgentMetadata,
+    AgentRuntime,
+    AgentType,
+    CancellationToken,
+    MessageContext,
+    MessageHandlerContext,
+    MessageSerializer,
+    Subscription,
+    TopicId,
+)
+from autogen_core._serialization import JSON_DATA_CONTENT_TYPE, SerializationRegistry
+from autogen_core._telemetry import MessageRuntimeTracingConfig, TraceHelper, get_telemetry_envelope_metadata
+
+from ._protocol import (
+    AddSerializers,
+    AgentCall,
+    Deliver,
+    PublishRequest,
+    RegisterFactory,
+    Result,
+    RuntimeCall,
+    SendRequest,
+    SerializedPayload,
+    Shutdown,
+    error_result,
+    result_error,
+    shard_for,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+logger = logging.getLogger("autogen_core")
+
+T = TypeVar("T", bound=Agent)
+
+type_func_alias = type
+
+
+def serialize_payload(registry: SerializationRegistry, message: Any) -> SerializedPayload | None:
+    """Serialize a message for another process. ``None`` is passed through as is."""
+    if message is None:
+        return None
+    type_name = registry.type_name(message)
+    data = registry.serialize(message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE)
+    return SerializedPayload(type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE, data=data)
+
+
+def deserialize_payload(registry: SerializationRegistry, payload: SerializedPayload | None) -> Any:
+    if payload is None:
+        return None
+    return registry.deserialize(payload.data, type_name=payload.type_name, data_content_type=payload.data_content_type)
+
+
+class WorkerAgentRuntime(AgentRuntime):
+    """The agent runtime seen by agents hosted in a worker process of a
+    :class:`~autogen_ext.runtimes.process_pool.ProcessPoolAgentRuntime`.
+
+    Messages sent or published by the agents are forwarded to the main process,
+    which routes them to the worker that hosts each recipient.
+    """
+
+    def __init__(
+        self,
+        worker_index: int,
+        num_workers: int,
+        inbound: "Queue[Any]",
+        outbound: "Queue[Any]",
+        factories: Sequence[RegisterFactory],
+        serializers: Sequence[MessageSerializer[Any]],
+    ) -> None:
+        self._worker_index = worker_index
+        self._num_workers = num_workers
+        self._inbound = inbound
+        self._outbound = outbound
+        self._agent_factories: Dict[str, RegisterFactory] = {factory.type: factory for factory in factories}
+        self._instantiated_agents: Dict[AgentId, Agent] = {}
+        self._serialization_registry = SerializationRegistry()
+        self._serialization_registry.add_serializer(list(serializers))
+        self._pending_requests: Dict[str, Future[Any]] = {}
+        self._background_tasks: Set[Task[Any]] = set()
+        self._stopped = asyncio.Event()
+        self._trace_helper = TraceHelper(None, MessageRuntimeTracingConfig(f"ProcessPool Worker {worker_index}"))
+
+    async def run(self) -> None:
+        """Process messages from the main process until shutdown."""
+        loop = asyncio.get_running_loop()
+
+        def read_loop() -> None:
+            while True:
+                item = self._inbound.get()
+                loop.call_soon_threadsafe(self._handle, item)
+                if isinstance(item, Shutdown):
+                    return
+
+        reader = threading.Thread(target=read_loop, name=f"autogen-worker-{self._worker_index}-reader", daemon=True)
+        reader.start()
+        await self._stopped.wait()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        for agent in self._instantiated_agents.values():
+            await agent.close()
+
+    def _handle(self, item: Any) -> None:
+        match item:
+            case Deliver():
+                self._create_task(self._process_deliver(item))
+            case Result(request_id=request_id, value=value, error=error):
+                # The request is no longer pending if its sender was cancelled.
+                future = self._pending_requests.pop(request_id, None)
+                if future is None or future.done():
+                    return
+                if error is not None:
+                    future.set_exception(result_error(item))
+                else:
+                    future.set_result(value)
+            case AgentCall():
+                self._create_task(self._process_agent_call(item))
+            case RegisterFactory():
+                self._agent_factories[item.type] = item
+            case AddSerializers(serializers=serializers):
+                self._serialization_registry.add_serializer(list(serializers))
+            case Shutdown():
+                self._stopped.set()
+            case _:
+                logger.warning(f"Worker {self._worker_index} received an unknown message: {item}")
+
+    def _create_task(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _process_deliver(self, deliver: Deliver) -> None:
+        try:
+            message = deserialize_payload(self._serialization_registry, deliver.payload)
+            message_context = MessageContext(
+                sender=deliver.sender,
+                topic_id=deliver.topic_id,
+                is_rpc=deliver.is_rpc,
+                cancellation_token=CancellationToken(),
+                message_id=deliver.message_id,
+            )
+
+            async def _on_message(agent_id: AgentId) -> Any:
+                agent = await self._get_agent(agent_id)
+                with self._trace_helper.trace_block("process", agent.id, parent=deliver.metadata):
+                    with MessageHandlerContext.populate_context(agent.id):
+                        return await agent.on_message(message, ctx=message_context)
+
+            if deliver.is_rpc:
+                response = await _on_message(deliver.recipients[0])
+                value = serialize_payload(self._serialization_registry, response)
+            else:
+                results = await asyncio.gather(
+                    *[_on_message(agent_id) for agent_id in deliver.recipients], return_exceptions=True
+                )
+                for agent_id, result in zip(deliver.recipients, results, strict=True):
+                    if isinstance(result, BaseException):
+                        logger.error(f"Error processing publish message for {agent_id}", exc_info=result)
+                value = None
+        except BaseException as e:
+            self._outbound.put(error_result(deliver.request_id, e))
+            return
+        self._outbound.put(Result(request_id=deliver.request_id, value=value))
+
+    async def _process_agent_call(self, call: AgentCall) -> None:
+        try:
+            match call.method:
+                case "save_state":
+                    value: Any = {
+                        str(agent_id): dict(await agent.save_state())
+                        for agent_id, agent in self._instantiated_agents.items()
+                    }
+                case "agent_metadata":
+                    value = (await self._get_agent(call.args[0])).metadata
+                case "agent_save_state":
+                    value = dict(await (await self._get_agent(call.args[0])).save_state())
+                case "agent_load_state":
+                    await (await self._get_agent(call.args[0])).load_state(call.args[1])
+                    value = None
+                case _:
+                    raise ValueError(f"Unknown agent call: {call.method}")
+        except BaseException as e:
+            self._outbound.put(error_result(call.request_id, e))
+            return
+        self._outbound.put(Result(request_id=call.request_id, value=value))
+
+    async def _call_runtime(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        future: Future[Any] = asyncio.get_running_loop().create_future()
+        request_id = str(uuid.uuid4())
+        self._pending_requests[request_id] = future
+        self._outbound.put(
+            RuntimeCall(worker_index=self._worker_index, request_id=request_id, method=method, args=args, kwargs=kwargs)
+        )
+        try:
+            return await future
+        finally:
+            self._pending_requests.pop(request_id, None)
+
+    async def send_message(
+        self,
+        message: Any,
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> Any:
+        if message_id is None:
+            message_id = str(uuid.uuid4())
+        future: Future[Any] = asyncio.get_running_loop().create_future()
+        request_id = str(uuid.uuid4())
+        self._pending_requests[request_id] = future
+        self._outbound.put(
+            SendRequest(
+                worker_index=self._worker_index,
+                request_id=request_id,
+                recipient=recipient,
+                sender=sender,
+                message_id=message_id,
+                payload=cast(SerializedPayload, serialize_payload(self._serialization_registry, message)),
+                metadata=get_telemetry_envelope_metadata(),
+            )
+        )
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        try:
+            value = await future
+        finally:
+            self._pending_requests.pop(request_id, None)
+        return deserialize_payload(self._serialization_registry, value)
+
+    async def publish_message(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> None:
+        if message_id is None:
+            message_id = str(uuid.uuid4())
+        # Put the request on the queue before returning, so the main process sees it
+        # before the result of the handler that published it.
+        self._outbound.put(
+            PublishRequest(
+                topic_id=topic_id,
+                sender=sender,
+                message_id=message_id,
+                payload=cast(SerializedPayload, serialize_payload(self._serialization_registry, message)),
+                metadata=get_telemetry_envelope_metadata(),
+            )
+        )
+
+    async def register_factory(
+        self,
+        type: str | AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        *,
+        expected_class: type[T] | None = None,
+    ) -> AgentType:
+        """Register an agent type with the main process, which makes it available in every worker process."""
+        if isinstance(type, str):
+            type = AgentType(type)
+        # The queue pickles in a background thread, where an error would be lost.
+        try:
+            pickle.dumps((agent_factory, expected_class))
+        except Exception as e:
+            raise ValueError(
+                f"The factory for agent type {type.type} must be picklable to be sent to the worker processes."
+            ) from e
+        # The main process sends the registration to this worker before the result of the call.
+        await self._call_runtime("register_factory", type.type, agent_factory, expected_class=expected_class)
+        return type
+
+    async def _invoke_agent_factory(self, registration: RegisterFactory, agent_id: AgentId) -> Agent:
+        agent_factory = registration.factory
+        with AgentInstantiationContext.populate_context((self, agent_id)):
+            if len(inspect.signature(agent_factory).parameters) == 0:
+                agent = agent_factory()
+            elif len(inspect.signature(agent_factory).parameters) == 2:
+                warnings.warn(
+                    "Agent factories that take two arguments are deprecated. Use AgentInstantiationContext instead. Two arg factories will be removed in a future version.",
+                    stacklevel=2,
+                )
+                agent = agent_factory(self, agent_id)
+            else:
+                raise ValueError("Agent factory must take 0 or 2 arguments.")
+
+            if inspect.isawaitable(agent):
+                agent = await agent
+
+        if registration.expected_class is not None and type_func_alias(agent) != registration.expected_class:
+            raise ValueError("Factory registered using the wrong type.")
+        return cast(Agent, agent)
+
+    async def _get_agent(self, agent_id: AgentId) -> Agent:
+        if agent_id in self._instantiated_agents:
+            return self._instantiated_agents[agent_id]
+
+        if agent_id.type not in self._agent_factories:
+            raise LookupError(f"Agent with name {agent_id.type} not found.")
+
+        agent = await self._invoke_agent_factory(self._agent_factories[agent_id.type], agent_id)
+        self._instantiated_agents[agent_id] = agent
+        return agent
+
+    # TODO: uncomment out the following type ignore when this is fixed in mypy: https://github.com/python/mypy/issues/3737
+    async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
+        if id.type not in self._agent_factories:
+            raise LookupError(f"Agent with name {id.type} not found.")
+        if shard_for(id, self._num_workers) != self._worker_index:
+            raise LookupError(f"Agent {id} is not hosted by worker {self._worker_index}.")
+        agent_instance = await self._get_agent(id)
+        if not isinstance(agent_instance, type):
+            raise TypeError(f"Agent with name {id.type} is not of type {type.__name__}")
+        return agent_instance
+
+    async def get(
+        self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
+    ) -> AgentId:
+        if isinstance(id_or_type, AgentId):
+            agent_id = id_or_type
+        else:
+            type_str = id_or_type if isinstance(id_or_type, str) else id_or_type.type
+            agent_id = AgentId(type_str, key)
+        if not lazy:
+            # Instantiate the agent in the worker process that hosts it.
+            await self.agent_metadata(agent_id)
+        return agent_id
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return cast(Mapping[str, Any], await self._call_runtime("save_state"))
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await self._call_runtime("load_state", dict(state))
+
+    async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
+        return cast(AgentMetadata, await self._call_runtime("agent_metadata", agent))
+
+    async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
+        return cast(Mapping[str, Any], await self._call_runtime("agent_save_state", agent))
+
+    async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
+        await self._call_runtime("agent_load_state", agent, dict(state))
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        await self._call_runtime("add_subscription", subscription)
+
+    async def remove_subscription(self, id: str) -> None:
+        await self._call_runtime("remove_subscription", id)
+
+    def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
+        self._serialization_registry.add_serializer(serializer)
+
+
+def run_worker(
+    worker_index: int,
+    num_workers: int,
+    inbound: "Queue[Any]",
+    outbound: "Queue[Any]",
+    factories: List[RegisterFactory],
+    serializers: List[MessageSerializer[Any]],
+) -> None:
+    """Entry point of a worker process."""
+    runtime = WorkerAgentRuntime(worker_index, num_workers, inbound, outbound, factories, serializers)
+    asyncio.run(runtime.run())
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+from weakref import WeakKeyDictionary
+
+import httpx
+
+# The clients shared by HTTP tools, per event loop, as connections cannot be used from another loop.
+_shared_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, httpx.AsyncClient]]" = WeakKeyDictionary()
+
+
+def get_shared_client(key: Hashable, create_client: Callable[[], httpx.AsyncClient]) -> httpx.AsyncClient:
+    """Get the client shared by the tools with the same key in the running event loop, creating it if needed."""
+    clients = _shared_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = create_client()
+        clients[key] = client
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the clients shared by HTTP tools in the running event loop."""
+    clients = _shared_clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.aclose() for client in clients.values()))
+
+
+def _cache_control(headers: httpx.Headers) -> Dict[str, str]:
+    directives: Dict[str, str] = {}
+    for directive in headers.get_list("cache-control", split_commas=True):
+        name, _, value = directive.partition("=")
+        directives[name.strip().lower()] = value.strip().strip('"')
+    return directives
+
+
+def _freshness_lifetime(response: httpx.Response) -> float | None:
+    """The number of seconds the response can be reused for according to its Cache-Control header,
+    or None if it must not be reused without revalidation."""
+    if response.status_code != 200 or response.headers.get("vary", "").strip() == "*":
+        return None
+    directives = _cache_control(response.headers)
+    if "no-store" in directives or "no-cache" in directives:
+        return None
+    try:
+        max_age = int(directives["max-age"])
+        age = int(response.headers.get("age", "0"))
+    except (KeyError, ValueError):
+        return None
+    lifetime = max_age - age
+    return lifetime if lifetime > 0 else None
+
+
+class ResponseCache:
+    """A bounded cache of responses to GET requests that honours the Cache-Control headers.
+
+    Responses are only cached when they allow it with a ``max-age`` directive, and requests
+    with a ``no-cache`` or ``no-store`` directive bypass the cache. The least recently used
+    response is dropped when the cache is full.
+
+    Args:
+        max_entries (int): The maximum number of cached responses.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        # Least recently used first.
+        self._entries: OrderedDict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[float, httpx.Response]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _key(request: httpx.Request) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        # The request headers are part of the key, so a response is never reused for other credentials.
+        return str(request.url), tuple(sorted(request.headers.multi_items()))
+
+    @staticmethod
+    def _bypass(request: httpx.Request) -> bool:
+        if request.method != "GET":
+            return True
+        directives = _cache_control(request.headers)
+        return "no-cache" in directives or "no-store" in directives
+
+    def get(self, request: httpx.Request) -> httpx.Response | None:
+        if self._bypass(request):
+            return None
+        key = self._key(request)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, request: httpx.Request, response: httpx.Response) -> None:
+        if self._bypass(request):
+            return
+        lifetime = _freshness_lifetime(response)
+        if lifetime is None:
+            return
+        key = self._key(request)
+        self._entries[key] = (time.monotonic() + lifetime, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
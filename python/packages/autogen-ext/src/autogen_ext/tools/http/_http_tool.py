@@ -1,5 +1,6 @@
 import re
-from typing import Any, Literal, Optional, Type
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Literal, Optional, Type
 
 import httpx
 from autogen_core import CancellationToken, Component
@@ -8,6 +9,8 @@
 from pydantic import BaseModel, Field
 from typing_extensions import Self
 
+from ._client_pool import ResponseCache, close_shared_clients, get_shared_client
+
 
 class HttpToolConfig(BaseModel):
     name: str
@@ -53,6 +56,35 @@ class HttpToolConfig(BaseModel):
     """
     The type of response to return from the tool.
     """
+    timeout: Optional[float] = 5.0
+    """
+    The timeout in seconds for connecting, reading, writing and waiting for a pooled connection.
+    None disables the timeout. Defaults to 5 seconds.
+    """
+    share_client: bool = True
+    """
+    Whether to send the requests with a client shared by the tools with the same scheme, host, port
+    and connection settings, which keeps connections alive across calls. If False, every call opens
+    new connections.
+    """
+    http2: bool = False
+    """
+    Whether to use HTTP/2 for HTTPS hosts that support it. Requires the :code:`h2` package,
+    which is installed with :code:`pip install httpx[http2]`.
+    """
+    max_connections: Optional[int] = 100
+    """
+    The maximum number of concurrent connections to the host. None means no limit.
+    """
+    max_keepalive_connections: Optional[int] = 20
+    """
+    The maximum number of idle connections kept alive to the host. None means no limit.
+    """
+    response_cache_size: int = 0
+    """
+    The maximum number of responses to GET requests to cache. Responses are cached for as long as
+    their Cache-Control header allows. Defaults to 0, which disables the cache.
+    """
 
 
 class HttpTool(BaseTool[BaseModel, Any], Component[HttpToolConfig]):
@@ -73,6 +105,19 @@ class HttpTool(BaseTool[BaseModel, Any], Component[HttpToolConfig]):
             Path parameters must also be included in the schema and must be strings.
         return_type (Literal["text", "json"], optional): The type of response to return from the tool.
             Defaults to "text".
+        timeout (float, optional): The timeout in seconds for connecting, reading, writing and waiting for
+            a pooled connection. None disables the timeout. Defaults to 5 seconds.
+        share_client (bool, optional): Whether to share a pooled client with the other tools for the same
+            scheme, host, port and connection settings, so connections are kept alive across calls.
+            Defaults to True.
+        http2 (bool, optional): Whether to use HTTP/2 for HTTPS hosts that support it. Requires the
+            :code:`h2` package. Defaults to False.
+        max_connections (int, optional): The maximum number of concurrent connections to the host.
+            Defaults to 100.
+        max_keepalive_connections (int, optional): The maximum number of idle connections kept alive to
+            the host. Defaults to 20.
+        response_cache_size (int, optional): The maximum number of responses to GET requests to cache
+            for as long as their Cache-Control header allows. Defaults to 0, which disables the cache.
 
     .. note::
         This tool requires the :code:`http-tool` extra for the :code:`autogen-ext` package.
@@ -148,6 +193,12 @@ def __init__(
         scheme: Literal["http", "https"] = "http",
         method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"] = "POST",
         return_type: Literal["text", "json"] = "text",
+        timeout: Optional[float] = 5.0,
+        share_client: bool = True,
+        http2: bool = False,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        response_cache_size: int = 0,
     ) -> None:
         self.server_params = HttpToolConfig(
             name=name,
@@ -160,7 +211,14 @@ def __init__(
             headers=headers,
             json_schema=json_schema,
             return_type=return_type,
+            timeout=timeout,
+            share_client=share_client,
+            http2=http2,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            response_cache_size=response_cache_size,
         )
+        self._response_cache = ResponseCache(response_cache_size) if response_cache_size > 0 else None
 
         # Use regex to find all path parameters, we will need those later to template the path
         path_params = {match.group(1) for match in re.finditer(r"{([^}]*)}", path)}
@@ -174,6 +232,40 @@ def __init__(
 
         super().__init__(input_model, base_return_type, name, description)
 
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.server_params.http2,
+            timeout=self.server_params.timeout,
+            limits=httpx.Limits(
+                max_connections=self.server_params.max_connections,
+                max_keepalive_connections=self.server_params.max_keepalive_connections,
+            ),
+        )
+
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        if not self.server_params.share_client:
+            async with self._create_client() as client:
+                yield client
+            return
+        key = (
+            self.server_params.scheme,
+            self.server_params.host,
+            self.server_params.port,
+            self.server_params.http2,
+            self.server_params.timeout,
+            self.server_params.max_connections,
+            self.server_params.max_keepalive_connections,
+        )
+        yield get_shared_client(key, self._create_client)
+
+    @staticmethod
+    async def close_shared_clients() -> None:
+        """Close the clients shared by HTTP tools in the running event loop.
+
+        Tools create new shared clients when they are called again."""
+        await close_shared_clients()
+
     def _to_config(self) -> HttpToolConfig:
         copied_config = self.server_params.model_copy()
         return copied_config
@@ -211,18 +303,26 @@ async def run(self, args: BaseModel, cancellation_token: CancellationToken) -> A
             port=self.server_params.port,
             path=path,
         )
-        async with httpx.AsyncClient() as client:
+        headers = self.server_params.headers
+        async with self._client() as client:
+            # Requests built by the client have its default headers, like requests sent with client.get.
             match self.server_params.method:
                 case "GET":
-                    response = await client.get(url, headers=self.server_params.headers, params=model_dump)
+                    request = client.build_request("GET", url, headers=headers, params=model_dump)
                 case "PUT":
-                    response = await client.put(url, headers=self.server_params.headers, json=model_dump)
+                    request = client.build_request("PUT", url, headers=headers, json=model_dump)
                 case "DELETE":
-                    response = await client.delete(url, headers=self.server_params.headers, params=model_dump)
+                    request = client.build_request("DELETE", url, headers=headers, params=model_dump)
                 case "PATCH":
-                    response = await client.patch(url, headers=self.server_params.headers, json=model_dump)
+                    request = client.build_request("PATCH", url, headers=headers, json=model_dump)
                 case _:  # Default case POST
-                    response = await client.post(url, headers=self.server_params.headers, json=model_dump)
+                    request = client.build_request("POST", url, headers=headers, json=model_dump)
+
+            response = self._response_cache.get(request) if self._response_cache is not None else None
+            if response is None:
+                response = await client.send(request)
+                if self._response_cache is not None:
+                    self._response_cache.set(request, response)
 
         match self.server_params.return_type:
             case "text":
@@ -1,5 +1,6 @@
 from ._config import McpServerParams, SseServerParams, StdioServerParams
 from ._factory import mcp_server_tools
+from ._session_pool import McpSessionPool, close_default_session_pool
 from ._sse import SseMcpToolAdapter
 from ._stdio import StdioMcpToolAdapter
 
@@ -10,4 +11,6 @@
     "SseServerParams",
     "McpServerParams",
     "mcp_server_tools",
+    "McpSessionPool",
+    "close_default_session_pool",
 ]
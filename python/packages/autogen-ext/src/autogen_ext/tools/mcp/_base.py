@@ -6,11 +6,12 @@
 from autogen_core import CancellationToken
 from autogen_core.tools import BaseTool
 from json_schema_to_pydantic import create_model
-from mcp import Tool
+from mcp import ClientSession, Tool
+from mcp.types import CallToolResult
 from pydantic import BaseModel
 
 from ._config import McpServerParams
-from ._session import create_mcp_server_session
+from ._session_pool import McpSessionPool, get_default_session_pool
 
 TServerParams = TypeVar("TServerParams", bound=McpServerParams)
 
@@ -22,13 +23,16 @@ class McpToolAdapter(BaseTool[BaseModel, Any], ABC, Generic[TServerParams]):
     Args:
         server_params (TServerParams): Parameters for the MCP server connection.
         tool (Tool): The MCP tool to wrap.
+        session_pool (McpSessionPool | None, optional): The pool of server sessions to run the tool with.
+            Defaults to None, which uses a pool shared by the whole process.
     """
 
     component_type = "tool"
 
-    def __init__(self, server_params: TServerParams, tool: Tool) -> None:
+    def __init__(self, server_params: TServerParams, tool: Tool, session_pool: McpSessionPool | None = None) -> None:
         self._tool = tool
         self._server_params = server_params
+        self._session_pool = session_pool or get_default_session_pool()
 
         # Extract name and description
         name = tool.name
@@ -61,32 +65,36 @@ async def run(self, args: BaseModel, cancellation_token: CancellationToken) -> A
         # for many servers.
         kwargs = args.model_dump(exclude_unset=True)
 
-        try:
-            async with create_mcp_server_session(self._server_params) as session:
-                await session.initialize()
+        async def call_tool(session: ClientSession) -> CallToolResult:
+            if cancellation_token.is_cancelled():
+                raise Exception("Operation cancelled")
 
-                if cancellation_token.is_cancelled():
-                    raise Exception("Operation cancelled")
+            result_future = asyncio.ensure_future(session.call_tool(name=self._tool.name, arguments=kwargs))
+            cancellation_token.link_future(result_future)
+            return await result_future
 
-                result_future = asyncio.ensure_future(session.call_tool(name=self._tool.name, arguments=kwargs))
-                cancellation_token.link_future(result_future)
-                result = await result_future
+        try:
+            result = await self._session_pool.run(self._server_params, call_tool)
 
-                if result.isError:
-                    raise Exception(f"MCP tool execution failed: {result.content}")
-                return result.content
+            if result.isError:
+                raise Exception(f"MCP tool execution failed: {result.content}")
+            return result.content
         except Exception as e:
             error_message = self._format_errors(e)
             raise Exception(error_message) from e
 
     @classmethod
-    async def from_server_params(cls, server_params: TServerParams, tool_name: str) -> "McpToolAdapter[TServerParams]":
+    async def from_server_params(
+        cls, server_params: TServerParams, tool_name: str, session_pool: McpSessionPool | None = None
+    ) -> "McpToolAdapter[TServerParams]":
         """
         Create an instance of McpToolAdapter from server parameters and tool name.
 
         Args:
             server_params (TServerParams): Parameters for the MCP server connection.
             tool_name (str): The name of the tool to wrap.
+            session_pool (McpSessionPool | None, optional): The pool of server sessions to use.
+                Defaults to None, which uses a pool shared by the whole process.
 
         Returns:
             McpToolAdapter[TServerParams]: An instance of McpToolAdapter.
@@ -94,18 +102,16 @@ async def from_server_params(cls, server_params: TServerParams, tool_name: str)
         Raises:
             ValueError: If the tool with the specified name is not found.
         """
-        async with create_mcp_server_session(server_params) as session:
-            await session.initialize()
-
-            tools_response = await session.list_tools()
-            matching_tool = next((t for t in tools_response.tools if t.name == tool_name), None)
+        session_pool = session_pool or get_default_session_pool()
+        tools_response = await session_pool.run(server_params, lambda session: session.list_tools(), idempotent=True)
+        matching_tool = next((t for t in tools_response.tools if t.name == tool_name), None)
 
-            if matching_tool is None:
-                raise ValueError(
-                    f"Tool '{tool_name}' not found, available tools: {', '.join([t.name for t in tools_response.tools])}"
-                )
+        if matching_tool is None:
+            raise ValueError(
+                f"Tool '{tool_name}' not found, available tools: {', '.join([t.name for t in tools_response.tools])}"
+            )
 
-        return cls(server_params=server_params, tool=matching_tool)
+        return cls(server_params=server_params, tool=matching_tool, session_pool=session_pool)
 
     def _format_errors(self, error: Exception) -> str:
         """Recursively format errors into a string."""
@@ -1,17 +1,22 @@
 from ._config import McpServerParams, SseServerParams, StdioServerParams
-from ._session import create_mcp_server_session
+from ._session_pool import McpSessionPool, get_default_session_pool
 from ._sse import SseMcpToolAdapter
 from ._stdio import StdioMcpToolAdapter
 
 
 async def mcp_server_tools(
     server_params: McpServerParams,
+    session_pool: McpSessionPool | None = None,
 ) -> list[StdioMcpToolAdapter | SseMcpToolAdapter]:
     """Creates a list of MCP tool adapters that can be used with AutoGen agents.
 
     This factory function connects to an MCP server and returns adapters for all available tools.
     The adapters can be directly assigned to an AutoGen agent's tools list.
 
+    The adapters share the sessions of a :class:`~autogen_ext.tools.mcp.McpSessionPool`, so the
+    server is connected to once rather than for every tool call. The session that lists the tools
+    is kept in the pool and reused by the first tool call.
+
     .. note::
 
         To use this function, you need to install `mcp` extra for the `autogen-ext` package.
@@ -24,6 +29,9 @@ async def mcp_server_tools(
         server_params (McpServerParams): Connection parameters for the MCP server.
             Can be either StdioServerParams for command-line tools or
             SseServerParams for HTTP/SSE services.
+        session_pool (McpSessionPool | None, optional): The pool of server sessions shared by the adapters.
+            Defaults to None, which uses a pool shared by the whole process. Close its sessions with
+            :func:`~autogen_ext.tools.mcp.close_default_session_pool`.
 
     Returns:
         list[StdioMcpToolAdapter | SseMcpToolAdapter]: A list of tool adapters ready to use
@@ -69,7 +77,9 @@ async def main() -> None:
                 )
 
                 # The agent can now use any of the filesystem tools
-                await agent.run(task="Create a file called test.txt with some content", cancellation_token=CancellationToken())
+                await agent.run(
+                    task="Create a file called test.txt with some content", cancellation_token=CancellationToken()
+                )
 
 
             if __name__ == "__main__":
@@ -120,23 +130,30 @@ async def main() -> None:
 
             async def main() -> None:
                 # Setup server params for remote service
-                server_params = SseServerParams(url="https://api.example.com/mcp", headers={"Authorization": "Bearer token"})
+                server_params = SseServerParams(
+                    url="https://api.example.com/mcp", headers={"Authorization": "Bearer token"}
+                )
 
                 # Get all available tools
                 tools = await mcp_server_tools(server_params)
 
                 # Create an agent with all tools
-                agent = AssistantAgent(name="tool_user", model_client=OpenAIChatCompletionClient(model="gpt-4"), tools=tools)  # type: ignore
+                agent = AssistantAgent(
+                    name="tool_user", model_client=OpenAIChatCompletionClient(model="gpt-4"), tools=tools
+                )  # type: ignore
 
     For more examples and detailed usage, see the samples directory in the package repository.
     """
-    async with create_mcp_server_session(server_params) as session:
-        await session.initialize()
-
-        tools = await session.list_tools()
+    session_pool = session_pool or get_default_session_pool()
+    tools = await session_pool.run(server_params, lambda session: session.list_tools(), idempotent=True)
 
     if isinstance(server_params, StdioServerParams):
-        return [StdioMcpToolAdapter(server_params=server_params, tool=tool) for tool in tools.tools]
+        return [
+            StdioMcpToolAdapter(server_params=server_params, tool=tool, session_pool=session_pool)
+            for tool in tools.tools
+        ]
     elif isinstance(server_params, SseServerParams):
-        return [SseMcpToolAdapter(server_params=server_params, tool=tool) for tool in tools.tools]
+        return [
+            SseMcpToolAdapter(server_params=server_params, tool=tool, session_pool=session_pool) for tool in tools.tools
+        ]
     raise ValueError(f"Unsupported server params type: {type(server_params)}")
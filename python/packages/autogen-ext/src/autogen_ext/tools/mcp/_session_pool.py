@@ -0,0 +1,347 @@
+import asyncio
+import builtins
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Set, Tuple, TypeVar
+
+import anyio
+from mcp import ClientSession, types
+from mcp.shared.exceptions import McpError
+
+from ._config import McpServerParams
+from ._session import create_mcp_server_session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Not defined by older versions of the mcp package.
+_CONNECTION_CLOSED = getattr(types, "CONNECTION_CLOSED", None)
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    """Whether the error means the connection to the server is lost, rather than a request failed."""
+    if isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)):
+        return True
+    if isinstance(error, McpError):
+        return _CONNECTION_CLOSED is not None and error.error.code == _CONNECTION_CLOSED
+    if hasattr(builtins, "BaseExceptionGroup") and isinstance(error, builtins.BaseExceptionGroup):
+        # BaseExceptionGroup is available in Python 3.11+.
+        return any(_is_connection_error(e) for e in error.exceptions)  # type: ignore
+    return False
+
+
+def _is_unsent_error(error: BaseException) -> bool:
+    """Whether the error means a request could not be sent because the connection was already closed.
+
+    Such a request never reached the server, so it is safe to send it again."""
+    if isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError)):
+        return True
+    if hasattr(builtins, "BaseExceptionGroup") and isinstance(error, builtins.BaseExceptionGroup):
+        # BaseExceptionGroup is available in Python 3.11+.
+        return all(_is_unsent_error(e) for e in error.exceptions)  # type: ignore
+    return False
+
+
+class _PooledSession:
+    """An initialized MCP session that stays open until it is closed.
+
+    The transports of the mcp package must be entered and exited in the same task, so a
+    background task owns the session for its whole lifetime."""
+
+    def __init__(self, server_params: McpServerParams) -> None:
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self.broken = False
+        self._server_params = server_params
+        self._ready: asyncio.Future[ClientSession] = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def alive(self) -> bool:
+        return not self.broken and not self._closing.is_set() and not self._task.done()
+
+    async def _run(self) -> None:
+        try:
+            async with create_mcp_server_session(self._server_params) as session:
+                await session.initialize()
+                self._ready.set_result(session)
+                await self._closing.wait()
+        except asyncio.CancelledError:
+            self._ready.cancel()
+            raise
+        except BaseException as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.warning(f"MCP server session closed with an error: {e}")
+
+    async def session(self) -> ClientSession:
+        """Wait until the session is initialized."""
+        return await asyncio.shield(self._ready)
+
+    async def ping(self) -> None:
+        session = await self.session()
+        await session.send_ping()
+
+    async def close(self) -> None:
+        self._closing.set()
+        try:
+            await self._task
+        except BaseException:
+            pass
+
+
+class McpSessionPool:
+    """A pool of initialized MCP server sessions, keyed by server parameters.
+
+    Opening an MCP session is expensive. For a STDIO server it starts a new process. Tool
+    adapters use a pool to keep their sessions open across tool calls, and adapters with the
+    same server parameters share sessions. By default, adapters use a pool shared by the whole
+    process, whose sessions are closed with :func:`~autogen_ext.tools.mcp.close_default_session_pool`.
+    Pass your own pool to the adapters, for example with :func:`~autogen_ext.tools.mcp.mcp_server_tools`,
+    to configure it and to close its sessions with :meth:`close` when you are done.
+
+    A session takes up to ``max_concurrent_calls`` calls at a time. When all sessions of a server
+    are busy, a new session is opened, up to ``max_sessions_per_server``, and beyond that calls
+    wait for a session to become available.
+
+    A background check closes sessions that have been idle for longer than ``idle_timeout``, and
+    pings the other idle sessions to close the ones that no longer respond. A session that loses
+    its connection is discarded. A call that could not be sent because of it is retried once on a
+    new session. A call that was sent is not retried, since the server may have run it already.
+
+    Sessions are bound to the event loop that opened them. When the pool is used from another
+    event loop, it forgets the sessions of the previous one.
+
+    Args:
+        max_concurrent_calls (int, optional): The maximum number of concurrent calls per session. Defaults to 16.
+        max_sessions_per_server (int, optional): The maximum number of open sessions per server. Defaults to 1.
+        idle_timeout (float | None, optional): Seconds after which an idle session is closed.
+            Defaults to 300. None keeps idle sessions open until the pool is closed.
+        health_check_interval (float | None, optional): Seconds between health checks of idle sessions.
+            Defaults to 30. None disables pinging the sessions.
+        health_check_timeout (float, optional): Seconds to wait for a session to answer a ping. Defaults to 5.
+
+    Example:
+
+        .. code-block:: python
+
+            import asyncio
+
+            from autogen_core import CancellationToken
+            from autogen_ext.tools.mcp import McpSessionPool, StdioServerParams, mcp_server_tools
+
+
+            async def main() -> None:
+                server_params = StdioServerParams(command="uvx", args=["mcp-server-fetch"])
+                pool = McpSessionPool(max_concurrent_calls=4, idle_timeout=60)
+
+                # The tools share one server process, which is started when the tools are listed.
+                tools = await mcp_server_tools(server_params, session_pool=pool)
+                fetch = tools[0]
+                results = await asyncio.gather(
+                    *(fetch.run_json({"url": url}, CancellationToken()) for url in ["https://example.com"] * 4)
+                )
+                print(results)
+
+                # Stop the server process.
+                await pool.close()
+
+
+            asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        max_concurrent_calls: int = 16,
+        max_sessions_per_server: int = 1,
+        idle_timeout: float | None = 300,
+        health_check_interval: float | None = 30,
+        health_check_timeout: float = 5,
+    ) -> None:
+        if max_concurrent_calls <= 0:
+            raise ValueError("max_concurrent_calls must be greater than 0.")
+        if max_sessions_per_server <= 0:
+            raise ValueError("max_sessions_per_server must be greater than 0.")
+        self._max_concurrent_calls = max_concurrent_calls
+        self._max_sessions_per_server = max_sessions_per_server
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._health_check_timeout = health_check_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._sessions: Dict[Tuple[str, str], List[_PooledSession]] = {}
+        self._available = asyncio.Condition()
+        self._checker: asyncio.Task[None] | None = None
+        self._closing: Set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def _key(server_params: McpServerParams) -> Tuple[str, str]:
+        return type(server_params).__name__, server_params.model_dump_json()
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._sessions = {}
+            self._available = asyncio.Condition()
+            self._checker = None
+            self._closing = set()
+
+    @asynccontextmanager
+    async def session(self, server_params: McpServerParams) -> AsyncGenerator[ClientSession, None]:
+        """Take an initialized session for the server from the pool, opening one if needed.
+
+        Args:
+            server_params (McpServerParams): Parameters of the server.
+        """
+        self._bind_to_running_loop()
+        key = self._key(server_params)
+        pooled = await self._acquire(key, server_params)
+        try:
+            session = await pooled.session()
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                # The session could not be opened.
+                pooled.broken = True
+            await self._release(key, pooled)
+            raise
+        try:
+            yield session
+        except BaseException as e:
+            if _is_connection_error(e):
+                pooled.broken = True
+            raise
+        finally:
+            await self._release(key, pooled)
+
+    async def run(
+        self, server_params: McpServerParams, func: Callable[[ClientSession], Awaitable[T]], idempotent: bool = False
+    ) -> T:
+        """Run a function with a pooled session for the server.
+
+        If the function fails because the connection to the server was closed before its request
+        was sent, it is retried once with a new session.
+
+        Args:
+            server_params (McpServerParams): Parameters of the server.
+            func (Callable[[ClientSession], Awaitable[T]]): The function to run with the session.
+            idempotent (bool, optional): Whether the function can safely run twice, such as listing
+                the tools of the server. It is then also retried when the connection is lost after its
+                request was sent. Defaults to False.
+
+        Returns:
+            T: The result of the function.
+        """
+        try:
+            async with self.session(server_params) as session:
+                return await func(session)
+        except Exception as e:
+            if not (_is_unsent_error(e) or (idempotent and _is_connection_error(e))):
+                raise
+            logger.info(f"Lost the connection to the MCP server, retrying with a new session: {e}")
+        async with self.session(server_params) as session:
+            return await func(session)
+
+    async def close(self) -> None:
+        """Close all sessions of the pool."""
+        if self._checker is not None:
+            self._checker.cancel()
+            self._checker = None
+        sessions = [pooled for pooled_sessions in self._sessions.values() for pooled in pooled_sessions]
+        self._sessions = {}
+        await asyncio.gather(*(pooled.close() for pooled in sessions), *self._closing)
+
+    async def _acquire(self, key: Tuple[str, str], server_params: McpServerParams) -> _PooledSession:
+        async with self._available:
+            while True:
+                sessions = self._sessions.setdefault(key, [])
+                for pooled in [pooled for pooled in sessions if not pooled.alive]:
+                    self._discard(key, pooled)
+                candidates = [pooled for pooled in sessions if pooled.in_flight < self._max_concurrent_calls]
+                if candidates:
+                    pooled = min(candidates, key=lambda pooled: pooled.in_flight)
+                    break
+                if len(sessions) < self._max_sessions_per_server:
+                    pooled = _PooledSession(server_params)
+                    sessions.append(pooled)
+                    self._start_checker()
+                    break
+                await self._available.wait()
+            pooled.in_flight += 1
+            return pooled
+
+    async def _release(self, key: Tuple[str, str], pooled: _PooledSession) -> None:
+        async with self._available:
+            pooled.in_flight -= 1
+            pooled.last_used = time.monotonic()
+            if not pooled.alive:
+                self._discard(key, pooled)
+            self._available.notify_all()
+
+    def _discard(self, key: Tuple[str, str], pooled: _PooledSession) -> None:
+        """Remove a session from the pool and close it once it has no calls in flight."""
+        pooled.broken = True
+        sessions = self._sessions.get(key, [])
+        if pooled in sessions:
+            sessions.remove(pooled)
+            if not sessions:
+                del self._sessions[key]
+        if pooled.in_flight == 0:
+            # Closing waits for the server to shut down, which the caller should not wait for.
+            task = asyncio.create_task(pooled.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def _start_checker(self) -> None:
+        interval = self._health_check_interval or self._idle_timeout
+        if interval is not None and self._checker is None:
+            self._checker = asyncio.create_task(self._check_sessions(interval))
+
+    async def _check_sessions(self, interval: float) -> None:
+        """Close idle and unhealthy sessions until the pool has no sessions left."""
+        while self._sessions:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            to_ping: List[Tuple[Tuple[str, str], _PooledSession]] = []
+            async with self._available:
+                for key, sessions in list(self._sessions.items()):
+                    for pooled in list(sessions):
+                        if pooled.in_flight > 0:
+                            continue
+                        if not pooled.alive or (
+                            self._idle_timeout is not None and now - pooled.last_used >= self._idle_timeout
+                        ):
+                            self._discard(key, pooled)
+                        elif self._health_check_interval is not None:
+                            to_ping.append((key, pooled))
+            for key, pooled in to_ping:
+                try:
+                    await asyncio.wait_for(pooled.ping(), self._health_check_timeout)
+                except Exception as e:
+                    logger.info(f"Closing an MCP server session that failed its health check: {e}")
+                    async with self._available:
+                        if pooled.in_flight == 0:
+                            self._discard(key, pooled)
+                        else:
+                            pooled.broken = True
+        self._checker = None
+
+
+_default_session_pool = McpSessionPool()
+
+
+def get_default_session_pool() -> McpSessionPool:
+    """The session pool shared by the MCP tool adapters that are not given a pool."""
+    return _default_session_pool
+
+
+async def close_default_session_pool() -> None:
+    """Close the sessions of the pool shared by the MCP tool adapters that are not given a pool.
+
+    Call it before the event loop that used the adapters stops, for example at the end of the
+    ``main`` coroutine, to stop the STDIO server processes. The pool opens new sessions when the
+    adapters are used again."""
+    await _default_session_pool.close()
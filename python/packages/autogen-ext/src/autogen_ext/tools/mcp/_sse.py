@@ -5,6 +5,7 @@
 
 from ._base import McpToolAdapter
 from ._config import SseServerParams
+from ._session_pool import McpSessionPool
 
 
 class SseMcpToolAdapterConfig(BaseModel):
@@ -37,6 +38,8 @@ class SseMcpToolAdapter(
         server_params (SseServerParameters): Parameters for the MCP server connection,
             including URL, headers, and timeouts
         tool (Tool): The MCP tool to wrap
+        session_pool (McpSessionPool | None, optional): The pool of server sessions to run the tool with.
+            Defaults to None, which uses a pool shared by the whole process.
 
     Examples:
         Use a remote translation service that implements MCP over SSE to create tools
@@ -86,8 +89,8 @@ async def main() -> None:
     component_config_schema = SseMcpToolAdapterConfig
     component_provider_override = "autogen_ext.tools.mcp.SseMcpToolAdapter"
 
-    def __init__(self, server_params: SseServerParams, tool: Tool) -> None:
-        super().__init__(server_params=server_params, tool=tool)
+    def __init__(self, server_params: SseServerParams, tool: Tool, session_pool: McpSessionPool | None = None) -> None:
+        super().__init__(server_params=server_params, tool=tool, session_pool=session_pool)
 
     def _to_config(self) -> SseMcpToolAdapterConfig:
         """
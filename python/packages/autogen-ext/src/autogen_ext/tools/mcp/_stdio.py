@@ -5,6 +5,7 @@
 
 from ._base import McpToolAdapter
 from ._config import StdioServerParams
+from ._session_pool import McpSessionPool
 
 
 class StdioMcpToolAdapterConfig(BaseModel):
@@ -37,6 +38,8 @@ class StdioMcpToolAdapter(
         server_params (StdioServerParams): Parameters for the MCP server connection,
             including command to run and its arguments
         tool (Tool): The MCP tool to wrap
+        session_pool (McpSessionPool | None, optional): The pool of server sessions to run the tool with.
+            Defaults to None, which uses a pool shared by the whole process.
 
     See :func:`~autogen_ext.tools.mcp.mcp_server_tools` for examples.
     """
@@ -44,8 +47,10 @@ class StdioMcpToolAdapter(
     component_config_schema = StdioMcpToolAdapterConfig
     component_provider_override = "autogen_ext.tools.mcp.StdioMcpToolAdapter"
 
-    def __init__(self, server_params: StdioServerParams, tool: Tool) -> None:
-        super().__init__(server_params=server_params, tool=tool)
+    def __init__(
+        self, server_params: StdioServerParams, tool: Tool, session_pool: McpSessionPool | None = None
+    ) -> None:
+        super().__init__(server_params=server_params, tool=tool, session_pool=session_pool)
 
     def _to_config(self) -> StdioMcpToolAdapterConfig:
         """
@@ -53,3 +53,28 @@ def test_diskcache_with_different_instances() -> None:
         loaded_store_1: DiskCacheStore[int] = DiskCacheStore.load_component(store_1_config)
         assert loaded_store_1.get(test_key) == test_value_1
         loaded_store_1.cache.close()
+
+
+@pytest.mark.asyncio
+async def test_diskcache_store_namespace_and_ttl() -> None:
+    from autogen_ext.cache_store.diskcache import DiskCacheStore
+    from diskcache import Cache
+
+    with tempfile.TemporaryDirectory() as temp_dir, Cache(temp_dir) as cache:
+        store_1 = DiskCacheStore[int](cache, namespace="one")
+        store_2 = DiskCacheStore[int](cache, namespace="two", default_ttl=60)
+
+        store_1.set_many({"a": 1, "b": 2})
+        await store_2.aset("a", 3)
+        await store_2.aset("b", 4, ttl=-1)
+        assert await store_1.aget_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+        assert store_2.get_many(["a", "b"]) == {"a": 3}
+        assert store_2.stats.misses == 1
+        assert cache.get("a") is None
+        assert cache.get("one:a") == 1
+
+        loaded_store_2: DiskCacheStore[int] = DiskCacheStore.load_component(store_2.dump_component())
+        assert loaded_store_2.namespace == "two"
+        assert loaded_store_2.default_ttl == 60
+        assert await loaded_store_2.aget("a") == 3
+        loaded_store_2.cache.close()
@@ -56,3 +56,32 @@ def test_redis_with_different_instances() -> None:
     store_1_config = store_1.dump_component()
     assert store_1_config.component_type == "cache_store"
     assert store_1_config.component_version == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_store_namespace_and_ttl() -> None:
+    from autogen_ext.cache_store.redis import RedisStore
+
+    redis_instance = MagicMock()
+    store = RedisStore[int](redis_instance, namespace="ns", default_ttl=1.5)
+
+    await store.aset("a", 1)
+    redis_instance.set.assert_called_with("ns:a", 1, px=1500)
+    store.set("a", 1, ttl=10)
+    redis_instance.set.assert_called_with("ns:a", 1, px=10000)
+
+    store.set_many({"a": 1, "b": 2})
+    pipeline = redis_instance.pipeline.return_value
+    pipeline.set.assert_any_call("ns:a", 1, px=1500)
+    pipeline.set.assert_any_call("ns:b", 2, px=1500)
+    pipeline.execute.assert_called_once()
+
+    redis_instance.mget.return_value = [1, None]
+    assert await store.aget_many(["a", "b"]) == {"a": 1}
+    redis_instance.mget.assert_called_with(["ns:a", "ns:b"])
+    assert store.stats.hits == 1
+    assert store.stats.misses == 1
+
+    config = store.dump_component()
+    assert config.config["namespace"] == "ns"
+    assert config.config["default_ttl"] == 1.5
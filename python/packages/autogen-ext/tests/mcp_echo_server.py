@@ -0,0 +1,25 @@
+"""A minimal MCP server over STDIO for testing the MCP tool adapters."""
+
+import os
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("echo", log_level="WARNING")
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    """Echo the text back."""
+    return text
+
+
+@mcp.tool()
+def pid(delay: float = 0) -> int:
+    """Return the process ID of the server after a delay in seconds."""
+    time.sleep(delay)
+    return os.getpid()
+
+
+if __name__ == "__main__":
+    mcp.run()
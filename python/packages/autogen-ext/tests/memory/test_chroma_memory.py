@@ -1,4 +1,7 @@
+import asyncio
+import threading
 from pathlib import Path
+from typing import Any
 
 import pytest
 from autogen_core.memory import MemoryContent, MemoryMimeType
@@ -240,3 +243,124 @@ async def test_component_serialization(base_config: PersistentChromaDBVectorMemo
 
     await memory.close()
     await loaded_memory.close()
+
+
+@pytest.mark.asyncio
+async def test_add_many_and_query_many(base_config: PersistentChromaDBVectorMemoryConfig) -> None:
+    """Test adding and querying in batches."""
+    memory = ChromaDBVectorMemory(config=base_config)
+    await memory.clear()
+
+    await memory.add_many(
+        [
+            MemoryContent(content="Paris is the capital of France.", mime_type=MemoryMimeType.TEXT),
+            MemoryContent(content="Jupiter is the largest planet in our solar system.", mime_type=MemoryMimeType.TEXT),
+            MemoryContent(content="The recipe needs flour, eggs and sugar.", mime_type=MemoryMimeType.TEXT),
+        ]
+    )
+
+    results = await memory.query_many(["capital of France", "largest planet"])
+    assert len(results) == 2
+    assert "Paris" in str(results[0].results[0].content)
+    assert "Jupiter" in str(results[1].results[0].content)
+
+    assert await memory.query_many([]) == []
+
+    await memory.close()
+
+
+@pytest.mark.asyncio
+async def test_write_buffer(tmp_path: Path) -> None:
+    """Test that buffered documents are written when the buffer is full, before queries and on close."""
+    config = PersistentChromaDBVectorMemoryConfig(
+        collection_name="test_collection",
+        allow_reset=True,
+        persistence_path=str(tmp_path / "chroma_db_buffered"),
+        write_buffer_size=3,
+    )
+    memory = ChromaDBVectorMemory(config=config)
+    await memory.clear()
+
+    await memory.add_many([MemoryContent(content=f"Note {i}", mime_type=MemoryMimeType.TEXT) for i in range(2)])
+    assert memory._collection is not None  # type: ignore[reportPrivateUsage]
+    assert memory._collection.count() == 0  # type: ignore[reportPrivateUsage]
+
+    await memory.add(MemoryContent(content="Note 2", mime_type=MemoryMimeType.TEXT))
+    assert memory._collection.count() == 3  # type: ignore[reportPrivateUsage]
+
+    await memory.add(MemoryContent(content="Note 3", mime_type=MemoryMimeType.TEXT))
+    results = await memory.query("Note 3")
+    assert any(r.content == "Note 3" for r in results.results)
+
+    await memory.add(MemoryContent(content="Note 4", mime_type=MemoryMimeType.TEXT))
+    await memory.close()
+
+    reopened = ChromaDBVectorMemory(config=config)
+    results = await reopened.query("Note 4")
+    assert any(r.content == "Note 4" for r in results.results)
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_write_buffer_flush_interval(tmp_path: Path) -> None:
+    """Test that buffered documents are written after the flush interval."""
+    config = PersistentChromaDBVectorMemoryConfig(
+        collection_name="test_collection",
+        allow_reset=True,
+        persistence_path=str(tmp_path / "chroma_db_interval"),
+        write_buffer_size=100,
+        write_buffer_flush_interval=0.1,
+    )
+    memory = ChromaDBVectorMemory(config=config)
+    await memory.clear()
+
+    await memory.add(MemoryContent(content="Buffered note", mime_type=MemoryMimeType.TEXT))
+    assert memory._collection is not None  # type: ignore[reportPrivateUsage]
+    assert memory._collection.count() == 0  # type: ignore[reportPrivateUsage]
+
+    await asyncio.sleep(0.5)
+    assert memory._collection.count() == 1  # type: ignore[reportPrivateUsage]
+
+    await memory.close()
+
+
+@pytest.mark.asyncio
+async def test_write_buffer_failed_flush(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a failed flush keeps its documents, unless the memory was cleared while it was writing."""
+    config = PersistentChromaDBVectorMemoryConfig(
+        collection_name="test_collection",
+        allow_reset=True,
+        persistence_path=str(tmp_path / "chroma_db_failed_flush"),
+        write_buffer_size=100,
+    )
+    memory = ChromaDBVectorMemory(config=config)
+    await memory.clear()
+    started = threading.Event()
+    proceed = threading.Event()
+
+    def failing_write(*args: Any) -> None:
+        started.set()
+        proceed.wait()
+        raise RuntimeError("Write failed")
+
+    monkeypatch.setattr(memory, "_write", failing_write)
+    await memory.add(MemoryContent(content="Kept note", mime_type=MemoryMimeType.TEXT))
+    proceed.set()
+    with pytest.raises(RuntimeError):
+        await memory.flush()
+    assert len(memory._write_buffer) == 1  # type: ignore[reportPrivateUsage]
+
+    started.clear()
+    proceed.clear()
+    flush = asyncio.create_task(memory.flush())
+    await asyncio.to_thread(started.wait)
+    clear = asyncio.create_task(memory.clear())
+    await asyncio.sleep(0.05)
+    proceed.set()
+    with pytest.raises(RuntimeError):
+        await flush
+    await clear
+    assert memory._write_buffer == []  # type: ignore[reportPrivateUsage]
+
+    monkeypatch.undo()
+    await memory.close()
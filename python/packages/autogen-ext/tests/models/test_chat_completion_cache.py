@@ -1,15 +1,23 @@
+import asyncio
 import copy
-from typing import List, Tuple, Union
+import hashlib
+import math
+import re
+import time
+from typing import Any, AsyncGenerator, List, Optional, Sequence, Tuple, Union
 
 import pytest
+from autogen_core import CancellationToken, FunctionCall, InMemoryStore
 from autogen_core.models import (
+    AssistantMessage,
     ChatCompletionClient,
     CreateResult,
     LLMMessage,
     SystemMessage,
     UserMessage,
 )
-from autogen_ext.models.cache import ChatCompletionCache
+from autogen_core.tools import ToolSchema
+from autogen_ext.models.cache import CacheStoreVectorIndex, ChatCompletionCache
 from autogen_ext.models.replay import ReplayChatCompletionClient
 from pydantic import BaseModel
 
@@ -184,3 +192,313 @@ async def test_cache_create_stream() -> None:
     # cached_client_config = cached_client.dump_component()
     # loaded_client = ChatCompletionCache.load_component(cached_client_config)
     # assert loaded_client.client == cached_client.client
+
+
+class SlowStreamClient(ReplayChatCompletionClient):
+    """A replay client that waits before each chunk of a stream, and counts the streams."""
+
+    def __init__(self, chat_completions: Sequence[str]) -> None:
+        super().__init__(chat_completions)
+        self.set_cached_bool_value(False)
+        self.num_streams = 0
+        self.cancellation_tokens: List[Optional[CancellationToken]] = []
+
+    async def create_stream(self, *args: Any, **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        self.num_streams += 1
+        self.cancellation_tokens.append(kwargs.get("cancellation_token"))
+        async for chunk in super().create_stream(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_cache_create_stream_concurrent() -> None:
+    responses = ["This is dummy message number 0", "This is dummy message number 1"]
+    client = SlowStreamClient(responses)
+    cached_client = ChatCompletionCache(client)
+    messages = [UserMessage(content="This is dummy prompt number 0", source="user")]
+
+    async def read_stream(delay: float) -> List[Union[str, CreateResult]]:
+        await asyncio.sleep(delay)
+        return [chunk async for chunk in cached_client.create_stream(messages)]
+
+    # The second stream starts while the first one is being read, and shares it.
+    results = await asyncio.gather(*(read_stream(delay) for delay in [0, 0, 0.03]))
+    assert client.num_streams == 1
+    for result in results:
+        assert result[:-1] == results[0][:-1]
+        assert isinstance(result[-1], CreateResult)
+        assert result[-1].content == responses[0]
+    assert [result[-1].cached for result in results] == [False, True, True]  # type: ignore
+
+    # The stream is cached once it is complete.
+    cached = [chunk async for chunk in cached_client.create_stream(messages)]
+    assert client.num_streams == 1
+    assert cached[:-1] == results[0][:-1]
+
+    # A non-streamed request hits the cached stream, and the other way around.
+    response = await cached_client.create(messages)
+    assert response.cached
+    assert response.content == responses[0]
+    other_messages = [UserMessage(content="This is dummy prompt number 1", source="user")]
+    response = await cached_client.create(other_messages)
+    assert not response.cached
+    cached = [chunk async for chunk in cached_client.create_stream(other_messages)]
+    assert len(cached) == 1
+    assert isinstance(cached[0], CreateResult) and cached[0].cached
+    assert cached[0].content == responses[1]
+
+
+@pytest.mark.asyncio
+async def test_cache_create_concurrent() -> None:
+    responses, prompts, system_prompt, replay_client, cached_client = get_test_data()
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
+
+    results = await asyncio.gather(*(cached_client.create(messages) for _ in range(3)))
+    assert [result.content for result in results] == [responses[0]] * 3
+    assert [result.cached for result in results] == [False, True, True]
+    response = await cached_client.create([system_prompt, UserMessage(content=prompts[1], source="user")])
+    # Only one request reached the replay client before this one.
+    assert response.content == responses[1]
+
+    # A cancelled request is not shared with the requests that follow.
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cached_client.create([UserMessage(content=prompts[2], source="user")], cancellation_token=token)
+    response = await cached_client.create([UserMessage(content=prompts[2], source="user")])
+    assert not response.cached
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_cancelled_streams", [True, False])
+async def test_cache_create_stream_cancelled(cache_cancelled_streams: bool) -> None:
+    client = SlowStreamClient(["This is dummy message number 0", "This is dummy message number 1"])
+    cached_client = ChatCompletionCache(client, cache_cancelled_streams=cache_cancelled_streams)
+    assert not ChatCompletionCache(client).cache_cancelled_streams
+    messages = [UserMessage(content="This is dummy prompt number 0", source="user")]
+
+    token = CancellationToken()
+    chunks: List[Union[str, CreateResult]] = []
+    with pytest.raises(asyncio.CancelledError):
+        async for chunk in cached_client.create_stream(messages, cancellation_token=token):
+            chunks.append(chunk)
+            token.cancel()
+    assert len(chunks) == 1
+    await asyncio.sleep(0.1)
+
+    result = [chunk async for chunk in cached_client.create_stream(messages)]
+    assert isinstance(result[-1], CreateResult)
+    if cache_cancelled_streams:
+        # The stream was read to the end and cached.
+        assert result[-1].cached
+        assert result[-1].content == "This is dummy message number 0"
+        assert client.num_streams == 1
+    else:
+        assert not result[-1].cached
+        assert client.num_streams == 2
+    # The request to the underlying client is only cancelled when nobody reads its stream.
+    upstream_token = client.cancellation_tokens[0]
+    assert upstream_token is not None and upstream_token.is_cancelled() != cache_cancelled_streams
+
+
+@pytest.mark.asyncio
+async def test_cache_create_stream_replay_delay() -> None:
+    responses, prompts, system_prompt, _, _ = get_test_data()
+    cached_client = ChatCompletionCache(ReplayChatCompletionClient(responses), stream_replay_delay=0.02)
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
+
+    original = [chunk async for chunk in cached_client.create_stream(messages)]
+    start = time.monotonic()
+    cached = [chunk async for chunk in cached_client.create_stream(messages)]
+    # The chunks after the first one are delayed, and the result is not.
+    assert time.monotonic() - start >= 0.02 * (len(original) - 2)
+    assert cached[:-1] == original[:-1]
+
+    with pytest.raises(ValueError):
+        ChatCompletionCache(ReplayChatCompletionClient(responses), stream_replay_delay=-1)
+
+
+def embed(text: str) -> List[float]:
+    """A deterministic bag of words embedding."""
+    vector = [0.0] * 64
+    for word in re.findall(r"\w+", text.lower()):
+        vector[hashlib.sha256(word.encode()).digest()[0] % 64] += 1.0
+    return vector
+
+
+@pytest.mark.asyncio
+async def test_cache_normalize_messages() -> None:
+    responses, prompts, system_prompt, _, cached_client = get_test_data(num_messages=4)
+    cached_client = ChatCompletionCache(cached_client.client, normalize_messages=True)
+
+    response0 = await cached_client.create([system_prompt, UserMessage(content=prompts[0], source="user")])
+    assert not response0.cached
+
+    # The source and whitespace changes are ignored.
+    response0_cached = await cached_client.create(
+        [system_prompt, UserMessage(content=f"  {prompts[0]} ".replace(" ", "\n "), source="other_user")]
+    )
+    assert response0_cached.cached
+    assert response0_cached.content == responses[0]
+
+    response1 = await cached_client.create([system_prompt, UserMessage(content=prompts[1], source="user")])
+    assert not response1.cached
+    assert response1.content == responses[1]
+
+    # Whitespace in the arguments of function calls is kept.
+    calls = [
+        FunctionCall(id="1", name="run_code", arguments='{"code": "if x:\\n    print(x)"}'),
+        FunctionCall(id="2", name="run_code", arguments='{"code": "if x:\\n print(x)"}'),
+    ]
+    response2 = await cached_client.create([system_prompt, AssistantMessage(content=[calls[0]], source="assistant")])
+    assert not response2.cached
+    response3 = await cached_client.create([system_prompt, AssistantMessage(content=[calls[1]], source="assistant")])
+    assert not response3.cached
+
+    loaded_client = ChatCompletionCache.load_component(cached_client.dump_component())
+    assert loaded_client.normalize_messages
+
+
+@pytest.mark.asyncio
+async def test_cache_similar_messages() -> None:
+    responses = ["Paris", "The Spree", "Paris again"]
+    replay_client = ReplayChatCompletionClient(responses)
+    replay_client.set_cached_bool_value(False)
+    vector_store = InMemoryStore[List[Tuple[str, List[float]]]]()
+    cached_client = ChatCompletionCache(
+        replay_client,
+        embedding_function=embed,
+        similarity_threshold=0.9,
+        vector_index=CacheStoreVectorIndex(vector_store),
+    )
+
+    response0 = await cached_client.create(
+        [UserMessage(content="What is the capital city of France? Answer briefly.", source="user")]
+    )
+    assert not response0.cached
+
+    # A near-duplicate request hits the cached response.
+    response0_cached = await cached_client.create(
+        [UserMessage(content="what is the capital city of France? Answer briefly please.", source="user")]
+    )
+    assert response0_cached.cached
+    assert response0_cached.content == responses[0]
+
+    # A different request misses.
+    response1 = await cached_client.create([UserMessage(content="Which river flows through Berlin?", source="user")])
+    assert not response1.cached
+    assert response1.content == responses[1]
+
+    # Near-duplicates with other arguments miss.
+    tool: ToolSchema = {"name": "search", "description": "Search the web."}
+    response2 = await cached_client.create(
+        [UserMessage(content="What is the capital city of France? Answer briefly.", source="user")], tools=[tool]
+    )
+    assert not response2.cached
+    assert response2.content == responses[2]
+
+    # The vectors are kept in the store of the index.
+    async def async_embed(text: str) -> Sequence[float]:
+        return embed(text)
+
+    cached_client = ChatCompletionCache(
+        replay_client,
+        cached_client.store,
+        embedding_function=async_embed,
+        similarity_threshold=0.9,
+        vector_index=CacheStoreVectorIndex(vector_store),
+    )
+    response0_cached = await cached_client.create(
+        [UserMessage(content="What is the capital city of France, answer briefly.", source="user")]
+    )
+    assert response0_cached.cached
+    assert response0_cached.content == responses[0]
+
+    with pytest.raises(ValueError, match="cannot be component serialized"):
+        cached_client.dump_component()
+
+
+@pytest.mark.asyncio
+async def test_cache_create_stream_similar_messages() -> None:
+    responses, _, system_prompt, _, cached_client = get_test_data()
+    cached_client = ChatCompletionCache(cached_client.client, embedding_function=embed, similarity_threshold=0.9)
+    messages: List[LLMMessage] = [
+        system_prompt,
+        UserMessage(content="Summarize the following conversation.", source="user"),
+        AssistantMessage(content="Sure, please share it.", source="assistant"),
+    ]
+
+    original = [result async for result in cached_client.create_stream(messages)]
+    similar_messages = [*messages[:2], AssistantMessage(content="Sure, please share it!", source="assistant")]
+
+    # A non-streamed request never hits a streamed response.
+    response = await cached_client.create(similar_messages)
+    assert not response.cached
+    assert response.content == responses[1]
+
+    similar_messages = [*messages[:2], AssistantMessage(content="Sure - please share it.", source="assistant")]
+    cached = [result async for result in cached_client.create_stream(similar_messages)]
+    assert cached[:-1] == original[:-1]
+    assert isinstance(cached[-1], CreateResult)
+    assert cached[-1].cached
+    assert cached[-1].content == responses[0]
+
+
+@pytest.mark.asyncio
+async def test_cache_similar_messages_expired() -> None:
+    responses = ["Paris", "The Spree", "Paris again"]
+    replay_client = ReplayChatCompletionClient(responses)
+    replay_client.set_cached_bool_value(False)
+    vector_store = InMemoryStore[List[Tuple[str, List[float]]]]()
+    cached_client = ChatCompletionCache(
+        replay_client,
+        InMemoryStore(max_size=1),
+        embedding_function=embed,
+        similarity_threshold=0.9,
+        vector_index=CacheStoreVectorIndex(vector_store),
+    )
+
+    await cached_client.create([UserMessage(content="What is the capital city of France?", source="user")])
+    # The result of the first request is evicted from the store.
+    await cached_client.create([UserMessage(content="Which river flows through Berlin?", source="user")])
+
+    # The near-duplicate misses, and the vector of the evicted result is removed.
+    response = await cached_client.create(
+        [UserMessage(content="what is the capital city of France? Please.", source="user")]
+    )
+    assert not response.cached
+    assert response.content == responses[2]
+    assert [] in vector_store.store.values()
+
+
+@pytest.mark.asyncio
+async def test_cache_store_vector_index() -> None:
+    vector_store = InMemoryStore[List[Tuple[str, List[float]]]]()
+    index = CacheStoreVectorIndex(vector_store)
+    await index.add("partition", "a", [1.0, 0.0])
+    await index.add("partition", "b", [1.0, 1.0])
+    await index.add("other", "c", [0.0, 1.0])
+
+    match = await index.search("partition", [2.0, 0.1], threshold=0.9)
+    assert match is not None and match[0] == "a"
+    assert math.isclose(match[1], 2.0 / math.sqrt(4.01))
+    match = await index.search("partition", [0.0, 1.0], threshold=0.7)
+    assert match is not None and match[0] == "b"
+    assert await index.search("partition", [0.0, 1.0], threshold=0.8) is None
+    assert await index.search("missing", [1.0, 0.0], threshold=0.0) is None
+
+    # Each vector is kept in its own entry of the store.
+    assert len(vector_store.store) == 3
+
+    await index.remove("partition", "a")
+    await index.add("partition", "d", [0.0, 1.0])
+    assert await index.search("partition", [1.0, 0.0], threshold=0.9) is None
+
+    # A new index loads the vectors from the store.
+    index = CacheStoreVectorIndex(vector_store)
+    match = await index.search("partition", [0.0, 1.0], threshold=0.9)
+    assert match is not None and match[0] == "d"
+    assert await index.search("partition", [1.0, 0.0], threshold=0.9) is None
+    await index.add("partition", "e", [1.0, 0.0])
+    assert len(vector_store.store) == 5
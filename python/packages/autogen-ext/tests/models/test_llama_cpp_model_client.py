@@ -1,6 +1,8 @@
+import asyncio
 import contextlib
 import sys
-from typing import TYPE_CHECKING, Any, ContextManager, Generator, List, Sequence, Union
+import time
+from typing import TYPE_CHECKING, Any, ContextManager, Generator, List, Sequence, Union, cast
 
 import pytest
 import torch
@@ -8,7 +10,8 @@
 # from autogen_agentchat.agents import AssistantAgent
 # from autogen_agentchat.messages import TextMessage
 # from autogen_core import CancellationToken
-from autogen_core.models import RequestUsage, SystemMessage, UserMessage
+from autogen_core import FunctionCall
+from autogen_core.models import CreateResult, RequestUsage, SystemMessage, UserMessage
 from llama_cpp import ChatCompletionRequestResponseFormat
 from pydantic import BaseModel
 
@@ -39,19 +42,50 @@ def __init__(
     ) -> None:
         self.model_path = model_path
         self.n_ctx = lambda: 1024
+        self.n_tokens = 0
+        self.cache: Any = None
+        self.active_requests = 0
+        self.max_active_requests = 0
+        self.tool_call_chunks: List[dict[str, Any]] | None = None
         self._structured_response = AgentResponse(thoughts="Test thoughts", content="Test content")
 
     # Added tokenize method for testing purposes.
-    def tokenize(self, b: bytes) -> list[int]:
+    def tokenize(self, b: bytes, **_: Any) -> list[int]:
         return list(b)
 
+    def set_cache(self, cache: Any) -> None:
+        self.cache = cache
+
+    def close(self) -> None:
+        pass
+
+    def _stream(self, messages: Any) -> Generator[dict[str, Any], None, None]:
+        self.active_requests += 1
+        self.max_active_requests = max(self.max_active_requests, self.active_requests)
+        try:
+            yield {"choices": [{"delta": {"role": "assistant"}, "finish_reason": None}]}
+            if self.tool_call_chunks is not None:
+                for tool_call_chunk in self.tool_call_chunks:
+                    yield {"choices": [{"delta": {"tool_calls": [tool_call_chunk]}, "finish_reason": None}]}
+            else:
+                for text in ["Hello ", "World"]:
+                    time.sleep(0.01)
+                    yield {"choices": [{"delta": {"content": text}, "finish_reason": None}]}
+            yield {"choices": [{"delta": {}, "finish_reason": "stop"}]}
+            self.n_tokens = len(str(messages)) + len("Hello World")
+        finally:
+            self.active_requests -= 1
+
     def create_chat_completion(
         self,
         messages: Any,
         tools: List[ChatCompletionMessageToolCalls] | None,
         stream: bool = False,
         response_format: ChatCompletionRequestResponseFormat | None = None,
-    ) -> dict[str, Any]:
+    ) -> Any:
+        if stream:
+            return self._stream(messages)
+
         # Return fake non-streaming response.
 
         if response_format is not None:
@@ -119,21 +153,99 @@ async def test_llama_cpp_create_structured_output(
         assert AgentResponse.model_validate_json(result.content).content == "Test content"
 
 
-# Commmented out due to raising not implemented error will leave in case streaming is supported in the future.
-# @pytest.mark.asyncio
-# async def test_llama_cpp_create_stream(
-#     get_completion_client: "ContextManager[type[LlamaCppChatCompletionClient]]",
-# ) -> None:
-#     with get_completion_client as Client:
-#         client = Client(filename="dummy")
-#         messages: Sequence[Union[SystemMessage, UserMessage]] = [
-#             SystemMessage(content="Test system"),
-#             UserMessage(content="Test user", source="user"),
-#         ]
-#         collected = ""
-#         async for token in client.create_stream(messages=messages):
-#             collected += token
-#         assert collected == "Hello World"
+@pytest.mark.asyncio
+async def test_llama_cpp_create_stream(
+    get_completion_client: "ContextManager[type[LlamaCppChatCompletionClient]]",
+) -> None:
+    with get_completion_client as Client:
+        client = Client(model_path="dummy")
+        messages: Sequence[Union[SystemMessage, UserMessage]] = [
+            SystemMessage(content="Test system"),
+            UserMessage(content="Test user", source="user"),
+        ]
+        collected = ""
+        result: CreateResult | None = None
+        async for token in client.create_stream(messages=messages):
+            if isinstance(token, CreateResult):
+                result = token
+            else:
+                collected += token
+        assert collected == "Hello World"
+        assert result is not None
+        assert result.content == "Hello World"
+        assert result.finish_reason == "stop"
+        assert result.usage.completion_tokens == len("Hello World")
+        assert result.usage.prompt_tokens > 0
+        assert client.total_usage() == result.usage
+
+
+@pytest.mark.asyncio
+async def test_llama_cpp_create_stream_tool_calls(
+    get_completion_client: "ContextManager[type[LlamaCppChatCompletionClient]]",
+) -> None:
+    with get_completion_client as Client:
+        client = Client(model_path="dummy")
+        cast(FakeLlama, client.llm).tool_call_chunks = [
+            {"index": 0, "id": "call_0", "type": "function", "function": {"name": "add", "arguments": '{"a": '}},
+            {"index": 0, "id": "call_0", "type": "function", "function": {"name": "add", "arguments": "1}"}},
+        ]
+        chunks = [chunk async for chunk in client.create_stream(messages=[UserMessage(content="Add", source="user")])]
+        assert len(chunks) == 1
+        result = chunks[0]
+        assert isinstance(result, CreateResult)
+        assert result.content == [FunctionCall(id="call_0", arguments='{"a": 1}', name="add")]
+        assert result.finish_reason == "function_calls"
+
+
+@pytest.mark.asyncio
+async def test_llama_cpp_requests_run_one_at_a_time(
+    get_completion_client: "ContextManager[type[LlamaCppChatCompletionClient]]",
+) -> None:
+    with get_completion_client as Client:
+        client = Client(model_path="dummy")
+
+        async def consume(content: str) -> str:
+            collected = ""
+            async for token in client.create_stream(messages=[UserMessage(content=content, source="user")]):
+                if isinstance(token, str):
+                    collected += token
+            return collected
+
+        results = await asyncio.gather(*(consume(f"Request {i}") for i in range(4)))
+        assert results == ["Hello World"] * 4
+        assert cast(FakeLlama, client.llm).max_active_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_llama_cpp_create_stream_stops_when_closed(
+    get_completion_client: "ContextManager[type[LlamaCppChatCompletionClient]]",
+) -> None:
+    with get_completion_client as Client:
+        client = Client(model_path="dummy")
+        stream = client.create_stream(messages=[UserMessage(content="Test user", source="user")])
+        assert await stream.__anext__() == "Hello "
+        await stream.aclose()
+        # The generation stops, and the next request runs.
+        result = await client.create(messages=[UserMessage(content="Test user", source="user")])
+        assert result.content == "Fake response"
+        assert cast(FakeLlama, client.llm).active_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_llama_cpp_prompt_cache(
+    get_completion_client: "ContextManager[type[LlamaCppChatCompletionClient]]",
+) -> None:
+    from llama_cpp.llama_cache import LlamaRAMCache
+
+    with get_completion_client as Client:
+        client = Client(model_path="dummy")
+        assert client.llm.cache is None
+        client = Client(model_path="dummy", prompt_cache=True)
+        assert isinstance(client.llm.cache, LlamaRAMCache)
+        cache = LlamaRAMCache(capacity_bytes=1 << 20)
+        client = Client(model_path="dummy", prompt_cache=cache)
+        assert client.llm.cache is cache
+        await client.close()
 
 
 @pytest.mark.asyncio
@@ -210,24 +322,33 @@ async def test_llama_cpp_integration_non_streaming_structured_output() -> None:
     assert AgentResponse.model_validate_json(result.content)
 
 
-# Commmented out due to raising not implemented error will leave in case streaming is supported in the future.
-# @pytest.mark.asyncio
-# async def test_llama_cpp_integration_streaming() -> None:
-#     if not ((hasattr(torch.backends, "mps") and torch.backends.mps.is_available()) or torch.cuda.is_available()):
-#         pytest.skip("Skipping LlamaCpp integration tests: GPU not available not set")
+@pytest.mark.asyncio
+async def test_llama_cpp_integration_streaming() -> None:
+    if not ((hasattr(torch.backends, "mps") and torch.backends.mps.is_available()) or torch.cuda.is_available()):
+        pytest.skip("Skipping LlamaCpp integration tests: GPU not available not set")
+
+    from autogen_ext.models.llama_cpp._llama_cpp_completion_client import LlamaCppChatCompletionClient
+
+    client = LlamaCppChatCompletionClient(
+        repo_id="unsloth/phi-4-GGUF",
+        filename="phi-4-Q2_K_L.gguf",
+        n_gpu_layers=-1,
+        seed=1337,
+        n_ctx=5000,
+        verbose=False,
+    )
+    messages: Sequence[Union[SystemMessage, UserMessage]] = [
+        SystemMessage(content="You are a helpful assistant."),
+        UserMessage(content="Please stream your response.", source="user"),
+    ]
+    collected = ""
+    async for token in client.create_stream(messages=messages):
+        if isinstance(token, str):
+            collected += token
+        else:
+            assert token.content == collected
+    assert isinstance(collected, str) and len(collected.strip()) > 0
 
-#     from autogen_ext.models.llama_cpp._llama_cpp_completion_client import LlamaCppChatCompletionClient
-#     client = LlamaCppChatCompletionClient(
-#         repo_id="unsloth/phi-4-GGUF", filename="phi-4-Q2_K_L.gguf", n_gpu_layers=-1, seed=1337, n_ctx=5000
-#     )
-#     messages: Sequence[Union[SystemMessage, UserMessage]] = [
-#         SystemMessage(content="You are a helpful assistant."),
-#         UserMessage(content="Please stream your response.", source="user"),
-#     ]
-#     collected = ""
-#     async for token in client.create_stream(messages=messages):
-#         collected += token
-#     assert isinstance(collected, str) and len(collected.strip()) > 0
 
 # Commented out tool use as this functionality is not yet implemented for Phi-4.
 # Define tools (functions) for the AssistantAgent
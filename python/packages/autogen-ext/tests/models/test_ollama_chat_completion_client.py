@@ -11,6 +11,7 @@
     CreateResult,
     FunctionExecutionResult,
     FunctionExecutionResultMessage,
+    LLMMessage,
     UserMessage,
 )
 from autogen_core.tools import FunctionTool
@@ -843,3 +844,27 @@ async def _mock_chat(*args: Any, **kwargs: Any) -> ChatResponse:
     assert chat_kwargs_captured["options"]["temperature"] == 0.7
     assert chat_kwargs_captured["options"]["top_p"] == 0.9
     assert chat_kwargs_captured["options"]["frequency_penalty"] == 1.2
+
+
+def test_count_tokens_reuses_message_counts(monkeypatch: pytest.MonkeyPatch) -> None:
+    encoded: List[str] = []
+
+    class FakeEncoding:
+        def encode(self, text: str) -> List[int]:
+            encoded.append(text)
+            return [0] * len(text.split())
+
+    monkeypatch.setattr("autogen_ext.models.ollama._ollama_client.get_encoding_for_model", lambda model: FakeEncoding())
+    client = OllamaChatCompletionClient(model="llama3.1")
+    messages: List[LLMMessage] = [
+        UserMessage(content="What is the capital of France?", source="user"),
+        AssistantMessage(content="The capital of France is Paris.", source="assistant"),
+    ]
+    num_tokens = client.count_tokens(messages)
+    assert encoded == ["What is the capital of France?", "The capital of France is Paris."]
+
+    # Only the new message of the conversation is encoded.
+    encoded.clear()
+    messages.append(UserMessage(content="And of Germany?", source="user"))
+    assert client.count_tokens(messages) == num_tokens + 3 + 3
+    assert encoded == ["And of Germany?"]
@@ -1,5 +1,10 @@
+import pickle
+from typing import List
+
 import pytest
+from autogen_core.models import AssistantMessage, LLMMessage, UserMessage
 from autogen_ext.models._utils.parse_r1_content import parse_r1_content
+from autogen_ext.models._utils.token_counting import TokenCountCache
 
 
 def test_parse_r1_content() -> None:
@@ -41,3 +46,40 @@ def test_parse_r1_content() -> None:
         thought, content = parse_r1_content(content)
         assert thought is None
         assert content == "</think>Hello, <think>world"
+
+
+def test_token_count_cache() -> None:
+    counted: List[LLMMessage] = []
+
+    def count(message: LLMMessage) -> int:
+        counted.append(message)
+        assert isinstance(message.content, str)
+        return len(message.content)
+
+    cache = TokenCountCache(max_entries=2)
+    history: List[LLMMessage] = [
+        UserMessage(content="Hello", source="user"),
+        AssistantMessage(content="Hi there", source="assistant"),
+    ]
+    assert [cache.get_or_count(message, "scope", count) for message in history] == [5, 8]
+    assert counted == history
+
+    # Equal messages are not counted again, even if they are other objects.
+    counted.clear()
+    assert cache.get_or_count(UserMessage(content="Hello", source="user"), "scope", count) == 5
+    assert counted == []
+
+    # Changed messages and other scopes are counted.
+    assert cache.get_or_count(UserMessage(content="Hello", source="other"), "scope", count) == 5
+    assert cache.get_or_count(history[1], "other scope", count) == 8
+    assert len(counted) == 2
+
+    # The least recently used counts were dropped.
+    counted.clear()
+    cache.get_or_count(history[1], "scope", count)
+    assert counted == [history[1]]
+
+    cache = pickle.loads(pickle.dumps(cache))
+    counted.clear()
+    cache.get_or_count(history[1], "scope", count)
+    assert counted == []
@@ -0,0 +1,233 @@
+import asyncio
+import os
+from functools import partial
+
+import pytest
+from autogen_core import (
+    AgentId,
+    AgentType,
+    CancellationToken,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_core.exceptions import CantHandleException
+from autogen_ext.runtimes.process_pool import ProcessPoolAgentRuntime
+from autogen_ext.runtimes.process_pool._protocol import shard_for
+from autogen_test_utils import CascadingAgent, CascadingMessageType, LoopbackAgent, MessageType, NoopAgent
+
+
+@pytest.mark.asyncio
+async def test_send_message_across_workers() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=2)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+
+    agent_ids = [AgentId("loopback", f"key{i}") for i in range(8)]
+    # The keys are spread over both workers.
+    assert {shard_for(agent_id, 2) for agent_id in agent_ids} == {0, 1}
+    for agent_id in agent_ids:
+        response = await runtime.send_message(MessageType(), recipient=agent_id)
+        assert isinstance(response, MessageType)
+
+    state = await runtime.save_state()
+    assert state == {str(agent_id): {"num_calls": 1} for agent_id in agent_ids}
+
+    with pytest.raises(LookupError):
+        await runtime.send_message(MessageType(), recipient=AgentId("unknown", "default"))
+    with pytest.raises(LookupError):
+        await runtime.get("unknown")
+
+    await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_publish_message_across_workers() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=2)
+    await runtime.register_factory(
+        type=AgentType("loopback"), agent_factory=LoopbackAgent, expected_class=LoopbackAgent
+    )
+    await runtime.add_subscription(TypeSubscription("default", "loopback"))
+    runtime.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    runtime.start()
+
+    sources = [f"source{i}" for i in range(8)]
+    for source in sources:
+        await runtime.publish_message(MessageType(), topic_id=TopicId("default", source))
+    await runtime.publish_message(MessageType(), topic_id=TopicId("other", "source0"))
+    await runtime.wait_until_idle()
+
+    for source in sources:
+        assert await runtime.agent_save_state(AgentId("loopback", source)) == {"num_calls": 1}
+    await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_publish_cascade_from_worker() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=2)
+    num_agents = 5
+    max_rounds = 3
+    for i in range(num_agents):
+        await CascadingAgent.register(runtime, f"name{i}", partial(CascadingAgent, max_rounds))
+    runtime.start()
+
+    await runtime.publish_message(CascadingMessageType(round=1), topic_id=DefaultTopicId())
+    # Waits for the messages the agents publish from their worker processes.
+    await runtime.wait_until_idle()
+
+    for i in range(num_agents):
+        state = await runtime.agent_save_state(AgentId(f"name{i}", "default"))
+        # Each round, every agent receives the messages published by the other agents.
+        assert state["num_calls"] == sum((num_agents - 1) ** r for r in range(max_rounds))
+    await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_state_round_trip() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=2)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+    await runtime.load_state({str(AgentId("loopback", "a")): {"num_calls": 3}})
+    await runtime.send_message(MessageType(), recipient=AgentId("loopback", "a"))
+    assert await runtime.save_state() == {str(AgentId("loopback", "a")): {"num_calls": 4}}
+    await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_factory_must_be_picklable() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=1)
+    with pytest.raises(ValueError):
+        await runtime.register_factory(type=AgentType("noop"), agent_factory=lambda: NoopAgent())
+
+
+class CrashingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that crashes its worker process.")
+
+    @message_handler
+    async def on_new_message(self, message: MessageType, ctx: MessageContext) -> MessageType:
+        os._exit(1)
+
+
+@pytest.mark.asyncio
+async def test_worker_crash_fails_pending_requests() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=1)
+    await CrashingAgent.register(runtime, "crashing", CrashingAgent)
+    runtime.start()
+
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        await runtime.send_message(MessageType(), recipient=AgentId("crashing", "default"))
+    # The agents of the worker are gone, so later messages fail right away.
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        await runtime.send_message(MessageType(), recipient=AgentId("crashing", "other"))
+    await runtime.stop_when_idle()
+
+
+class RegisteringAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that registers another agent type from its worker process.")
+
+    @message_handler
+    async def on_new_message(self, message: MessageType, ctx: MessageContext) -> MessageType:
+        await self.runtime.register_factory(type="loopback", agent_factory=LoopbackAgent)
+        response = await self.send_message(MessageType(), recipient=AgentId("loopback", "default"))
+        assert isinstance(response, MessageType)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_register_factory_from_worker() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=2)
+    await RegisteringAgent.register(runtime, "registering", RegisteringAgent)
+    runtime.start()
+    await runtime.send_message(MessageType(), recipient=AgentId("registering", "default"))
+    assert await runtime.agent_save_state(AgentId("loopback", "default")) == {"num_calls": 1}
+    with pytest.raises(LookupError):
+        await runtime.try_get_underlying_agent_instance(AgentId("loopback", "default"))
+    await runtime.stop()
+
+
+class SlowAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that replies after a delay.")
+
+    @message_handler
+    async def on_new_message(self, message: MessageType, ctx: MessageContext) -> MessageType:
+        await asyncio.sleep(0.5)
+        return MessageType()
+
+
+class CancellingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that cancels a message it sent from its worker process.")
+
+    @message_handler
+    async def on_new_message(self, message: MessageType, ctx: MessageContext) -> MessageType:
+        token = CancellationToken()
+        send = asyncio.ensure_future(
+            self.send_message(MessageType(), recipient=AgentId("slow", "default"), cancellation_token=token)
+        )
+        await asyncio.sleep(0.1)
+        token.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await send
+        assert not self.runtime._pending_requests  # type: ignore[attr-defined]
+        # The reply to the cancelled request arrives while this one is pending and is ignored.
+        response = await self.send_message(MessageType(), recipient=AgentId("slow", "default"))
+        assert not self.runtime._pending_requests  # type: ignore[attr-defined]
+        return response
+
+
+@pytest.mark.asyncio
+async def test_cancel_send_from_worker() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=1)
+    await SlowAgent.register(runtime, "slow", SlowAgent)
+    await CancellingAgent.register(runtime, "cancelling", CancellingAgent)
+    runtime.start()
+    response = await runtime.send_message(MessageType(), recipient=AgentId("cancelling", "default"))
+    assert isinstance(response, MessageType)
+    await runtime.stop()
+
+
+class CustomError(Exception):
+    pass
+
+
+class FailingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that raises an error chosen by its key.")
+
+    @message_handler
+    async def on_new_message(self, message: MessageType, ctx: MessageContext) -> MessageType:
+        if self.id.key == "value":
+            raise ValueError("bad value")
+        if self.id.key == "cant_handle":
+            raise CantHandleException("cannot handle")
+        if self.id.key == "custom":
+            raise CustomError("custom error")
+        # Errors of the sends from a worker keep their type too.
+        with pytest.raises(LookupError, match="does not exist"):
+            await self.send_message(MessageType(), recipient=AgentId("unknown", "default"))
+        return MessageType()
+
+
+@pytest.mark.asyncio
+async def test_error_types() -> None:
+    runtime = ProcessPoolAgentRuntime(num_workers=1)
+    await FailingAgent.register(runtime, "failing", FailingAgent)
+    runtime.start()
+    with pytest.raises(ValueError, match="bad value"):
+        await runtime.send_message(MessageType(), recipient=AgentId("failing", "value"))
+    with pytest.raises(CantHandleException, match="cannot handle"):
+        await runtime.send_message(MessageType(), recipient=AgentId("failing", "cant_handle"))
+    # Other types are raised as Exception with the original message.
+    with pytest.raises(Exception, match="custom error") as exc_info:
+        await runtime.send_message(MessageType(), recipient=AgentId("failing", "custom"))
+    assert type(exc_info.value) is Exception
+    response = await runtime.send_message(MessageType(), recipient=AgentId("failing", "lookup"))
+    assert isinstance(response, MessageType)
+    await runtime.stop()
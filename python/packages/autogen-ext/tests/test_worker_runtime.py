@@ -3,9 +3,12 @@
 import os
 from typing import Any, List
 
+import grpc
 import pytest
 from autogen_core import (
+    JSON_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
+    AgentEvictionPolicy,
     AgentId,
     AgentType,
     DefaultSubscription,
@@ -17,10 +20,16 @@
     TypeSubscription,
     default_subscription,
     event,
+    rpc,
     try_get_known_serializers_for_type,
     type_subscription,
 )
-from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost, MessageBatching
+from autogen_ext.runtimes.grpc import _constants
+from autogen_ext.runtimes.grpc._batching import MessageBatcher, unbatch
+from autogen_ext.runtimes.grpc._hash_ring import HashRing
+from autogen_ext.runtimes.grpc._rpc_deadlines import TimerWheel
+from autogen_ext.runtimes.grpc.protos import agent_worker_pb2, cloudevent_pb2
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
@@ -60,7 +69,7 @@ async def test_agent_types_must_be_unique_single_worker() -> None:
 
 @pytest.mark.grpc
 @pytest.mark.asyncio
-async def test_agent_types_must_be_unique_multiple_workers() -> None:
+async def test_agent_types_can_be_shared_by_multiple_workers() -> None:
     host_address = "localhost:50052"
     host = GrpcWorkerAgentRuntimeHost(address=host_address)
     host.start()
@@ -71,8 +80,9 @@ async def test_agent_types_must_be_unique_multiple_workers() -> None:
     await worker2.start()
 
     await worker1.register_factory(type=AgentType("name1"), agent_factory=lambda: NoopAgent(), expected_class=NoopAgent)
+    await worker2.register_factory(type=AgentType("name1"), agent_factory=lambda: NoopAgent(), expected_class=NoopAgent)
 
-    with pytest.raises(Exception, match="Agent type name1 already registered"):
+    with pytest.raises(ValueError):
         await worker2.register_factory(
             type=AgentType("name1"), agent_factory=lambda: NoopAgent(), expected_class=NoopAgent
         )
@@ -375,13 +385,19 @@ async def test_duplicate_subscription() -> None:
 
         await worker1_2.start()
 
-        # Note: This passes because worker1 is still running
-        with pytest.raises(Exception, match="Agent type worker1 already registered"):
-            await NoopAgent.register(worker1_2, "worker1", lambda: NoopAgent())
+        # Workers can share an agent type, and then share its subscriptions.
+        await NoopAgent.register(worker1_2, "worker1", lambda: NoopAgent())
+        assert len(host._servicer._subscription_manager.subscriptions) == 1  # type: ignore[reportPrivateUsage]
 
         # This is somehow covered in test_disconnected_agent as well as a stop will also disconnect the agent.
         #  Will keep them both for now as we might replace the way we simulate a disconnect
         await worker1.stop()
+        await asyncio.sleep(1)
+
+        # The subscriptions of worker1_2 replace the subscriptions of worker1.
+        assert len(host._servicer._subscription_manager.subscriptions) == 1  # type: ignore[reportPrivateUsage]
+        recipients = await host._servicer._subscription_manager.get_subscribed_recipients(TopicId("worker1:", "a"))  # type: ignore[reportPrivateUsage]
+        assert recipients == [AgentId(type="worker1", key="a")]
 
         with pytest.raises(ValueError):
             await NoopAgent.register(worker1_2, "worker1", lambda: NoopAgent())
@@ -583,3 +599,440 @@ async def test_grpc_max_message_size() -> None:
 
     asyncio.run(test_disconnected_agent())
     asyncio.run(test_grpc_max_message_size())
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_agent_eviction() -> None:
+    host_address = "localhost:50062"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+
+    policy = AgentEvictionPolicy(max_agents=1)
+    worker = GrpcWorkerAgentRuntime(host_address=host_address, agent_eviction_policy=policy)
+    await worker.start()
+    worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await worker.register_factory(
+        type=AgentType("name1"), agent_factory=lambda: LoopbackAgent(), expected_class=LoopbackAgent
+    )
+    await worker.add_subscription(TypeSubscription("default", "name1"))
+
+    await worker.publish_message(MessageType(), topic_id=TopicId("default", "a"))
+    await worker.publish_message(MessageType(), topic_id=TopicId("default", "b"))
+    await asyncio.sleep(2)
+
+    # Looking up the agent for "a" again evicts the agent for "b", and restores "a" from its saved state.
+    agent = await worker.try_get_underlying_agent_instance(AgentId("name1", "a"), LoopbackAgent)
+    assert agent.num_calls == 1
+    await asyncio.sleep(0.1)
+    assert policy.state_store.get("name1/b") == {"num_calls": 1}
+
+    await worker.stop()
+    await host.stop()
+
+
+def test_hash_ring_rebalancing() -> None:
+    ring = HashRing()
+    assert ring.get("a") is None
+    for node in ["w1", "w2", "w3"]:
+        ring.add(node)
+    keys = [f"key{i}" for i in range(3000)]
+    before = {key: ring.get(key) for key in keys}
+    # The keys are spread evenly over the nodes.
+    for node in ["w1", "w2", "w3"]:
+        assert 700 < list(before.values()).count(node) < 1300
+
+    # A new node only takes over keys, about a quarter of them.
+    ring.add("w4")
+    after_add = {key: ring.get(key) for key in keys}
+    moved = [key for key in keys if after_add[key] != before[key]]
+    assert all(after_add[key] == "w4" for key in moved)
+    assert 500 < len(moved) < 1000
+
+    # Only the keys of a removed node move.
+    ring.remove("w2")
+    after_remove = {key: ring.get(key) for key in keys}
+    assert all(after_remove[key] == after_add[key] for key in keys if after_add[key] != "w2")
+    assert "w2" not in after_remove.values()
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_agent_type_shared_by_multiple_workers() -> None:
+    host_address = "localhost:50063"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+
+    workers: List[GrpcWorkerAgentRuntime] = []
+    for _ in range(3):
+        worker = GrpcWorkerAgentRuntime(host_address=host_address)
+        await worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        await worker.register_factory(
+            type=AgentType("name1"), agent_factory=lambda: LoopbackAgent(), expected_class=LoopbackAgent
+        )
+        await worker.add_subscription(TypeSubscription("default", "name1"))
+        workers.append(worker)
+
+    keys = [f"key{i}" for i in range(30)]
+
+    async def owners() -> List[int]:
+        # The index of the worker whose agent handled the message of each key, and checks that only one did.
+        result: List[int] = []
+        for key in keys:
+            calls = [
+                (await worker.try_get_underlying_agent_instance(AgentId("name1", key), LoopbackAgent)).num_calls
+                for worker in workers
+            ]
+            assert sorted(calls) == [0] * (len(workers) - 1) + [1]
+            result.append(calls.index(1))
+            for worker in workers:
+                (await worker.try_get_underlying_agent_instance(AgentId("name1", key), LoopbackAgent)).num_calls = 0
+        return result
+
+    try:
+        # Each event is delivered once, by the worker the agent key is routed to.
+        for key in keys:
+            await workers[0].publish_message(MessageType(), topic_id=TopicId("default", key))
+        await asyncio.sleep(2)
+        published_owners = await owners()
+        assert len(set(published_owners)) == 3
+
+        # Direct messages to an agent are routed to the same worker.
+        for key in keys:
+            await workers[1].send_message(MessageType(), AgentId("name1", key))
+        assert await owners() == published_owners
+
+        # When a worker leaves, only its agents move to the other workers.
+        await workers[2].stop()
+        await asyncio.sleep(1)
+        workers.pop()
+        for key in keys:
+            await workers[0].publish_message(MessageType(), topic_id=TopicId("default", key))
+        await asyncio.sleep(2)
+        remaining_owners = await owners()
+        for published_owner, remaining_owner in zip(published_owners, remaining_owners, strict=True):
+            if published_owner != 2:
+                assert remaining_owner == published_owner
+    finally:
+        for worker in workers:
+            await worker.stop()
+        await host.stop()
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_local_delivery() -> None:
+    host_address = "localhost:50064"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+
+    worker1 = GrpcWorkerAgentRuntime(host_address=host_address, local_delivery=True)
+    await worker1.start()
+    worker1.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await worker1.register_factory(
+        type=AgentType("name1"), agent_factory=lambda: LoopbackAgent(), expected_class=LoopbackAgent
+    )
+    await worker1.add_subscription(TypeSubscription("default", "name1"))
+
+    worker2 = GrpcWorkerAgentRuntime(host_address=host_address)
+    await worker2.start()
+    worker2.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await worker2.register_factory(
+        type=AgentType("name2"), agent_factory=lambda: LoopbackAgent(), expected_class=LoopbackAgent
+    )
+    await worker2.add_subscription(TypeSubscription("default", "name2"))
+
+    # Count the messages worker1 sends to the host.
+    sent_messages: List[Any] = []
+    host_connection = worker1._host_connection  # type: ignore[reportPrivateUsage]
+    assert host_connection is not None
+    send = host_connection.send
+
+    async def counting_send(message: Any) -> None:
+        sent_messages.append(message)
+        await send(message)
+
+    host_connection.send = counting_send  # type: ignore[method-assign]
+
+    try:
+        # Wait for the host to send the routing of name1.
+        await asyncio.sleep(0.5)
+
+        # A message sent to an agent of the same worker does not go through the host.
+        result = await worker1.send_message(MessageType(), AgentId("name1", "default"))
+        assert isinstance(result, MessageType)
+        assert sent_messages == []
+        # A message sent to an agent of another worker does.
+        await worker1.send_message(MessageType(), AgentId("name2", "default"))
+        assert len(sent_messages) == 1
+
+        # A published message is delivered locally and through the host, once to each agent.
+        await worker1.publish_message(MessageType(), topic_id=TopicId("default", "default"))
+        await asyncio.sleep(1)
+        assert len(sent_messages) == 2
+        worker1_agent = await worker1.try_get_underlying_agent_instance(AgentId("name1", "default"), LoopbackAgent)
+        assert worker1_agent.num_calls == 2
+        worker2_agent = await worker2.try_get_underlying_agent_instance(AgentId("name2", "default"), LoopbackAgent)
+        assert worker2_agent.num_calls == 2
+    finally:
+        await worker1.stop()
+        await worker2.stop()
+        await host.stop()
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_local_delivery_waits_for_new_workers() -> None:
+    host_address = "localhost:50068"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    servicer = host._servicer  # type: ignore[reportPrivateUsage]
+
+    workers: List[GrpcWorkerAgentRuntime] = []
+    for _ in range(2):
+        worker = GrpcWorkerAgentRuntime(host_address=host_address, local_delivery=True)
+        await worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        workers.append(worker)
+    client_ids = [worker._host_connection.client_id for worker in workers]  # type: ignore[reportPrivateUsage, union-attr]
+
+    # Hold back the acknowledgements of the first worker.
+    held: List[Any] = []
+    host_connection = workers[0]._host_connection  # type: ignore[reportPrivateUsage]
+    assert host_connection is not None
+    send = host_connection.send
+
+    async def holding_send(message: Any) -> None:
+        if message.WhichOneof("message") == "agentTypeClients":
+            held.append(message)
+        else:
+            await send(message)
+
+    host_connection.send = holding_send  # type: ignore[method-assign]
+
+    keys = [f"key{i}" for i in range(30)]
+
+    def local_keys(worker: GrpcWorkerAgentRuntime) -> List[str]:
+        return [key for key in keys if worker._is_local(AgentId("name1", key))]  # type: ignore[reportPrivateUsage]
+
+    def routed_keys(client_id: str) -> List[str]:
+        return [key for key in keys if servicer._get_client_id("name1", key) == client_id]  # type: ignore[reportPrivateUsage]
+
+    try:
+        await workers[0].register_factory(
+            type=AgentType("name1"), agent_factory=lambda: LoopbackAgent(), expected_class=LoopbackAgent
+        )
+        await asyncio.sleep(0.5)
+        assert local_keys(workers[0]) == keys
+
+        # While the first worker has not acknowledged the second one, both send messages through the host,
+        # which still routes them all to the first worker.
+        await workers[1].register_factory(
+            type=AgentType("name1"), agent_factory=lambda: LoopbackAgent(), expected_class=LoopbackAgent
+        )
+        await asyncio.sleep(0.5)
+        assert len(held) == 1
+        assert local_keys(workers[0]) == [] and local_keys(workers[1]) == []
+        assert routed_keys(client_ids[0]) == keys
+
+        # Once acknowledged, the workers deliver locally the agents the host routes to them.
+        host_connection.send = send  # type: ignore[method-assign]
+        await send(held[0])
+        await asyncio.sleep(0.5)
+        for worker, client_id in zip(workers, client_ids, strict=True):
+            assert local_keys(worker) == routed_keys(client_id) != []
+    finally:
+        for worker in workers:
+            await worker.stop()
+        await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_event_without_recipients_is_not_decoded() -> None:
+    worker = GrpcWorkerAgentRuntime(host_address="localhost:50065")
+    worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await worker._subscription_manager.add_subscription(TypeSubscription("default", "name1"))  # type: ignore[reportPrivateUsage]
+
+    def attribute(value: str) -> cloudevent_pb2.CloudEvent.CloudEventAttributeValue:
+        return cloudevent_pb2.CloudEvent.CloudEventAttributeValue(ce_string=value)
+
+    # The only subscriber is the sender, so the payload, which is not valid JSON, is never decoded.
+    event = cloudevent_pb2.CloudEvent(
+        id="1",
+        spec_version="1.0",
+        type="default",
+        source="a",
+        attributes={
+            _constants.DATA_CONTENT_TYPE_ATTR: attribute(JSON_DATA_CONTENT_TYPE),
+            _constants.DATA_SCHEMA_ATTR: attribute(worker._serialization_registry.type_name(MessageType())),  # type: ignore[reportPrivateUsage]
+            _constants.AGENT_SENDER_TYPE_ATTR: attribute("name1"),
+            _constants.AGENT_SENDER_KEY_ATTR: attribute("a"),
+        },
+        binary_data=b"not json",
+    )
+    await worker._process_event(event)  # type: ignore[reportPrivateUsage]
+
+    # From another sender, it is.
+    event.attributes[_constants.AGENT_SENDER_KEY_ATTR].ce_string = "b"
+    with pytest.raises(ValueError):
+        await worker._process_event(event)  # type: ignore[reportPrivateUsage]
+
+
+@pytest.mark.asyncio
+async def test_message_batcher() -> None:
+    def message(request_id: str) -> agent_worker_pb2.Message:
+        return agent_worker_pb2.Message(request=agent_worker_pb2.RpcRequest(request_id=request_id))
+
+    def request_ids(message: agent_worker_pb2.Message) -> List[str]:
+        return [item.request.request_id for item in unbatch(message)]
+
+    queue: asyncio.Queue[agent_worker_pb2.Message] = asyncio.Queue()
+    batcher = MessageBatcher(queue, MessageBatching(max_messages=3, max_bytes=1000, max_delay=0.05))
+    for i in range(5):
+        queue.put_nowait(message(str(i)))
+    # A full batch is sent right away, and the rest after the delay.
+    assert request_ids(await batcher.get()) == ["0", "1", "2"]
+    assert request_ids(await batcher.get()) == ["3", "4"]
+
+    # Messages that arrive during the delay join the batch.
+    async def put_later() -> None:
+        await asyncio.sleep(0.01)
+        queue.put_nowait(message("6"))
+
+    queue.put_nowait(message("5"))
+    task = asyncio.create_task(put_later())
+    assert request_ids(await batcher.get()) == ["5", "6"]
+    await task
+
+    # A single message is not wrapped in a batch, and a message that does not fit waits for the next batch.
+    queue.put_nowait(message("7"))
+    queue.put_nowait(message("8" * 2000))
+    first = await batcher.get()
+    assert first.WhichOneof("message") == "request"
+    assert request_ids(first) == ["7"]
+    assert request_ids(await batcher.get()) == ["8" * 2000]
+    batcher.close()
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_message_batching_and_compression() -> None:
+    host_address = "localhost:50066"
+    host = GrpcWorkerAgentRuntimeHost(
+        address=host_address, message_batching=MessageBatching(), compression=grpc.Compression.Gzip
+    )
+    host.start()
+
+    workers: List[GrpcWorkerAgentRuntime] = []
+    for agent_type in ["name1", "name2"]:
+        worker = GrpcWorkerAgentRuntime(
+            host_address=host_address,
+            message_batching=MessageBatching(),
+            compression=grpc.Compression.Gzip,
+        )
+        await worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        await worker.register_factory(
+            type=AgentType(agent_type), agent_factory=lambda: LoopbackAgent(), expected_class=LoopbackAgent
+        )
+        await worker.add_subscription(TypeSubscription("default", agent_type))
+        workers.append(worker)
+
+    try:
+        # Concurrent messages between workers are sent in batches.
+        results = await asyncio.gather(
+            *[workers[0].send_message(MessageType(), AgentId("name2", str(i))) for i in range(50)]
+        )
+        assert all(isinstance(result, MessageType) for result in results)
+        for i in range(50):
+            await workers[1].publish_message(MessageType(), topic_id=TopicId("default", str(i)))
+        await asyncio.sleep(1)
+        for i in range(50):
+            agent = await workers[0].try_get_underlying_agent_instance(AgentId("name1", str(i)), LoopbackAgent)
+            assert agent.num_calls == 1
+    finally:
+        for worker in workers:
+            await worker.stop()
+        await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel() -> None:
+    expired: List[str] = []
+    wheel = TimerWheel[str](expired.append, tick=0.01, slots=8)
+    now = asyncio.get_running_loop().time()
+    # Further away than one turn of the wheel.
+    wheel.schedule("late", now + 0.3)
+    wheel.schedule("soon", now + 0.02)
+    wheel.schedule("cancelled", now + 0.05)
+    wheel.schedule("past", now - 1)
+    wheel.cancel("cancelled")
+    assert len(wheel) == 3
+
+    await asyncio.sleep(0.1)
+    assert expired == ["past", "soon"]
+    assert "late" in wheel
+
+    await asyncio.sleep(0.3)
+    assert expired == ["past", "soon", "late"]
+    assert len(wheel) == 0
+
+
+class StuckAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that only responds when released.")
+        self.released = asyncio.Event()
+        self.cancelled = asyncio.Event()
+
+    @rpc
+    async def on_message_type(self, message: MessageType, ctx: MessageContext) -> MessageType:
+        ctx.cancellation_token.add_callback(self.cancelled.set)
+        await self.released.wait()
+        return message
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_rpc_deadlines() -> None:
+    host_address = "localhost:50067"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address, rpc_timeout=1.0)
+    host.start()
+    worker1 = GrpcWorkerAgentRuntime(host_address=host_address)
+    worker2 = GrpcWorkerAgentRuntime(host_address=host_address, rpc_timeout=0.2)
+    worker3 = GrpcWorkerAgentRuntime(host_address=host_address)
+    for worker in [worker1, worker2, worker3]:
+        await worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await worker1.register_factory(type=AgentType("stuck"), agent_factory=StuckAgent, expected_class=StuckAgent)
+
+    try:
+        # The deadline of the sender is enforced by the sender, the host, and the handler's cancellation token.
+        with pytest.raises(TimeoutError):
+            await worker2.send_message(MessageType(), AgentId("stuck", "with_deadline"))
+        agent = await worker1.try_get_underlying_agent_instance(AgentId("stuck", "with_deadline"), StuckAgent)
+        await asyncio.wait_for(agent.cancelled.wait(), timeout=1)
+        metrics = worker2.rpc_metrics()
+        assert metrics.timed_out == 1
+        assert metrics.in_flight == 0
+        assert metrics.max_in_flight == 1
+
+        # The host times out requests without a deadline.
+        with pytest.raises(TimeoutError):
+            await worker3.send_message(MessageType(), AgentId("stuck", "without_deadline"))
+        assert worker3.rpc_metrics().in_flight == 0
+        await asyncio.sleep(0.1)
+        metrics = host.rpc_metrics()
+        assert metrics.timed_out == 2
+        assert metrics.in_flight == 0
+
+        # The responses that arrive after their deadline are dropped.
+        for key in ["with_deadline", "without_deadline"]:
+            agent = await worker1.try_get_underlying_agent_instance(AgentId("stuck", key), StuckAgent)
+            agent.released.set()
+        await asyncio.sleep(0.5)
+        assert host.rpc_metrics().late_responses == 2
+    finally:
+        for worker in [worker1, worker2, worker3]:
+            await worker.stop()
+        await host.stop()
@@ -5,7 +5,7 @@
 import pytest_asyncio
 import uvicorn
 from autogen_core import ComponentModel
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from pydantic import BaseModel, Field
 
 
@@ -57,6 +57,29 @@ async def test_patch_endpoint(body: TestArgs) -> TestResponse:
     return TestResponse(result=f"Received: {body.query} with value {body.value}")
 
 
+@app.get("/connection")
+async def test_connection_endpoint(request: Request) -> TestResponse:
+    # The client port identifies the connection the request came on.
+    assert request.client is not None
+    return TestResponse(result=str(request.client.port))
+
+
+@app.get("/user-agent")
+async def test_user_agent_endpoint(request: Request) -> TestResponse:
+    return TestResponse(result=request.headers.get("user-agent", ""))
+
+
+cached_calls = 0
+
+
+@app.get("/cached")
+async def test_cached_endpoint(response: Response, max_age: int) -> TestResponse:
+    global cached_calls
+    cached_calls += 1
+    response.headers["Cache-Control"] = f"max-age={max_age}"
+    return TestResponse(result=str(cached_calls))
+
+
 @pytest.fixture
 def test_config() -> ComponentModel:
     return ComponentModel(
@@ -180,6 +180,68 @@ async def test_invalid_request(test_config: ComponentModel, test_server: None) -
         await tool.run_json({"query": "test query", "value": 42}, CancellationToken())
 
 
+@pytest.mark.asyncio
+async def test_shared_client(test_config: ComponentModel, test_server: None) -> None:
+    config = test_config.model_copy()
+    config.config["path"] = "/connection"
+    config.config["method"] = "GET"
+    config.config["json_schema"] = {"type": "object", "properties": {}}
+    tool = HttpTool.load_component(config)
+    other_tool = HttpTool.load_component(config)
+
+    # The tools share a client, which keeps the connection alive across calls.
+    ports = {json.loads(await t.run_json({}, CancellationToken()))["result"] for t in [tool, other_tool, tool]}
+    assert len(ports) == 1
+
+    config.config["share_client"] = False
+    unshared_tool = HttpTool.load_component(config)
+    ports = {json.loads(await unshared_tool.run_json({}, CancellationToken()))["result"] for _ in range(2)}
+    assert len(ports) == 2
+
+    await HttpTool.close_shared_clients()
+
+
+@pytest.mark.asyncio
+async def test_client_default_headers(test_config: ComponentModel, test_server: None) -> None:
+    config = test_config.model_copy()
+    config.config["path"] = "/user-agent"
+    config.config["method"] = "GET"
+    config.config["json_schema"] = {"type": "object", "properties": {}}
+
+    # Requests are sent with the default headers of the client, shared or not.
+    for share_client in [True, False]:
+        config.config["share_client"] = share_client
+        tool = HttpTool.load_component(config)
+        result = json.loads(await tool.run_json({}, CancellationToken()))["result"]
+        assert result.startswith("python-httpx/")
+
+    await HttpTool.close_shared_clients()
+
+
+@pytest.mark.asyncio
+async def test_response_cache(test_config: ComponentModel, test_server: None) -> None:
+    config = test_config.model_copy()
+    config.config["path"] = "/cached"
+    config.config["method"] = "GET"
+    config.config["return_type"] = "json"
+    config.config["response_cache_size"] = 10
+    config.config["json_schema"] = {
+        "type": "object",
+        "properties": {"max_age": {"type": "integer"}},
+        "required": ["max_age"],
+    }
+    tool = HttpTool.load_component(config)
+
+    first = await tool.run_json({"max_age": 60}, CancellationToken())
+    assert await tool.run_json({"max_age": 60}, CancellationToken()) == first
+
+    # Responses with max-age=0 must not be reused.
+    uncached = await tool.run_json({"max_age": 0}, CancellationToken())
+    assert await tool.run_json({"max_age": 0}, CancellationToken()) != uncached
+
+    await HttpTool.close_shared_clients()
+
+
 def test_config_serialization(test_config: ComponentModel) -> None:
     tool = HttpTool.load_component(test_config)
     config = tool.dump_component()
@@ -1,18 +1,26 @@
+import asyncio
 import logging
 import os
+import signal
+import sys
+from pathlib import Path
+from typing import List
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from autogen_core import CancellationToken
 from autogen_ext.tools.mcp import (
+    McpSessionPool,
     SseMcpToolAdapter,
     SseServerParams,
     StdioMcpToolAdapter,
     StdioServerParams,
+    close_default_session_pool,
     mcp_server_tools,
 )
 from json_schema_to_pydantic import create_model
 from mcp import ClientSession, Tool
+from mcp.types import TextContent
 
 
 @pytest.fixture
@@ -77,6 +85,17 @@ def cancellation_token() -> CancellationToken:
     return CancellationToken()
 
 
+@pytest.fixture
+def echo_server_params() -> StdioServerParams:
+    server = Path(__file__).parent.parent / "mcp_echo_server.py"
+    return StdioServerParams(command=sys.executable, args=[str(server)], read_timeout_seconds=30)
+
+
+async def _server_pid(tool: StdioMcpToolAdapter | SseMcpToolAdapter, delay: float = 0) -> int:
+    result: List[TextContent] = await tool.run_json({"delay": delay}, CancellationToken())
+    return int(result[0].text)
+
+
 def test_adapter_config_serialization(sample_tool: Tool, sample_server_params: StdioServerParams) -> None:
     """Test that adapter can be saved to and loaded from config."""
     original_adapter = StdioMcpToolAdapter(server_params=sample_server_params, tool=sample_tool)
@@ -118,7 +137,7 @@ async def test_mcp_tool_execution(
     mock_context = AsyncMock()
     mock_context.__aenter__.return_value = mock_session
     monkeypatch.setattr(
-        "autogen_ext.tools.mcp._base.create_mcp_server_session",
+        "autogen_ext.tools.mcp._session_pool.create_mcp_server_session",
         lambda *args, **kwargs: mock_context,  # type: ignore
     )
 
@@ -150,7 +169,7 @@ async def test_adapter_from_server_params(
     mock_context = AsyncMock()
     mock_context.__aenter__.return_value = mock_session
     monkeypatch.setattr(
-        "autogen_ext.tools.mcp._base.create_mcp_server_session",
+        "autogen_ext.tools.mcp._session_pool.create_mcp_server_session",
         lambda *args, **kwargs: mock_context,  # type: ignore
     )
 
@@ -224,7 +243,7 @@ async def test_sse_tool_execution(
     mock_sse_session.call_tool.return_value = MagicMock(isError=False, content={"result": "test_output"})
 
     monkeypatch.setattr(
-        "autogen_ext.tools.mcp._base.create_mcp_server_session",
+        "autogen_ext.tools.mcp._session_pool.create_mcp_server_session",
         lambda *args, **kwargs: mock_context,  # type: ignore
     )
 
@@ -254,7 +273,7 @@ async def test_sse_adapter_from_server_params(
     mock_context = AsyncMock()
     mock_context.__aenter__.return_value = mock_sse_session
     monkeypatch.setattr(
-        "autogen_ext.tools.mcp._base.create_mcp_server_session",
+        "autogen_ext.tools.mcp._session_pool.create_mcp_server_session",
         lambda *args, **kwargs: mock_context,  # type: ignore
     )
 
@@ -284,6 +303,101 @@ async def test_sse_adapter_from_server_params(
     )
 
 
+@pytest.mark.asyncio
+async def test_session_pool_reuses_session(echo_server_params: StdioServerParams) -> None:
+    """Test that the adapters share one server session across tool calls."""
+    pool = McpSessionPool()
+    tools = {tool.name: tool for tool in await mcp_server_tools(echo_server_params, session_pool=pool)}
+
+    results = await asyncio.gather(
+        *(tools["echo"].run_json({"text": f"hello {i}"}, CancellationToken()) for i in range(5))
+    )
+    assert [result[0].text for result in results] == [f"hello {i}" for i in range(5)]
+
+    pids = {await _server_pid(tools["pid"]) for _ in range(3)}
+    assert len(pids) == 1
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_session_pool_reconnects(echo_server_params: StdioServerParams) -> None:
+    """Test that a call is retried on a new session when the server is gone."""
+    pool = McpSessionPool()
+    tools = {tool.name: tool for tool in await mcp_server_tools(echo_server_params, session_pool=pool)}
+
+    pid = await _server_pid(tools["pid"])
+    os.kill(pid, signal.SIGKILL)
+    await asyncio.sleep(0.5)
+
+    new_pid = await _server_pid(tools["pid"])
+    assert new_pid != pid
+    assert await _server_pid(tools["pid"]) == new_pid
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_session_pool_does_not_retry_sent_calls(echo_server_params: StdioServerParams) -> None:
+    """Test that a call that reached the server is not retried when the server is gone."""
+    pool = McpSessionPool()
+    tools = {tool.name: tool for tool in await mcp_server_tools(echo_server_params, session_pool=pool)}
+    pid = await _server_pid(tools["pid"])
+
+    async def kill_server() -> None:
+        await asyncio.sleep(0.5)
+        os.kill(pid, signal.SIGKILL)
+
+    kill_task = asyncio.create_task(kill_server())
+    with pytest.raises(Exception, match="Connection closed"):
+        await _server_pid(tools["pid"], delay=2)
+    await kill_task
+
+    # The next call runs on a new session.
+    assert await _server_pid(tools["pid"]) != pid
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_close_default_session_pool(echo_server_params: StdioServerParams) -> None:
+    """Test that the sessions of the default pool are closed."""
+    tools = {tool.name: tool for tool in await mcp_server_tools(echo_server_params)}
+    pid = await _server_pid(tools["pid"])
+
+    await close_default_session_pool()
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+    assert await _server_pid(tools["pid"]) != pid
+
+    await close_default_session_pool()
+
+
+@pytest.mark.asyncio
+async def test_session_pool_max_concurrent_calls(echo_server_params: StdioServerParams) -> None:
+    """Test that busy sessions make the pool open more sessions, up to the limit."""
+    pool = McpSessionPool(max_concurrent_calls=1, max_sessions_per_server=2)
+    tools = {tool.name: tool for tool in await mcp_server_tools(echo_server_params, session_pool=pool)}
+
+    pids = await asyncio.gather(*(_server_pid(tools["pid"], delay=0.2) for _ in range(4)))
+    assert len(set(pids)) == 2
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_session_pool_idle_timeout(echo_server_params: StdioServerParams) -> None:
+    """Test that idle sessions are closed."""
+    pool = McpSessionPool(idle_timeout=0.2, health_check_interval=None)
+    tools = {tool.name: tool for tool in await mcp_server_tools(echo_server_params, session_pool=pool)}
+
+    pid = await _server_pid(tools["pid"])
+    await asyncio.sleep(1)
+    assert await _server_pid(tools["pid"]) != pid
+
+    await pool.close()
+
+
 # TODO: why is this test not working in CI?
 @pytest.mark.skip(reason="Skipping test_mcp_server_fetch due to CI issues.")
 @pytest.mark.asyncio
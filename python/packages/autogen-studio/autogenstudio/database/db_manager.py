@@ -1,17 +1,24 @@
+import asyncio
 import json
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from loguru import logger
-from sqlalchemy import exc, inspect, text
+from sqlalchemy import Engine, event, exc, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, and_, create_engine, select
 
 from ..datamodel import BaseDBModel, Response, Team
 from ..teammanager import TeamManager
 from .schema_manager import SchemaManager
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -20,10 +27,41 @@ def default(self, obj):
         return super().default(obj)
 
 
+def _configure_sqlite(engine: Engine) -> None:
+    """Use write-ahead logging for SQLite, so that reads do not wait for writes, and only sync the WAL at
+    checkpoints, which is safe in WAL mode"""
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+def _async_engine_uri(engine_uri: str) -> str:
+    """The URI of the async driver of the database, if the URI does not name a driver"""
+    url = make_url(engine_uri)
+    if url.drivername == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if url.drivername == "postgresql":
+        # psycopg 3 has an async API
+        return url.set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+    return engine_uri
+
+
 class DatabaseManager:
     _init_lock = threading.Lock()
 
-    def __init__(self, engine_uri: str, base_dir: Optional[Union[str, Path]] = None) -> None:
+    def __init__(
+        self,
+        engine_uri: str,
+        base_dir: Optional[Union[str, Path]] = None,
+        async_engine: bool = False,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+    ) -> None:
         """
         Initialize DatabaseManager with database connection settings.
         Does not perform any database operations.
@@ -31,15 +69,45 @@ def __init__(self, engine_uri: str, base_dir: Optional[Union[str, Path]] = None)
         Args:
             engine_uri: Database connection URI (e.g. sqlite:///db.sqlite3)
             base_dir: Base directory for migration files. If None, uses current directory
+            async_engine: If True, the async methods use an async engine, which needs the async driver of the
+                database and greenlet. They are not installed with autogenstudio, install them with
+                `pip install aiosqlite "sqlalchemy[asyncio]"` for SQLite (psycopg is async already for PostgreSQL).
+                Otherwise the async methods run the sync methods in a worker thread.
+                In-memory SQLite databases always use a worker thread, as an async engine would open another database
+            pool_size: Number of connections kept open in the connection pool
+            max_overflow: Number of connections opened beyond pool_size under load
         """
-        connection_args = {"check_same_thread": True} if "sqlite" in engine_uri else {}
+        is_sqlite = "sqlite" in engine_uri
+        # Messages are written from a worker thread, so pooled SQLite connections are shared between threads
+        connection_args = {"check_same_thread": False} if is_sqlite else {}
+        engine_args: Dict[str, Any] = {
+            "connect_args": connection_args,
+            "json_serializer": lambda obj: json.dumps(obj, cls=CustomJSONEncoder),
+        }
+        in_memory = is_sqlite and make_url(engine_uri).database in (None, "", ":memory:")
+        if in_memory:
+            # Each connection to an in-memory SQLite database opens a new database, so all threads share one connection
+            engine_args.update(poolclass=StaticPool)
+        else:
+            engine_args.update(pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True)
 
         if base_dir is not None and isinstance(base_dir, str):
             base_dir = Path(base_dir)
 
-        self.engine = create_engine(
-            engine_uri, connect_args=connection_args, json_serializer=lambda obj: json.dumps(obj, cls=CustomJSONEncoder)
-        )
+        self.engine = create_engine(engine_uri, **engine_args)
+        self.async_engine: Optional["AsyncEngine"] = None
+        if async_engine and in_memory:
+            # Each in-memory database is private to its connection, so an async engine would not see the same data
+            logger.warning("In-memory SQLite databases do not support async_engine, using a worker thread instead")
+        elif async_engine:
+            # Needs the greenlet package, which is optional for SQLAlchemy
+            from sqlalchemy.ext.asyncio import create_async_engine
+
+            self.async_engine = create_async_engine(_async_engine_uri(engine_uri), **engine_args)
+        if is_sqlite and not in_memory:
+            _configure_sqlite(self.engine)
+            if self.async_engine is not None:
+                _configure_sqlite(self.async_engine.sync_engine)
         self.schema_manager = SchemaManager(
             engine=self.engine,
             base_dir=base_dir,
@@ -81,10 +149,13 @@ def initialize_database(self, auto_upgrade: bool = False, force_init_alembic: bo
             # Handle existing database
             if auto_upgrade or self._should_auto_upgrade():
                 logger.info("Checking database schema...")
-                if self.schema_manager.ensure_schema_up_to_date():
-                    return Response(message="Database schema is up to date", status=True)
-                return Response(message="Database upgrade failed", status=False)
+                if not self.schema_manager.ensure_schema_up_to_date():
+                    return Response(message="Database upgrade failed", status=False)
+                # Indexes may be on columns that the upgrade added
+                self._ensure_indexes()
+                return Response(message="Database schema is up to date", status=True)
 
+            self._ensure_indexes()
             return Response(message="Database is ready", status=True)
 
         except Exception as e:
@@ -94,6 +165,14 @@ def initialize_database(self, auto_upgrade: bool = False, force_init_alembic: bo
         finally:
             self._init_lock.release()
 
+    def _ensure_indexes(self) -> None:
+        """Create the indexes of the models that are missing from existing tables"""
+        table_names = set(inspect(self.engine).get_table_names())
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name in table_names:
+                for index in table.indexes:
+                    index.create(self.engine, checkfirst=True)
+
     def reset_db(self, recreate_tables: bool = True) -> Response:
         """
         Reset the database by dropping all tables and optionally recreating them.
@@ -194,9 +273,131 @@ def upsert(self, model: BaseDBModel, return_json: bool = True) -> Response:
             data=model.model_dump() if return_json else model,
         )
 
+    def insert_many(self, models: Sequence[BaseDBModel]) -> Response:
+        """Create several entities in a single transaction
+
+        Unlike upsert, the models are not checked for existing rows nor refreshed after the commit.
+
+        Args:
+            models (Sequence[SQLModel]): The new model instances to create
+
+        Returns:
+            Response: Contains status and message
+        """
+        status = True
+        status_message = f"{len(models)} entities Created Successfully"
+
+        with Session(self.engine) as session:
+            try:
+                session.add_all(models)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                status = False
+                status_message = f"Error while creating entities: {e}"
+                logger.error(status_message)
+
+        return Response(message=status_message, status=status, data=None)
+
+    def _upsert_statements(self, models: Sequence[BaseDBModel]) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+        """Bulk INSERT ... ON CONFLICT statements for the models, and the rows to execute them with.
+
+        Models with an id are updated if their row exists. Models without an id get a new row."""
+        dialect = sqlite if self.engine.dialect.name == "sqlite" else postgresql
+        now = datetime.now()
+        groups: Dict[Tuple[type, bool], List[Dict[str, Any]]] = {}
+        for model in models:
+            data = model.model_dump()
+            row = {column.name: data[column.name] for column in model.__table__.columns if column.name in data}
+            has_id = row.get("id") is not None
+            if not has_id:
+                row.pop("id", None)
+            groups.setdefault((type(model), has_id), []).append(row)
+
+        statements = []
+        for (model_class, has_id), rows in groups.items():
+            table = model_class.__table__
+            statement = dialect.insert(table)
+            if has_id:
+                updates = {
+                    column.name: statement.excluded[column.name]
+                    for column in table.columns
+                    if column.name not in ("id", "created_at")
+                }
+                updates["updated_at"] = now
+                statement = statement.on_conflict_do_update(index_elements=[table.c.id], set_=updates)
+            statements.append((statement, rows))
+        return statements
+
+    def upsert_many(self, models: Sequence[BaseDBModel]) -> Response:
+        """Create or update several entities in a single transaction
+
+        Uses INSERT ... ON CONFLICT on SQLite and PostgreSQL, rather than a select per entity.
+        The models are not refreshed after the commit.
+
+        Args:
+            models (Sequence[SQLModel]): The model instances to create or update
+
+        Returns:
+            Response: Contains status and message
+        """
+        status = True
+        status_message = f"{len(models)} entities Upserted Successfully"
+
+        with Session(self.engine) as session:
+            try:
+                if self.engine.dialect.name in ("sqlite", "postgresql"):
+                    for statement, rows in self._upsert_statements(models):
+                        session.execute(statement, rows)
+                else:
+                    for model in models:
+                        session.merge(model)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                status = False
+                status_message = f"Error while upserting entities: {e}"
+                logger.error(status_message)
+
+        return Response(message=status_message, status=status, data=None)
+
+    async def aupsert_many(self, models: Sequence[BaseDBModel]) -> Response:
+        """Async version of upsert_many"""
+        if self.async_engine is None or self.engine.dialect.name not in ("sqlite", "postgresql"):
+            return await asyncio.to_thread(self.upsert_many, models)
+
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        status = True
+        status_message = f"{len(models)} entities Upserted Successfully"
+
+        async with AsyncSession(self.async_engine) as session:
+            try:
+                for statement, rows in self._upsert_statements(models):
+                    await session.execute(statement, rows)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                status = False
+                status_message = f"Error while upserting entities: {e}"
+                logger.error(status_message)
+
+        return Response(message=status_message, status=status, data=None)
+
     def _model_to_dict(self, model_obj):
         return {col.name: getattr(model_obj, col.name) for col in model_obj.__table__.columns}
 
+    def _select(self, model_class: type[BaseDBModel], filters: dict | None, order: str):
+        statement = select(model_class)  # type: ignore
+        if filters:
+            conditions = [getattr(model_class, col) == value for col, value in filters.items()]
+            statement = statement.where(and_(*conditions))
+
+        if hasattr(model_class, "created_at") and order:
+            order_by_clause = getattr(model_class.created_at, order)()  # Dynamically apply asc/desc
+            statement = statement.order_by(order_by_clause)
+        return statement
+
     def get(
         self,
         model_class: type[BaseDBModel],
@@ -211,20 +412,41 @@ def get(
             status_message = ""
 
             try:
-                statement = select(model_class)  # type: ignore
-                if filters:
-                    conditions = [getattr(model_class, col) == value for col, value in filters.items()]
-                    statement = statement.where(and_(*conditions))
+                items = session.exec(self._select(model_class, filters, order)).all()
+                result = [self._model_to_dict(item) if return_json else item for item in items]
+                status_message = f"{model_class.__name__} Retrieved Successfully"
+            except Exception as e:
+                session.rollback()
+                status = False
+                status_message = f"Error while fetching {model_class.__name__}"
+                logger.error("Error while getting items: " + str(model_class.__name__) + " " + str(e))
 
-                if hasattr(model_class, "created_at") and order:
-                    order_by_clause = getattr(model_class.created_at, order)()  # Dynamically apply asc/desc
-                    statement = statement.order_by(order_by_clause)
+            return Response(message=status_message, status=status, data=result)
 
-                items = session.exec(statement).all()
+    async def aget(
+        self,
+        model_class: type[BaseDBModel],
+        filters: dict | None = None,
+        return_json: bool = False,
+        order: str = "desc",
+    ):
+        """Async version of get"""
+        if self.async_engine is None:
+            return await asyncio.to_thread(self.get, model_class, filters, return_json, order)
+
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        async with AsyncSession(self.async_engine) as session:
+            result = []
+            status = True
+            status_message = ""
+
+            try:
+                items = (await session.exec(self._select(model_class, filters, order))).all()
                 result = [self._model_to_dict(item) if return_json else item for item in items]
                 status_message = f"{model_class.__name__} Retrieved Successfully"
             except Exception as e:
-                session.rollback()
+                await session.rollback()
                 status = False
                 status_message = f"Error while fetching {model_class.__name__}"
                 logger.error("Error while getting items: " + str(model_class.__name__) + " " + str(e))
@@ -355,8 +577,10 @@ async def close(self):
         """Close database connections and cleanup resources"""
         logger.info("Closing database connections...")
         try:
-            # Dispose of the SQLAlchemy engine
+            # Dispose of the SQLAlchemy engines
             self.engine.dispose()
+            if self.async_engine is not None:
+                await self.async_engine.dispose()
             logger.info("Database connections closed successfully")
         except Exception as e:
             logger.error(f"Error closing database connections: {str(e)}")
@@ -44,7 +44,8 @@ class BaseDBModel(SQLModel, table=False):
         sa_column_kwargs={"onupdate": func.now(), "nullable": True},
     )
 
-    user_id: Optional[str] = None
+    # Lists are filtered by user, run and session, so these columns are indexed
+    user_id: Optional[str] = Field(default=None, index=True)
     version: Optional[str] = "0.0.1"
 
 
@@ -60,9 +61,11 @@ class Message(BaseDBModel, table=True):
         default_factory=lambda: MessageConfig(source="", content=""), sa_column=Column(JSON)
     )
     session_id: Optional[int] = Field(
-        default=None, sa_column=Column(Integer, ForeignKey("session.id", ondelete="NO ACTION"))
+        default=None, sa_column=Column(Integer, ForeignKey("session.id", ondelete="NO ACTION"), index=True)
+    )
+    run_id: Optional[int] = Field(
+        default=None, sa_column=Column(Integer, ForeignKey("run.id", ondelete="CASCADE"), index=True)
     )
-    run_id: Optional[int] = Field(default=None, sa_column=Column(Integer, ForeignKey("run.id", ondelete="CASCADE")))
 
     message_meta: Optional[Union[MessageMeta, dict]] = Field(default={}, sa_column=Column(JSON))
 
@@ -94,7 +97,8 @@ class Run(BaseDBModel, table=True):
     __table_args__ = {"sqlite_autoincrement": True}
 
     session_id: Optional[int] = Field(
-        default=None, sa_column=Column(Integer, ForeignKey("session.id", ondelete="CASCADE"), nullable=False)
+        default=None,
+        sa_column=Column(Integer, ForeignKey("session.id", ondelete="CASCADE"), nullable=False, index=True),
     )
     status: RunStatus = Field(default=RunStatus.CREATED)
 
@@ -111,7 +115,7 @@ class Run(BaseDBModel, table=True):
     messages: Union[List[Message], List[dict]] = Field(default_factory=list, sa_column=Column(JSON))
 
     model_config = ConfigDict(json_encoders={datetime: lambda v: v.isoformat()})  # type: ignore[call-arg]
-    user_id: Optional[str] = None
+    user_id: Optional[str] = Field(default=None, index=True)
 
 
 class Gallery(BaseDBModel, table=True):
@@ -33,6 +33,7 @@
     TeamResult,
 )
 from ...teammanager import TeamManager
+from .message_writer import MessageWriter
 from .run_context import RunContext
 
 logger = logging.getLogger(__name__)
@@ -43,6 +44,8 @@ class WebSocketManager:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        # Messages are saved in batches, so that database commits do not hold up streaming
+        self._message_writer = MessageWriter(db_manager)
         self._connections: Dict[int, WebSocket] = {}
         self._cancellation_tokens: Dict[int, CancellationToken] = {}
         # Track explicitly closed connections
@@ -136,10 +139,13 @@ async def start_stream(
                                 LLMCallEventMessage,
                             ),
                         ):
-                            await self._save_message(run_id, message)
+                            if run is not None:
+                                await self._save_message(run, message)
                         # Capture final result if it's a TeamResult
                         elif isinstance(message, TeamResult):
                             final_result = message.model_dump()
+                # Save the remaining messages before the run is marked as finished
+                await self._message_writer.flush(run_id)
                 if not cancellation_token.is_cancelled() and run_id not in self._closed_connections:
                     if final_result:
                         await self._update_run(run_id, RunStatus.COMPLETE, team_result=final_result)
@@ -165,21 +171,17 @@ async def start_stream(
                 await self._handle_stream_error(run_id, e)
             finally:
                 self._cancellation_tokens.pop(run_id, None)
-
-    async def _save_message(
-        self, run_id: int, message: Union[BaseAgentEvent | BaseChatMessage, BaseChatMessage]
-    ) -> None:
-        """Save a message to the database"""
-
-        run = await self._get_run(run_id)
-        if run:
-            db_message = Message(
-                session_id=run.session_id,
-                run_id=run_id,
-                config=self._convert_images_in_dict(message.model_dump()),
-                user_id=None,  # You might want to pass this from somewhere
-            )
-            self.db_manager.upsert(db_message)
+                await self._message_writer.flush(run_id)
+
+    async def _save_message(self, run: Run, message: Union[BaseAgentEvent | BaseChatMessage, BaseChatMessage]) -> None:
+        """Queue a message to be saved to the database"""
+        db_message = Message(
+            session_id=run.session_id,
+            run_id=run.id,
+            config=self._convert_images_in_dict(message.model_dump()),
+            user_id=None,  # You might want to pass this from somewhere
+        )
+        await self._message_writer.add(db_message)
 
     async def _update_run(
         self, run_id: int, status: RunStatus, team_result: Optional[dict] = None, error: Optional[str] = None
@@ -402,7 +404,7 @@ async def _get_run(self, run_id: int) -> Optional[Run]:
         Returns:
             Optional[Run]: Run object if found, None otherwise
         """
-        response = self.db_manager.get(Run, filters={"id": run_id}, return_json=False)
+        response = await self.db_manager.aget(Run, filters={"id": run_id}, return_json=False)
         return response.data[0] if response.status and response.data else None
 
     async def _get_settings(self, user_id: str) -> Optional[Settings]:
@@ -412,7 +414,7 @@ async def _get_settings(self, user_id: str) -> Optional[Settings]:
         Returns:
             Optional[dict]: User settings if found, None otherwise
         """
-        response = self.db_manager.get(filters={"user_id": user_id}, model_class=Settings, return_json=False)
+        response = await self.db_manager.aget(filters={"user_id": user_id}, model_class=Settings, return_json=False)
         return response.data[0] if response.status and response.data else None
 
     async def _update_run_status(self, run_id: int, status: RunStatus, error: Optional[str] = None) -> None:
@@ -471,6 +473,10 @@ async def cleanup(self) -> None:
         except Exception as e:
             logger.error(f"Error during WebSocketManager cleanup: {e}")
         finally:
+            try:
+                await self._message_writer.flush()
+            except Exception as e:
+                logger.error(f"Error saving messages during WebSocketManager cleanup: {e}")
             # Always clear internal state, even if cleanup had errors
             self._connections.clear()
             self._cancellation_tokens.clear()
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from ...database import DatabaseManager
+from ...datamodel import Message
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriter:
+    """Writes the messages of runs to the database in batches, off the event loop.
+
+    Messages are queued by :meth:`add` and written by a background task in a worker thread, in one
+    transaction per run. A batch is written once ``batch_size`` messages are queued, or
+    ``flush_interval`` seconds after the previous batch. When ``max_pending`` messages are waiting
+    to be written, :meth:`add` waits for them, so a slow database cannot make the queue grow
+    without bound.
+
+    Args:
+        db_manager: The database to write to
+        batch_size: The number of queued messages that starts a write immediately
+        flush_interval: Seconds to wait for more messages before writing a batch
+        max_pending: The maximum number of messages waiting to be written
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_pending: int = 1000,
+    ):
+        self.db_manager = db_manager
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        # Messages that are queued, by run
+        self._queued: Dict[int, List[Message]] = {}
+        self._num_queued = 0
+        # Messages that are queued or being written, by run
+        self._unwritten: Dict[int, int] = {}
+        self._num_unwritten = 0
+        self._flush_requested = asyncio.Event()
+        self._written = asyncio.Condition()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def add(self, message: Message) -> None:
+        """Queue a message to be written, waiting if too many messages are waiting to be written"""
+        if self._num_unwritten >= self._max_pending:
+            self._flush_requested.set()
+            async with self._written:
+                await self._written.wait_for(lambda: self._num_unwritten < self._max_pending)
+
+        run_id = message.run_id or 0
+        self._queued.setdefault(run_id, []).append(message)
+        self._num_queued += 1
+        self._unwritten[run_id] = self._unwritten.get(run_id, 0) + 1
+        self._num_unwritten += 1
+        if self._num_queued >= self._batch_size:
+            self._flush_requested.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._write_batches())
+
+    async def flush(self, run_id: Optional[int] = None) -> None:
+        """Wait until the queued messages of a run, or of all runs, are written"""
+        if (self._unwritten.get(run_id, 0) if run_id is not None else self._num_unwritten) == 0:
+            return
+        self._flush_requested.set()
+        async with self._written:
+            if run_id is None:
+                await self._written.wait_for(lambda: self._num_unwritten == 0)
+            else:
+                await self._written.wait_for(lambda: run_id not in self._unwritten)
+
+    async def _write_batches(self) -> None:
+        # The batch being written
+        batches: Dict[int, List[Message]] = {}
+        cancelled = False
+        try:
+            while self._queued:
+                if not self._flush_requested.is_set():
+                    try:
+                        await asyncio.wait_for(self._flush_requested.wait(), self._flush_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                self._flush_requested.clear()
+                batches, self._queued, self._num_queued = self._queued, {}, 0
+                await asyncio.to_thread(self._write, batches)
+                await self._settle(batches)
+                batches = {}
+        except asyncio.CancelledError:
+            cancelled = True
+            # Nothing will write the queued messages, so they are lost with the batch
+            for run_id, messages in self._queued.items():
+                batches.setdefault(run_id, []).extend(messages)
+            self._queued, self._num_queued = {}, 0
+            raise
+        except Exception:
+            logger.exception("Failed to save messages")
+        finally:
+            # Settle the lost messages, so that flush and add do not wait for them forever
+            num_lost = sum(len(messages) for messages in batches.values())
+            if num_lost:
+                logger.error(f"{num_lost} messages were not saved")
+                await self._settle(batches)
+            self._task = None
+            if self._queued and not cancelled:
+                self._task = asyncio.create_task(self._write_batches())
+
+    async def _settle(self, batches: Dict[int, List[Message]]) -> None:
+        """Count the messages of the batches as no longer waiting to be written, and wake up their waiters"""
+        async with self._written:
+            for run_id, messages in batches.items():
+                self._unwritten[run_id] -= len(messages)
+                self._num_unwritten -= len(messages)
+                if self._unwritten[run_id] == 0:
+                    del self._unwritten[run_id]
+            self._written.notify_all()
+
+    def _write(self, batches: Dict[int, List[Message]]) -> None:
+        for run_id, messages in batches.items():
+            response = self.db_manager.insert_many(messages)
+            if not response.status:
+                logger.error(f"Failed to save {len(messages)} messages of run {run_id}: {response.message}")
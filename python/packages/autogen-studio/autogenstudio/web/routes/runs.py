@@ -50,7 +50,7 @@ async def create_run(
 @router.get("/{run_id}")
 async def get_run(run_id: int, db=Depends(get_db)) -> Dict:
     """Get run details including task and result"""
-    run = db.get(Run, filters={"id": run_id}, return_json=False)
+    run = await db.aget(Run, filters={"id": run_id}, return_json=False)
     if not run.status or not run.data:
         raise HTTPException(status_code=404, detail="Run not found")
 
@@ -60,6 +60,6 @@ async def get_run(run_id: int, db=Depends(get_db)) -> Dict:
 @router.get("/{run_id}/messages")
 async def get_run_messages(run_id: int, db=Depends(get_db)) -> Dict:
     """Get all messages for a run"""
-    messages = db.get(Message, filters={"run_id": run_id}, order="created_at asc", return_json=False)
+    messages = await db.aget(Message, filters={"run_id": run_id}, order="created_at asc", return_json=False)
 
     return {"status": True, "data": messages.data}
@@ -14,7 +14,7 @@
 @router.get("/")
 async def list_sessions(user_id: str, db=Depends(get_db)) -> Dict:
     """List all sessions for a user"""
-    response = db.get(Session, filters={"user_id": user_id})
+    response = await db.aget(Session, filters={"user_id": user_id})
     return {"status": True, "data": response.data}
 
 
@@ -69,29 +69,30 @@ async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -
 
     try:
         # 1. Verify session exists and belongs to user
-        session = db.get(Session, filters={"id": session_id, "user_id": user_id}, return_json=False)
+        session = await db.aget(Session, filters={"id": session_id, "user_id": user_id}, return_json=False)
         if not session.status:
             raise HTTPException(status_code=500, detail="Database error while fetching session")
         if not session.data:
             raise HTTPException(status_code=404, detail="Session not found or access denied")
 
         # 2. Get ordered runs for session
-        runs = db.get(Run, filters={"session_id": session_id}, order="asc", return_json=False)
+        runs = await db.aget(Run, filters={"session_id": session_id}, order="asc", return_json=False)
         if not runs.status:
             raise HTTPException(status_code=500, detail="Database error while fetching runs")
 
+        # Get the messages of all runs in one query, rather than one query per run
+        session_messages = await db.aget(Message, filters={"session_id": session_id}, order="asc", return_json=False)
+        if not session_messages.status:
+            logger.error(f"Failed to fetch messages for session {session_id}")
+        messages_by_run: Dict[int, list] = {}
+        for message in session_messages.data or []:
+            messages_by_run.setdefault(message.run_id, []).append(message)
+
         # 3. Build response with messages per run
         run_data = []
         if runs.data:  # It's ok to have no runs
             for run in runs.data:
                 try:
-                    # Get messages for this specific run
-                    messages = db.get(Message, filters={"run_id": run.id}, order="asc", return_json=False)
-                    if not messages.status:
-                        logger.error(f"Failed to fetch messages for run {run.id}")
-                        # Continue processing other runs even if one fails
-                        messages.data = []
-
                     run_data.append(
                         {
                             "id": str(run.id),
@@ -99,7 +100,7 @@ async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -
                             "status": run.status,
                             "task": run.task,
                             "team_result": run.team_result,
-                            "messages": messages.data or [],
+                            "messages": messages_by_run.get(run.id, []),
                         }
                     )
                 except Exception as e:
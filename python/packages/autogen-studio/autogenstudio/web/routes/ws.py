@@ -29,7 +29,7 @@ async def run_websocket(
 
     try:
         # Verify run exists before connecting
-        run_response = db.get(Run, filters={"id": run_id}, return_json=False)
+        run_response = await db.aget(Run, filters={"id": run_id}, return_json=False)
         if not run_response.status or not run_response.data:
             await websocket.close(code=4004, reason="Run not found")
             return
@@ -1,5 +1,6 @@
 import asyncio 
 import pytest
+from sqlalchemy import inspect
 from sqlmodel import Session, text, select
 from typing import Generator
 
@@ -9,6 +10,7 @@
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.conditions import TextMentionTermination
 from autogenstudio.datamodel.db import Team, Session as SessionModel, Run, Message, RunStatus, MessageConfig
+from autogenstudio.web.managers.message_writer import MessageWriter
 
 
 @pytest.fixture
@@ -167,6 +169,141 @@ def test_cascade_delete(self, test_db: DatabaseManager, test_user: str):
         # Clean up
         test_db.delete(Team, {"id": team1.id})
 
+    def test_message_writer(self, test_db: DatabaseManager, test_user: str):
+        """Test that queued messages are saved in batches and flushed"""
+        team = Team(user_id=test_user, component={"name": "Team1", "type": "team"})
+        test_db.upsert(team)
+        session = SessionModel(user_id=test_user, team_id=team.id, name="Session1")
+        test_db.upsert(session)
+        run = Run(
+            user_id=test_user,
+            session_id=session.id,
+            status=RunStatus.ACTIVE,
+            task=MessageConfig(content="Task1", source="user").model_dump()
+        )
+        test_db.upsert(run)
+
+        async def write_messages() -> None:
+            writer = MessageWriter(test_db, batch_size=10, flush_interval=10, max_pending=20)
+            for i in range(25):
+                await writer.add(Message(
+                    user_id=test_user,
+                    session_id=session.id,
+                    run_id=run.id,
+                    config=MessageConfig(content=f"Message{i}", source="assistant").model_dump()
+                ))
+            # Full batches are written without waiting for the flush interval
+            saved = test_db.get(Message, {"run_id": run.id})
+            assert 10 <= len(saved.data) < 25
+            await writer.flush(run.id)
+
+        asyncio.run(write_messages())
+        saved = test_db.get(Message, {"run_id": run.id}, order="asc")
+        assert [message.config["content"] for message in saved.data] == [f"Message{i}" for i in range(25)]
+
+    def test_message_writer_failure(self, test_db: DatabaseManager, test_user: str, monkeypatch):
+        """Test that flush returns when a batch fails to be written, and that later messages are still saved"""
+        writer = MessageWriter(test_db, batch_size=10, flush_interval=10, max_pending=20)
+        insert_many = test_db.insert_many
+
+        def failing_insert_many(messages):
+            monkeypatch.setattr(test_db, "insert_many", insert_many)
+            raise RuntimeError("Database is gone")
+
+        monkeypatch.setattr(test_db, "insert_many", failing_insert_many)
+
+        def message(content: str) -> Message:
+            return Message(
+                user_id=test_user,
+                config=MessageConfig(content=content, source="assistant").model_dump()
+            )
+
+        async def write_messages() -> None:
+            await writer.add(message("Lost"))
+            await asyncio.wait_for(writer.flush(), timeout=5)
+            await writer.add(message("Saved"))
+            await asyncio.wait_for(writer.flush(), timeout=5)
+
+        asyncio.run(write_messages())
+        saved = test_db.get(Message, {"user_id": test_user})
+        assert [message.config["content"] for message in saved.data] == ["Saved"]
+
+    def test_upsert_many(self, test_db: DatabaseManager, test_user: str):
+        """Test bulk create and update with a single statement per model"""
+        teams = [Team(user_id=test_user, component={"name": f"Team{i}", "type": "team"}) for i in range(3)]
+        response = test_db.upsert_many(teams)
+        assert response.status is True
+
+        saved = test_db.get(Team, {"user_id": test_user}, order="asc")
+        assert [team.component["name"] for team in saved.data] == ["Team0", "Team1", "Team2"]
+
+        # Update existing rows and create a new one in the same call
+        updated = [
+            Team(id=team.id, user_id=test_user, component={"name": team.component["name"] + "-v2"})
+            for team in saved.data[:2]
+        ]
+        updated.append(Team(user_id=test_user, component={"name": "Team3", "type": "team"}))
+        response = test_db.upsert_many(updated)
+        assert response.status is True
+
+        saved = test_db.get(Team, {"user_id": test_user}, order="asc")
+        assert [team.component["name"] for team in saved.data] == ["Team0-v2", "Team1-v2", "Team2", "Team3"]
+
+    def test_sqlite_wal_and_indexes(self, test_db: DatabaseManager):
+        """Test that SQLite uses WAL and that the filtered columns are indexed"""
+        with Session(test_db.engine) as session:
+            assert session.exec(text("PRAGMA journal_mode")).first()[0] == "wal"  # type: ignore
+
+        indexes = {index["name"] for index in inspect(test_db.engine).get_indexes("message")}
+        assert {"ix_message_run_id", "ix_message_session_id", "ix_message_user_id"} <= indexes
+
+    def test_async_methods(self, test_db: DatabaseManager, test_user: str):
+        """Test the async methods without an async engine, which run the sync methods in a worker thread"""
+        assert test_db.async_engine is None
+
+        async def run_queries() -> None:
+            teams = [Team(user_id=test_user, component={"name": f"Team{i}", "type": "team"}) for i in range(2)]
+            response = await test_db.aupsert_many(teams)
+            assert response.status is True
+            response = await test_db.aget(Team, {"user_id": test_user}, order="asc")
+            assert [team.component["name"] for team in response.data] == ["Team0", "Team1"]
+
+        asyncio.run(run_queries())
+
+    def test_async_engine(self, tmp_path, test_user: str):
+        """Test the async methods with an async engine"""
+        pytest.importorskip("aiosqlite")
+        pytest.importorskip("greenlet")
+        db = DatabaseManager(f"sqlite:///{tmp_path / 'test_async.db'}", base_dir=tmp_path, async_engine=True)
+        db.initialize_database(auto_upgrade=False)
+
+        async def run_queries() -> None:
+            teams = [Team(user_id=test_user, component={"name": f"Team{i}", "type": "team"}) for i in range(2)]
+            response = await db.aupsert_many(teams)
+            assert response.status is True
+            response = await db.aget(Team, {"user_id": test_user}, order="asc")
+            assert [team.component["name"] for team in response.data] == ["Team0", "Team1"]
+            await db.close()
+
+        try:
+            asyncio.run(run_queries())
+        finally:
+            db.reset_db()
+
+    def test_async_engine_in_memory(self, tmp_path, test_user: str):
+        """Test that in-memory databases run the async methods on the same database as the sync ones"""
+        db = DatabaseManager("sqlite:///:memory:", base_dir=tmp_path, async_engine=True)
+        assert db.async_engine is None
+        db.initialize_database(auto_upgrade=False)
+        db.upsert(Team(user_id=test_user, component={"name": "Team0", "type": "team"}))
+
+        async def run_queries() -> None:
+            response = await db.aget(Team, {"user_id": test_user})
+            assert [team.component["name"] for team in response.data] == ["Team0"]
+            await db.close()
+
+        asyncio.run(run_queries())
+
     def test_initialize_database_scenarios(self, tmp_path, monkeypatch):
         """Test different initialize_database parameters"""
         db_path = tmp_path / "test_init.db"
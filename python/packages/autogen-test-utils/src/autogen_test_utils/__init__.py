@@ -2,7 +2,7 @@
 
 from asyncio import Event
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Mapping
 
 from autogen_core import (
     BaseAgent,
@@ -48,6 +48,12 @@ async def on_new_message(
         self.event.set()
         return message
 
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"num_calls": self.num_calls}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self.num_calls = state["num_calls"]
+
 
 @default_subscription
 class LoopbackAgentWithDefaultSubscription(LoopbackAgent): ...
@@ -67,6 +73,12 @@ async def on_new_message(self, message: CascadingMessageType, ctx: MessageContex
             return
         await self.publish_message(CascadingMessageType(round=message.round + 1), topic_id=DefaultTopicId())
 
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"num_calls": self.num_calls}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self.num_calls = state["num_calls"]
+
 
 class NoopAgent(BaseAgent):
     def __init__(self) -> None:
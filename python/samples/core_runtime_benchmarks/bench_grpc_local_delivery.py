@@ -0,0 +1,63 @@
+"""Measure the round trip of a message between two agents of the same GrpcWorkerAgentRuntime,
+through the host and with local delivery."""
+
+import argparse
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+
+from autogen_core import AgentId, MessageContext, RoutedAgent, message_handler, try_get_known_serializers_for_type
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+
+
+@dataclass
+class Ping:
+    content: str
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An echo agent.")
+
+    @message_handler
+    async def handle_ping(self, message: Ping, ctx: MessageContext) -> Ping:
+        return message
+
+
+async def run(host_address: str, num_messages: int, local_delivery: bool) -> tuple[float, float]:
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    worker = GrpcWorkerAgentRuntime(host_address=host_address, local_delivery=local_delivery)
+    await worker.start()
+    worker.add_message_serializer(try_get_known_serializers_for_type(Ping))
+    await EchoAgent.register(worker, "echo", EchoAgent)
+    # Let the host tell the worker that it hosts the agent type.
+    await asyncio.sleep(0.5)
+    message = Ping(content="x" * 256)
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        sent = time.perf_counter()
+        await worker.send_message(message, AgentId("echo", "default"))
+        latencies.append(time.perf_counter() - sent)
+    send_rate = num_messages / (time.perf_counter() - start)
+
+    await worker.stop()
+    await host.stop()
+    return statistics.median(latencies) * 1e6, send_rate
+
+
+async def main(host_address: str, num_messages: int) -> None:
+    for label, local_delivery in [("through the host", False), ("local delivery", True)]:
+        median_latency, send_rate = await run(host_address, num_messages, local_delivery)
+        print(f"{label:<18} round trip: {median_latency:>10.1f} us (median)   send: {send_rate:>10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="gRPC worker runtime local delivery benchmark.")
+    parser.add_argument("--messages", type=int, default=2000, help="Number of messages to send.")
+    parser.add_argument("--address", default="localhost:50099", help="Address of the host runtime.")
+    args = parser.parse_args()
+    asyncio.run(main(args.address, args.messages))
@@ -0,0 +1,93 @@
+"""Measure the publish throughput between two GrpcWorkerAgentRuntime workers through a local host,
+with and without message batching and compression."""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+import grpc
+from autogen_core import (
+    MessageContext,
+    RoutedAgent,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost, MessageBatching
+
+
+@dataclass
+class ChatEvent:
+    content: str
+
+
+class CountingAgent(RoutedAgent):
+    received = 0
+    done = asyncio.Event()
+    expected = 0
+
+    def __init__(self) -> None:
+        super().__init__("A counting agent.")
+
+    @message_handler
+    async def handle_event(self, message: ChatEvent, ctx: MessageContext) -> None:
+        CountingAgent.received += 1
+        if CountingAgent.received == CountingAgent.expected:
+            CountingAgent.done.set()
+
+
+async def run(
+    host_address: str,
+    num_messages: int,
+    message_batching: MessageBatching | None,
+    compression: grpc.Compression | None,
+) -> float:
+    host = GrpcWorkerAgentRuntimeHost(address=host_address, message_batching=message_batching, compression=compression)
+    host.start()
+    publisher = GrpcWorkerAgentRuntime(
+        host_address=host_address, message_batching=message_batching, compression=compression
+    )
+    receiver = GrpcWorkerAgentRuntime(
+        host_address=host_address, message_batching=message_batching, compression=compression
+    )
+    for worker in [publisher, receiver]:
+        await worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(ChatEvent))
+    await CountingAgent.register(receiver, "counter", CountingAgent, skip_class_subscriptions=True)
+    await receiver.add_subscription(TypeSubscription("chat", "counter"))
+
+    CountingAgent.received = 0
+    CountingAgent.expected = num_messages
+    CountingAgent.done = asyncio.Event()
+    message = ChatEvent(content="A short chat message. " * 4)
+
+    start = time.perf_counter()
+    for i in range(num_messages):
+        await publisher.publish_message(message, TopicId("chat", str(i % 10)))
+    await CountingAgent.done.wait()
+    rate = num_messages / (time.perf_counter() - start)
+
+    await publisher.stop()
+    await receiver.stop()
+    await host.stop()
+    return rate
+
+
+async def main(host_address: str, num_messages: int) -> None:
+    for label, message_batching, compression in [
+        ("unbatched", None, None),
+        ("batched", MessageBatching(), None),
+        ("batched, gzip", MessageBatching(), grpc.Compression.Gzip),
+    ]:
+        rate = await run(host_address, num_messages, message_batching, compression)
+        print(f"{label:<14} publish: {rate:>10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="gRPC worker runtime throughput benchmark.")
+    parser.add_argument("--messages", type=int, default=20000, help="Number of messages to publish.")
+    parser.add_argument("--address", default="localhost:50098", help="Address of the host runtime.")
+    args = parser.parse_args()
+    asyncio.run(main(args.address, args.messages))
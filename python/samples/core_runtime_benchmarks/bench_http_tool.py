@@ -0,0 +1,72 @@
+"""Measure HttpTool call latency with a new client per call, a shared client, and a response cache."""
+
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from autogen_core import CancellationToken
+from autogen_ext.tools.http import HttpTool
+
+
+class Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests.
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm delays on kept-alive connections.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        body = b'{"result": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=60")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def make_tool(port: int, **kwargs: Any) -> HttpTool:
+    return HttpTool(
+        name="bench",
+        host="127.0.0.1",
+        port=port,
+        path="/",
+        method="GET",
+        json_schema={"type": "object", "properties": {"value": {"type": "string"}}},
+        **kwargs,
+    )
+
+
+async def latency(tool: HttpTool, num_calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        await tool.run_json({"value": "x"}, CancellationToken())
+    return (time.perf_counter() - start) / num_calls * 1e3
+
+
+async def main(num_calls: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    for label, tool in [
+        ("new client per call", make_tool(port, share_client=False)),
+        ("shared client", make_tool(port)),
+        ("shared client, response cache", make_tool(port, response_cache_size=100)),
+    ]:
+        print(f"{label:<35} {await latency(tool, num_calls):>10.3f} ms/call")
+
+    await HttpTool.close_shared_clients()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HttpTool connection pooling benchmark against a local server.")
+    parser.add_argument("--calls", type=int, default=500, help="Number of tool calls per measurement.")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
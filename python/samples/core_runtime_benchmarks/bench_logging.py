@@ -0,0 +1,89 @@
+"""Measure publish/send throughput of the SingleThreadedAgentRuntime with event logging on and off."""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from autogen_core import (
+    EVENT_LOGGER_NAME,
+    AgentId,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    default_subscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+
+
+@dataclass
+class Ping:
+    content: str
+
+
+class FormattingHandler(logging.Handler):
+    """Formats every record, like a real log handler would, and discards the output."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+
+
+@default_subscription
+class NoopAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("A no-op agent.")
+
+    @message_handler
+    async def handle_ping(self, message: Ping, ctx: MessageContext) -> None:
+        pass
+
+
+async def run(num_messages: int, num_subscribers: int) -> tuple[float, float]:
+    runtime = SingleThreadedAgentRuntime()
+    await NoopAgent.register(runtime, "noop", NoopAgent)
+    # Register the message type so event payloads can be serialized.
+    runtime.add_message_serializer(try_get_known_serializers_for_type(Ping))
+    runtime.start()
+    message = Ping(content="x" * 256)
+
+    start = time.perf_counter()
+    for i in range(num_messages):
+        await runtime.publish_message(message, DefaultTopicId(source=str(i % num_subscribers)))
+    await runtime.stop_when_idle()
+    publish_rate = num_messages / (time.perf_counter() - start)
+
+    runtime.start()
+    start = time.perf_counter()
+    for i in range(num_messages):
+        await runtime.send_message(message, AgentId("noop", str(i % num_subscribers)))
+    await runtime.stop_when_idle()
+    send_rate = num_messages / (time.perf_counter() - start)
+    await runtime.close()
+    return publish_rate, send_rate
+
+
+async def main(num_messages: int, num_subscribers: int) -> None:
+    event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+    event_logger.propagate = False
+    for label, level, handler in [
+        ("logging off", logging.WARNING, None),
+        ("logging on, no consumer", logging.INFO, logging.NullHandler()),
+        ("logging on, formatted", logging.INFO, FormattingHandler()),
+    ]:
+        event_logger.handlers.clear()
+        event_logger.setLevel(level)
+        if handler is not None:
+            event_logger.addHandler(handler)
+        publish_rate, send_rate = await run(num_messages, num_subscribers)
+        print(f"{label:<26} publish: {publish_rate:>10.0f} msg/s   send: {send_rate:>10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runtime event logging benchmark.")
+    parser.add_argument("--messages", type=int, default=20000, help="Number of messages to publish and send.")
+    parser.add_argument("--subscribers", type=int, default=100, help="Number of distinct agent keys.")
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.subscribers))
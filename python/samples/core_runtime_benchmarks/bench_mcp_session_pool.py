@@ -0,0 +1,55 @@
+"""Measure MCP tool call latency and throughput with and without a session pool."""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from autogen_core import CancellationToken
+from autogen_ext.tools.mcp import McpSessionPool, StdioServerParams, mcp_server_tools
+from autogen_ext.tools.mcp._session import create_mcp_server_session
+
+
+async def call_with_new_session(server_params: StdioServerParams, text: str) -> None:
+    # What every tool call paid before sessions were pooled.
+    async with create_mcp_server_session(server_params) as session:
+        await session.initialize()
+        await session.call_tool(name="echo", arguments={"text": text})
+
+
+async def main(num_calls: int, concurrency: int) -> None:
+    # The echo server of the MCP tool adapter tests.
+    server = Path(__file__).parents[2] / "packages" / "autogen-ext" / "tests" / "mcp_echo_server.py"
+    server_params = StdioServerParams(command=sys.executable, args=[str(server)], read_timeout_seconds=60)
+
+    start = time.perf_counter()
+    for i in range(num_calls):
+        await call_with_new_session(server_params, str(i))
+    latency = (time.perf_counter() - start) / num_calls * 1e3
+    print(f"{'sequential, new session per call':<40} {latency:>10.2f} ms/call")
+
+    pool = McpSessionPool(max_concurrent_calls=concurrency)
+    tools = {tool.name: tool for tool in await mcp_server_tools(server_params, session_pool=pool)}
+    echo = tools["echo"]
+
+    start = time.perf_counter()
+    for i in range(num_calls):
+        await echo.run_json({"text": str(i)}, CancellationToken())
+    latency = (time.perf_counter() - start) / num_calls * 1e3
+    print(f"{'sequential, pooled session':<40} {latency:>10.2f} ms/call")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(echo.run_json({"text": str(i)}, CancellationToken()) for i in range(num_calls)))
+    rate = num_calls / (time.perf_counter() - start)
+    print(f"{f'concurrent ({concurrency} per session), pooled':<40} {rate:>10.0f} calls/s")
+
+    await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP session pool benchmark against a local STDIO echo server.")
+    parser.add_argument("--calls", type=int, default=50, help="Number of tool calls per measurement.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum concurrent calls per session.")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency))
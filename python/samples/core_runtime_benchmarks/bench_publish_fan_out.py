@@ -0,0 +1,68 @@
+"""Measure 1->N publish throughput of the SingleThreadedAgentRuntime with and without a fan-out concurrency limit."""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from autogen_core import (
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+
+
+@dataclass
+class Broadcast:
+    content: str
+
+
+class NoopAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("A no-op agent.")
+
+    @message_handler
+    async def handle_broadcast(self, message: Broadcast, ctx: MessageContext) -> None:
+        pass
+
+
+async def run(num_messages: int, num_subscribers: int, max_publish_concurrency: int | None) -> float:
+    runtime = SingleThreadedAgentRuntime(max_publish_concurrency=max_publish_concurrency)
+    for i in range(num_subscribers):
+        await NoopAgent.register(runtime, f"noop{i}", NoopAgent, skip_class_subscriptions=True)
+        await runtime.add_subscription(TypeSubscription("broadcast", f"noop{i}"))
+    runtime.start()
+    topic_id = TopicId("broadcast", "default")
+    message = Broadcast(content="x" * 256)
+
+    # Instantiate the subscribers before timing.
+    await runtime.publish_message(message, topic_id)
+    await runtime.stop_when_idle()
+
+    runtime.start()
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await runtime.publish_message(message, topic_id)
+    await runtime.stop_when_idle()
+    elapsed = time.perf_counter() - start
+    await runtime.close()
+    return num_messages * num_subscribers / elapsed
+
+
+async def main(num_messages: int, num_subscribers: int, max_publish_concurrency: int) -> None:
+    for limit in [None, max_publish_concurrency]:
+        rate = await run(num_messages, num_subscribers, limit)
+        label = "unbounded" if limit is None else f"max_publish_concurrency={limit}"
+        print(f"1->{num_subscribers} publish, {label:<30} {rate:>10.0f} deliveries/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runtime publish fan-out benchmark.")
+    parser.add_argument("--messages", type=int, default=100, help="Number of messages to publish.")
+    parser.add_argument("--subscribers", type=int, default=1000, help="Number of subscribers per message.")
+    parser.add_argument("--max-publish-concurrency", type=int, default=64, help="Fan-out concurrency limit.")
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.subscribers, args.max_publish_concurrency))